@@ -72,11 +72,16 @@ from xmodule.exceptions import SerializationError
 from xmodule.modulestore import COURSE_ROOT, LIBRARY_ROOT, ModuleStoreEnum
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import DuplicateCourseError, InvalidProctoringProvider, ItemNotFoundError
-from xmodule.modulestore.xml_exporter import export_course_to_xml, export_library_to_xml
+from xmodule.modulestore.xml_exporter import (
+    export_course_to_tarball,
+    export_course_to_xml,
+    export_library_to_tarball,
+    export_library_to_xml
+)
 from xmodule.modulestore.xml_importer import CourseImportException, import_course_from_xml, import_library_from_xml
 from .outlines import update_outline_from_modulestore
 from .outlines_regenerate import CourseOutlineRegenerate
-from .toggles import bypass_olx_failure_enabled
+from .toggles import bypass_olx_failure_enabled, stream_course_export_enabled
 from .utils import course_import_olx_validation_is_enabled
 
 User = get_user_model()
@@ -358,17 +363,30 @@ def create_export_tarball(course_block, course_key, context, status=None):
     root_dir = path(mkdtemp())
 
     try:
-        if isinstance(course_key, LibraryLocator):
-            export_library_to_xml(modulestore(), contentstore(), course_key, root_dir, name)
+        if stream_course_export_enabled():
+            # Write the export straight into the tarball, rather than compressing an exported directory.
+            LOGGER.debug('tar file being generated at %s', export_file.name)
+            with tarfile.open(name=export_file.name, mode='w:gz') as tar_file:
+                if isinstance(course_key, LibraryLocator):
+                    export_library_to_tarball(modulestore(), contentstore(), course_key, tar_file, name)
+                else:
+                    export_course_to_tarball(modulestore(), contentstore(), course_block.id, tar_file, name)
+
+            if status:
+                status.set_state('Compressing')
+                status.increment_completed_steps()
         else:
-            export_course_to_xml(modulestore(), contentstore(), course_block.id, root_dir, name)
-
-        if status:
-            status.set_state('Compressing')
-            status.increment_completed_steps()
-        LOGGER.debug('tar file being generated at %s', export_file.name)
-        with tarfile.open(name=export_file.name, mode='w:gz') as tar_file:
-            tar_file.add(root_dir / name, arcname=name)
+            if isinstance(course_key, LibraryLocator):
+                export_library_to_xml(modulestore(), contentstore(), course_key, root_dir, name)
+            else:
+                export_course_to_xml(modulestore(), contentstore(), course_block.id, root_dir, name)
+
+            if status:
+                status.set_state('Compressing')
+                status.increment_completed_steps()
+            LOGGER.debug('tar file being generated at %s', export_file.name)
+            with tarfile.open(name=export_file.name, mode='w:gz') as tar_file:
+                tar_file.add(root_dir / name, arcname=name)
 
     except SerializationError as exc:
         LOGGER.exception('There was an error exporting %s', course_key, exc_info=True)
@@ -5,6 +5,7 @@ Unit tests for course import and export Celery tasks
 
 import copy
 import json
+import tarfile
 from unittest import mock
 from uuid import uuid4
 
@@ -17,15 +18,24 @@ from organizations.models import OrganizationCourse
 from organizations.tests.factories import OrganizationFactory
 from user_tasks.models import UserTaskArtifact, UserTaskStatus
 
-from cms.djangoapps.contentstore.tasks import export_olx, update_special_exams_and_publish, rerun_course
+from cms.djangoapps.contentstore.tasks import (
+    create_export_tarball,
+    export_olx,
+    update_special_exams_and_publish,
+    rerun_course
+)
 from cms.djangoapps.contentstore.tests.test_libraries import LibraryTestCase
 from cms.djangoapps.contentstore.tests.utils import CourseTestCase
+from cms.djangoapps.contentstore.toggles import STREAM_COURSE_EXPORT
 from common.djangoapps.course_action_state.models import CourseRerunState
 from common.djangoapps.student.tests.factories import UserFactory
 from openedx.core.djangoapps.course_apps.toggles import EXAMS_IDA
 from openedx.core.djangoapps.embargo.models import Country, CountryAccessRule, RestrictedCourse
+from xmodule.contentstore.content import StaticContent  # lint-amnesty, pylint: disable=wrong-import-order
+from xmodule.contentstore.django import contentstore  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.modulestore.django import modulestore  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.modulestore.tests.django_utils import TEST_DATA_SPLIT_MODULESTORE
+from xmodule.modulestore.tests.factories import BlockFactory
 
 TEST_DATA_CONTENTSTORE = copy.deepcopy(settings.CONTENTSTORE)
 TEST_DATA_CONTENTSTORE['DOC_STORE_CONFIG']['db'] = 'test_xcontent_%s' % uuid4().hex
@@ -57,6 +67,28 @@ class ExportCourseTestCase(CourseTestCase):
         output = artifacts[0]
         self.assertEqual(output.name, 'Output')
 
+    def test_streaming_export(self):
+        """
+        Verify that a course export streamed into the tarball has the same files as one compressed from a directory
+        """
+        BlockFactory.create(parent=self.course, category='chapter', display_name='Chapter')
+        asset_key = self.course.id.make_asset_key('asset', 'sample.txt')
+        contentstore().save(StaticContent(asset_key, 'sample.txt', 'text/plain', b'sample content'))
+
+        def _exported_files(stream):
+            with override_waffle_flag(STREAM_COURSE_EXPORT, active=stream):
+                export_file = create_export_tarball(self.course, self.course.id, {})
+            with tarfile.open(export_file.name) as tar_file:
+                return {
+                    member.name: tar_file.extractfile(member).read()
+                    for member in tar_file.getmembers() if member.isfile()
+                }
+
+        streamed_files = _exported_files(stream=True)
+        self.assertIn(f'{self.course.url_name}/course.xml', streamed_files)
+        self.assertEqual(streamed_files[f'{self.course.url_name}/static/sample.txt'], b'sample content')
+        self.assertEqual(streamed_files, _exported_files(stream=False))
+
     @mock.patch('cms.djangoapps.contentstore.tasks.export_course_to_xml', side_effect=side_effect_exception)
     def test_exception(self, mock_export):  # pylint: disable=unused-argument
         """
@@ -51,6 +51,23 @@ BYPASS_OLX_FAILURE = WaffleFlag(
 )
 
 
+# .. toggle_name: contentstore.stream_course_export
+# .. toggle_implementation: WaffleFlag
+# .. toggle_default: False
+# .. toggle_description: When enabled, course and library exports are written straight into the export tarball as
+#   they're produced, with static assets copied from GridFS a chunk at a time, instead of being exported to a
+#   temporary directory which is then compressed. This bounds the memory used by the export of courses with large
+#   assets, and avoids writing every exported file to disk twice.
+# .. toggle_use_cases: temporary
+# .. toggle_creation_date: 2026-10-18
+# .. toggle_target_removal_date: 2027-01-18
+STREAM_COURSE_EXPORT = WaffleFlag(
+    f'{CONTENTSTORE_NAMESPACE}.stream_course_export',
+    __name__,
+    CONTENTSTORE_LOG_PREFIX,
+)
+
+
 def split_library_view_on_dashboard():
     """
     check if data new view for library is enabled on studio dashboard.
@@ -65,6 +82,13 @@ def bypass_olx_failure_enabled():
     return BYPASS_OLX_FAILURE.is_enabled()
 
 
+def stream_course_export_enabled():
+    """
+    Check if course exports should be streamed into the export tarball.
+    """
+    return STREAM_COURSE_EXPORT.is_enabled()
+
+
 # .. toggle_name: FEATURES['ENABLE_EXAM_SETTINGS_HTML_VIEW']
 # .. toggle_use_cases: open_edx
 # .. toggle_implementation: SettingDictToggle
@@ -157,6 +157,16 @@ BLOCK_STRUCTURES_SETTINGS = dict(
     TASK_MAX_RETRIES=5,
 )
 
+################################ Course Overviews ###################################
+
+# .. setting_name: COURSE_OVERVIEW_CACHE_TIMEOUT
+# .. setting_default: 3600
+# .. setting_description: Time, in seconds, for which CourseOverviews (with their tabs and image
+#   sets) are kept in the default cache by CourseOverview.get_from_id and get_from_ids. Cached
+#   overviews are invalidated when they're saved or deleted, and when their course is published
+#   or deleted. Set to 0 to disable the cache.
+COURSE_OVERVIEW_CACHE_TIMEOUT = 3600
+
 ############################ FEATURE CONFIGURATION #############################
 
 PLATFORM_NAME = _('Your Platform Name Here')
@@ -1223,6 +1233,19 @@ CODE_JAIL_REST_SERVICE_CONNECT_TIMEOUT = 0.5  # time in seconds
 #   codejail remote service endpoint.
 CODE_JAIL_REST_SERVICE_READ_TIMEOUT = 3.5  # time in seconds
 
+# Code jail warm worker pool
+ENABLE_CODEJAIL_WORKER_POOL = False
+# .. setting_name: CODE_JAIL_WORKER_POOL_SIZE
+# .. setting_default: 4
+# .. setting_description: The maximum number of warm sandbox workers started by each process
+#   to run jailed code, when ENABLE_CODEJAIL_WORKER_POOL is True.
+CODE_JAIL_WORKER_POOL_SIZE = 4
+# .. setting_name: CODE_JAIL_WORKER_POOL_MAX_JOBS
+# .. setting_default: 100
+# .. setting_description: The number of executions of jailed code after which a warm sandbox
+#   worker is replaced with a new one.
+CODE_JAIL_WORKER_POOL_MAX_JOBS = 100
+
 ############################ DJANGO_BUILTINS ################################
 # Change DEBUG in your environment settings files, not here
 DEBUG = False
@@ -2335,6 +2358,37 @@ CACHES = {
     },
 }
 
+# .. setting_name: COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES
+# .. setting_default: 0
+# .. setting_description: Maximum total size, in bytes, of the uncompressed pickles of split
+#     modulestore course structures kept in a per-process LRU cache in front of the
+#     'course_structure_cache' django cache. The per-process cache saves the django cache round
+#     trip and the zlib decompression, but structures are still unpickled on each read, so that
+#     callers get their own copy. Set to 0 to disable the per-process cache. Structures are
+#     immutable, so the per-process cache never needs to be invalidated.
+COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES = 0
+
+# .. setting_name: COURSE_ASSETS_DISK_CACHE_DIR
+# .. setting_default: None
+# .. setting_description: Directory of a local disk cache of the data of course assets which are too
+#   large for the content cache. Such assets are copied from the contentstore to a file named after
+#   their digest, in a background thread, the first time they're requested, and later full and ranged
+#   requests are served from that file. The directory may be shared by the processes of a server.
+#   Set to None to disable the disk cache.
+COURSE_ASSETS_DISK_CACHE_DIR = None
+
+# .. setting_name: COURSE_ASSETS_DISK_CACHE_MAX_SIZE
+# .. setting_default: 10 * 1024 ** 3 (10GiB)
+# .. setting_description: Approximate maximum total size, in bytes, of the files of the course asset
+#   disk cache. The least recently used files are deleted when it is exceeded.
+COURSE_ASSETS_DISK_CACHE_MAX_SIZE = 10 * 1024 ** 3
+
+# .. setting_name: COURSE_ASSETS_DISK_CACHE_MAX_FILE_SIZE
+# .. setting_default: 1024 ** 3 (1GiB)
+# .. setting_description: Maximum size, in bytes, of a course asset kept in the course asset disk
+#   cache. Larger assets are always served from the contentstore.
+COURSE_ASSETS_DISK_CACHE_MAX_FILE_SIZE = 1024 ** 3
+
 ############################ OAUTH2 Provider ###################################
 
 # 5 minute expiration time for JWT id tokens issued for external API requests.
@@ -2522,6 +2576,28 @@ ANALYTICS_DASHBOARD_NAME = 'Your Platform Name Here Insights'
 COMMENTS_SERVICE_URL = 'http://localhost:18080'
 COMMENTS_SERVICE_KEY = 'password'
 
+# .. setting_name: COMMENTS_SERVICE_POOL_SIZE
+# .. setting_default: 10
+# .. setting_description: The maximum number of keep-alive connections to the comments service kept
+#   open by each process, which are reused by the requests to the service.
+COMMENTS_SERVICE_POOL_SIZE = 10
+
+# .. setting_name: COMMENTS_SERVICE_GET_RETRIES
+# .. setting_default: 2
+# .. setting_description: The number of times GET requests to the comments service are retried
+#   on connection and read errors. Other requests are only retried when they could not connect.
+COMMENTS_SERVICE_GET_RETRIES = 2
+
+# .. toggle_name: COMMENTS_SERVICE_REQUEST_CACHE_ENABLED
+# .. toggle_implementation: DjangoSetting
+# .. toggle_default: False
+# .. toggle_description: When enabled, the responses of identical GET requests to the comments
+#   service are cached for the duration of a Django request. Other requests to the service clear
+#   the cache.
+# .. toggle_use_cases: open_edx
+# .. toggle_creation_date: 2026-10-18
+COMMENTS_SERVICE_REQUEST_CACHE_ENABLED = False
+
 EXAMS_SERVICE_URL = 'http://localhost:18740/api/v1'
 EXAMS_SERVICE_USERNAME = 'edx_exams_worker'
 
@@ -25,3 +25,8 @@ class BaseBackend(metaclass=abc.ABCMeta):
     def send(self, event):
         """Send event to tracker."""
         pass  # lint-amnesty, pylint: disable=unnecessary-pass
+
+    def send_batch(self, events):
+        """Send a list of events to tracker, at once if the backend can."""
+        for event in events:
+            self.send(event)
@@ -98,3 +98,13 @@ class MongoBackend(BaseBackend):
             # during the next event.
             msg = 'Error inserting to MongoDB event tracker backend'
             log.exception(msg)
+
+    def send_batch(self, events):
+        """Insert the events in to the Mongo collection at once"""
+        try:
+            # Copy the events, since insert_many adds their _id to them.
+            self.collection.insert_many([dict(event) for event in events], ordered=False)
+        except (PyMongoError, BSONError):
+            # The events will be lost, as in send.
+            msg = 'Error inserting to MongoDB event tracker backend'
+            log.exception(msg)
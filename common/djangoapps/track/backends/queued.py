@@ -0,0 +1,220 @@
+"""
+Event tracker backend that sends events to other backends from a background thread.
+
+Sending an event to a slow backend, such as a MongoDB collection, otherwise
+adds to the latency of the request that emitted it. This backend only puts
+the event in an in-process queue, and a background thread sends the events
+to the wrapped backends, in batches when events are emitted faster than they
+are sent.
+
+It can be configured in TRACKING_BACKENDS, for example::
+
+  TRACKING_BACKENDS = {
+      'queued': {
+          'ENGINE': 'common.djangoapps.track.backends.queued.QueuedBackend',
+          'OPTIONS': {
+              'backends': {
+                  'mongo': {
+                      'ENGINE': 'common.djangoapps.track.backends.mongodb.MongoBackend',
+                      'OPTIONS': {...},
+                  },
+              },
+              'max_queue_size': 10000,
+              'overflow': 'drop',
+          }
+      }
+  }
+
+or in EVENT_TRACKING_BACKENDS, around a RoutingBackend, so that its
+processors (such as the ones of track.shim) also run in the background.
+
+Events must not be modified once sent, since they are sent to the wrapped
+backends later.
+"""
+
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.utils.module_loading import import_string
+from edx_django_utils.monitoring import set_custom_attribute
+
+from common.djangoapps.track.backends import BaseBackend
+
+log = logging.getLogger(__name__)
+
+# Overflow policies, for events sent while the queue is full.
+OVERFLOW_DROP = 'drop'
+OVERFLOW_BLOCK = 'block'
+
+# Marks the end of the events in the queue.
+_STOP = object()
+
+
+class QueuedBackend(BaseBackend):
+    """
+    Event tracker backend that sends events to other backends from a background thread.
+
+    The backends are sent lists of events with their send_batch method if they have
+    one, and event by event with their send method otherwise.
+    """
+
+    def __init__(
+        self, backends, max_queue_size=10000, batch_size=100, overflow=OVERFLOW_DROP, shutdown_timeout=5.0,
+        **kwargs
+    ):
+        """
+        :Parameters:
+
+          - `backends`: the backends to send the events to, by name. Each is either a
+            backend or the configuration of one, with its `ENGINE` and `OPTIONS`.
+          - `max_queue_size`: the maximum number of events waiting to be sent.
+          - `batch_size`: the maximum number of events sent to the backends at once.
+          - `overflow`: what to do with an event sent when the queue is full: 'drop'
+            the event, or 'block' until there is room in the queue.
+          - `shutdown_timeout`: the maximum time, in seconds, to wait at exit for the
+            queued events to be sent.
+
+        """
+        super().__init__(**kwargs)
+
+        if overflow not in (OVERFLOW_DROP, OVERFLOW_BLOCK):
+            raise ValueError(f'Invalid overflow policy for the queued event track backend: {overflow}')
+
+        self.backends = {
+            name: _instantiate_backend(backend)
+            for name, backend in backends.items()
+            # Ignore empty values to turn-off backends
+            if backend
+        }
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.overflow = overflow
+        self.shutdown_timeout = shutdown_timeout
+
+        # The statistics of this process.
+        self.events_sent = 0
+        self.events_dropped = 0
+        # The time, in seconds, from the queueing of the oldest event of the last batch to the end of its sending.
+        self.last_batch_latency = 0.0
+
+        self._lock = threading.Lock()
+        self._queue = None
+        self._thread = None
+        # The process which started the thread, since forked processes need their own thread.
+        self._pid = None
+        self._closed = False
+        atexit.register(self.close)
+
+    def send(self, event):
+        """
+        Queue the event to be sent to the backends.
+        """
+        if self._closed:
+            self._send_batch([event])
+            return
+
+        event_queue = self._get_queue()
+        try:
+            event_queue.put((time.monotonic(), event), block=self.overflow == OVERFLOW_BLOCK)
+        except queue.Full:
+            self.events_dropped += 1
+            log.warning('The queue of the queued event track backend is full, dropping an event')
+
+        set_custom_attribute('track_queue_depth', event_queue.qsize())
+        set_custom_attribute('track_queue_dropped_events', self.events_dropped)
+        set_custom_attribute('track_queue_latency', self.last_batch_latency)
+
+    def close(self):
+        """
+        Send the queued events to the backends, waiting at most shutdown_timeout
+        seconds, and stop the background thread. Later events are sent synchronously.
+        """
+        with self._lock:
+            self._closed = True
+            thread = self._thread if self._pid == os.getpid() else None
+            self._thread = None
+        if thread is None:
+            return
+
+        deadline = time.monotonic() + self.shutdown_timeout
+        try:
+            self._queue.put(_STOP, timeout=self.shutdown_timeout)
+        except queue.Full:
+            pass
+        thread.join(max(0, deadline - time.monotonic()))
+        if thread.is_alive():
+            log.warning(
+                'Timed out sending the %d queued events of the queued event track backend', self._queue.qsize()
+            )
+
+    def _get_queue(self):
+        """
+        Returns the queue of this process, starting its background thread if needed.
+        """
+        pid = os.getpid()
+        if self._pid != pid:
+            with self._lock:
+                if self._pid != pid:
+                    self._queue = queue.Queue(maxsize=self.max_queue_size)
+                    self._thread = threading.Thread(
+                        target=self._run, args=(self._queue,), name='track-queued-backend', daemon=True,
+                    )
+                    self._thread.start()
+                    self._pid = pid
+        return self._queue
+
+    def _run(self, event_queue):
+        """
+        Send the events of the queue to the backends, until the end of the events.
+        """
+        stopped = False
+        while not stopped:
+            batch = []
+            item = event_queue.get()
+            # Also send the events which were queued while the previous batch was sent.
+            while True:
+                if item is _STOP:
+                    stopped = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = event_queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._send_batch([event for __, event in batch])
+                self.events_sent += len(batch)
+                self.last_batch_latency = time.monotonic() - batch[0][0]
+
+    def _send_batch(self, events):
+        """
+        Send the events to each backend.
+        """
+        for name, backend in self.backends.items():
+            try:
+                if hasattr(backend, 'send_batch'):
+                    backend.send_batch(events)
+                else:
+                    for event in events:
+                        backend.send(event)
+            except Exception:  # pylint: disable=broad-except
+                log.exception('Unable to send %d events to the event track backend %s', len(events), name)
+
+
+def _instantiate_backend(backend):
+    """
+    Returns the given backend, instantiated from its configuration if needed.
+    """
+    if isinstance(backend, dict):
+        backend = import_string(backend['ENGINE'])(**backend.get('OPTIONS', {}))
+    if not callable(getattr(backend, 'send', None)):
+        raise ValueError(f'Event track backend {backend} does not have a send method')
+    return backend
@@ -36,3 +36,17 @@ class TestMongoBackend(TestCase):  # lint-amnesty, pylint: disable=missing-class
 
         assert events[0] == first_argument(calls[0])
         assert events[1] == first_argument(calls[1])
+
+    def test_mongo_backend_send_batch(self):
+        events = [{'test': 1}, {'test': 2}]
+
+        self.backend.send_batch(events)
+
+        # Check if we inserted copies of the events into the database at once,
+        # since insert_many adds their _id to them.
+        calls = self.backend.collection.insert_many.mock_calls
+        assert len(calls) == 1
+        _, args, kwargs = calls[0]
+        assert args[0] == events
+        assert args[0][0] is not events[0]
+        assert kwargs == {'ordered': False}
@@ -0,0 +1,145 @@
+"""Tests for the queued event tracker backend."""
+
+
+import threading
+
+import pytest
+from django.test import TestCase
+
+from common.djangoapps.track.backends import BaseBackend
+from common.djangoapps.track.backends.queued import QueuedBackend
+
+
+class RecordingBackend(BaseBackend):
+    """Event tracker backend that records the batches of events it is sent."""
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.batches = []
+        # Set when the backend is sent a batch of events.
+        self.sending = threading.Event()
+        # Set to let the backend send events.
+        self.unblocked = threading.Event()
+        self.unblocked.set()
+
+    def send(self, event):
+        self.send_batch([event])
+
+    def send_batch(self, events):
+        self.sending.set()
+        self.unblocked.wait()
+        self.batches.append(list(events))
+
+    @property
+    def events(self):
+        return [event for batch in self.batches for event in batch]
+
+
+class SendOnlyBackend:
+    """Event tracker backend without a send_batch method."""
+    def __init__(self):
+        self.events = []
+
+    def send(self, event):
+        self.events.append(event)
+
+
+class FailingBackend(BaseBackend):
+    """Event tracker backend that fails to send events."""
+    def send(self, event):
+        raise ValueError('Failed to send the event')
+
+
+class TestQueuedBackend(TestCase):
+    """Tests for QueuedBackend."""
+
+    def create_backend(self, **options):
+        """
+        Returns a QueuedBackend sending events to a RecordingBackend.
+        """
+        backend = QueuedBackend(
+            backends={'recording': {'ENGINE': f'{__name__}.RecordingBackend'}},
+            **options
+        )
+        self.addCleanup(backend.close)
+        return backend, backend.backends['recording']
+
+    def test_send(self):
+        backend, recording_backend = self.create_backend()
+        events = [{'test': index} for index in range(10)]
+        for event in events:
+            backend.send(event)
+        backend.close()
+
+        assert recording_backend.events == events
+        assert backend.events_sent == 10
+        assert backend.events_dropped == 0
+
+    def test_batches(self):
+        backend, recording_backend = self.create_backend(batch_size=3)
+        # The first event is being sent while the next ones are queued.
+        recording_backend.unblocked.clear()
+        events = [{'test': index} for index in range(8)]
+        backend.send(events[0])
+        assert recording_backend.sending.wait(timeout=5)
+        for event in events[1:]:
+            backend.send(event)
+        recording_backend.unblocked.set()
+        backend.close()
+
+        assert recording_backend.events == events
+        assert [len(batch) for batch in recording_backend.batches] == [1, 3, 3, 1]
+
+    def test_overflow_drop(self):
+        backend, recording_backend = self.create_backend(max_queue_size=2)
+        recording_backend.unblocked.clear()
+        events = [{'test': index} for index in range(5)]
+        backend.send(events[0])
+        assert recording_backend.sending.wait(timeout=5)
+        for event in events[1:]:
+            backend.send(event)
+        recording_backend.unblocked.set()
+        backend.close()
+
+        # The first event is being sent while max_queue_size events are queued.
+        assert backend.events_dropped == 2
+        assert recording_backend.events == events[:3]
+
+    def test_overflow_block(self):
+        backend, recording_backend = self.create_backend(max_queue_size=1, overflow='block')
+        events = [{'test': index} for index in range(20)]
+        for event in events:
+            backend.send(event)
+        backend.close()
+
+        assert recording_backend.events == events
+        assert backend.events_dropped == 0
+
+    def test_invalid_overflow(self):
+        with pytest.raises(ValueError):
+            QueuedBackend(backends={}, overflow='ignore')
+
+    def test_send_after_close(self):
+        backend, recording_backend = self.create_backend()
+        backend.close()
+        backend.send({'test': 1})
+        assert recording_backend.events == [{'test': 1}]
+
+    def test_backends(self):
+        send_only_backend = SendOnlyBackend()
+        backend = QueuedBackend(backends={
+            'failing': {'ENGINE': f'{__name__}.FailingBackend'},
+            'send_only': send_only_backend,
+            'disabled': None,
+        })
+        assert set(backend.backends) == {'failing', 'send_only'}
+
+        backend.send({'test': 1})
+        backend.send({'test': 2})
+        backend.close()
+
+        # The failing backend doesn't prevent the other backends from being sent the events.
+        assert send_only_backend.events == [{'test': 1}, {'test': 2}]
+
+    def test_invalid_backend(self):
+        with pytest.raises(ValueError):
+            QueuedBackend(backends={'invalid': object()})
@@ -109,3 +109,72 @@ def get_course_blocks(
         starting_block_usage_key,
         collected_block_structure,
     )
+
+
+def get_course_block_removal_transformers():
+    """
+    Default list of transformers for computing the course blocks that
+    users have access to with get_course_blocks_for_users.
+
+    These are the transformers from get_course_block_access_transformers
+    which remove blocks from the block structure, rather than override
+    the fields of the blocks that are left.
+    """
+    return [
+        library_content.ContentLibraryTransformer(),
+        start_date.StartDateTransformer(),
+        user_partitions.UserPartitionTransformer(),
+        visibility.VisibilityTransformer(),
+    ]
+
+
+def get_course_blocks_for_users(
+        users,
+        starting_block_usage_key,
+        transformers=None,
+        collected_block_structure=None,
+        allow_start_dates_in_future=False,
+):
+    """
+    Returns the course blocks that each of the given users has access to,
+    starting at starting_block_usage_key.
+
+    Unlike get_course_blocks, the collected block structure is shared by
+    all the users rather than copied and transformed for each of them,
+    and the transformers compute anything that doesn't depend on the
+    user only once. So it is meant for reports and bulk operations on
+    many users, which only need to know which blocks each of the users
+    can access.
+
+    Arguments:
+        users ([django.contrib.auth.models.User]) - The users for which
+            the course blocks are evaluated.
+
+        starting_block_usage_key (UsageKey) - Specifies the starting block
+            of the block structure that is to be transformed.
+
+        transformers (BlockStructureTransformers) - A collection of
+            transformers which all implement MultiUserTransformerMixin.
+            If None, get_course_block_removal_transformers() is used.
+
+        collected_block_structure (BlockStructureBlockData) - A
+            block structure retrieved from a prior call to
+            BlockStructureManager.get_collected.  Can be optionally
+            provided if already available, for optimization.
+
+    Returns:
+        dict {user id: BlockSet} - The usage keys of the blocks that each
+            user has access to.
+    """
+    if not transformers:
+        transformers = BlockStructureTransformers(get_course_block_removal_transformers())
+    course_key = starting_block_usage_key.course_key
+    usage_infos = [CourseUsageInfo(course_key, user, allow_start_dates_in_future) for user in users]
+
+    block_sets = get_block_structure_manager(course_key).get_transformed_for_users(
+        transformers,
+        usage_infos,
+        starting_block_usage_key,
+        collected_block_structure,
+    )
+    return {user.id: block_set for user, block_set in zip(users, block_sets)}
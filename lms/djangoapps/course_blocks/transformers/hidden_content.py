@@ -5,9 +5,13 @@ Visibility Transformer implementation.
 
 from datetime import datetime
 
+from edx_when.api import get_dates_for_course
 from pytz import utc
 
-from openedx.core.djangoapps.content.block_structure.transformer import BlockStructureTransformer
+from openedx.core.djangoapps.content.block_structure.transformer import (
+    BlockStructureTransformer,
+    MultiUserTransformerMixin
+)
 from xmodule.seq_block import SequenceBlock  # lint-amnesty, pylint: disable=wrong-import-order
 
 from .utils import collect_merged_boolean_field, collect_merged_date_field
@@ -15,7 +19,7 @@ from .utils import collect_merged_boolean_field, collect_merged_date_field
 MAXIMUM_DATE = utc.localize(datetime.max)
 
 
-class HiddenContentTransformer(BlockStructureTransformer):
+class HiddenContentTransformer(MultiUserTransformerMixin, BlockStructureTransformer):
     """
     A transformer that enforces the hide_after_due field on
     blocks by removing children blocks from the block structure for
@@ -36,6 +40,13 @@ class HiddenContentTransformer(BlockStructureTransformer):
     MERGED_HIDE_AFTER_DUE = 'merged_hide_after_due'
     MERGED_END_DATE = 'merged_end_date'
 
+    # Set by prepare_for_users: whether the course is self-paced, and the
+    # masks of the blocks hidden after their due date and of the blocks
+    # hidden given their collected dates.
+    _self_paced = False
+    _hide_after_due_blocks = 0
+    _hidden_blocks = 0
+
     @classmethod
     def name(cls):
         """
@@ -92,15 +103,47 @@ class HiddenContentTransformer(BlockStructureTransformer):
         if usage_info.has_staff_access:
             return [block_structure.create_universal_filter()]
 
-        block_structure.remove_block_traversal(lambda block_key: self._is_block_hidden(block_structure, block_key))
+        self_paced = block_structure[block_structure.root_block_usage_key].self_paced
+        block_structure.remove_block_traversal(
+            lambda block_key: self._is_block_hidden(block_structure, block_key, self_paced)
+        )
 
-    def _is_block_hidden(self, block_structure, block_key):
+    def prepare_for_users(self, usage_infos, block_structure, block_index):
+        self._self_paced = block_structure[block_index.root_block_usage_key].self_paced
+        self._hide_after_due_blocks = block_index.mask_where(
+            lambda block_key: self._get_merged_hide_after_due(block_structure, block_key)
+        )
+        self._hidden_blocks = block_index.mask(
+            block_key for block_key in block_index.block_keys_in(self._hide_after_due_blocks)
+            if self._is_block_hidden(block_structure, block_key, self._self_paced)
+        )
+
+    def removed_blocks_for_user(self, usage_info, block_structure, block_index):
+        # Users with staff access bypass the Visibility check.
+        if usage_info.has_staff_access:
+            return 0
+        if self._self_paced or not self._hide_after_due_blocks:
+            return self._hidden_blocks
+
+        # The due dates of the user, as the DateOverrideTransformer would
+        # set them before the transform.
+        removed = self._hidden_blocks
+        for (block_key, field_name), date in get_dates_for_course(usage_info.course_key, usage_info.user).items():
+            block_bit = block_index.bit(block_key)
+            if field_name != 'due' or not block_bit & self._hide_after_due_blocks:
+                continue
+            if SequenceBlock.verify_current_content_visibility(date or MAXIMUM_DATE, True):
+                removed &= ~block_bit
+            else:
+                removed |= block_bit
+        return removed
+
+    def _is_block_hidden(self, block_structure, block_key, self_paced):
         """
         Returns whether the block with the given block_key should
         be hidden, given the current time.
         """
         hide_after_due = self._get_merged_hide_after_due(block_structure, block_key)
-        self_paced = block_structure[block_structure.root_block_usage_key].self_paced
         if self_paced:
             hidden_date = self._get_merged_end_date(block_structure, block_key)
         else:
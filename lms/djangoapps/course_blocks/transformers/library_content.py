@@ -12,7 +12,8 @@ from common.djangoapps.track import contexts
 from lms.djangoapps.courseware.models import StudentModule
 from openedx.core.djangoapps.content.block_structure.transformer import (
     BlockStructureTransformer,
-    FilteringTransformerMixin
+    FilteringTransformerMixin,
+    MultiUserTransformerMixin
 )
 from xmodule.library_content_block import LibraryContentBlock  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.modulestore.django import modulestore  # lint-amnesty, pylint: disable=wrong-import-order
@@ -22,7 +23,7 @@ from ..utils import get_student_module_as_dict
 logger = logging.getLogger(__name__)
 
 
-class ContentLibraryTransformer(FilteringTransformerMixin, BlockStructureTransformer):
+class ContentLibraryTransformer(MultiUserTransformerMixin, FilteringTransformerMixin, BlockStructureTransformer):
     """
     A transformer that manipulates the block structure by removing all
     blocks within a library_content block to which a user should not
@@ -33,6 +34,13 @@ class ContentLibraryTransformer(FilteringTransformerMixin, BlockStructureTransfo
     WRITE_VERSION = 1
     READ_VERSION = 1
 
+    # Set by prepare_for_users: the library_content blocks with children,
+    # the mask of their children, and the state of the blocks for each
+    # (user id, block key).
+    _library_blocks = ()
+    _library_children = 0
+    _student_module_states = {}
+
     @classmethod
     def name(cls):
         """
@@ -82,49 +90,11 @@ class ContentLibraryTransformer(FilteringTransformerMixin, BlockStructureTransfo
             library_children = block_structure.get_children(block_key)
             if library_children:
                 all_library_children.update(library_children)
-                selected = []
-                mode = block_structure.get_xblock_field(block_key, 'mode')
-                max_count = block_structure.get_xblock_field(block_key, 'max_count')
-                if max_count < 0:
-                    max_count = len(library_children)
-
                 # Retrieve "selected" json from LMS MySQL database.
                 state_dict = get_student_module_as_dict(usage_info.user, usage_info.course_key, block_key)
-                for selected_block in state_dict.get('selected', []):
-                    # Add all selected entries for this user for this
-                    # library block to the selected list.
-                    block_type, block_id = selected_block
-                    usage_key = usage_info.course_key.make_usage_key(block_type, block_id)
-                    if usage_key in library_children:
-                        selected.append(selected_block)
-
-                # Update selected
-                previous_count = len(selected)
-                block_keys = LibraryContentBlock.make_selection(selected, library_children, max_count, mode)
-                selected = block_keys['selected']
-
-                # Save back any changes
-                if any(block_keys[changed] for changed in ('invalid', 'overlimit', 'added')):
-                    state_dict['selected'] = selected
-                    StudentModule.save_state(
-                        student=usage_info.user,
-                        course_id=usage_info.course_key,
-                        module_state_key=block_key,
-                        defaults={
-                            'state': json.dumps(state_dict),
-                        },
-                    )
-
-                # publish events for analytics
-                self._publish_events(
-                    block_structure,
-                    block_key,
-                    previous_count,
-                    max_count,
-                    block_keys,
-                    usage_info.user.id,
+                all_selected_children.update(
+                    self._select_children(usage_info, block_structure, block_key, state_dict)
                 )
-                all_selected_children.update(usage_info.course_key.make_usage_key(s[0], s[1]) for s in selected)
 
         def check_child_removal(block_key):
             """
@@ -141,6 +111,89 @@ class ContentLibraryTransformer(FilteringTransformerMixin, BlockStructureTransfo
 
         return [block_structure.create_removal_filter(check_child_removal)]
 
+    def prepare_for_users(self, usage_infos, block_structure, block_index):
+        self._library_blocks = [
+            block_key for block_key in block_index.block_keys
+            if block_key.block_type == 'library_content' and block_structure.get_children(block_key)
+        ]
+        self._library_children = block_index.mask(
+            child_key
+            for block_key in self._library_blocks
+            for child_key in block_structure.get_children(block_key)
+        )
+
+        # Retrieve the "selected" json of all the users from LMS MySQL database at once.
+        self._student_module_states = {}
+        user_ids = [usage_info.user.id for usage_info in usage_infos if usage_info.user.is_authenticated]
+        if self._library_blocks and user_ids:
+            course_key = block_index.root_block_usage_key.course_key
+            student_modules = StudentModule.objects.chunked_filter(
+                'student_id__in',
+                user_ids,
+                course_id=course_key,
+                module_state_key__in=self._library_blocks,
+            )
+            for student_module in student_modules:
+                block_key = student_module.module_state_key.map_into_course(course_key)
+                self._student_module_states[(student_module.student_id, block_key)] = json.loads(student_module.state)
+
+    def removed_blocks_for_user(self, usage_info, block_structure, block_index):
+        selected_children = set()
+        for block_key in self._library_blocks:
+            state_dict = self._student_module_states.get((usage_info.user.id, block_key), {})
+            selected_children.update(self._select_children(usage_info, block_structure, block_key, state_dict))
+        return self._library_children & ~block_index.mask(selected_children)
+
+    def _select_children(self, usage_info, block_structure, block_key, state_dict):
+        """
+        Returns the usage keys of the children of the given
+        library_content block that are selected for the user, given the
+        user's state of the block. The selection is updated, saved and
+        published for analytics as needed.
+        """
+        library_children = block_structure.get_children(block_key)
+        selected = []
+        mode = block_structure.get_xblock_field(block_key, 'mode')
+        max_count = block_structure.get_xblock_field(block_key, 'max_count')
+        if max_count < 0:
+            max_count = len(library_children)
+
+        for selected_block in state_dict.get('selected', []):
+            # Add all selected entries for this user for this
+            # library block to the selected list.
+            block_type, block_id = selected_block
+            usage_key = usage_info.course_key.make_usage_key(block_type, block_id)
+            if usage_key in library_children:
+                selected.append(selected_block)
+
+        # Update selected
+        previous_count = len(selected)
+        block_keys = LibraryContentBlock.make_selection(selected, library_children, max_count, mode)
+        selected = block_keys['selected']
+
+        # Save back any changes
+        if any(block_keys[changed] for changed in ('invalid', 'overlimit', 'added')):
+            state_dict['selected'] = selected
+            StudentModule.save_state(
+                student=usage_info.user,
+                course_id=usage_info.course_key,
+                module_state_key=block_key,
+                defaults={
+                    'state': json.dumps(state_dict),
+                },
+            )
+
+        # publish events for analytics
+        self._publish_events(
+            block_structure,
+            block_key,
+            previous_count,
+            max_count,
+            block_keys,
+            usage_info.user.id,
+        )
+        return {usage_info.course_key.make_usage_key(s[0], s[1]) for s in selected}
+
     def _publish_events(self, block_structure, location, previous_count, max_count, block_keys, user_id):
         """
         Helper method to publish events for analytics purposes
@@ -5,11 +5,12 @@ Split Test Block Transformer
 
 from openedx.core.djangoapps.content.block_structure.transformer import (
     BlockStructureTransformer,
-    FilteringTransformerMixin
+    FilteringTransformerMixin,
+    MultiUserTransformerMixin
 )
 
 
-class SplitTestTransformer(FilteringTransformerMixin, BlockStructureTransformer):
+class SplitTestTransformer(MultiUserTransformerMixin, FilteringTransformerMixin, BlockStructureTransformer):
     """
     A nested transformer of the UserPartitionTransformer that honors the
     block structure pathways created by split_test blocks.
@@ -87,3 +88,9 @@ class SplitTestTransformer(FilteringTransformerMixin, BlockStructureTransformer)
                 keep_descendants=True,
             )
         ]
+
+    def blocks_removed_keeping_descendants(self, block_structure, block_index):
+        return block_index.mask_where(lambda block_key: block_key.block_type == 'split_test')
+
+    def removed_blocks_for_user(self, usage_info, block_structure, block_index):
+        return 0
@@ -2,21 +2,23 @@
 Start Date Transformer implementation.
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from pytz import UTC
 
-from lms.djangoapps.courseware.access_utils import check_start_date
+from common.djangoapps.student.roles import CourseBetaTesterRole
+from lms.djangoapps.courseware.access_utils import check_start_date, is_exempt_from_start_dates
 from openedx.core.djangoapps.content.block_structure.transformer import (
     BlockStructureTransformer,
-    FilteringTransformerMixin
+    FilteringTransformerMixin,
+    MultiUserTransformerMixin
 )
 from xmodule.course_metadata_utils import DEFAULT_START_DATE  # lint-amnesty, pylint: disable=wrong-import-order
 
 from .utils import collect_merged_date_field
 
 
-class StartDateTransformer(FilteringTransformerMixin, BlockStructureTransformer):
+class StartDateTransformer(MultiUserTransformerMixin, FilteringTransformerMixin, BlockStructureTransformer):
     """
     A transformer that enforces the 'start' and 'days_early_for_beta'
     fields on blocks by removing blocks from the block structure for
@@ -36,6 +38,11 @@ class StartDateTransformer(FilteringTransformerMixin, BlockStructureTransformer)
     READ_VERSION = 1
     MERGED_START_DATE = 'merged_start_date'
 
+    # The masks of the blocks that haven't started yet for learners and
+    # for beta testers, set by prepare_for_users.
+    _not_started = 0
+    _not_started_for_beta_testers = 0
+
     @classmethod
     def name(cls):
         """
@@ -109,3 +116,37 @@ class StartDateTransformer(FilteringTransformerMixin, BlockStructureTransformer)
             self._check_has_scheduled_content(block_structure, _removal_condition)
 
         return [block_structure.create_removal_filter(_removal_condition)]
+
+    def prepare_for_users(self, usage_infos, block_structure, block_index):
+        now = datetime.now(UTC)
+        self._not_started = 0
+        self._not_started_for_beta_testers = 0
+        for block_key in block_index.block_keys:
+            start = self._get_merged_start_date(block_structure, block_key)
+            if not start:
+                continue
+            days_early_for_beta = block_structure.get_xblock_field(block_key, 'days_early_for_beta')
+            if days_early_for_beta is not None:
+                start_for_beta_testers = start - timedelta(days_early_for_beta)
+            else:
+                start_for_beta_testers = start
+            block_bit = block_index.bit(block_key)
+            if now <= start:
+                self._not_started |= block_bit
+            if now <= start_for_beta_testers:
+                self._not_started_for_beta_testers |= block_bit
+
+    def removed_blocks_for_user(self, usage_info, block_structure, block_index):
+        # Users with staff access bypass the Start Date check.
+        if usage_info.has_staff_access or usage_info.allow_start_dates_in_future:
+            return 0
+
+        # The same checks as check_start_date, done once for all blocks.
+        if is_exempt_from_start_dates(usage_info.user, usage_info.course_key):
+            return 0
+        if (
+            self._not_started_for_beta_testers != self._not_started and
+            CourseBetaTesterRole(usage_info.course_key).has_user(usage_info.user)
+        ):
+            return self._not_started_for_beta_testers
+        return self._not_started
@@ -14,9 +14,10 @@ from common.djangoapps.course_modes.models import CourseMode
 from common.djangoapps.student.tests.factories import CourseEnrollmentFactory, UserFactory
 from lms.djangoapps.courseware.access import has_access
 from openedx.core.djangoapps.content.block_structure.tests.helpers import clear_registered_transformers_cache
+from openedx.core.djangoapps.content.block_structure.transformer import MultiUserTransformerMixin
 from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
 
-from ...api import get_course_blocks
+from ...api import get_course_blocks, get_course_blocks_for_users
 
 
 class TransformerRegistryTestMixin:
@@ -345,6 +346,11 @@ class BlockParentsMapTestCase(TransformerRegistryTestMixin, ModuleStoreTestCase)
                         f'block structure ({block_structure_result}) & has_access ({has_access_result})' \
                         f' results not equal for block {i} for user {user.username}'
 
+        # verify the transform for multiple users has the same results
+        if transformers is self.transformers and issubclass(self.TRANSFORMER_CLASS_TO_TEST, MultiUserTransformerMixin):
+            block_set = get_course_blocks_for_users([user], self.course.location, transformers)[user.id]
+            assert set(block_set) == set(block_structure)
+
         self.client.logout()
 
 
@@ -8,7 +8,7 @@ from common.djangoapps.student.tests.factories import CourseEnrollmentFactory
 from openedx.core.djangoapps.content.block_structure.api import clear_course_from_cache
 from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
 
-from ...api import get_course_blocks
+from ...api import get_course_blocks, get_course_blocks_for_users
 from ..library_content import ContentLibraryOrderTransformer, ContentLibraryTransformer
 from .helpers import CourseStructureTestCase
 
@@ -160,6 +160,13 @@ class ContentLibraryTransformerTestCase(CourseStructureTestCase):
                                                                                          selected_vertical,
                                                                                          selected_child), f"Expected 'selected' equality failed in iteration {i}."  # pylint: disable=line-too-long
 
+        # The saved selection is used for multiple users too.
+        block_set = get_course_blocks_for_users([self.user], self.course.location, self.transformers)[self.user.id]
+        assert set(block_set) == self.get_block_key_set(
+            self.blocks, 'course', 'chapter1', 'lesson1', 'vertical1', 'library_content1', selected_vertical,
+            selected_child,
+        )
+
 
 class ContentLibraryOrderTransformerTestCase(CourseStructureTestCase):
     """
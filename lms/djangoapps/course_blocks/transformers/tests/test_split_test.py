@@ -12,7 +12,7 @@ from xmodule.modulestore.tests.factories import check_mongo_calls  # lint-amnest
 from xmodule.partitions.partitions import Group, UserPartition  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.partitions.partitions_service import get_user_partition_groups  # lint-amnesty, pylint: disable=wrong-import-order
 
-from ...api import get_course_blocks
+from ...api import get_course_blocks, get_course_blocks_for_users
 from ..user_partitions import UserPartitionTransformer
 from .helpers import CourseStructureTestCase, create_location
 
@@ -196,6 +196,9 @@ class SplitTestTransformerTestCase(CourseStructureTestCase):
         )
         assert set(block_structure1.get_block_keys()) == set(self.get_block_key_set(self.blocks, *expected_blocks))
 
+        block_set = get_course_blocks_for_users([self.user], self.course.location, self.transformers)[self.user.id]
+        assert set(block_set) == set(self.get_block_key_set(self.blocks, *expected_blocks))
+
     def test_user_randomly_assigned(self):
         # user was randomly assigned to one of the groups
         user_groups = get_user_partition_groups(
@@ -22,7 +22,7 @@ from openedx.features.content_type_gating.partitions import create_content_gatin
 from xmodule.modulestore.tests.factories import CourseFactory  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.partitions.partitions import Group, UserPartition  # lint-amnesty, pylint: disable=wrong-import-order
 
-from ...api import get_course_blocks
+from ...api import get_course_blocks, get_course_blocks_for_users
 from ..user_partitions import UserPartitionTransformer, _MergedGroupAccess
 from .helpers import CourseStructureTestCase, update_block
 
@@ -226,6 +226,9 @@ class UserPartitionTransformerTestCase(UserPartitionTestMixin, CourseStructureTe
             self.get_block_key_set(self.blocks, *expected_blocks)
         )
 
+        block_set = get_course_blocks_for_users([self.user], self.course.location, self.transformers)[self.user.id]
+        self.assertSetEqual(set(block_set), self.get_block_key_set(self.blocks, *expected_blocks))
+
     def test_transform_with_content_gating_partition(self):
         self.setup_partitions_and_course()
         CourseModeFactory.create(course_id=self.course.id, mode_slug='audit')
@@ -5,8 +5,10 @@ User Partitions Transformer
 
 from lms.djangoapps.courseware.access import has_access
 from openedx.core.djangoapps.content.block_structure.transformer import (  # lint-amnesty, pylint: disable=unused-import
-    BlockStructureTransformer
+    BlockStructureTransformer,
+    MultiUserTransformerMixin
 )
+from xmodule.partitions.partitions import UserPartition  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.partitions.partitions_service import (  # lint-amnesty, pylint: disable=wrong-import-order
     get_all_partitions_for_course,
     get_partition_from_id,
@@ -17,7 +19,7 @@ from .split_test import SplitTestTransformer
 from .utils import get_field_on_block
 
 
-class UserPartitionTransformer(BlockStructureTransformer):
+class UserPartitionTransformer(MultiUserTransformerMixin, BlockStructureTransformer):
     """
     A transformer that enforces the group access rules on course blocks,
     by honoring their user_partitions and group_access fields, and
@@ -29,6 +31,12 @@ class UserPartitionTransformer(BlockStructureTransformer):
     WRITE_VERSION = 1
     READ_VERSION = 1
 
+    # Set by prepare_for_users: for each partition id, the mask of the
+    # blocks with group access restrictions for that partition, and the
+    # masks of the blocks that each of its groups may access.
+    _restricted_blocks = {}
+    _allowed_blocks = {}
+
     @classmethod
     def name(cls):
         """
@@ -127,6 +135,68 @@ class UserPartitionTransformer(BlockStructureTransformer):
                         block_key, 'authorization_denial_message', access_denying_messages[0]
                     )
 
+    def blocks_removed_keeping_descendants(self, block_structure, block_index):
+        return SplitTestTransformer().blocks_removed_keeping_descendants(block_structure, block_index)
+
+    def prepare_for_users(self, usage_infos, block_structure, block_index):
+        self._restricted_blocks = {}
+        self._allowed_blocks = {}
+        for block_key in block_index.block_keys:
+            merged_group_access = block_structure.get_transformer_block_field(block_key, self, 'merged_group_access')
+            if merged_group_access is None:
+                continue
+            block_bit = block_index.bit(block_key)
+            for partition_id, allowed_group_ids in merged_group_access.get_allowed_groups().items():
+                self._restricted_blocks[partition_id] = self._restricted_blocks.get(partition_id, 0) | block_bit
+                allowed_blocks = self._allowed_blocks.setdefault(partition_id, {})
+                for group_id in allowed_group_ids:
+                    allowed_blocks[group_id] = allowed_blocks.get(group_id, 0) | block_bit
+
+    def removed_blocks_for_user(self, usage_info, block_structure, block_index):
+        if not self._restricted_blocks:
+            return 0
+
+        user = usage_info.user
+        # If you have staff access, you are allowed access to the entire result list
+        if has_access(user, 'staff', usage_info.course_key):
+            return 0
+
+        user_partitions = block_structure.get_transformer_data(self, 'user_partitions')
+        user_groups = get_user_partition_groups(usage_info.course_key, user_partitions, user, 'id')
+
+        removed = 0
+        denied_blocks_with_messages = {}
+        for partition_id, restricted_blocks in self._restricted_blocks.items():
+            partition = get_partition_from_id(user_partitions, partition_id)
+            if not partition:
+                continue
+            user_group = user_groups.get(partition_id)
+            allowed_blocks = self._allowed_blocks[partition_id].get(user_group.id, 0) if user_group else 0
+            denied_blocks = restricted_blocks & ~allowed_blocks
+            removed |= denied_blocks
+            if denied_blocks and _has_access_denied_message(partition):
+                denied_blocks_with_messages[partition] = denied_blocks
+
+        # As in transform, blocks for which a partition has an access
+        # denied message are kept, with the message.
+        for partition, denied_blocks in denied_blocks_with_messages.items():
+            for block_key in block_index.block_keys_in(denied_blocks & removed):
+                merged_group_access = block_structure.get_transformer_block_field(
+                    block_key, self, 'merged_group_access'
+                )
+                allowed_groups = merged_group_access.get_allowed_groups()[partition.id]
+                if partition.access_denied_message(block_key, user, user_groups.get(partition.id), allowed_groups):
+                    removed &= ~block_index.bit(block_key)
+        return removed
+
+
+def _has_access_denied_message(partition):
+    """
+    Returns whether the given partition may have an access denied
+    message for the blocks it denies access to.
+    """
+    return type(partition).access_denied_message is not UserPartition.access_denied_message
+
 
 class _MergedGroupAccess:
     """
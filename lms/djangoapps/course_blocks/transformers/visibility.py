@@ -5,13 +5,14 @@ Visibility Transformer implementation.
 
 from openedx.core.djangoapps.content.block_structure.transformer import (
     BlockStructureTransformer,
-    FilteringTransformerMixin
+    FilteringTransformerMixin,
+    MultiUserTransformerMixin
 )
 
 from .utils import collect_merged_boolean_field
 
 
-class VisibilityTransformer(FilteringTransformerMixin, BlockStructureTransformer):
+class VisibilityTransformer(MultiUserTransformerMixin, FilteringTransformerMixin, BlockStructureTransformer):
     """
     A transformer that enforces the visible_to_staff_only field on
     blocks by removing blocks from the block structure for which the
@@ -29,6 +30,9 @@ class VisibilityTransformer(FilteringTransformerMixin, BlockStructureTransformer
 
     MERGED_VISIBLE_TO_STAFF_ONLY = 'merged_visible_to_staff_only'
 
+    # The mask of the blocks visible to staff only, set by prepare_for_users.
+    _visible_to_staff_only = 0
+
     @classmethod
     def name(cls):
         """
@@ -71,3 +75,14 @@ class VisibilityTransformer(FilteringTransformerMixin, BlockStructureTransformer
                 lambda block_key: self._get_visible_to_staff_only(block_structure, block_key),
             )
         ]
+
+    def prepare_for_users(self, usage_infos, block_structure, block_index):
+        self._visible_to_staff_only = block_index.mask_where(
+            lambda block_key: self._get_visible_to_staff_only(block_structure, block_key),
+        )
+
+    def removed_blocks_for_user(self, usage_info, block_structure, block_index):
+        # Users with staff access bypass the Visibility check.
+        if usage_info.has_staff_access:
+            return 0
+        return self._visible_to_staff_only
@@ -130,30 +130,35 @@ def check_start_date(user, days_early_for_beta, start, course_key, display_error
     Returns:
         AccessResponse: Either ACCESS_GRANTED or StartDateError.
     """
-    start_dates_disabled = settings.FEATURES['DISABLE_START_DATES']
-    masquerading_as_student = is_masquerading_as_student(user, course_key)
+    if start is None or is_exempt_from_start_dates(user, course_key):
+        return ACCESS_GRANTED
 
-    if start_dates_disabled and not masquerading_as_student:
+    if now is None:
+        now = datetime.now(UTC)
+    effective_start = adjust_start_date(user, days_early_for_beta, start, course_key)
+
+    should_grant_access = now > effective_start
+    if should_grant_access:
         return ACCESS_GRANTED
-    else:
-        if start is None or in_preview_mode() or get_course_masquerade(user, course_key):
-            return ACCESS_GRANTED
 
-        if now is None:
-            now = datetime.now(UTC)
-        effective_start = adjust_start_date(user, days_early_for_beta, start, course_key)
+    # Before returning a StartDateError, determine if the learner should be redirected to the enterprise learner
+    # portal by returning StartDateEnterpriseLearnerError instead.
+    request = get_current_request()
+    if request and enterprise_learner_enrolled(request, user, course_key):
+        return StartDateEnterpriseLearnerError(start, display_error_to_user=display_error_to_user)
 
-        should_grant_access = now > effective_start
-        if should_grant_access:
-            return ACCESS_GRANTED
+    return StartDateError(start, display_error_to_user=display_error_to_user)
 
-        # Before returning a StartDateError, determine if the learner should be redirected to the enterprise learner
-        # portal by returning StartDateEnterpriseLearnerError instead.
-        request = get_current_request()
-        if request and enterprise_learner_enrolled(request, user, course_key):
-            return StartDateEnterpriseLearnerError(start, display_error_to_user=display_error_to_user)
 
-        return StartDateError(start, display_error_to_user=display_error_to_user)
+def is_exempt_from_start_dates(user, course_key):
+    """
+    Returns whether the given user may access the content of the given
+    course regardless of its start dates.
+    """
+    start_dates_disabled = settings.FEATURES['DISABLE_START_DATES']
+    if start_dates_disabled and not is_masquerading_as_student(user, course_key):
+        return True
+    return in_preview_mode() or bool(get_course_masquerade(user, course_key))
 
 
 def in_preview_mode():
@@ -7,6 +7,7 @@ import json
 import logging
 import textwrap
 from collections import OrderedDict
+from contextlib import nullcontext
 
 from functools import partial
 
@@ -61,9 +62,10 @@ from lms.djangoapps.courseware.masquerade import (
     is_masquerading_as_specific_student,
     setup_masquerade
 )
-from lms.djangoapps.courseware.model_data import DjangoKeyValueStore, FieldDataCache
+from lms.djangoapps.courseware.model_data import DjangoKeyValueStore, FieldDataCache, user_state_write_behind
 from lms.djangoapps.courseware.field_overrides import OverrideFieldData
 from lms.djangoapps.courseware.services import UserStateService
+from lms.djangoapps.courseware.toggles import COURSEWARE_COALESCE_USER_STATE_WRITES
 from lms.djangoapps.grades.api import GradesUtilService
 from lms.djangoapps.lms_xblock.field_data import LmsFieldData
 from lms.djangoapps.lms_xblock.runtime import UserTagsService, lms_wrappers_aside, lms_applicable_aside_types
@@ -951,7 +953,13 @@ def _invoke_xblock_handler(request, course_id, usage_id, handler, suffix, course
                     handler_instance = get_aside_from_xblock(instance, usage_key.aside_type)
                 else:
                     handler_instance = instance
-                resp = handler_instance.handle(handler, req, suffix)
+                # Repeated saves of the learner's state by the handler are coalesced into one write.
+                if COURSEWARE_COALESCE_USER_STATE_WRITES.is_enabled(course_key):
+                    write_behind = user_state_write_behind()
+                else:
+                    write_behind = nullcontext()
+                with write_behind:
+                    resp = handler_instance.handle(handler, req, suffix)
                 if suffix == 'problem_check' \
                         and course \
                         and getattr(course, 'entrance_exam_enabled', False) \
@@ -19,6 +19,9 @@ UserStateSummaryCache: A cache for Scope.user_state_summary
 PreferencesCache: A cache for Scope.preferences
 UserInfoCache: A cache for Scope.user_info
 DjangoOrmFieldCache: A base-class for single-row-per-field caches.
+
+:func:`user_state_write_behind`: A context manager which buffers and coalesces
+    the Scope.user_state writes of all FieldDataCaches, until it exits.
 """
 
 
@@ -26,8 +29,11 @@ import json
 import logging
 from abc import ABCMeta, abstractmethod
 from collections import defaultdict, namedtuple
+from contextlib import contextmanager
 
 from django.db import DatabaseError, IntegrityError, transaction
+from edx_django_utils import monitoring as monitoring_utils
+from edx_django_utils.cache import RequestCache
 from opaque_keys.edx.asides import AsideUsageKeyV1, AsideUsageKeyV2
 from opaque_keys.edx.block_types import BlockTypeKeyV1
 from opaque_keys.edx.keys import LearningContextKey
@@ -51,6 +57,53 @@ class InvalidWriteError(Exception):
     """
 
 
+_WRITE_BEHIND_CACHE_NAMESPACE = 'courseware.model_data.write_behind'
+_WRITE_BEHIND_CACHES_KEY = 'user_state_caches'
+
+
+@contextmanager
+def user_state_write_behind():
+    """
+    Within this context, the Scope.user_state writes of all FieldDataCaches
+    are buffered, so that all writes to the same StudentModule are coalesced
+    into one. The buffered writes are flushed when the context exits, even
+    if it exits with an exception, or when FieldDataCache.save is called.
+
+    Nested uses of this context have no effect: writes are flushed when the
+    outermost one exits.
+    """
+    request_cache = RequestCache(_WRITE_BEHIND_CACHE_NAMESPACE)
+    if request_cache.get_cached_response(_WRITE_BEHIND_CACHES_KEY).is_found:
+        yield
+        return
+
+    # The UserStateCaches that have buffered writes.
+    user_state_caches = []
+    request_cache.set(_WRITE_BEHIND_CACHES_KEY, user_state_caches)
+    try:
+        yield
+    finally:
+        request_cache.delete(_WRITE_BEHIND_CACHES_KEY)
+        flush_error = None
+        for user_state_cache in user_state_caches:
+            try:
+                user_state_cache.flush()
+            except KeyValueMultiSaveError as exc:
+                # Flush the writes of the other caches before raising.
+                flush_error = flush_error or exc
+        if flush_error:
+            raise flush_error
+
+
+def _write_behind_caches():
+    """
+    Returns the list of UserStateCaches with buffered writes, or None if
+    writes aren't currently buffered.
+    """
+    cached_response = RequestCache(_WRITE_BEHIND_CACHE_NAMESPACE).get_cached_response(_WRITE_BEHIND_CACHES_KEY)
+    return cached_response.value if cached_response.is_found else None
+
+
 def _all_usage_keys(blocks, aside_types):
     """
     Return a set of all usage_ids for the `blocks` and for
@@ -340,6 +393,11 @@ class UserStateCache:
         self.user = user
         self._client = DjangoXBlockUserStateClient(self.user)
 
+        # Writes buffered by user_state_write_behind, coalesced by block.
+        self._pending_updates = defaultdict(dict)
+        # The number of block writes that the pending updates replace.
+        self._pending_write_count = 0
+
     def cache_fields(self, fields, xblocks, aside_types):  # pylint: disable=unused-argument
         """
         Load all fields specified by ``fields`` for the supplied ``xblocks``
@@ -357,6 +415,24 @@ class UserStateCache:
         for user_state in block_field_state:
             self._cache[user_state.block_key] = user_state.state
 
+    def cache_student_modules(self, student_modules):
+        """
+        Load the state stored in the supplied StudentModules, which must belong
+        to this cache's user, into this cache, without querying them again.
+
+        Arguments:
+            student_modules (list of :class:`StudentModule`): The StudentModules to cache.
+        """
+        for student_module in student_modules:
+            if student_module.state is None:
+                continue
+            state = json.loads(student_module.state)
+            # As in DjangoXBlockUserStateClient.get_many, empty state is deleted state.
+            if state == {}:
+                continue
+            usage_key = student_module.module_state_key.map_into_course(student_module.course_id)
+            self._cache[usage_key] = state
+
     def set(self, kvs_key, value):
         """
         Set the specified `kvs_key` to the field value `value`.
@@ -376,6 +452,7 @@ class UserStateCache:
 
         Returns: datetime if there was a modified date, or None otherwise
         """
+        self.flush()
         try:
             return self._client.get(
                 self.user.username,
@@ -399,6 +476,38 @@ class UserStateCache:
 
             pending_updates[cache_key][kvs_key.field_name] = value
 
+        write_behind_caches = _write_behind_caches()
+        if write_behind_caches is not None:
+            if not self._pending_updates:
+                write_behind_caches.append(self)
+            for cache_key, field_updates in pending_updates.items():
+                self._pending_updates[cache_key].update(field_updates)
+            self._pending_write_count += len(pending_updates)
+            self._cache.update(pending_updates)
+            return
+
+        self._save(pending_updates)
+
+    def flush(self):
+        """
+        Saves the writes buffered by user_state_write_behind, if any.
+        """
+        if not self._pending_updates:
+            return
+
+        pending_updates, self._pending_updates = self._pending_updates, defaultdict(dict)
+        pending_write_count, self._pending_write_count = self._pending_write_count, 0
+        self._save(pending_updates)
+        monitoring_utils.accumulate(
+            'xb_user_state.write_behind.writes_saved',
+            pending_write_count - len(pending_updates),
+        )
+
+    def _save(self, pending_updates):
+        """
+        Saves the given updates, a dict mapping block keys to dicts of field
+        names to values, and updates the cache with them.
+        """
         try:
             self._client.set_many(
                 self.user.username,
@@ -444,6 +553,8 @@ class UserStateCache:
         if kvs_key.field_name not in field_state:
             raise KeyError(kvs_key.field_name)
 
+        # Buffered writes are saved first, so that they can't undo the deletion.
+        self.flush()
         self._client.delete(self.user.username, cache_key, fields=[kvs_key.field_name])
         del field_state[kvs_key.field_name]
 
@@ -776,6 +887,27 @@ class FieldDataCache:
         cache.add_block_descendents(block, depth, block_filter)
         return cache
 
+    @classmethod
+    def cache_for_student_module(cls, student_module, block, asides=None, read_only=False):
+        """
+        Returns a FieldDataCache for the user of `student_module` and `block` (but not its
+        descendants), with the block's user state loaded from `student_module` rather
+        than queried again.
+
+        student_module: the StudentModule of the user for `block`, with its student loaded.
+        block: An XBlock without children
+        """
+        cache = FieldDataCache([], student_module.course_id, student_module.student, asides=asides,
+                               read_only=read_only)
+        if cache.user.is_authenticated:
+            if block.has_score:
+                cache.scorable_locations.add(block.location)
+            cache.cache[Scope.user_state].cache_student_modules([student_module])
+            for scope, fields in cache._fields_to_cache([block]).items():  # pylint: disable=protected-access
+                if scope in cache.cache and scope != Scope.user_state:
+                    cache.cache[scope].cache_fields(fields, [block], cache.asides)
+        return cache
+
     def _fields_to_cache(self, blocks):
         """
         Returns a map of scopes to fields in that scope that should be cached
@@ -904,6 +1036,12 @@ class FieldDataCache:
 
         return self.cache[key.scope].last_modified(key)
 
+    def save(self):
+        """
+        Saves any writes buffered by user_state_write_behind.
+        """
+        self.cache[Scope.user_state].flush()
+
     def __len__(self):
         return sum(len(cache) for cache in self.cache.values())
 
@@ -966,6 +1104,31 @@ class ScoresClient:
         client.fetch_scores(scorable_locations)
         return client
 
+    @classmethod
+    def create_for_users(cls, course_id, user_ids, scorable_locations):
+        """
+        Create a ScoresClient for each of the given users, with pre-fetched
+        data for the given locations, using a single query for all users.
+
+        Returns a dict of {user_id: ScoresClient}.
+        """
+        clients = {user_id: cls(course_id, user_id) for user_id in user_ids}
+        scores_qset = StudentModule.objects.filter(
+            student_id__in=list(clients),
+            course_id=course_id,
+            module_state_key__in=set(scorable_locations),
+        )
+        for user_id, location, correct, total, created in scores_qset.values_list(
+            'student_id', 'module_state_key', 'grade', 'max_grade', 'created'
+        ):
+            # See fetch_scores for why course info is added back to the location.
+            clients[user_id]._locations_to_scores[location.map_into_course(course_id)] = cls.Score(  # pylint: disable=protected-access
+                correct, total, created
+            )
+        for client in clients.values():
+            client._has_fetched = True  # pylint: disable=protected-access
+        return clients
+
 
 def set_score(user_id, usage_key, score, max_score):
     """
@@ -13,7 +13,12 @@ from xblock.exceptions import KeyValueMultiSaveError
 from xblock.fields import BlockScope, Scope, ScopeIds
 
 from common.djangoapps.student.tests.factories import UserFactory
-from lms.djangoapps.courseware.model_data import DjangoKeyValueStore, FieldDataCache, InvalidScopeError
+from lms.djangoapps.courseware.model_data import (
+    DjangoKeyValueStore,
+    FieldDataCache,
+    InvalidScopeError,
+    user_state_write_behind
+)
 from lms.djangoapps.courseware.models import (
     StudentModule,
     XModuleStudentInfoField,
@@ -238,6 +243,92 @@ class TestStudentModuleStorage(OtherUserFailureTestMixin, TestCase):
                 self.kvs.set_many(kv_dict)
         assert exception_context.value.saved_field_names == []
 
+    def test_cache_for_student_module(self):
+        "Test that a FieldDataCache made from a StudentModule doesn't query its state again"
+        student_module = StudentModule.objects.select_related('student').get()
+        with self.assertNumQueries(0):
+            field_data_cache = FieldDataCache.cache_for_student_module(
+                student_module,
+                mock_block([mock_field(Scope.user_state, 'a_field')]),
+            )
+            kvs = DjangoKeyValueStore(field_data_cache)
+            assert kvs.get(user_state_key('a_field')) == 'a_value'
+            assert kvs.get(user_state_key('b_field')) == 'b_value'
+
+        kvs.set(user_state_key('a_field'), 'new_value')
+        assert json.loads(StudentModule.objects.get().state) == {'a_field': 'new_value', 'b_field': 'b_value'}
+
+    def test_write_behind_coalesces_writes(self):
+        "Test that writes to the same StudentModule are saved once when the write-behind context exits"
+        with user_state_write_behind():
+            with self.assertNumQueries(0, using='default'):
+                self.kvs.set(user_state_key('a_field'), 'new_value')
+                self.kvs.set(user_state_key('not_a_field'), 'other_value')
+                self.kvs.set_many(self.construct_kv_dict())
+                self.kvs.set(user_state_key('a_field'), 'newest_value')
+            # Buffered writes are visible to reads.
+            assert self.kvs.get(user_state_key('a_field')) == 'newest_value'
+            assert json.loads(StudentModule.objects.get().state)['a_field'] == 'a_value'
+
+        assert json.loads(StudentModule.objects.get().state) == {
+            'a_field': 'newest_value',
+            'b_field': 'b_value',
+            'not_a_field': 'other_value',
+            'field_a': 'new value',
+            'field_b': 'newer value',
+        }
+
+    def test_write_behind_query_count(self):
+        "Test that exiting the write-behind context writes each StudentModule once"
+        write_behind = user_state_write_behind()
+        write_behind.__enter__()  # pylint: disable=unnecessary-dunder-call
+        for value in range(5):
+            self.kvs.set(user_state_key('a_field'), value)
+        with self.assertNumQueries(4, using='default'):
+            with self.assertNumQueries(2, using='student_module_history'):
+                write_behind.__exit__(None, None, None)  # pylint: disable=unnecessary-dunder-call
+        assert json.loads(StudentModule.objects.get().state)['a_field'] == 4
+
+    def test_write_behind_flushes_on_exception(self):
+        "Test that buffered writes are saved when the write-behind context exits with an exception"
+        with pytest.raises(ValueError):
+            with user_state_write_behind():
+                self.kvs.set(user_state_key('a_field'), 'new_value')
+                raise ValueError
+        assert json.loads(StudentModule.objects.get().state)['a_field'] == 'new_value'
+
+    def test_write_behind_save(self):
+        "Test that FieldDataCache.save saves buffered writes before the write-behind context exits"
+        with user_state_write_behind():
+            self.kvs.set(user_state_key('a_field'), 'new_value')
+            self.field_data_cache.save()
+            assert json.loads(StudentModule.objects.get().state)['a_field'] == 'new_value'
+            with self.assertNumQueries(0, using='default'):
+                self.field_data_cache.save()
+
+    def test_write_behind_nested(self):
+        "Test that writes are saved when the outermost write-behind context exits"
+        with user_state_write_behind():
+            with user_state_write_behind():
+                self.kvs.set(user_state_key('a_field'), 'new_value')
+            assert json.loads(StudentModule.objects.get().state)['a_field'] == 'a_value'
+        assert json.loads(StudentModule.objects.get().state)['a_field'] == 'new_value'
+
+    def test_write_behind_delete(self):
+        "Test that buffered writes are saved before a field is deleted"
+        with user_state_write_behind():
+            self.kvs.set(user_state_key('not_a_field'), 'new_value')
+            self.kvs.delete(user_state_key('a_field'))
+            assert json.loads(StudentModule.objects.get().state) == {'b_field': 'b_value', 'not_a_field': 'new_value'}
+        assert json.loads(StudentModule.objects.get().state) == {'b_field': 'b_value', 'not_a_field': 'new_value'}
+
+    def test_write_behind_failure(self):
+        "Test that a failure to save buffered writes is raised when the write-behind context exits"
+        with patch('django.db.models.Model.save', side_effect=DatabaseError):
+            with pytest.raises(KeyValueMultiSaveError):
+                with user_state_write_behind():
+                    self.kvs.set(user_state_key('a_field'), 'new_value')
+
 
 class TestMissingStudentModule(TestCase):  # lint-amnesty, pylint: disable=missing-class-docstring
     # Tell Django to clean out all databases, not just default
@@ -8,6 +8,7 @@ from opaque_keys.edx.locator import BlockUsageLocator, CourseLocator
 from xblock.fields import Scope
 from datetime import datetime
 from unittest import TestCase
+from unittest.mock import patch
 from collections import defaultdict
 from django.db import connections
 
@@ -122,6 +123,21 @@ class _UserStateClientTestUtils(TestCase):
             fields=fields,
         )
 
+    def get_many_for_users(self, users, blocks, fields=None):
+        """
+        Get the state for the specified users and blocks.
+
+        This wraps :meth:`~XBlockUserStateClient.get_many_for_users`
+        to take indexes rather than actual values to make tests easier
+        to write concisely.
+        """
+        return self.client.get_many_for_users(
+            usernames=[self._user(user) for user in users],
+            block_keys=[self._block(block) for block in blocks],
+            scope=self.scope,
+            fields=fields,
+        )
+
     def set_many(self, user, block_to_state):
         """
         Set the state for the specified user and blocks.
@@ -338,6 +354,40 @@ class _UserStateClientTestCRUD(_UserStateClientTestUtils):
         self.delete_many(user=0, blocks=[0, 1], fields=['a', 'b'])
         self.assertCountEqual(self.get_many(user=0, blocks=[0, 1]), [])
 
+    def test_get_many_for_users(self):
+        for user in range(3):
+            self.set_many(user=user, block_to_state={0: {'a': user}, 1001: {'b': user, 'c': 'd'}})
+        self.delete(user=1, block=0)
+
+        self.assertCountEqual(
+            [
+                (entry.username, entry.block_key, entry.state)
+                for entry in self.get_many_for_users(users=[0, 1, 3], blocks=[0, 1, 1001])
+            ],
+            [
+                (self._user(0), self._block(0), {'a': 0}),
+                (self._user(0), self._block(1001), {'b': 0, 'c': 'd'}),
+                (self._user(1), self._block(1001), {'b': 1, 'c': 'd'}),
+            ]
+        )
+
+    def test_get_many_for_users_fields(self):
+        for user in range(2):
+            self.set_many(user=user, block_to_state={0: {'a': user, 'b': 'c'}, 1: {'b': user}})
+
+        self.assertCountEqual(
+            [
+                (entry.username, entry.block_key, entry.state)
+                for entry in self.get_many_for_users(users=[0, 1], blocks=[0, 1], fields=['a'])
+            ],
+            [
+                (self._user(0), self._block(0), {'a': 0}),
+                (self._user(0), self._block(1), {}),
+                (self._user(1), self._block(0), {'a': 1}),
+                (self._user(1), self._block(1), {}),
+            ]
+        )
+
     def test_get_mod_date(self):
         start_time = datetime.now(pytz.utc)
         self.set_many(user=0, block_to_state={0: {'a': 'b'}, 1: {'b': 'c'}})
@@ -740,6 +790,20 @@ class TestDjangoUserStateClient(UserStateClientTestBase, ModuleStoreTestCase):
         self.client = DjangoXBlockUserStateClient()
         self.users = defaultdict(UserFactory.create)
 
+    def test_get_many_for_users_chunked(self):
+        for user in range(5):
+            self.set_many(user=user, block_to_state={block: {'a': block} for block in (0, 1, 2, 1000)})
+
+        with patch.object(DjangoXBlockUserStateClient, 'USER_STATE_CHUNK_SIZE', 2):
+            # 3 queries for the users, then 2 courses x 3 chunks of users x up to 2 chunks of blocks.
+            with self.assertNumQueries(3 + 3 * 2 + 3 * 1):
+                entries = list(self.get_many_for_users(users=range(5), blocks=[0, 1, 2, 1000]))
+
+        self.assertCountEqual(
+            [(entry.username, entry.block_key) for entry in entries],
+            [(self._user(user), self._block(block)) for user in range(5) for block in (0, 1, 2, 1000)]
+        )
+
     def test_history_after_delete(self):
         """
         Changes made in the edx-platform repo broke this test in the edx-user-state-client repo.
@@ -138,6 +138,32 @@ COURSEWARE_OPTIMIZED_RENDER_XBLOCK = CourseWaffleFlag(
     f'{WAFFLE_FLAG_NAMESPACE}.optimized_render_xblock', __name__
 )
 
+# .. toggle_name: courseware.coalesce_user_state_writes
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: Waffle flag that buffers the learner state (StudentModule) writes made while an XBlock
+#   handler runs, and saves them when the handler returns, so that repeated saves of the same block in a request
+#   result in a single write and a single history row.
+# .. toggle_use_cases: temporary
+# .. toggle_creation_date: 2026-10-18
+# .. toggle_target_removal_date: None
+COURSEWARE_COALESCE_USER_STATE_WRITES = CourseWaffleFlag(
+    f'{WAFFLE_FLAG_NAMESPACE}.coalesce_user_state_writes', __name__
+)
+
+# .. toggle_name: courseware.prefetch_block_definitions
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: Waffle flag that makes render_xblock load the definitions of the rendered block and of
+#   all its descendants in bulk before rendering, rather than with one query per block as each block's content is
+#   first accessed. Only has an effect for courses in the split modulestore.
+# .. toggle_use_cases: temporary
+# .. toggle_creation_date: 2026-10-18
+# .. toggle_target_removal_date: None
+COURSEWARE_PREFETCH_BLOCK_DEFINITIONS = CourseWaffleFlag(
+    f'{WAFFLE_FLAG_NAMESPACE}.prefetch_block_definitions', __name__
+)
+
 # .. toggle_name: COURSES_INVITE_ONLY
 # .. toggle_implementation: SettingToggle
 # .. toggle_type: feature_flag
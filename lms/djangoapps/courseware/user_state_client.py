@@ -20,7 +20,7 @@ from django.db.utils import IntegrityError
 from edx_django_utils import monitoring as monitoring_utils
 from xblock.fields import Scope
 
-from lms.djangoapps.courseware.models import BaseStudentModuleHistory, StudentModule
+from lms.djangoapps.courseware.models import BaseStudentModuleHistory, StudentModule, chunks
 
 try:
     import simplejson as json
@@ -159,6 +159,23 @@ class XBlockUserStateClient():
         """
         raise NotImplementedError()
 
+    def get_many_for_users(self, usernames, block_keys, scope=Scope.user_state, fields=None):
+        """
+        Retrieve the stored XBlock state for the specified XBlock usages, for many users.
+
+        Arguments:
+            usernames: A list of the names of the users whose state should be retrieved
+            block_keys: A list of keys identifying which xblock states to load.
+            scope (Scope): The scope to load data from
+            fields: A list of field values to retrieve. If None, retrieve all stored fields.
+
+        Yields:
+            XBlockUserState tuples for each specified user and key in block_keys,
+            in no particular order.
+        """
+        for username in usernames:
+            yield from self.get_many(username, block_keys, scope, fields=fields)
+
     @abstractmethod
     def set_many(self, username, block_keys_to_state, scope=Scope.user_state):
         """
@@ -258,6 +275,9 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         """
         pass  # lint-amnesty, pylint: disable=unnecessary-pass
 
+    # The maximum number of users, and of blocks, queried at once by get_many_for_users.
+    USER_STATE_CHUNK_SIZE = 500
+
     def __init__(self, user=None):
         """
         Arguments:
@@ -396,6 +416,94 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         duration = (finish_time - evt_time) * 1000  # milliseconds
         self._nr_stat_accumulate('get_many', 'duration', duration)
 
+    def get_many_for_users(self, usernames, block_keys, scope=Scope.user_state, fields=None):
+        """
+        Retrieve the stored XBlock state for the specified XBlock usages, for many users.
+
+        The StudentModules are queried in chunks of at most
+        USER_STATE_CHUNK_SIZE users and USER_STATE_CHUNK_SIZE blocks (per
+        course), and streamed from the database, so that memory use stays
+        bounded however many users and blocks are requested.
+
+        Arguments:
+            usernames: A list of the names of the users whose state should be retrieved
+            block_keys ([UsageKey]): A list of UsageKeys identifying which xblock states to load.
+            scope (Scope): The scope to load data from
+            fields: A list of field values to retrieve. If None, retrieve all stored fields.
+
+        Yields:
+            XBlockUserState tuples for each specified user and UsageKey in block_keys,
+            ordered by course, then by chunk of users, then by chunk of blocks.
+            field_state is a dict mapping field names to values.
+        """
+        if scope != Scope.user_state:
+            raise ValueError(f"Only Scope.user_state is supported, not {scope}")
+
+        evt_time = time()
+
+        # count how many times this function gets called
+        self._nr_stat_increment('get_many_for_users', 'calls')
+
+        # keep track of users and blocks requested
+        self._nr_stat_accumulate('get_many_for_users', 'users_requested', len(usernames))
+        self._nr_stat_accumulate('get_many_for_users', 'blocks_requested', len(block_keys))
+
+        usernames_by_id = {}
+        for usernames_chunk in chunks(usernames, self.USER_STATE_CHUNK_SIZE):
+            usernames_by_id.update(User.objects.filter(username__in=usernames_chunk).values_list('id', 'username'))
+        user_ids = sorted(usernames_by_id)
+
+        course_key_func = attrgetter('course_key')
+        by_course = itertools.groupby(
+            sorted(block_keys, key=course_key_func),
+            course_key_func,
+        )
+
+        for course_key, usage_keys in by_course:
+            usage_keys = list(usage_keys)
+            for user_ids_chunk in chunks(user_ids, self.USER_STATE_CHUNK_SIZE):
+                for usage_keys_chunk in chunks(usage_keys, self.USER_STATE_CHUNK_SIZE):
+                    self._nr_stat_increment('get_many_for_users', 'queries')
+                    query = StudentModule.objects.filter(
+                        student_id__in=user_ids_chunk,
+                        module_state_key__in=usage_keys_chunk,
+                        course_id=course_key,
+                    )
+                    for module in query.iterator(chunk_size=self.USER_STATE_CHUNK_SIZE):
+                        if module.state is None:
+                            continue
+
+                        state = json.loads(module.state)
+
+                        # If the state is the empty dict, then it has been deleted, and so
+                        # conformant UserStateClients should treat it as if it doesn't exist.
+                        if state == {}:
+                            continue
+
+                        usage_key = module.module_state_key.map_into_course(module.course_id)
+
+                        # collect statistics for custom attribute reporting
+                        self._nr_block_stat_increment('get_many_for_users', usage_key.block_type, 'blocks_out')
+                        self._nr_block_stat_accumulate(
+                            'get_many_for_users', usage_key.block_type, 'size', len(module.state)
+                        )
+
+                        # filter state on fields
+                        if fields is not None:
+                            state = {
+                                field: state[field]
+                                for field in fields
+                                if field in state
+                            }
+                        yield XBlockUserState(
+                            usernames_by_id[module.student_id], usage_key, state, module.modified, scope
+                        )
+
+        # The rest of this method exists only to report custom attributes.
+        finish_time = time()
+        duration = (finish_time - evt_time) * 1000  # milliseconds
+        self._nr_stat_accumulate('get_many_for_users', 'duration', duration)
+
     def set_many(self, username, block_keys_to_state, scope=Scope.user_state):
         """
         Set fields for a particular XBlock.
@@ -94,6 +94,7 @@ from lms.djangoapps.courseware.toggles import (
     courseware_mfe_search_is_enabled,
     COURSEWARE_MICROFRONTEND_ENABLE_NAVIGATION_SIDEBAR,
     COURSEWARE_MICROFRONTEND_ALWAYS_OPEN_AUXILIARY_SIDEBAR,
+    COURSEWARE_PREFETCH_BLOCK_DEFINITIONS,
 )
 from lms.djangoapps.courseware.user_state_client import DjangoXBlockUserStateClient
 from lms.djangoapps.courseware.utils import (
@@ -1584,6 +1585,10 @@ def render_xblock(request, usage_key_string, check_if_enrolled=True, disable_sta
             request.user, usage_key.course_key, request=request, only_if_mobile_app=True
         )
 
+        # Load the content of the block and its descendants with as few queries as possible.
+        if COURSEWARE_PREFETCH_BLOCK_DEFINITIONS.is_enabled(course_key):
+            modulestore().prefetch_definitions(usage_key)
+
         # get the block, which verifies whether the user has access to the block.
         recheck_access = request.GET.get('recheck_access') == '1'
         block, _ = get_block_by_usage_id(
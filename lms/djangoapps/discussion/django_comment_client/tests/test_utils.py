@@ -10,6 +10,7 @@ from unittest.mock import Mock, patch
 import ddt
 import pytest
 from django.test import RequestFactory, TestCase
+from django.test.utils import override_settings
 from django.urls import reverse
 from edx_django_utils.cache import RequestCache
 from opaque_keys.edx.keys import CourseKey
@@ -38,7 +39,9 @@ from openedx.core.djangoapps.discussions.utils import (
     has_required_keys,
 )
 from openedx.core.djangoapps.django_comment_common.comment_client.utils import (
+    RESPONSES_REQUEST_CACHE_NAMESPACE,
     CommentClientMaintenanceError,
+    get_session,
     perform_request,
 )
 from openedx.core.djangoapps.django_comment_common.models import (
@@ -1662,7 +1665,7 @@ class ClientConfigurationTestCase(TestCase):
         with pytest.raises(CommentClientMaintenanceError):
             perform_request('GET', 'http://www.google.com')
 
-    @patch('requests.request')
+    @patch('openedx.core.djangoapps.django_comment_common.comment_client.utils.send_request')
     def test_enabled(self, mock_request):
         """Ensures that requests proceed normally when forums are enabled."""
         config = ForumsConfig.current()
@@ -1679,6 +1682,86 @@ class ClientConfigurationTestCase(TestCase):
         assert result == {}
 
 
+@patch('openedx.core.djangoapps.django_comment_common.comment_client.utils.send_request')
+class CommentsServiceRequestTestCase(TestCase):
+    """Tests of the requests to the comments service."""
+
+    def setUp(self):
+        super().setUp()
+        config = ForumsConfig.current()
+        config.enabled = True
+        config.save()
+        RequestCache.clear_all_namespaces()
+        self.addCleanup(RequestCache.clear_all_namespaces)
+
+    def set_response(self, mock_request, text):
+        """Makes the comments service return the given JSON text."""
+        response = Mock()
+        response.status_code = 200
+        response.text = text
+        response.json = lambda: json.loads(text)
+        mock_request.return_value = response
+
+    def test_session(self, mock_request):  # pylint: disable=unused-argument
+        """Ensures that the requests share a session with a pool of connections and retried GET requests."""
+        with override_settings(COMMENTS_SERVICE_POOL_SIZE=5, COMMENTS_SERVICE_GET_RETRIES=3):
+            with patch('openedx.core.djangoapps.django_comment_common.comment_client.utils._SESSION', None):
+                session = get_session()
+                assert get_session() is session
+                adapter = session.get_adapter('http://localhost:18080')
+                assert adapter._pool_maxsize == 5  # pylint: disable=protected-access
+                assert adapter.max_retries.total == 3
+                assert 'POST' not in adapter.max_retries.allowed_methods
+
+                # Forked processes have their own session.
+                with patch('os.getpid', return_value=-1):
+                    assert get_session() is not session
+
+    @patch('openedx.core.djangoapps.django_comment_common.comment_client.utils.increment')
+    @patch('openedx.core.djangoapps.django_comment_common.comment_client.utils.accumulate')
+    def test_metrics(self, mock_accumulate, mock_increment, mock_request):
+        """Ensures that the number and duration of the requests are recorded."""
+        self.set_response(mock_request, '{}')
+        perform_request('get', 'http://localhost:18080/api/v1/threads')
+        mock_increment.assert_called_once_with('comments_service.request_count')
+        assert mock_accumulate.call_args[0][0] == 'comments_service.request_time'
+
+    @override_settings(COMMENTS_SERVICE_REQUEST_CACHE_ENABLED=True)
+    @patch('openedx.core.djangoapps.django_comment_common.comment_client.utils.get_current_request')
+    def test_request_cache(self, mock_get_current_request, mock_request):
+        """Ensures that identical GET requests are sent once per Django request, until other requests."""
+        url = 'http://localhost:18080/api/v1/threads'
+        self.set_response(mock_request, '{"id": "1"}')
+        result = perform_request('get', url, {'page': 1})
+        assert result == {'id': '1'}
+        result['id'] = '2'
+        assert perform_request('get', url, {'page': 1}) == {'id': '1'}
+        assert perform_request('get', url, {'page': 1}, raw=True) == '{"id": "1"}'
+        assert mock_request.call_count == 1
+
+        perform_request('get', url, {'page': 2})
+        assert mock_request.call_count == 2
+
+        perform_request('post', url, {'body': 'text'})
+        perform_request('get', url, {'page': 1})
+        assert mock_request.call_count == 4
+
+        # Outside of Django requests, the responses aren't cached.
+        mock_get_current_request.return_value = None
+        RequestCache(RESPONSES_REQUEST_CACHE_NAMESPACE).clear()
+        perform_request('get', url, {'page': 1})
+        perform_request('get', url, {'page': 1})
+        assert mock_request.call_count == 6
+
+    @patch('openedx.core.djangoapps.django_comment_common.comment_client.utils.get_current_request')
+    def test_request_cache_disabled(self, mock_get_current_request, mock_request):  # pylint: disable=unused-argument
+        """Ensures that the responses aren't cached unless COMMENTS_SERVICE_REQUEST_CACHE_ENABLED is set."""
+        self.set_response(mock_request, '{}')
+        perform_request('get', 'http://localhost:18080/api/v1/threads')
+        perform_request('get', 'http://localhost:18080/api/v1/threads')
+        assert mock_request.call_count == 2
+
+
 def set_discussion_division_settings(
     course_key, enable_cohorts=False, always_divide_inline_discussions=False,
     divided_discussions=[], division_scheme=CourseDiscussionSettings.COHORT
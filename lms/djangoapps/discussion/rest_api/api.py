@@ -77,7 +77,7 @@ from openedx.core.djangoapps.django_comment_common.signals import (
     thread_voted,
     thread_unfollowed
 )
-from openedx.core.djangoapps.user_api.accounts.api import get_account_settings
+from openedx.core.djangoapps.user_api.accounts.api import get_profile_images
 from openedx.core.lib.exceptions import CourseNotFoundError, DiscussionNotFoundError, PageNotFoundError
 from xmodule.course_block import CourseBlock
 from xmodule.modulestore import ModuleStoreEnum
@@ -747,6 +747,9 @@ def _get_user_profile_dict(request, usernames):
     Gets user profile details for a list of usernames and creates a dictionary with
     profile details against username.
 
+    The users and their profiles are read with a single query, rather than serializing
+    the account of each user, since only their profile images are used.
+
     Parameters:
 
         request: The django request object.
@@ -756,12 +759,16 @@ def _get_user_profile_dict(request, usernames):
 
         A dict with username as key and user profile details as value.
     """
-    if usernames:
-        username_list = usernames.split(",")
-    else:
-        username_list = []
-    user_profile_details = get_account_settings(request, username_list)
-    return {user['username']: user for user in user_profile_details}
+    if not usernames:
+        return {}
+    users = User.objects.select_related('profile').filter(username__in=usernames.split(","))
+    return {
+        user.username: {
+            'username': user.username,
+            'profile_image': get_profile_images(user.profile, user, request) if hasattr(user, 'profile') else None,
+        }
+        for user in users
+    }
 
 
 def _user_profile(user_profile):
@@ -838,6 +845,53 @@ def _include_profile_image(requested_fields):
     return requested_fields and 'profile_image' in requested_fields
 
 
+def _iter_discussion_entities(discussion_entities):
+    """
+    Yields the given threads or comments, and the child comments of the comments.
+    """
+    for entity in discussion_entities:
+        yield entity
+        yield from _iter_discussion_entities(entity.get("children") or [])
+
+
+def _get_users_context(discussion_entities):
+    """
+    Returns the users referenced by the given threads or comments other than as their
+    authors (i.e. as the endorsers of comments, the last editors of threads and comments,
+    and the moderators who closed threads), read with a single query.
+
+    The serializers find these users in their context, rather than reading each of them.
+
+    Parameters:
+
+        discussion_entities: List of Thread or Comment objects
+
+    Returns:
+
+        A dict with the users by id ("users_by_id") and by username ("users_by_username").
+    """
+    user_ids = set()
+    usernames = set()
+    for entity in _iter_discussion_entities(discussion_entities):
+        endorsement = entity.get("endorsement")
+        if endorsement and endorsement.get("user_id"):
+            user_ids.add(int(endorsement["user_id"]))
+        edit_history = entity.get("edit_history")
+        if edit_history and edit_history[-1].get("editor_username"):
+            usernames.add(edit_history[-1]["editor_username"])
+        closed_by = entity.get("closed_by")
+        if closed_by:
+            usernames.add(closed_by)
+
+    users = []
+    if user_ids or usernames:
+        users = list(User.objects.filter(Q(id__in=user_ids) | Q(username__in=usernames)))
+    return {
+        "users_by_id": {user.id: user for user in users},
+        "users_by_username": {user.username: user for user in users},
+    }
+
+
 def _serialize_discussion_entities(request, context, discussion_entities, requested_fields, discussion_entity_type):
     """
     It serializes Discussion Entity (Thread or Comment) and add additional data if requested.
@@ -861,6 +915,7 @@ def _serialize_discussion_entities(request, context, discussion_entities, reques
     results = []
     usernames = []
     include_profile_image = _include_profile_image(requested_fields)
+    context = {**context, **_get_users_context(discussion_entities)}
     for entity in discussion_entities:
         if discussion_entity_type == DiscussionEntity.thread:
             serialized_entity = ThreadSerializer(entity, context=context).data
@@ -222,6 +222,9 @@ class _ContentSerializer(serializers.Serializer):
         Returns role label of user from username
         Possible Role Labels: Staff, Moderator, Community TA or None
         """
+        if "users_by_username" in self.context:
+            user = self.context["users_by_username"].get(username)
+            return self._get_user_label(user.id) if user else None
         try:
             user = User.objects.get(username=username)
             return self._get_user_label(user.id)
@@ -536,7 +539,10 @@ class CommentSerializer(_ContentSerializer):
                 self._is_anonymous(self.context["thread"]) and
                 not self._is_user_privileged(endorser_id)
             ):
-                return User.objects.get(id=endorser_id).username
+                endorser = self.context.get("users_by_id", {}).get(endorser_id)
+                if endorser is None:
+                    endorser = User.objects.get(id=endorser_id)
+                return endorser.username
         return None
 
     def get_endorsed_by_label(self, obj):
@@ -12,7 +12,9 @@ from urllib.parse import parse_qs, urlencode, urlparse
 import ddt
 import httpretty
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from edx_toggles.toggles.testutils import override_waffle_flag
 from opaque_keys.edx.keys import CourseKey
@@ -1355,6 +1357,42 @@ class ThreadViewSetListTest(DiscussionAPIViewTestMixin, ModuleStoreTestCase, Pro
         assert response_thread['author'] is None
         assert {} == response_thread['users']
 
+    def test_profile_image_requested_field_query_count(self):
+        """
+        Tests that the number of queries doesn't depend on the number of threads and of their users
+        """
+        GlobalStaff().add_users(self.user)
+
+        def get_thread_list_queries(thread_count):
+            users = [UserFactory.create() for __ in range(thread_count)]
+            source_threads = [
+                self.create_source_thread({
+                    "id": f"test_thread_{index}",
+                    "user_id": str(user.id),
+                    "username": user.username,
+                    "closed": True,
+                    "closed_by": user.username,
+                    "edit_history": [{"editor_username": user.username, "original_body": "Test body"}],
+                })
+                for index, user in enumerate(users)
+            ]
+            self.register_get_user_response(self.user)
+            self.register_get_threads_response(source_threads, page=1, num_pages=1)
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(
+                    self.url,
+                    {"course_id": str(self.course.id), "requested_fields": "profile_image"},
+                )
+            assert response.status_code == 200
+            response_threads = json.loads(response.content.decode('utf-8'))['results']
+            assert [set(response_thread['users']) for response_thread in response_threads] == [
+                {user.username} for user in users
+            ]
+            return len(queries)
+
+        get_thread_list_queries(1)
+        assert get_thread_list_queries(2) == get_thread_list_queries(10)
+
 
 @httpretty.activate
 @disable_signal(api, 'thread_created')
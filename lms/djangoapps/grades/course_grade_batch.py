@@ -0,0 +1,122 @@
+"""
+Computes the course grades of many users at once from their persisted
+subsection grades, using the batch grading path of the course grader.
+
+This is meant for recomputing the course grades of a whole course, e.g.
+after a change to its grading policy, without building the grade sheet of
+each user in Python.
+"""
+from collections import OrderedDict, namedtuple
+
+import numpy
+
+from xmodule.graders import batch_percents_graded  # lint-amnesty, pylint: disable=wrong-import-order
+
+from .course_data import CourseData
+from .course_grade import CourseGrade, _uniqueify_and_keep_order
+from .models import PersistentSubsectionGrade
+from .subsection_grade import ReadSubsectionGrade, ZeroSubsectionGrade
+
+BatchCourseGrade = namedtuple('BatchCourseGrade', ['percent', 'letter_grade', 'passed', 'grade_breakdown'])
+
+
+def compute_course_grades_in_batch(user_ids, course=None, collected_block_structure=None, course_key=None):
+    """
+    Returns an OrderedDict of {user_id: BatchCourseGrade} with the course
+    grade of each of the given users, computed from their persisted
+    subsection grades (including overrides).  Graded subsections without a
+    persisted grade count as zero, as they do for a CourseGrade.
+
+    The results are the same as those of CourseGrade.update, provided that
+    the course structure is the same for all users, since the graded
+    subsections are taken from the collected course structure rather than
+    from the structure of each user.
+
+    At least one of course, collected_block_structure or course_key should
+    be provided.
+    """
+    user_ids = list(user_ids)
+    course_data = CourseData(
+        user=None, course=course, collected_block_structure=collected_block_structure, course_key=course_key,
+    )
+    structure = course_data.collected_structure
+    course = CourseGrade._prep_course_for_grading(course_data.course)  # pylint: disable=protected-access
+
+    subsections = _graded_subsections(structure, course_data.location)
+    earned, possible = _score_matrices(course_data, subsections, user_ids)
+
+    percents = batch_percents_graded(earned, possible)
+    batch_sheet = OrderedDict()
+    for subsection_format in _uniqueify_and_keep_order(subsection.format for subsection in subsections):
+        columns = [index for index, subsection in enumerate(subsections) if subsection.format == subsection_format]
+        batch_sheet[subsection_format] = percents[:, columns]
+
+    grader_result = course.grader.grade_batch(batch_sheet, len(user_ids))
+    course_percents = _compute_percents(grader_result['percent'])
+    grade_breakdown = grader_result.get('grade_breakdown', {})
+
+    course_grades = OrderedDict()
+    for index, user_id in enumerate(user_ids):
+        percent = float(course_percents[index])
+        course_grades[user_id] = BatchCourseGrade(
+            percent=percent,
+            letter_grade=CourseGrade._compute_letter_grade(course.grade_cutoffs, percent),  # pylint: disable=protected-access
+            passed=CourseGrade._compute_passed(course.grade_cutoffs, percent),  # pylint: disable=protected-access
+            grade_breakdown=OrderedDict(
+                (category, float(category_percents[index])) for category, category_percents in grade_breakdown.items()
+            ),
+        )
+    return course_grades
+
+
+def _graded_subsections(structure, course_location):
+    """
+    Returns a ZeroSubsectionGrade for each graded subsection in the course,
+    in the order in which they appear in grade sheets.
+    """
+    course_data = CourseData(user=None, structure=structure)
+    subsection_keys = _uniqueify_and_keep_order(
+        subsection_key
+        for chapter_key in structure.get_children(course_location)
+        for subsection_key in structure.get_children(chapter_key)
+    )
+    subsections = (ZeroSubsectionGrade(structure[subsection_key], course_data) for subsection_key in subsection_keys)
+    return [subsection for subsection in subsections if subsection.graded]
+
+
+def _score_matrices(course_data, subsections, user_ids):
+    """
+    Returns a (earned, possible) tuple of 2D numpy arrays of shape
+    (users, subsections) with the graded totals of the given users
+    in the given subsections.
+    """
+    # Subsections without a persisted grade have the graded total of a zero grade.
+    earned = numpy.zeros((len(user_ids), len(subsections)))
+    possible = numpy.tile([subsection.graded_total.possible for subsection in subsections], (len(user_ids), 1))
+
+    user_indices = {user_id: index for index, user_id in enumerate(user_ids)}
+    subsection_indices = {subsection.location: index for index, subsection in enumerate(subsections)}
+    grade_models = PersistentSubsectionGrade.objects.select_related('override').filter(
+        user_id__in=user_ids,
+        course_id=course_data.course_key,
+    )
+    for grade_model in grade_models:
+        subsection_index = subsection_indices.get(grade_model.full_usage_key)
+        if subsection_index is not None:
+            graded_total = ReadSubsectionGrade._aggregated_score_from_model(  # pylint: disable=protected-access
+                grade_model, is_graded=True,
+            )
+            user_index = user_indices[grade_model.user_id]
+            earned[user_index, subsection_index] = graded_total.earned
+            possible[user_index, subsection_index] = graded_total.possible
+    return earned, possible
+
+
+def _compute_percents(grader_percents):
+    """
+    Returns the course grade percentages for the given percentages from
+    the grader, rounded as by CourseGrade._compute_percent.
+    """
+    # Round away from zero, as by round_away_from_zero.
+    shifted = grader_percents * 100 + 0.05
+    return numpy.where(shifted >= 0, numpy.floor(shifted + 0.5), numpy.ceil(shifted - 0.5)) / 100
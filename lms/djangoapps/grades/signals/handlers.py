@@ -4,8 +4,11 @@ Grades related signals.
 
 
 from contextlib import contextmanager
+from functools import partial
 from logging import getLogger
+from threading import local
 
+from django.db import transaction
 from django.dispatch import receiver
 from opaque_keys.edx.keys import LearningContextKey
 from openedx_events.learning.signals import EXAM_ATTEMPT_REJECTED, EXAM_ATTEMPT_VERIFIED
@@ -44,6 +47,9 @@ from openedx.core.djangoapps.signals.signals import (  # lint-amnesty, pylint: d
 
 log = getLogger(__name__)
 
+# The subsection grade updates deferred by defer_subsection_grade_updates, in this thread.
+_deferred_subsection_updates = local()
+
 
 @receiver(score_set, dispatch_uid='submissions_score_set_handler')
 def submissions_score_set_handler(sender, **kwargs):  # pylint: disable=unused-argument
@@ -233,22 +239,57 @@ def enqueue_subsection_update(sender, **kwargs):  # pylint: disable=unused-argum
     context_key = LearningContextKey.from_string(kwargs['course_id'])
     if not context_key.is_course:
         return  # If it's not a course, it has no subsections, so skip the subsection grading update
-    recalculate_subsection_grade_v3.apply_async(
-        kwargs=dict(
-            user_id=kwargs['user_id'],
-            anonymous_user_id=kwargs.get('anonymous_user_id'),
-            course_id=kwargs['course_id'],
-            usage_id=kwargs['usage_id'],
-            only_if_higher=kwargs.get('only_if_higher'),
-            expected_modified_time=to_timestamp(kwargs['modified']),
-            score_deleted=kwargs.get('score_deleted', False),
-            event_transaction_id=str(get_event_transaction_id()),
-            event_transaction_type=str(get_event_transaction_type()),
-            score_db_table=kwargs['score_db_table'],
-            force_update_subsections=kwargs.get('force_update_subsections', False),
-        ),
-        countdown=RECALCULATE_GRADE_DELAY_SECONDS,
+    task_kwargs = dict(
+        user_id=kwargs['user_id'],
+        anonymous_user_id=kwargs.get('anonymous_user_id'),
+        course_id=kwargs['course_id'],
+        usage_id=kwargs['usage_id'],
+        only_if_higher=kwargs.get('only_if_higher'),
+        expected_modified_time=to_timestamp(kwargs['modified']),
+        score_deleted=kwargs.get('score_deleted', False),
+        event_transaction_id=str(get_event_transaction_id()),
+        event_transaction_type=str(get_event_transaction_type()),
+        score_db_table=kwargs['score_db_table'],
+        force_update_subsections=kwargs.get('force_update_subsections', False),
     )
+    deferred_updates = getattr(_deferred_subsection_updates, 'updates', None)
+    if deferred_updates is not None:
+        deferred_updates.append(task_kwargs)
+    else:
+        recalculate_subsection_grade_v3.apply_async(kwargs=task_kwargs, countdown=RECALCULATE_GRADE_DELAY_SECONDS)
+
+
+@contextmanager
+def defer_subsection_grade_updates():
+    """
+    Context manager which defers the subsection grade updates enqueued by the
+    scores changed within it: they are all enqueued when it exits, once the
+    current transaction (if any) has been committed.
+
+    It is meant to be used within a transaction which saves many scores, so that
+    the updates only run once the scores they are computed from are committed,
+    and are never enqueued if the transaction is rolled back.
+    """
+    if getattr(_deferred_subsection_updates, 'updates', None) is not None:
+        # Updates are already deferred by an outer context.
+        yield
+        return
+
+    deferred_updates = _deferred_subsection_updates.updates = []
+    try:
+        yield
+    finally:
+        _deferred_subsection_updates.updates = None
+        if deferred_updates:
+            transaction.on_commit(partial(_enqueue_subsection_updates, deferred_updates))
+
+
+def _enqueue_subsection_updates(deferred_updates):
+    """
+    Enqueues the given subsection grade updates, deferred by defer_subsection_grade_updates.
+    """
+    for task_kwargs in deferred_updates:
+        recalculate_subsection_grade_v3.apply_async(kwargs=task_kwargs, countdown=RECALCULATE_GRADE_DELAY_SECONDS)
 
 
 @receiver(SUBSECTION_SCORE_CHANGED)
@@ -3,18 +3,21 @@ SubsectionGrade Factory Class
 """
 
 
-from collections import OrderedDict
+from collections import OrderedDict, namedtuple
 from logging import getLogger
 
 from django.conf import settings
 from lazy import lazy
 from submissions import api as submissions_api
+from submissions.models import ScoreSummary
+from submissions.serializers import UnannotatedScoreSerializer
 
-from common.djangoapps.student.models import anonymous_id_for_user
+from common.djangoapps.student.models import AnonymousUserId, anonymous_id_for_user
 from lms.djangoapps.courseware.model_data import ScoresClient
 from lms.djangoapps.grades.models import PersistentSubsectionGrade
 from lms.djangoapps.grades.scores import possibly_scored
 from openedx.core.djangoapps.signals.signals import COURSE_ASSESSMENT_GRADE_CHANGED
+from openedx.core.lib.cache_utils import get_cache
 from openedx.core.lib.grade_utils import is_score_higher_or_equal
 
 from .course_data import CourseData
@@ -22,6 +25,70 @@ from .subsection_grade import CreateSubsectionGrade, ReadSubsectionGrade, ZeroSu
 
 log = getLogger(__name__)
 
+_PREFETCHED_SCORES_CACHE_NAMESPACE = 'grades.subsection_grade_factory.prefetched_scores'
+
+PrefetchedScores = namedtuple('PrefetchedScores', ['submissions_scores', 'csm_scores'])
+
+
+def prefetch_scores(course_data, users):
+    """
+    Prefetches the CSM and Submissions API scores of the given users in the
+    course, using a fixed number of queries for all users, so that the
+    SubsectionGradeFactory of each user doesn't query them individually.
+
+    The scores of all possibly scored blocks in the collected course
+    structure are fetched, since that is a superset of the blocks in the
+    structure of each user.
+    """
+    course_key = course_data.course_key
+    scorable_locations = [
+        block_key for block_key in course_data.collected_structure if possibly_scored(block_key)
+    ]
+    csm_scores = ScoresClient.create_for_users(course_key, [user.id for user in users], scorable_locations)
+    submissions_scores = _bulk_submissions_scores(course_key, users)
+
+    get_cache(_PREFETCHED_SCORES_CACHE_NAMESPACE)[course_key] = {
+        user.id: PrefetchedScores(submissions_scores[user.id], csm_scores[user.id]) for user in users
+    }
+
+
+def clear_prefetched_scores(course_key):
+    """
+    Clears the prefetched scores for this course from the RequestCache.
+    """
+    get_cache(_PREFETCHED_SCORES_CACHE_NAMESPACE).pop(course_key, None)
+
+
+def _bulk_submissions_scores(course_key, users):
+    """
+    Returns the scores stored by the Submissions API for the given users in
+    the course, as a dict of {user_id: scores}, where scores are in the same
+    format as returned by submissions_api.get_scores.
+    """
+    # As in anonymous_id_for_user, the most recently created id of a user is used.
+    anonymous_ids = dict(
+        AnonymousUserId.objects.filter(
+            user_id__in=[user.id for user in users],
+            course_id=course_key,
+        ).order_by('id').values_list('user_id', 'anonymous_user_id')
+    )
+    for user in users:
+        if user.id not in anonymous_ids:
+            anonymous_ids[user.id] = anonymous_id_for_user(user, course_key)
+    user_ids_by_anonymous_id = {anonymous_user_id: user_id for user_id, anonymous_user_id in anonymous_ids.items()}
+
+    scores = {user.id: {} for user in users}
+    score_summaries = ScoreSummary.objects.filter(
+        student_item__course_id=str(course_key),
+        student_item__student_id__in=list(user_ids_by_anonymous_id),
+    ).select_related('latest', 'latest__submission', 'student_item')
+    for summary in score_summaries:
+        # Hidden scores are excluded, as by submissions_api.get_scores.
+        if not summary.latest.is_hidden():
+            user_id = user_ids_by_anonymous_id[summary.student_item.student_id]
+            scores[user_id][summary.student_item.item_id] = UnannotatedScoreSerializer(summary.latest).data
+    return scores
+
 
 class SubsectionGradeFactory:
     """
@@ -121,6 +188,9 @@ class SubsectionGradeFactory:
         Lazily queries and returns all the scores stored in the user
         state (in CSM) for the course, while caching the result.
         """
+        prefetched_scores = self._prefetched_scores()
+        if prefetched_scores:
+            return prefetched_scores.csm_scores
         scorable_locations = [block_key for block_key in self.course_data.structure if possibly_scored(block_key)]
         return ScoresClient.create_for_locations(self.course_data.course_key, self.student.id, scorable_locations)
 
@@ -130,9 +200,20 @@ class SubsectionGradeFactory:
         Lazily queries and returns the scores stored by the
         Submissions API for the course, while caching the result.
         """
+        prefetched_scores = self._prefetched_scores()
+        if prefetched_scores:
+            return prefetched_scores.submissions_scores
         anonymous_user_id = anonymous_id_for_user(self.student, self.course_data.course_key)
         return submissions_api.get_scores(str(self.course_data.course_key), anonymous_user_id)
 
+    def _prefetched_scores(self):
+        """
+        Returns the PrefetchedScores of the student in the course, or None
+        if they weren't prefetched.
+        """
+        prefetched_scores = get_cache(_PREFETCHED_SCORES_CACHE_NAMESPACE).get(self.course_data.course_key, {})
+        return prefetched_scores.get(self.student.id)
+
     def _get_bulk_cached_grade(self, subsection):
         """
         Returns the student's SubsectionGrade for the subsection,
@@ -0,0 +1,71 @@
+"""
+Tests for the course_grade_batch module.
+"""
+from common.djangoapps.student.models import CourseEnrollment
+from common.djangoapps.student.tests.factories import UserFactory
+from openedx.core.djangolib.testing.utils import get_mock_request
+
+from ..course_grade_batch import compute_course_grades_in_batch
+from ..course_grade_factory import CourseGradeFactory
+from ..models import PersistentSubsectionGrade, PersistentSubsectionGradeOverride
+from .base import GradeTestBase
+from .utils import answer_problem
+
+
+class TestComputeCourseGradesInBatch(GradeTestBase):
+    """
+    Tests that course grades computed in batch match those computed for each user.
+    """
+    def setUp(self):
+        super().setUp()
+        self.users = [self.request.user]
+        for _ in range(3):
+            user = UserFactory.create()
+            CourseEnrollment.enroll(user, self.course.id)
+            self.users.append(user)
+
+        # The first user doesn't answer any problems.
+        answer_problem(self.course, get_mock_request(self.users[1]), self.problem, score=1, max_value=1)
+        answer_problem(self.course, get_mock_request(self.users[2]), self.problem, score=1, max_value=2)
+        answer_problem(self.course, get_mock_request(self.users[2]), self.problem2, score=1, max_value=1)
+        answer_problem(self.course, get_mock_request(self.users[3]), self.problem2, score=0, max_value=1)
+
+    def _assert_batch_grades_match(self):
+        """
+        Asserts that the batch course grades of the users match their updated course grades.
+        """
+        batch_grades = compute_course_grades_in_batch([user.id for user in self.users], course=self.course)
+        assert list(batch_grades) == [user.id for user in self.users]
+        for user in self.users:
+            course_grade = CourseGradeFactory().update(user, self.course)
+            assert batch_grades[user.id].percent == course_grade.percent
+            assert batch_grades[user.id].letter_grade == course_grade.letter_grade
+            assert batch_grades[user.id].passed == course_grade.passed
+            assert batch_grades[user.id].grade_breakdown == {
+                category: breakdown['percent']
+                for category, breakdown in course_grade.grader_result()['grade_breakdown'].items()
+            }
+        return batch_grades
+
+    def test_matches_course_grades(self):
+        batch_grades = self._assert_batch_grades_match()
+        assert batch_grades[self.users[0].id].percent == 0.0
+        assert batch_grades[self.users[2].id].passed
+
+    def test_matches_after_policy_change(self):
+        self._set_grading_policy(passing=0.2)
+        batch_grades = self._assert_batch_grades_match()
+        assert batch_grades[self.users[1].id].passed
+
+    def test_overrides(self):
+        grade_model = PersistentSubsectionGrade.read_grade(self.users[3].id, self.sequence2.location)
+        PersistentSubsectionGradeOverride.update_or_create_override(
+            requesting_user=None,
+            subsection_grade_model=grade_model,
+            earned_graded_override=1.0,
+        )
+        batch_grades = self._assert_batch_grades_match()
+        assert batch_grades[self.users[3].id].percent > 0.0
+
+    def test_no_users(self):
+        assert not compute_course_grades_in_batch([], course=self.course)
@@ -4,9 +4,14 @@ Tests for the CourseGradeFactory class.
 from unittest.mock import patch
 
 import ddt
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from submissions import api as submissions_api
 
+from common.djangoapps.student.models import CourseEnrollment, anonymous_id_for_user
 from common.djangoapps.student.tests.factories import UserFactory
 from lms.djangoapps.courseware.access import has_access
+from lms.djangoapps.courseware.tests.factories import StudentModuleFactory
 from openedx.core.djangoapps.content.block_structure.factory import BlockStructureFactory
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.modulestore.tests.factories import CourseFactory  # lint-amnesty, pylint: disable=wrong-import-order
@@ -214,6 +219,90 @@ class TestCourseGradeFactory(GradeTestBase):
         assert expected_summary == actual_summary
 
 
+@ddt.ddt
+class TestScoresPrefetch(GradeTestBase):
+    """
+    Tests that the scores of a batch of users are prefetched when iterating
+    through their course grades.
+    """
+    def setUp(self):
+        super().setUp()
+        self.users = [self.request.user]
+        for _ in range(3):
+            user = UserFactory.create()
+            CourseEnrollment.enroll(user, self.course.id)
+            self.users.append(user)
+
+        for index, user in enumerate(self.users):
+            StudentModuleFactory.create(
+                student=user,
+                course_id=self.course.id,
+                module_state_key=self.problem.location,
+                grade=index,
+                max_grade=len(self.users),
+            )
+            submission = submissions_api.create_submission(
+                {
+                    'student_id': anonymous_id_for_user(user, self.course.id),
+                    'course_id': str(self.course.id),
+                    'item_id': str(self.problem2.location),
+                    'item_type': 'problem',
+                },
+                'any answer',
+            )
+            submissions_api.set_score(submission['uuid'], index + 1, len(self.users))
+
+    def _iter_problem_scores(self, users, prefetch_scores):
+        """
+        Returns the earned and possible scores of each problem for each of the given users.
+        """
+        return {
+            user.id: {
+                location: (score.earned, score.possible)
+                for location, score in course_grade.problem_scores.items()
+            }
+            for user, course_grade, __ in CourseGradeFactory().iter(
+                users, course=self.course, force_update=True, prefetch_scores=prefetch_scores,
+            )
+        }
+
+    def test_prefetched_scores_match(self):
+        prefetched_scores = self._iter_problem_scores(self.users, prefetch_scores=True)
+        assert prefetched_scores == self._iter_problem_scores(self.users, prefetch_scores=False)
+        for index, user in enumerate(self.users):
+            assert prefetched_scores[user.id][self.problem.location] == (index, len(self.users))
+            assert prefetched_scores[user.id][self.problem2.location] == (index + 1, len(self.users))
+
+    @ddt.data(1, 2, 4)
+    def test_score_query_counts(self, num_users):
+        users = self.users[:num_users]
+
+        def _score_query_counts(prefetch_scores):
+            """
+            Returns the number of queries of CSM and Submissions API scores.
+            """
+            with CaptureQueriesContext(connection) as queries:
+                self._iter_problem_scores(users, prefetch_scores)
+            selects = [query['sql'] for query in queries.captured_queries if query['sql'].startswith('SELECT')]
+            return (
+                sum('courseware_studentmodule' in sql for sql in selects),
+                sum('submissions_scoresummary' in sql for sql in selects),
+            )
+
+        assert _score_query_counts(prefetch_scores=False) == (num_users, num_users)
+        assert _score_query_counts(prefetch_scores=True) == (1, 1)
+
+    @patch.object(CourseGradeFactory, 'SCORES_PREFETCH_BATCH_SIZE', 3)
+    def test_prefetch_batches(self):
+        with patch(
+            'lms.djangoapps.grades.course_grade_factory.prefetch_subsection_scores',
+        ) as mock_prefetch_scores:
+            list(CourseGradeFactory().iter(iter(self.users), course=self.course, force_update=True))
+        assert [call_args[0][1] for call_args in mock_prefetch_scores.call_args_list] == [
+            self.users[:3], self.users[3:],
+        ]
+
+
 class TestGradeIteration(SharedModuleStoreTestCase):
     """
     Test iteration through student course grades.
@@ -10,6 +10,7 @@ from unittest.mock import MagicMock, patch
 import ddt
 import pytest
 import pytz
+from django.db import transaction
 from django.test import TestCase
 from django.test.utils import override_settings
 from opaque_keys.edx.locator import CourseLocator
@@ -24,7 +25,9 @@ from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 
 from ..constants import ScoreDatabaseTableEnum
 from ..signals.handlers import (
+    defer_subsection_grade_updates,
     disconnect_submissions_signal_receiver,
+    enqueue_subsection_update,
     listen_for_course_grade_passed_first_time,
     listen_for_failing_grade,
     listen_for_passing_grade,
@@ -271,6 +274,54 @@ class ScoreChangedSignalRelayTest(TestCase):
                 pass
 
 
+class DeferSubsectionGradeUpdatesTest(TestCase):
+    """
+    Tests for the defer_subsection_grade_updates context manager.
+    """
+    def setUp(self):
+        super().setUp()
+        patcher = patch('lms.djangoapps.grades.signals.handlers.recalculate_subsection_grade_v3.apply_async')
+        self.apply_async_mock = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _score_changed(self, user_id):
+        """
+        Sends the kwargs of a PROBLEM_WEIGHTED_SCORE_CHANGED signal for the given user to enqueue_subsection_update.
+        """
+        kwargs = dict(PROBLEM_WEIGHTED_SCORE_CHANGED_KWARGS, user_id=user_id, course_id='course-v1:org+course+run')
+        enqueue_subsection_update(**kwargs)
+
+    def _enqueued_user_ids(self):
+        return [call[1]['kwargs']['user_id'] for call in self.apply_async_mock.call_args_list]
+
+    def test_not_deferred(self):
+        self._score_changed(1)
+        assert self._enqueued_user_ids() == [1]
+
+    def test_deferred_until_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                with defer_subsection_grade_updates():
+                    self._score_changed(1)
+                    with defer_subsection_grade_updates():
+                        self._score_changed(2)
+                    assert self._enqueued_user_ids() == []
+                assert self._enqueued_user_ids() == []
+        assert self._enqueued_user_ids() == [1, 2]
+
+        self._score_changed(3)
+        assert self._enqueued_user_ids() == [1, 2, 3]
+
+    def test_discarded_on_rollback(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with pytest.raises(ValueError):
+                with transaction.atomic():
+                    with defer_subsection_grade_updates():
+                        self._score_changed(1)
+                        raise ValueError
+        assert self._enqueued_user_ids() == []
+
+
 class CourseEventsSignalsTest(ModuleStoreTestCase):
     """
     Tests to ensure that the courseware module correctly catches
@@ -36,6 +36,31 @@ USE_ON_DISK_GRADE_REPORTING = CourseWaffleFlag(
     f'{WAFFLE_NAMESPACE}.use_on_disk_grade_reporting', __name__
 )
 
+# .. toggle_name: instructor_task.use_sharded_grade_reporting
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: When generating course grade reports, split the enrolled learners into shards of
+#   settings.COURSE_GRADE_REPORT_USERS_PER_SHARD learners (by user id) that are graded in parallel by separate
+#   subtasks, each writing a partial CSV to the report store. The partial CSVs are merged once all shards are done.
+# .. toggle_use_cases: opt_in
+# .. toggle_creation_date: 2026-10-18
+USE_SHARDED_GRADE_REPORTING = CourseWaffleFlag(
+    f'{WAFFLE_NAMESPACE}.use_sharded_grade_reporting', __name__
+)
+
+# .. toggle_name: instructor_task.bulk_rescore
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: When rescoring a problem for many learners, load the course once and bind each learner's
+#   state to the already loaded problem, read the learners' StudentModules in batches of
+#   settings.BULK_RESCORE_BATCH_SIZE and save each batch in a single transaction, enqueueing the resulting subsection
+#   grade updates once it's committed. Per-learner timings are reported in the task's progress.
+# .. toggle_use_cases: opt_in
+# .. toggle_creation_date: 2026-10-18
+BULK_RESCORE = CourseWaffleFlag(
+    f'{WAFFLE_NAMESPACE}.bulk_rescore', __name__
+)
+
 
 def optimize_get_learners_switch_enabled():
     """
@@ -69,3 +94,19 @@ def use_on_disk_grade_reporting(course_id):
     False otherwise.
     """
     return USE_ON_DISK_GRADE_REPORTING.is_enabled(course_id)
+
+
+def use_sharded_grade_reporting(course_id):
+    """
+    Returns True if course grade reports should be generated in parallel
+    shards of learners, False otherwise.
+    """
+    return USE_SHARDED_GRADE_REPORTING.is_enabled(course_id)
+
+
+def use_bulk_rescore(course_id):
+    """
+    Returns True if problems should be rescored for many learners
+    in bulk in the given course, False otherwise.
+    """
+    return BULK_RESCORE.is_enabled(course_id)
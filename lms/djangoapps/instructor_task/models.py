@@ -318,6 +318,24 @@ class DjangoStorageReportStore(ReportStore):
         output_buffer.seek(0)
         self.store(course_id, filename, output_buffer, parent_dir)
 
+    def exists(self, course_id, filename, parent_dir=''):
+        """
+        Return whether a file named `filename` has been stored for `course_id`.
+        """
+        return self.storage.exists(self.path_to(course_id, filename, parent_dir))
+
+    def open(self, course_id, filename, parent_dir=''):
+        """
+        Open the stored file named `filename` for `course_id` for reading.
+        """
+        return self.storage.open(self.path_to(course_id, filename, parent_dir))
+
+    def delete(self, course_id, filename, parent_dir=''):
+        """
+        Delete the stored file named `filename` for `course_id`, if it exists.
+        """
+        self.storage.delete(self.path_to(course_id, filename, parent_dir))
+
     def links_for(self, course_id):
         """
         For a given `course_id`, return a list of `(filename, url)` tuples.
@@ -24,14 +24,23 @@ import logging
 from functools import partial
 
 from celery import shared_task
+from celery.states import FAILURE, RETRY, SUCCESS
+from django.conf import settings
 from django.utils.translation import gettext_noop
 from edx_django_utils.monitoring import set_code_owner_attribute
 
 from lms.djangoapps.bulk_email.tasks import perform_delegate_email_batches
+from lms.djangoapps.instructor_task.config.waffle import use_sharded_grade_reporting
+from lms.djangoapps.instructor_task.subtasks import SubtaskStatus, check_subtask_is_valid, update_subtask_status
 from lms.djangoapps.instructor_task.tasks_base import BaseInstructorTask
 from lms.djangoapps.instructor_task.tasks_helper.certs import generate_students_certificates
 from lms.djangoapps.instructor_task.tasks_helper.enrollments import upload_may_enroll_csv, upload_students_csv
-from lms.djangoapps.instructor_task.tasks_helper.grades import CourseGradeReport, ProblemGradeReport, ProblemResponses
+from lms.djangoapps.instructor_task.tasks_helper.grades import (
+    CourseGradeReport,
+    ProblemGradeReport,
+    ProblemResponses,
+    ShardedCourseGradeReport
+)
 from lms.djangoapps.instructor_task.tasks_helper.misc import (
     cohort_students_and_upload,
     upload_course_survey_report,
@@ -43,6 +52,7 @@ from lms.djangoapps.instructor_task.tasks_helper.misc import (
 )
 
 from lms.djangoapps.instructor_task.tasks_helper.module_state import (
+    bulk_rescore_problem_module_states,
     delete_problem_module_state,
     override_score_module_state,
     perform_module_state_update,
@@ -77,8 +87,9 @@ def rescore_problem(entry_id, xblock_instance_args):
     # Translators: This is a past-tense verb that is inserted into task progress messages as {action}.
     action_name = gettext_noop('rescored')
     update_fcn = partial(rescore_problem_module_state, xblock_instance_args)
+    bulk_update_fcn = partial(bulk_rescore_problem_module_states, xblock_instance_args)
 
-    visit_fcn = partial(perform_module_state_update, update_fcn, None)
+    visit_fcn = partial(perform_module_state_update, update_fcn, None, bulk_update_fcn=bulk_update_fcn)
     return run_main_task(entry_id, visit_fcn, action_name)
 
 
@@ -193,10 +204,79 @@ def calculate_grades_csv(entry_id, xblock_instance_args):
         xblock_instance_args.get('task_id'), entry_id, action_name
     )
 
-    task_fn = partial(CourseGradeReport.generate, xblock_instance_args)
+    task_fn = partial(_generate_course_grade_report, xblock_instance_args)
     return run_main_task(entry_id, task_fn, action_name)
 
 
+def _generate_course_grade_report(xblock_instance_args, entry_id, course_id, task_input, action_name):
+    """
+    Generates the course grade report, either within this task or by
+    queueing subtasks for shards of the learners in the course.
+    """
+    if not use_sharded_grade_reporting(course_id):
+        return CourseGradeReport.generate(xblock_instance_args, entry_id, course_id, task_input, action_name)
+
+    def _create_shard_subtask(shard, initial_subtask_status):
+        """Creates a subtask to grade the given shard of learners."""
+        return calculate_grades_csv_shard.subtask(
+            (
+                entry_id,
+                xblock_instance_args,
+                shard,
+                initial_subtask_status.to_dict(),
+            ),
+            task_id=initial_subtask_status.task_id,
+        )
+
+    return ShardedCourseGradeReport.queue_shards(
+        xblock_instance_args, entry_id, course_id, task_input, action_name, _create_shard_subtask,
+    )
+
+
+@shared_task(bind=True, default_retry_delay=30, max_retries=settings.COURSE_GRADE_REPORT_SHARD_MAX_RETRIES)
+@set_code_owner_attribute
+def calculate_grades_csv_shard(self, entry_id, xblock_instance_args, shard, subtask_status_dict):
+    """
+    Grades one shard of the learners of a course grade report into partial
+    CSVs, and merges all the shards into the report if it is the last to finish,
+    or marks the report as failed if any shard failed.
+
+    `shard` is a dict with the 'index' of the shard, the 'min_user_id' and
+    'max_user_id' of its learners, and the 'action_name' of the report task.
+    `subtask_status_dict` is the SubtaskStatus of this subtask, as a dict.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+    TASK_LOG.info(
+        "Task: %s, InstructorTask ID: %s, Grading grade report shard %s",
+        current_task_id, entry_id, shard['index'],
+    )
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+
+    try:
+        succeeded, failed = ShardedCourseGradeReport.generate_shard(xblock_instance_args, entry_id, shard)
+    except Exception as exc:  # pylint: disable=broad-except
+        if self.request.retries < self.max_retries:
+            TASK_LOG.warning("Grade report shard task %s failed, retrying", current_task_id, exc_info=True)
+            subtask_status.increment(retried_withmax=1, state=RETRY)
+            update_subtask_status(entry_id, current_task_id, subtask_status)
+            raise self.retry(  # pylint: disable=raise-missing-from
+                args=[entry_id, xblock_instance_args, shard, subtask_status.to_dict()], exc=exc,
+            )
+        TASK_LOG.exception("Grade report shard task %s failed", current_task_id)
+        subtask_status.increment(state=FAILURE)
+        update_subtask_status(entry_id, current_task_id, subtask_status)
+        # If this is the last shard to finish, this marks the report as failed.
+        ShardedCourseGradeReport.merge_shards_if_complete(xblock_instance_args, entry_id, shard['action_name'])
+        raise
+
+    subtask_status.increment(succeeded=succeeded, failed=failed, state=SUCCESS)
+    update_subtask_status(entry_id, current_task_id, subtask_status)
+    # If the merge fails, this marks the report as failed before raising.
+    ShardedCourseGradeReport.merge_shards_if_complete(xblock_instance_args, entry_id, shard['action_name'])
+    return subtask_status.to_dict()
+
+
 @shared_task(base=BaseInstructorTask)
 @set_code_owner_attribute
 def calculate_problem_grade_report(entry_id, xblock_instance_args):
@@ -2,9 +2,13 @@
 Functionality for generating grade reports.
 """
 
+import codecs
 import csv
+import io
+import json
 import logging
 import re
+import traceback
 from collections import OrderedDict, defaultdict
 from datetime import datetime
 from itertools import chain
@@ -12,8 +16,10 @@ from tempfile import TemporaryFile
 
 from time import time
 
+from celery.states import FAILURE
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from lazy import lazy
 from opaque_keys.edx.keys import UsageKey
 from pytz import UTC
@@ -36,6 +42,9 @@ from lms.djangoapps.instructor_task.config.waffle import (
     problem_grade_report_verified_only,
     use_on_disk_grade_reporting,
 )
+from lms.djangoapps.instructor_task.exceptions import GradeReportShardError
+from lms.djangoapps.instructor_task.models import InstructorTask, ReportStore
+from lms.djangoapps.instructor_task.subtasks import queue_subtasks_for_query
 from lms.djangoapps.teams.models import CourseTeamMembership
 from lms.djangoapps.verify_student.services import IDVerificationService
 from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
@@ -92,6 +101,7 @@ class _CourseGradeReportContext:
             course_id=course_id,
             task_input=_task_input,
         )
+        self.entry_id = _entry_id
         self.action_name = action_name
         self.course_id = course_id
         self.task_progress = TaskProgress(self.action_name, total=None, start_time=time())
@@ -443,26 +453,33 @@ class GradeReportBase:
         TASK_LOG.info('%s, Task type: %s, %s, %s', task_info_string, self.context.action_name,
                       message, self.context.task_progress.state)
 
-    def _batch_users(self):
+    def _enrolled_learners_filter_kwargs(self):
+        """
+        Returns the filter kwargs that select the users enrolled in the course
+        of this report.
+        """
+        filter_kwargs = {
+            'courseenrollment__course_id': self.context.course_id,
+        }
+        if self.context.report_for_verified_only:
+            filter_kwargs['courseenrollment__mode'] = CourseMode.VERIFIED
+        return filter_kwargs
+
+    def _batch_users(self, min_user_id=None, max_user_id=None):
         """
-        Returns a generator of batches of users.
+        Returns a generator of batches of users, optionally limited to
+        users whose ids are within the given (inclusive) range.
         """
         def grouper(iterable, chunk_size=100, fillvalue=None):
             args = [iter(iterable)] * chunk_size
             return zip_longest(*args, fillvalue=fillvalue)
 
-        def get_enrolled_learners_for_course(course_id, verified_only=False):
+        def get_enrolled_learners_for_course(filter_kwargs):
             """
             Get all the enrolled users in a course chunk by chunk.
             This generator method fetches & loads the enrolled user objects on demand which in chunk
             size defined. This method is a workaround to avoid out-of-memory errors.
             """
-            filter_kwargs = {
-                'courseenrollment__course_id': course_id,
-            }
-            if verified_only:
-                filter_kwargs['courseenrollment__mode'] = CourseMode.VERIFIED
-
             user_ids_list = get_user_model().objects.filter(**filter_kwargs).values_list('id', flat=True).order_by('id')
             user_chunks = grouper(user_ids_list)
             for user_ids in user_chunks:
@@ -477,10 +494,12 @@ class GradeReportBase:
 
                 yield users
 
-        return get_enrolled_learners_for_course(
-            course_id=self.context.course_id,
-            verified_only=self.context.report_for_verified_only
-        )
+        filter_kwargs = self._enrolled_learners_filter_kwargs()
+        if min_user_id is not None:
+            filter_kwargs['id__gte'] = min_user_id
+        if max_user_id is not None:
+            filter_kwargs['id__lte'] = max_user_id
+        return get_enrolled_learners_for_course(filter_kwargs)
 
     def log_additional_info_for_testing(self, message):
         """
@@ -496,11 +515,12 @@ class GradeReportBase:
         been processed
         """
 
-    def _batched_rows(self):
+    def _batched_rows(self, min_user_id=None, max_user_id=None):
         """
-        A generator of batches of (success_rows, error_rows) for this report.
+        A generator of batches of (success_rows, error_rows) for this report,
+        optionally limited to users whose ids are within the given range.
         """
-        for users in self._batch_users():
+        for users in self._batch_users(min_user_id, max_user_id):
             yield self._rows_for_users(users)
             self._clear_caches()
 
@@ -706,6 +726,273 @@ class TempFileCourseGradeReport(CourseGradeReport, TemporaryFileReportMixin):
     """ Course Grade Report that writes file iteratively to a TempFile to then be uploaded """
 
 
+class ShardedCourseGradeReport(CourseGradeReport, TemporaryFileReportMixin):
+    """
+    Course Grade Report whose learners are split into shards of contiguous user
+    id ranges, each of which is graded by its own subtask.
+
+    Each shard writes its rows to partial CSVs in the report store.  Once all
+    shards are done, the last one to finish merges the partial CSVs into the
+    final report, or marks the report as failed if any shard failed.  The
+    partial success CSV of a shard is written last, so it serves as the
+    checkpoint for that shard: a retried shard reuses it if it was stored
+    before the failure, and a retried shard never recomputes the other shards.
+    """
+    # Report store directory (within which each report has its own
+    # directory) for the partial CSVs of sharded reports.
+    SHARDS_PARENT_DIR = 'grade_report_shards'
+
+    # Lock expiration should be long enough to allow the merge to complete.
+    MERGE_LOCK_EXPIRE = 60 * 60
+
+    @classmethod
+    def queue_shards(cls, _xblock_instance_args, _entry_id, course_id, _task_input, action_name, create_subtask_fcn):
+        """
+        Queues a subtask, created by `create_subtask_fcn(shard, subtask_status)`,
+        for each shard of the learners enrolled in the course.
+
+        Returns the task progress as stored in the InstructorTask object.
+        """
+        entry = InstructorTask.objects.get(pk=_entry_id)
+
+        # If the parent task is run again after its shards were queued (e.g.
+        # after a loss of connection to the broker), don't queue them again.
+        if len(entry.subtasks) > 0 and len(entry.task_output) > 0:
+            TASK_LOG.warning("Task %s has already queued its grade report shards", entry.task_id)
+            return json.loads(entry.task_output)
+
+        context = _CourseGradeReportContext(_xblock_instance_args, _entry_id, course_id, _task_input, action_name)
+        report = cls(context)
+        learners = get_user_model().objects.filter(**report._enrolled_learners_filter_kwargs()).order_by('id')
+        total_num_learners = learners.count()
+        if total_num_learners == 0:
+            return TempFileCourseGradeReport(context)._generate()  # pylint: disable=protected-access
+
+        shard_count = [0]
+
+        def _create_shard_subtask(learners_for_shard, initial_subtask_status):
+            """
+            Creates the subtask for the shard of the given learners.
+            """
+            user_ids = [learner['pk'] for learner in learners_for_shard]
+            shard = {
+                'index': shard_count[0],
+                'min_user_id': min(user_ids),
+                'max_user_id': max(user_ids),
+                'action_name': action_name,
+            }
+            shard_count[0] += 1
+            return create_subtask_fcn(shard, initial_subtask_status)
+
+        return queue_subtasks_for_query(
+            entry,
+            action_name,
+            _create_shard_subtask,
+            [learners],
+            [],
+            settings.COURSE_GRADE_REPORT_USERS_PER_SHARD,
+            total_num_learners,
+        )
+
+    @classmethod
+    def generate_shard(cls, _xblock_instance_args, _entry_id, shard):
+        """
+        Grades the learners of the given shard into its partial CSVs, unless
+        they were already written by a previous run of the shard.
+
+        Returns a (succeeded, failed) tuple of the number of learners in the shard.
+        """
+        report = cls._for_entry(_xblock_instance_args, _entry_id, shard['action_name'])
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        success_filename, error_filename = cls._shard_filenames(shard['index'])
+        parent_dir = report._shards_dir()
+
+        if report_store.exists(report.context.course_id, success_filename, parent_dir):
+            TASK_LOG.info(
+                '%s, Reusing grade report shard %s from a previous run', report.context.task_info_string, shard['index']
+            )
+            return (
+                report._count_shard_rows(report_store, success_filename),
+                report._count_shard_rows(report_store, error_filename),
+            )
+
+        succeeded, failed = 0, 0
+        with TemporaryFile('r+') as success_file, TemporaryFile('r+') as error_file:
+            success_writer = csv.writer(success_file)
+            error_writer = csv.writer(error_file)
+            for success_rows, error_rows in report._batched_rows(shard['min_user_id'], shard['max_user_id']):
+                success_writer.writerows(success_rows)
+                error_writer.writerows(error_rows)
+                succeeded += len(success_rows)
+                failed += len(error_rows)
+
+            # Store the success CSV last, as its presence marks the shard as done.
+            for partial_file, filename in ((error_file, error_filename), (success_file, success_filename)):
+                # Replace the partial CSV stored by a failed run of the shard, which storages
+                # that don't overwrite files would otherwise keep, saving this one under another name.
+                if report_store.exists(report.context.course_id, filename, parent_dir):
+                    report_store.delete(report.context.course_id, filename, parent_dir)
+                partial_file.seek(0)
+                report_store.store(report.context.course_id, filename, partial_file, parent_dir)
+
+        TASK_LOG.info(
+            '%s, Completed grade report shard %s: %s succeeded, %s failed',
+            report.context.task_info_string, shard['index'], succeeded, failed,
+        )
+        return succeeded, failed
+
+    @classmethod
+    def merge_shards_if_complete(cls, _xblock_instance_args, _entry_id, action_name):
+        """
+        Merges the partial CSVs of all shards into the final report and
+        uploads it, once all shards of the report have completed.
+        Only one caller will merge the shards of a given report.
+
+        If any shard failed, or if the merge fails, the report task is marked
+        as failed and the partial CSVs are deleted. Errors of the merge are raised.
+
+        Returns whether the shards were merged.
+        """
+        entry = InstructorTask.objects.get(pk=_entry_id)
+        subtask_dict = json.loads(entry.subtasks)
+        num_shards = subtask_dict['total']
+        if subtask_dict['succeeded'] + subtask_dict['failed'] < num_shards:
+            return False
+
+        lock_key = f'grade-report-merge-{_entry_id}'
+        # cache.add fails if the key already exists
+        if not cache.add(lock_key, 'true', cls.MERGE_LOCK_EXPIRE):
+            return False
+
+        try:
+            report = cls._for_entry(_xblock_instance_args, _entry_id, action_name)
+            if report._is_merged_or_failed(subtask_dict):
+                return False
+
+            if subtask_dict['failed']:
+                TASK_LOG.error(
+                    'Task: %s, InstructorTask ID: %s, %s grade report shards failed, not merging the report',
+                    entry.task_id, _entry_id, subtask_dict['failed'],
+                )
+                report._fail(GradeReportShardError(f"{subtask_dict['failed']} grade report shards failed"), num_shards)
+                return False
+
+            try:
+                report._merge_shards(num_shards)
+            except Exception as exc:
+                TASK_LOG.exception(
+                    'Task: %s, InstructorTask ID: %s, Failed to merge the grade report shards',
+                    entry.task_id, _entry_id,
+                )
+                report._fail(exc, num_shards, traceback.format_exc())
+                raise
+            return True
+        finally:
+            cache.delete(lock_key)
+
+    @classmethod
+    def _for_entry(cls, _xblock_instance_args, _entry_id, action_name):
+        """
+        Returns the report for the given InstructorTask entry id.
+        """
+        entry = InstructorTask.objects.get(pk=_entry_id)
+        context = _CourseGradeReportContext(
+            _xblock_instance_args, _entry_id, entry.course_id, json.loads(entry.task_input), action_name,
+        )
+        return cls(context)
+
+    @staticmethod
+    def _shard_filenames(shard_index):
+        """
+        Returns the names of the partial success and error CSVs of the given shard.
+        """
+        return f'shard_{shard_index:05d}.csv', f'shard_{shard_index:05d}_err.csv'
+
+    def _shards_dir(self):
+        """
+        Returns the report store directory of the partial CSVs of this report.
+        """
+        return f'{self.SHARDS_PARENT_DIR}/{self.context.entry_id}'
+
+    def _count_shard_rows(self, report_store, filename):
+        """
+        Returns the number of rows in the given partial CSV of this report.
+        """
+        with report_store.open(self.context.course_id, filename, self._shards_dir()) as partial_file:
+            return sum(1 for __ in csv.reader(codecs.iterdecode(partial_file, 'utf-8')))
+
+    def _merge_shards(self, num_shards):
+        """
+        Concatenates the partial CSVs of the given number of shards, in order,
+        uploads the result as the final report and deletes the partial CSVs.
+        """
+        self.context.update_status('ShardedCourseGradeReport - 1: Merging grade report shards')
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        parent_dir = self._shards_dir()
+        course_id = self.context.course_id
+
+        with TemporaryFile('w+b') as success_file, TemporaryFile('w+b') as error_file:
+            success_file.write(self._csv_header(self._success_headers()))
+            error_file.write(self._csv_header(self._error_headers()))
+            has_errors = False
+            for shard_index in range(num_shards):
+                success_filename, error_filename = self._shard_filenames(shard_index)
+                with report_store.open(course_id, success_filename, parent_dir) as partial_file:
+                    success_file.write(partial_file.read())
+                with report_store.open(course_id, error_filename, parent_dir) as partial_file:
+                    error_rows = partial_file.read()
+                    has_errors = has_errors or bool(error_rows)
+                    error_file.write(error_rows)
+
+            self.context.update_status('ShardedCourseGradeReport - 2: Uploading files')
+            self.upload_temp_files(success_file, error_file, has_errors)
+
+        self._delete_shards(num_shards)
+        return self.context.update_status('ShardedCourseGradeReport - 3: Completed grades')
+
+    def _is_merged_or_failed(self, subtask_dict):
+        """
+        Returns whether the shards of this report were already merged, or the report marked as failed.
+        """
+        if InstructorTask.objects.get(pk=self.context.entry_id).task_state == FAILURE:
+            return True
+        # The partial CSVs are deleted once merged.
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        success_filename, __ = self._shard_filenames(0)
+        return not subtask_dict['failed'] and not report_store.exists(
+            self.context.course_id, success_filename, self._shards_dir()
+        )
+
+    def _fail(self, exception, num_shards, traceback_string=None):
+        """
+        Marks the report task as failed with the given exception, and deletes the partial CSVs.
+        """
+        entry = InstructorTask.objects.get(pk=self.context.entry_id)
+        entry.task_output = InstructorTask.create_output_for_failure(exception, traceback_string)
+        entry.task_state = FAILURE
+        entry.save_now()
+        self._delete_shards(num_shards)
+
+    def _delete_shards(self, num_shards):
+        """
+        Deletes the partial CSVs of the given number of shards which were stored.
+        """
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        for shard_index in range(num_shards):
+            for filename in self._shard_filenames(shard_index):
+                if report_store.exists(self.context.course_id, filename, self._shards_dir()):
+                    report_store.delete(self.context.course_id, filename, self._shards_dir())
+
+    @staticmethod
+    def _csv_header(headers):
+        """
+        Returns the utf-8 encoded CSV line of the given headers.
+        """
+        header_file = io.StringIO()
+        csv.writer(header_file).writerow(headers)
+        return header_file.getvalue().encode('utf-8')
+
+
 class ProblemGradeReport(GradeReportBase):
     """
     Class to encapsulate functionality related to generating user/row had header data for Problem Grade Reports.
@@ -755,6 +1042,7 @@ class ProblemGradeReport(GradeReportBase):
             course=self.context.course,
             collected_block_structure=self.context.course_structure,
             course_key=self.context.course_id,
+            prefetch_scores=True,
         ):
             if not course_grade:
                 err_msg = str(error)
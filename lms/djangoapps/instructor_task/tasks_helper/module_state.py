@@ -7,6 +7,8 @@ import json
 import logging
 from time import time
 
+from django.conf import settings
+from django.db.models import QuerySet
 from django.utils.translation import gettext_noop
 from opaque_keys.edx.keys import UsageKey
 from xblock.scorable import Score
@@ -20,10 +22,12 @@ from lms.djangoapps.courseware.courses import get_problems_in_section
 from lms.djangoapps.courseware.model_data import FieldDataCache
 from lms.djangoapps.courseware.models import StudentModule
 from lms.djangoapps.courseware.block_render import get_block_for_descriptor
+from lms.djangoapps.grades.api import defer_subsection_grade_updates
 from lms.djangoapps.grades.api import events as grades_events
 from openedx.core.lib.courses import get_course_by_id
 from xmodule.modulestore.django import modulestore  # lint-amnesty, pylint: disable=wrong-import-order
 
+from ..config.waffle import use_bulk_rescore
 from ..exceptions import UpdateProblemModuleStateError
 from .runner import TaskProgress
 from .utils import UNKNOWN_TASK_ID, UPDATE_STATUS_FAILED, UPDATE_STATUS_SKIPPED, UPDATE_STATUS_SUCCEEDED
@@ -31,7 +35,8 @@ from .utils import UNKNOWN_TASK_ID, UPDATE_STATUS_FAILED, UPDATE_STATUS_SKIPPED,
 TASK_LOG = logging.getLogger('edx.celery.task')
 
 
-def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, task_input, action_name):
+def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, task_input, action_name,
+                                bulk_update_fcn=None):
     """
     Performs generic update by visiting StudentModule instances with the update_fcn provided.
 
@@ -43,6 +48,10 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
     on the particular student module failed.
     A raised exception indicates a fatal condition -- that no other student modules should be considered.
 
+    If `bulk_update_fcn` is provided and bulk rescoring is enabled for the course, it is called once
+    instead, with the course id, the dict of blocks by usage key, the ids of the StudentModules to update,
+    the task_input and the TaskProgress, and returns an iterable of the update status of each StudentModule.
+
     The return value is a dict containing the task's results, with the following keys:
 
           'attempted': number of attempts made
@@ -85,15 +94,23 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
         course_id, usage_keys, student_identifier, filter_fcn, override_score_task
     )
 
-    task_progress = TaskProgress(action_name, len(modules_to_update), start_time)
-    task_progress.update_task_state()
-
-    for module_to_update in modules_to_update:
-        task_progress.attempted += 1
-        block = problems[str(module_to_update.module_state_key)]
+    if bulk_update_fcn is not None and use_bulk_rescore(course_id):
+        module_ids_to_update = _get_student_module_ids(modules_to_update)
+        task_progress = TaskProgress(action_name, len(module_ids_to_update), start_time)
+        task_progress.update_task_state()
+        update_statuses = bulk_update_fcn(course_id, problems, module_ids_to_update, task_input, task_progress)
+    else:
+        task_progress = TaskProgress(action_name, len(modules_to_update), start_time)
+        task_progress.update_task_state()
         # There is no try here:  if there's an error, we let it throw, and the task will
         # be marked as FAILED, with a stack trace.
-        update_status = update_fcn(block, module_to_update, task_input)
+        update_statuses = (
+            update_fcn(problems[str(module_to_update.module_state_key)], module_to_update, task_input)
+            for module_to_update in modules_to_update
+        )
+
+    for update_status in update_statuses:
+        task_progress.attempted += 1
         if update_status == UPDATE_STATUS_SUCCEEDED:
             # If the update_fcn returns true, then it performed some kind of work.
             # Logging of failures is left to the update_fcn itself.
@@ -121,80 +138,118 @@ def rescore_problem_module_state(xblock_instance_args, block, student_module, ta
     Returns True if problem was successfully rescored for the given student, and False
     if problem encountered some kind of error in rescoring.
     '''
-    # unpack the StudentModule:
-    course_id = student_module.course_id
-    student = student_module.student
-    usage_key = student_module.module_state_key
-
-    with modulestore().bulk_operations(course_id):
-        course = get_course_by_id(course_id)
+    with modulestore().bulk_operations(student_module.course_id):
+        course = get_course_by_id(student_module.course_id)
         # TODO: Here is a call site where we could pass in a loaded course.  I
         # think we certainly need it since grading is happening here, and field
         # overrides would be important in handling that correctly
-        instance = _get_module_instance_for_task(
-            course_id,
-            student,
-            block,
-            xblock_instance_args,
-            grade_bucket_type='rescore',
-            course=course
-        )
+        return _rescore_student_module(xblock_instance_args, block, student_module, task_input, course)
 
-        if instance is None:
-            # Either permissions just changed, or someone is trying to be clever
-            # and load something they shouldn't have access to.
-            msg = "No module {location} for student {student}--access denied?".format(
-                location=usage_key,
-                student=student
-            )
-            TASK_LOG.warning(msg)
-            return UPDATE_STATUS_FAILED
 
-        if not hasattr(instance, 'rescore'):
-            # This should not happen, since it should be already checked in the
-            # caller, but check here to be sure.
-            msg = f"Specified module {usage_key} of type {instance.__class__} does not support rescoring."
-            raise UpdateProblemModuleStateError(msg)
+def bulk_rescore_problem_module_states(xblock_instance_args, course_id, problems, student_module_ids, task_input,
+                                       task_progress):
+    """
+    Rescores the StudentModules with the given ids, and yields the update status of each of them,
+    as rescore_problem_module_state returns it.
+
+    Unlike calling rescore_problem_module_state for each StudentModule, the course is loaded once,
+    and the StudentModules are read with their students settings.BULK_RESCORE_BATCH_SIZE at a time.
+    Only the learner's state, taken from the StudentModule, is bound to the already loaded problem
+    block for each learner. Each batch is saved in a single transaction, and the subsection grade
+    updates of the batch are enqueued once it's committed. The time spent on each learner is
+    recorded in `task_progress`, which is updated after each batch.
+    """
+    batch_size = settings.BULK_RESCORE_BATCH_SIZE
+    with modulestore().bulk_operations(course_id):
+        course = get_course_by_id(course_id)
+        for batch_start in range(0, len(student_module_ids), batch_size):
+            update_statuses = []
+            with outer_atomic(), defer_subsection_grade_updates():
+                student_modules = StudentModule.objects.filter(
+                    id__in=student_module_ids[batch_start:batch_start + batch_size],
+                ).select_related('student').order_by('id')
+                for student_module in student_modules:
+                    learner_start_time = time()
+                    block = problems[str(student_module.module_state_key)]
+                    if block.has_children:
+                        # The state of the block's descendants is needed too.
+                        field_data_cache = None
+                    else:
+                        field_data_cache = FieldDataCache.cache_for_student_module(student_module, block)
+                    update_statuses.append(_rescore_student_module(
+                        xblock_instance_args, block, student_module, task_input, course, field_data_cache,
+                    ))
+                    task_progress.record_learner_duration(time() - learner_start_time)
+            yield from update_statuses
+            task_progress.update_task_state()
+
+
+def _rescore_student_module(xblock_instance_args, block, student_module, task_input, course,
+                            field_data_cache=None):
+    """
+    Rescores the student's submission to the problem `block` stored in `student_module`,
+    and returns the update status, as described by rescore_problem_module_state.
 
-        # We check here to see if the problem has any submissions. If it does not, we don't want to rescore it
-        if not instance.has_submitted_answer():
-            return UPDATE_STATUS_SKIPPED
+    If `field_data_cache` is None, the student's state for the block is read from the database.
+    """
+    # unpack the StudentModule:
+    course_id = student_module.course_id
+    student = student_module.student
+    usage_key = student_module.module_state_key
 
-        # Set the tracking info before this call, because it makes downstream
-        # calls that create events.  We retrieve and store the id here because
-        # the request cache will be erased during downstream calls.
-        create_new_event_transaction_id()
-        set_event_transaction_type(grades_events.GRADES_RESCORE_EVENT_TYPE)
-
-        # specific events from CAPA are not propagated up the stack. Do we want this?
-        try:
-            instance.rescore(only_if_higher=task_input['only_if_higher'])
-        except (LoncapaProblemError, ResponseError):
-            # Capture a backtrace for these errors, but only a warning below for student input errors.
-            TASK_LOG.exception(
-                "error processing rescore call for course %(course)s, problem %(loc)s "
-                "and student %(student)s",
-                dict(
-                    course=course_id,
-                    loc=usage_key,
-                    student=student
-                )
-            )
-        except StudentInputError:
-            TASK_LOG.warning(
-                "error processing rescore call for course %(course)s, problem %(loc)s "
-                "and student %(student)s",
-                dict(
-                    course=course_id,
-                    loc=usage_key,
-                    student=student
-                )
-            )
-            return UPDATE_STATUS_FAILED
+    instance = _get_module_instance_for_task(
+        course_id,
+        student,
+        block,
+        xblock_instance_args,
+        grade_bucket_type='rescore',
+        course=course,
+        field_data_cache=field_data_cache,
+    )
 
-        instance.save()
-        TASK_LOG.debug(
-            "successfully processed rescore call for course %(course)s, problem %(loc)s "
+    if instance is None:
+        # Either permissions just changed, or someone is trying to be clever
+        # and load something they shouldn't have access to.
+        msg = "No module {location} for student {student}--access denied?".format(
+            location=usage_key,
+            student=student
+        )
+        TASK_LOG.warning(msg)
+        return UPDATE_STATUS_FAILED
+
+    if not hasattr(instance, 'rescore'):
+        # This should not happen, since it should be already checked in the
+        # caller, but check here to be sure.
+        msg = f"Specified module {usage_key} of type {instance.__class__} does not support rescoring."
+        raise UpdateProblemModuleStateError(msg)
+
+    # We check here to see if the problem has any submissions. If it does not, we don't want to rescore it
+    if not instance.has_submitted_answer():
+        return UPDATE_STATUS_SKIPPED
+
+    # Set the tracking info before this call, because it makes downstream
+    # calls that create events.  We retrieve and store the id here because
+    # the request cache will be erased during downstream calls.
+    create_new_event_transaction_id()
+    set_event_transaction_type(grades_events.GRADES_RESCORE_EVENT_TYPE)
+
+    # specific events from CAPA are not propagated up the stack. Do we want this?
+    try:
+        instance.rescore(only_if_higher=task_input['only_if_higher'])
+    except (LoncapaProblemError, ResponseError):
+        # Capture a backtrace for these errors, but only a warning below for student input errors.
+        TASK_LOG.exception(
+            "error processing rescore call for course %(course)s, problem %(loc)s "
+            "and student %(student)s",
+            dict(
+                course=course_id,
+                loc=usage_key,
+                student=student
+            )
+        )
+    except StudentInputError:
+        TASK_LOG.warning(
+            "error processing rescore call for course %(course)s, problem %(loc)s "
             "and student %(student)s",
             dict(
                 course=course_id,
@@ -202,8 +257,20 @@ def rescore_problem_module_state(xblock_instance_args, block, student_module, ta
                 student=student
             )
         )
+        return UPDATE_STATUS_FAILED
+
+    instance.save()
+    TASK_LOG.debug(
+        "successfully processed rescore call for course %(course)s, problem %(loc)s "
+        "and student %(student)s",
+        dict(
+            course=course_id,
+            loc=usage_key,
+            student=student
+        )
+    )
 
-        return UPDATE_STATUS_SUCCEEDED
+    return UPDATE_STATUS_SUCCEEDED
 
 
 @outer_atomic
@@ -329,16 +396,19 @@ def delete_problem_module_state(xblock_instance_args, _block, student_module, _t
 
 
 def _get_module_instance_for_task(course_id, student, block, xblock_instance_args=None,
-                                  grade_bucket_type=None, course=None):
+                                  grade_bucket_type=None, course=None, field_data_cache=None):
     """
     Fetches a StudentModule instance for a given `course_id`, `student` object, and `block`.
 
     `xblock_instance_args` is used to provide information for creating a track function.
     It is passed, along with `grade_bucket_type`, to get_block_for_descriptor.
+    If `field_data_cache` isn't provided, one is created for the student and the block's descendants.
     """
     # get request-related tracking information from args passthrough, and supplement with task-specific information:
     request_info = xblock_instance_args.get('request_info', {}) if xblock_instance_args is not None else {}
     task_info = {"student": student.username, "task_id": _get_task_id_from_xblock_args(xblock_instance_args)}
+    if field_data_cache is None:
+        field_data_cache = FieldDataCache.cache_for_block_descendents(course_id, student, block)
 
     def make_track_function():
         '''
@@ -354,7 +424,7 @@ def _get_module_instance_for_task(course_id, student, block, xblock_instance_arg
         user=student,
         request=None,
         block=block,
-        field_data_cache=FieldDataCache.cache_for_block_descendents(course_id, student, block),
+        field_data_cache=field_data_cache,
         course_key=course_id,
         track_function=make_track_function(),
         grade_bucket_type=grade_bucket_type,
@@ -389,6 +459,15 @@ def _get_task_id_from_xblock_args(xblock_instance_args):
         return xblock_instance_args.get('task_id', UNKNOWN_TASK_ID)
 
 
+def _get_student_module_ids(student_modules):
+    """
+    Returns the ids of the given StudentModules (a query or a list), in increasing order.
+    """
+    if isinstance(student_modules, QuerySet):
+        return list(student_modules.order_by('id').values_list('id', flat=True))
+    return sorted(student_module.id for student_module in student_modules)
+
+
 def _get_modules_to_update(course_id, usage_keys, student_identifier, filter_fcn, override_score_task=False):
     """
     Fetches a StudentModule instances for a given `course_id`, `student` object, and `usage_keys`.
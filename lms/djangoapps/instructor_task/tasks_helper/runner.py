@@ -21,6 +21,9 @@ class TaskProgress:
     Encapsulates the current task's progress by keeping track of
     'attempted', 'succeeded', 'skipped', 'failed', 'total',
     'action_name', and 'duration_ms' values.
+
+    If the time spent on each learner is recorded with `record_learner_duration`,
+    it is summarized as 'learner_duration_ms' too.
     """
     def __init__(self, action_name, total, start_time):
         self.action_name = action_name
@@ -31,10 +34,22 @@ class TaskProgress:
         self.skipped = 0
         self.failed = 0
         self.preassigned = 0
+        # The number, total and maximum of the recorded learner durations, in seconds.
+        self.learner_count = 0
+        self.learner_total_duration = 0
+        self.learner_max_duration = 0
+
+    def record_learner_duration(self, duration):
+        """
+        Records the time spent (in seconds) on the task's work for one learner.
+        """
+        self.learner_count += 1
+        self.learner_total_duration += duration
+        self.learner_max_duration = max(self.learner_max_duration, duration)
 
     @property
     def state(self):
-        return {
+        state = {
             'action_name': self.action_name,
             'attempted': self.attempted,
             'succeeded': self.succeeded,
@@ -44,6 +59,13 @@ class TaskProgress:
             'preassigned': self.preassigned,
             'duration_ms': int((time() - self.start_time) * 1000),
         }
+        if self.learner_count:
+            state['learner_duration_ms'] = {
+                'count': self.learner_count,
+                'mean': int(self.learner_total_duration / self.learner_count * 1000),
+                'max': int(self.learner_max_duration * 1000),
+            }
+        return state
 
     def update_task_state(self, extra_meta=None):
         """
@@ -19,11 +19,13 @@ from celery.states import FAILURE, SUCCESS
 from django.contrib.auth.models import User  # lint-amnesty, pylint: disable=imported-auth-user
 from django.test.utils import override_settings
 from django.urls import reverse
+from edx_toggles.toggles.testutils import override_waffle_flag
 
 from xmodule.capa.responsetypes import StudentInputError
 from xmodule.capa.tests.response_xml_factory import CodeResponseXMLFactory, CustomResponseXMLFactory
 from lms.djangoapps.courseware.model_data import StudentModule
 from lms.djangoapps.grades.api import CourseGradeFactory
+from lms.djangoapps.instructor_task.config.waffle import BULK_RESCORE
 from lms.djangoapps.instructor_task.api import (
     submit_delete_problem_state_for_all_students,
     submit_rescore_problem_for_all_students,
@@ -229,6 +231,22 @@ class TestRescoringTask(TestIntegrationTask):
             problem_edit, new_expected_scores, new_expected_max, rescore_if_higher=True,
         )
 
+    @ddt.data(
+        RescoreTestData(edit=dict(correct_answer=OPTION_2), new_expected_scores=(0, 1, 1, 2), new_expected_max=2),
+        RescoreTestData(edit=dict(num_inputs=2), new_expected_scores=(2, 1, 1, 0), new_expected_max=4),
+    )
+    @ddt.unpack
+    @override_waffle_flag(BULK_RESCORE, active=True)
+    # The test's transaction is never committed, so run the subsection grade updates deferred until commit at once.
+    @patch('lms.djangoapps.grades.signals.handlers.transaction.on_commit', lambda callback: callback())
+    def test_bulk_rescoring_option_problem(self, problem_edit, new_expected_scores, new_expected_max):
+        """
+        Run rescore scenario on option problem, rescoring in bulk.
+        """
+        self.verify_rescore_results(
+            problem_edit, new_expected_scores, new_expected_max, rescore_if_higher=False,
+        )
+
     def test_rescoring_if_higher_scores_equal(self):
         """
         Specifically tests rescore when the previous and new raw scores are equal. In this case, the scores should
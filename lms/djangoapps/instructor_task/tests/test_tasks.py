@@ -12,12 +12,15 @@ from uuid import uuid4
 import pytest
 import ddt
 from celery.states import FAILURE, SUCCESS
+from django.test.utils import override_settings
 from django.utils.translation import gettext_noop
+from edx_toggles.toggles.testutils import override_waffle_flag
 from opaque_keys.edx.keys import i4xEncoder
 
 from common.djangoapps.course_modes.models import CourseMode
 from lms.djangoapps.courseware.models import StudentModule
 from lms.djangoapps.courseware.tests.factories import StudentModuleFactory
+from lms.djangoapps.instructor_task.config.waffle import BULK_RESCORE
 from lms.djangoapps.instructor_task.exceptions import UpdateProblemModuleStateError
 from lms.djangoapps.instructor_task.models import InstructorTask
 from lms.djangoapps.instructor_task.tasks import (
@@ -489,6 +492,44 @@ class TestRescoreInstructorTask(TestInstructorTasks):
             action_name='rescored'
         )
 
+    @override_waffle_flag(BULK_RESCORE, active=True)
+    @override_settings(BULK_RESCORE_BATCH_SIZE=3)
+    def test_bulk_rescoring_success(self):
+        """
+        Tests rescoring a problem in bulk, for all students, in batches of 3 students.
+        """
+        mock_instance = MagicMock()
+        getattr(mock_instance, 'rescore').return_value = None  # lint-amnesty, pylint: disable=literal-used-as-attribute
+        mock_instance.has_submitted_answer.side_effect = [True] * 9 + [False]
+
+        num_students = 10
+        students = self._create_students_with_state(num_students, json.dumps({'attempts': 1}))
+        task_entry = self._create_input_entry()
+        with patch(
+                'lms.djangoapps.instructor_task.tasks_helper.module_state.get_block_for_descriptor'
+        ) as mock_get_block, patch(
+                'lms.djangoapps.courseware.model_data.FieldDataCache.cache_for_block_descendents'
+        ) as mock_cache_for_block_descendents:
+            mock_get_block.return_value = mock_instance
+            self._run_task_with_mock_celery(rescore_problem, task_entry.id, task_entry.task_id)
+
+        output = self.get_task_output(task_entry.id)
+        self.assert_task_output(
+            output=output,
+            total=num_students,
+            attempted=num_students,
+            succeeded=num_students - 1,
+            skipped=1,
+            failed=0,
+            action_name='rescored'
+        )
+        assert output['learner_duration_ms']['count'] == num_students
+        # Each student's state is taken from the StudentModules read in bulk, rather than queried again.
+        assert [call[1]['user'] for call in mock_get_block.call_args_list] == students
+        mock_cache_for_block_descendents.assert_not_called()
+        # The progress is updated at the start, after each of the 4 batches and at the end.
+        assert self.current_task.update_state.call_count == 6
+
 
 class TestResetAttemptsInstructorTask(TestInstructorTasks):
     """Tests instructor task that resets problem attempts."""
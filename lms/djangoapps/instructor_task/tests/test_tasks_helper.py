@@ -7,6 +7,7 @@ Unit tests for LMS instructor-initiated background tasks helper functions.
 """
 
 
+import json
 import os
 import shutil
 import tempfile
@@ -14,11 +15,14 @@ from collections import OrderedDict
 from contextlib import ExitStack, contextmanager
 from datetime import datetime, timedelta
 from unittest.mock import ANY, MagicMock, Mock, patch
+from uuid import uuid4
 
 import ddt
 import pytest
 import unicodecsv
+from celery.states import FAILURE, SUCCESS
 from django.conf import settings
+from django.core.cache import cache
 from django.test.utils import override_settings
 from edx_django_utils.cache import RequestCache
 from freezegun import freeze_time
@@ -38,6 +42,7 @@ from lms.djangoapps.grades.models import PersistentCourseGrade, PersistentSubsec
 from lms.djangoapps.grades.subsection_grade import CreateSubsectionGrade
 from lms.djangoapps.grades.transformer import GradesTransformer
 from lms.djangoapps.instructor_analytics.basic import UNAVAILABLE, list_problem_responses
+from lms.djangoapps.instructor_task.subtasks import update_subtask_status
 from lms.djangoapps.instructor_task.tasks_helper.certs import generate_students_certificates
 from lms.djangoapps.instructor_task.tasks_helper.enrollments import upload_may_enroll_csv, upload_students_csv
 from lms.djangoapps.instructor_task.tasks_helper.grades import (
@@ -46,6 +51,7 @@ from lms.djangoapps.instructor_task.tasks_helper.grades import (
     CourseGradeReport,
     ProblemGradeReport,
     ProblemResponses,
+    ShardedCourseGradeReport,
 )
 from lms.djangoapps.instructor_task.tasks_helper.misc import (
     cohort_students_and_upload,
@@ -54,6 +60,7 @@ from lms.djangoapps.instructor_task.tasks_helper.misc import (
     upload_ora2_submission_files,
     upload_ora2_summary
 )
+from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
 from lms.djangoapps.instructor_task.tests.test_base import (
     InstructorTaskCourseTestCase,
     InstructorTaskModuleTestCase,
@@ -74,7 +81,7 @@ from xmodule.partitions.partitions import Group, UserPartition  # lint-amnesty,
 # noinspection PyUnresolvedReferences
 from xmodule.tests.helpers import override_descriptor_system  # pylint: disable=unused-import
 
-from ..models import ReportStore
+from ..models import DjangoStorageReportStore, InstructorTask, ReportStore
 from ..tasks_helper.utils import UPDATE_STATUS_FAILED, UPDATE_STATUS_SUCCEEDED
 
 _TEAMS_CONFIG = TeamsConfig({
@@ -432,6 +439,144 @@ class TestInstructorGradeReport(InstructorGradeReportTestCase):
         )
 
 
+@override_settings(COURSE_GRADE_REPORT_USERS_PER_SHARD=2)
+@patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task')
+class TestShardedCourseGradeReport(InstructorGradeReportTestCase):
+    """
+    Tests that course grade reports can be generated in shards of learners.
+    """
+    def setUp(self):
+        super().setUp()
+        self.course = CourseFactory.create()
+        self.students = [self.create_student(f'student{index}', f'student{index}@example.com') for index in range(5)]
+        self.entry = InstructorTaskFactory.create(
+            task_type='grade_course',
+            course_id=self.course.id,
+            task_id=str(uuid4()),
+            task_input='{}',
+            task_output='',
+        )
+
+    def _queue_shards(self):
+        """
+        Queues the shards of the report, returning the (shard, subtask_status) of each.
+        """
+        queued = []
+
+        def _create_subtask(shard, subtask_status):
+            queued.append((shard, subtask_status))
+            return Mock()
+
+        ShardedCourseGradeReport.queue_shards(None, self.entry.id, self.course.id, {}, 'graded', _create_subtask)
+        return queued
+
+    def _complete_shard(self, shard, subtask_status):
+        """
+        Grades the given shard and records its success.
+        """
+        succeeded, failed = ShardedCourseGradeReport.generate_shard(None, self.entry.id, shard)
+        subtask_status.increment(succeeded=succeeded, failed=failed, state=SUCCESS)
+        update_subtask_status(self.entry.id, subtask_status.task_id, subtask_status)
+        return ShardedCourseGradeReport.merge_shards_if_complete(None, self.entry.id, 'graded')
+
+    def test_shards_cover_all_learners(self, _mock_current_task):
+        queued = self._queue_shards()
+        assert [shard['index'] for shard, __ in queued] == [0, 1, 2]
+        assert queued[0][0]['min_user_id'] == self.students[0].id
+        assert queued[-1][0]['max_user_id'] == self.students[-1].id
+
+        merged = [self._complete_shard(shard, subtask_status) for shard, subtask_status in queued]
+        assert merged == [False, False, True]
+
+        self.verify_rows_in_csv(
+            [
+                {'Student ID': str(student.id), 'Username': student.username}
+                for student in self.students
+            ],
+            ignore_other_columns=True,
+        )
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        assert len(report_store.links_for(self.course.id)) == 1
+
+    def test_completed_shard_is_not_regraded(self, _mock_current_task):
+        shard, __ = self._queue_shards()[0]
+        assert ShardedCourseGradeReport.generate_shard(None, self.entry.id, shard) == (2, 0)
+
+        with patch.object(ShardedCourseGradeReport, '_rows_for_users') as mock_rows_for_users:
+            assert ShardedCourseGradeReport.generate_shard(None, self.entry.id, shard) == (2, 0)
+        mock_rows_for_users.assert_not_called()
+
+    def test_retried_shard_replaces_partial_csvs(self, _mock_current_task):
+        # pylint: disable=protected-access
+        queued = self._queue_shards()
+        shard, __ = queued[0]
+        success_filename, __ = ShardedCourseGradeReport._shard_filenames(shard['index'])
+        store = DjangoStorageReportStore.store
+
+        def store_error_csv_only(report_store, course_id, filename, buff, parent_dir=''):
+            if filename == success_filename:
+                raise OSError('Storage failed')
+            store(report_store, course_id, filename, buff, parent_dir)
+
+        # The first run of the shard fails once it has stored an error CSV.
+        with patch.object(ShardedCourseGradeReport, '_rows_for_users', return_value=([], [['stale', 'error']])):
+            with patch.object(DjangoStorageReportStore, 'store', store_error_csv_only):
+                with pytest.raises(OSError):
+                    ShardedCourseGradeReport.generate_shard(None, self.entry.id, shard)
+
+        merged = [self._complete_shard(shard, subtask_status) for shard, subtask_status in queued]
+        assert merged == [False, False, True]
+
+        # The merge only used the second run of the shard, which had no errors.
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        assert len(report_store.links_for(self.course.id)) == 1
+        shards_dir = ShardedCourseGradeReport._for_entry(None, self.entry.id, 'graded')._shards_dir()
+        assert not report_store.storage.listdir(report_store.path_to(self.course.id, '', shards_dir))[1]
+
+    def _assert_failed_without_shards(self, queued):
+        """
+        Asserts that the report task failed, without a report or partial CSVs.
+        """
+        entry = InstructorTask.objects.get(pk=self.entry.id)
+        assert entry.task_state == FAILURE
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        assert not report_store.links_for(self.course.id)
+        # pylint: disable=protected-access
+        report = ShardedCourseGradeReport._for_entry(None, self.entry.id, 'graded')
+        for shard, __ in queued:
+            for filename in report._shard_filenames(shard['index']):
+                assert not report_store.exists(self.course.id, filename, report._shards_dir())
+
+    def test_no_merge_with_failed_shard(self, _mock_current_task):
+        queued = self._queue_shards()
+        for shard, subtask_status in queued[:-1]:
+            self._complete_shard(shard, subtask_status)
+
+        __, failed_subtask_status = queued[-1]
+        failed_subtask_status.increment(state=FAILURE)
+        update_subtask_status(self.entry.id, failed_subtask_status.task_id, failed_subtask_status)
+
+        assert not ShardedCourseGradeReport.merge_shards_if_complete(None, self.entry.id, 'graded')
+        self._assert_failed_without_shards(queued)
+        assert json.loads(InstructorTask.objects.get(pk=self.entry.id).task_output)['exception'] == (
+            'GradeReportShardError'
+        )
+
+    def test_failed_merge(self, _mock_current_task):
+        queued = self._queue_shards()
+        for shard, subtask_status in queued[:-1]:
+            self._complete_shard(shard, subtask_status)
+
+        with patch.object(ShardedCourseGradeReport, 'upload_temp_files', side_effect=ValueError('Upload failed')):
+            with pytest.raises(ValueError):
+                self._complete_shard(*queued[-1])
+
+        self._assert_failed_without_shards(queued)
+        assert json.loads(InstructorTask.objects.get(pk=self.entry.id).task_output)['message'] == 'Upload failed'
+        # The merge lock was released.
+        assert cache.add(f'grade-report-merge-{self.entry.id}', 'true')
+
+
 @ddt.ddt
 class TestTeamGradeReport(InstructorGradeReportTestCase):
     """ Test that teams appear correctly in the grade report when it is enabled for the course. """
@@ -0,0 +1,192 @@
+"""
+Module for evaluating a block structure for many usages at once.
+
+A BlockIndex numbers the blocks of a block structure, so that a set of
+its blocks can be represented by an int used as a bitset: the block at
+position i in the index is in the set if bit i is set. Transformers
+can then compute the blocks to remove for each user with a few bitwise
+operations, and the blocks visible to each user are computed from
+those, without copying or mutating the collected block structure.
+"""
+
+
+from openedx.core.lib.graph_traversals import traverse_post_order, traverse_topologically
+
+
+class BlockIndex:
+    """
+    An immutable numbering of the blocks of a block structure, in
+    topological order from its root block (at position 0).
+    """
+    def __init__(self, block_structure, root_block_usage_key=None):
+        """
+        Arguments:
+            block_structure (BlockStructure) - The block structure to
+                index. It must not be modified while the index is used.
+
+            root_block_usage_key (UsageKey) - The block from which the
+                structure is indexed. If None, the root of the
+                block_structure is used. Parents of the blocks which
+                aren't descendants of this block are ignored.
+        """
+        self.root_block_usage_key = root_block_usage_key or block_structure.root_block_usage_key
+
+        descendants = set(traverse_post_order(self.root_block_usage_key, block_structure.get_children))
+
+        def get_parents(block_key):
+            return [parent for parent in block_structure.get_parents(block_key) if parent in descendants]
+
+        # The usage keys of the blocks, by position.
+        # list [UsageKey]
+        self.block_keys = list(traverse_topologically(
+            start_node=self.root_block_usage_key,
+            get_parents=get_parents,
+            get_children=block_structure.get_children,
+        ))
+        self._positions = {block_key: position for position, block_key in enumerate(self.block_keys)}
+        self.all_blocks = (1 << len(self.block_keys)) - 1
+
+        # The mask of the parents of each block, by position.
+        self._parent_masks = [
+            self.mask(get_parents(block_key)) for block_key in self.block_keys
+        ]
+        self._is_tree = all(
+            len(get_parents(block_key)) <= 1 for block_key in self.block_keys
+        )
+
+        # The mask of each block and its descendants, by position. Only
+        # needed for trees, whose blocks are hidden with their subtrees.
+        self._subtree_masks = None
+        if self._is_tree:
+            self._subtree_masks = [0] * len(self.block_keys)
+            for position in reversed(range(len(self.block_keys))):
+                subtree_mask = self._subtree_masks[position] | (1 << position)
+                self._subtree_masks[position] = subtree_mask
+                parent_mask = self._parent_masks[position]
+                if parent_mask:
+                    self._subtree_masks[parent_mask.bit_length() - 1] |= subtree_mask
+
+    def __len__(self):
+        return len(self.block_keys)
+
+    def __contains__(self, usage_key):
+        return usage_key in self._positions
+
+    def bit(self, usage_key):
+        """
+        Returns the mask of the block with the given usage_key, or 0 if
+        it isn't in the index.
+        """
+        position = self._positions.get(usage_key)
+        return 0 if position is None else 1 << position
+
+    def mask(self, usage_keys):
+        """
+        Returns the mask of the given blocks. Blocks which aren't in the
+        index are ignored.
+        """
+        mask = 0
+        for usage_key in usage_keys:
+            position = self._positions.get(usage_key)
+            if position is not None:
+                mask |= 1 << position
+        return mask
+
+    def mask_where(self, condition):
+        """
+        Returns the mask of the blocks whose usage keys satisfy the
+        given condition.
+
+        Arguments:
+            condition ((usage_key)->bool)
+        """
+        mask = 0
+        for position, block_key in enumerate(self.block_keys):
+            if condition(block_key):
+                mask |= 1 << position
+        return mask
+
+    def block_keys_in(self, mask):
+        """
+        Returns the usage keys of the blocks in the given mask, in
+        topological order.
+        """
+        block_keys = []
+        while mask:
+            low_bit = mask & -mask
+            block_keys.append(self.block_keys[low_bit.bit_length() - 1])
+            mask ^= low_bit
+        return block_keys
+
+    def visible(self, removed, removed_keeping_descendants=0):
+        """
+        Returns the mask of the blocks that are left after removing the
+        given blocks from the structure and pruning the unreachable
+        ones, as a transform of the block structure would.
+
+        Arguments:
+            removed (int) - Mask of the blocks that are removed with
+                their descendants, as remove_block does when
+                keep_descendants is False. A block with multiple
+                parents stays visible if any of its parents is.
+
+            removed_keeping_descendants (int) - Mask of the blocks
+                that are removed while their children are reattached to
+                their parents, as remove_block does when keep_descendants
+                is True. Blocks which are also in removed are removed
+                with their descendants.
+        """
+        # The root has no parents to reattach its children to.
+        if removed_keeping_descendants & 1:
+            removed |= 1
+        transparent = removed_keeping_descendants & ~removed
+
+        if self._is_tree:
+            hidden = 0
+            while removed:
+                low_bit = removed & -removed
+                if not low_bit & hidden:
+                    hidden |= self._subtree_masks[low_bit.bit_length() - 1]
+                removed ^= low_bit
+            return self.all_blocks & ~hidden & ~transparent
+
+        if removed & 1:
+            return 0
+        reachable = 1
+        parent_masks = self._parent_masks
+        for position in range(1, len(self.block_keys)):
+            bit = 1 << position
+            if not removed & bit and reachable & parent_masks[position]:
+                reachable |= bit
+        return reachable & ~transparent
+
+
+class BlockSet:
+    """
+    A set of the blocks of a BlockIndex.
+    """
+    def __init__(self, block_index, mask):
+        """
+        Arguments:
+            block_index (BlockIndex) - The index of the blocks.
+
+            mask (int) - The mask of the blocks in the set.
+        """
+        self.block_index = block_index
+        self.mask = mask
+
+    def __contains__(self, usage_key):
+        return bool(self.mask & self.block_index.bit(usage_key))
+
+    def __iter__(self):
+        """
+        Iterates over the usage keys of the blocks in the set, in
+        topological order.
+        """
+        return iter(self.block_index.block_keys_in(self.mask))
+
+    def __len__(self):
+        return bin(self.mask).count('1')
+
+    def __bool__(self):
+        return bool(self.mask)
@@ -89,6 +89,10 @@ class BlockStructureFactory:
     def create_new(cls, root_block_usage_key, block_relations, transformer_data, block_data_map):
         """
         Returns a new block structure for given the arguments.
+
+        The values of block_data_map may have lazily loaded fields and
+        transformer data (see serialization.LazyFieldDict), in which case
+        their columns are only deserialized when first accessed.
         """
         block_structure = BlockStructureBlockData(root_block_usage_key)
         block_structure._block_relations = block_relations  # pylint: disable=protected-access
@@ -77,6 +77,55 @@ class BlockStructureManager:
         transformers.transform(block_structure)
         return block_structure
 
+    def get_transformed_for_users(
+            self,
+            transformers,
+            usage_infos,
+            starting_block_usage_key=None,
+            collected_block_structure=None,
+    ):
+        """
+        Returns the blocks of the Block Structure for the
+        root_block_usage_key, starting at starting_block_usage_key, that
+        are left for each of the given usage_infos after the
+        transformation, getting block data from the cache and
+        modulestore, as needed.
+
+        Details: Similar to the get_transformed method, except that the
+        collected block structure is shared by all the usage_infos
+        rather than copied and transformed for each of them. So all the
+        transformers must implement MultiUserTransformerMixin.
+
+        Arguments:
+            transformers (BlockStructureTransformers) - Collection of
+                transformers to apply.
+
+            usage_infos ([any negotiated type]) - The usage_info of each
+                user for which the block structure is evaluated.
+
+            starting_block_usage_key (UsageKey) - Specifies the starting block
+                in the block structure that is to be transformed.
+                If None, root_block_usage_key is used.
+
+            collected_block_structure (BlockStructureBlockData) - A
+                block structure retrieved from a prior call to
+                get_collected.  Can be optionally provided if already available,
+                for optimization.
+
+        Returns:
+            [BlockSet] - The blocks left for each of the usage_infos, in
+                the same order.
+        """
+        block_structure = collected_block_structure or self.get_collected()
+
+        if starting_block_usage_key and starting_block_usage_key not in block_structure:
+            raise UsageKeyNotInBlockStructure(  # lint-amnesty, pylint: disable=raising-format-tuple
+                "The requested usage_key '{0}' is not found in the block_structure with root '{1}'",
+                str(starting_block_usage_key),
+                str(self.root_block_usage_key),
+            )
+        return transformers.transform_for_users(block_structure, usage_infos, starting_block_usage_key)
+
     def get_collected(self):
         """
         Returns the collected Block Structure for the root_block_usage_key,
@@ -0,0 +1,315 @@
+"""
+Serialization formats for the data of BlockStructure objects.
+
+Two formats are supported:
+
+    pickle - The block relations, transformer data and block data map are
+        pickled wholesale. Loading the data deserializes everything at once.
+
+    columnar - Blocks are stored in an integer-indexed table of usage keys,
+        relations as adjacency arrays of indices into that table, and the
+        collected block data as one column per xBlock field and one column per
+        transformer, each pickled separately. When loaded, a column is only
+        deserialized the first time one of its values is accessed, so a
+        transformer that reads only a few fields doesn't pay for the rest.
+
+Both formats are zlib compressed. The format of stored data is detected when
+it is loaded, so the configured format can be changed at any time.
+"""
+import pickle
+import zlib
+from copy import deepcopy
+
+from .block_structure import BlockData, TransformerDataMap, _BlockRelations
+
+SERIALIZATION_FORMAT_PICKLE = 'pickle'
+SERIALIZATION_FORMAT_COLUMNAR = 'columnar'
+SERIALIZATION_FORMATS = (SERIALIZATION_FORMAT_PICKLE, SERIALIZATION_FORMAT_COLUMNAR)
+
+# Increment this value whenever the layout of the columnar format changes.
+COLUMNAR_SCHEMA_VERSION = 1
+
+PICKLE_PROTOCOL = 4
+
+
+def _dumps(data):
+    return pickle.dumps(data, PICKLE_PROTOCOL)
+
+
+def _loads(data):
+    return pickle.loads(data, encoding='latin1')
+
+
+def serialize(block_relations, transformer_data, block_data_map, serialization_format=SERIALIZATION_FORMAT_PICKLE):
+    """
+    Returns the compressed serialization of the given block structure data
+    in the requested format.
+    """
+    if serialization_format == SERIALIZATION_FORMAT_COLUMNAR:
+        data = _to_columns(block_relations, transformer_data, block_data_map)
+    elif serialization_format == SERIALIZATION_FORMAT_PICKLE:
+        data = (block_relations, transformer_data, block_data_map)
+    else:
+        raise ValueError(f"Unknown block structure serialization format: {serialization_format}")
+    return zlib.compress(_dumps(data))
+
+
+def deserialize(serialized_data):
+    """
+    Returns a (block_relations, transformer_data, block_data_map) tuple
+    deserialized from the given data, which may be in either format.
+    Columns of data in the columnar format are loaded lazily.
+    """
+    data = _loads(zlib.decompress(serialized_data))
+    if isinstance(data, dict) and data.get('format') == SERIALIZATION_FORMAT_COLUMNAR:
+        return _from_columns(data)
+    block_relations, transformer_data, block_data_map = data
+    return block_relations, transformer_data, block_data_map
+
+
+def _to_columns(block_relations, transformer_data, block_data_map):
+    """
+    Returns the columnar representation of the given block structure data.
+    """
+    block_keys = list(block_relations)
+    block_keys.extend(key for key in block_data_map if key not in block_relations)
+    index_of = {block_key: index for index, block_key in enumerate(block_keys)}
+
+    field_columns = {}
+    transformer_columns = {}
+    for block_key, block_data in block_data_map.items():
+        index = index_of[block_key]
+        for field_name, value in block_data.fields.items():
+            field_columns.setdefault(field_name, {})[index] = value
+        for transformer_name, transformer_block_data in block_data.transformer_data.items():
+            transformer_columns.setdefault(transformer_name, {})[index] = transformer_block_data
+
+    return {
+        'format': SERIALIZATION_FORMAT_COLUMNAR,
+        'schema_version': COLUMNAR_SCHEMA_VERSION,
+        'block_keys': block_keys,
+        'num_related_blocks': len(block_relations),
+        'children': [
+            [index_of[child] for child in relations.children] for relations in block_relations.values()
+        ],
+        'parents': [
+            [index_of[parent] for parent in relations.parents] for relations in block_relations.values()
+        ],
+        'data_block_indices': [index_of[block_key] for block_key in block_data_map],
+        'transformer_data': _dumps(transformer_data),
+        'field_columns': {name: _dumps(column) for name, column in field_columns.items()},
+        'transformer_columns': {name: _dumps(column) for name, column in transformer_columns.items()},
+    }
+
+
+def _from_columns(data):
+    """
+    Returns a (block_relations, transformer_data, block_data_map) tuple
+    for the given columnar representation.
+    """
+    if data['schema_version'] != COLUMNAR_SCHEMA_VERSION:
+        raise ValueError(f"Unsupported columnar block structure schema version: {data['schema_version']}")
+
+    block_keys = data['block_keys']
+
+    block_relations = {}
+    for index in range(data['num_related_blocks']):
+        relations = _BlockRelations()
+        relations.children = [block_keys[child] for child in data['children'][index]]
+        relations.parents = [block_keys[parent] for parent in data['parents'][index]]
+        block_relations[block_keys[index]] = relations
+
+    field_loader = _ColumnLoader(data['field_columns'])
+    transformer_loader = _ColumnLoader(data['transformer_columns'])
+    block_data_map = {}
+    for index in data['data_block_indices']:
+        block_data = BlockData(block_keys[index])
+        block_data.fields = field_loader.add_target(index, LazyFieldDict())
+        block_data.transformer_data = transformer_loader.add_target(index, LazyTransformerDataMap())
+        block_data_map[block_keys[index]] = block_data
+
+    return block_relations, _loads(data['transformer_data']), block_data_map
+
+
+class _ColumnLoader:
+    """
+    Deserializes columns of block data on demand, filling in the
+    corresponding entries of every block's lazy mapping at once.
+    """
+    def __init__(self, columns):
+        # dict {column name: pickled dict {block index: value}}
+        self._columns = dict(columns)
+        # dict {block index: lazy mapping}
+        self._targets = {}
+
+    def add_target(self, index, target):
+        """
+        Registers and returns the lazy mapping of the block at the given index.
+        """
+        target._loader = self  # pylint: disable=protected-access
+        target._index = index  # pylint: disable=protected-access
+        self._targets[index] = target
+        return target
+
+    def load(self, name):
+        """
+        Deserializes the column with the given name, if it hasn't been already.
+        Values that were already set on a block are left untouched.
+        """
+        column = self._columns.pop(name, None)
+        if column is None:
+            return
+        for index, value in _loads(column).items():
+            target = self._targets.get(index)
+            if target is not None:
+                target._set_loaded_value(name, value)  # pylint: disable=protected-access
+
+    def load_all(self):
+        """
+        Deserializes all remaining columns.
+        """
+        for name in list(self._columns):
+            self.load(name)
+
+    def __deepcopy__(self, memo):
+        # The serialized columns are immutable, so they are shared with the copy,
+        # whose targets are the copies of the lazy mappings.
+        loader = _ColumnLoader(self._columns)
+        memo[id(self)] = loader
+        return loader
+
+
+class _LazyColumnsMixin:
+    """
+    Mixin for dict classes whose entries are loaded from columns on first
+    access. Operations that need all entries (iteration, comparison,
+    shallow copying, pickling) load all remaining columns first. Deep
+    copies only copy the loaded entries, and load the other columns on
+    first access as well.
+    """
+    _loader = None
+    _index = None
+
+    def _ensure_loaded(self, key):
+        if self._loader is not None:
+            self._loader.load(self._translate(key))
+
+    def _ensure_all_loaded(self):
+        if self._loader is not None:
+            self._loader.load_all()
+
+    def _translate(self, key):
+        return key
+
+    def _set_loaded_value(self, key, value):
+        dict.setdefault(self, key, value)
+
+    def __missing__(self, key):
+        self._ensure_loaded(key)
+        if dict.__contains__(self, key):
+            return dict.__getitem__(self, key)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        self._ensure_loaded(key)
+        return dict.get(self, self._translate(key), default)
+
+    def __contains__(self, key):
+        self._ensure_loaded(key)
+        return dict.__contains__(self, self._translate(key))
+
+    def __setitem__(self, key, value):
+        self._ensure_loaded(key)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._ensure_loaded(key)
+        super().__delitem__(key)
+
+    def pop(self, key, *args):
+        self._ensure_loaded(key)
+        return dict.pop(self, self._translate(key), *args)
+
+    def setdefault(self, key, default=None):
+        self._ensure_loaded(key)
+        return dict.setdefault(self, self._translate(key), default)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __iter__(self):
+        self._ensure_all_loaded()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        self._ensure_all_loaded()
+        return dict.__len__(self)
+
+    def __eq__(self, other):
+        self._ensure_all_loaded()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def keys(self):
+        self._ensure_all_loaded()
+        return dict.keys(self)
+
+    def values(self):
+        self._ensure_all_loaded()
+        return dict.values(self)
+
+    def items(self):
+        self._ensure_all_loaded()
+        return dict.items(self)
+
+    def copy(self):
+        self._ensure_all_loaded()
+        return self._materialized_cls()(dict.items(self))
+
+    def __repr__(self):
+        self._ensure_all_loaded()
+        return dict.__repr__(self)
+
+    def __reduce_ex__(self, protocol):
+        # Pickles are plain, fully loaded mappings.
+        self._ensure_all_loaded()
+        return (self._materialized_cls(), (), None, None, iter(dict.items(self)))
+
+    def __deepcopy__(self, memo):
+        result = type(self)()
+        memo[id(self)] = result
+        for key, value in dict.items(self):
+            dict.__setitem__(result, key, deepcopy(value, memo))
+        if self._loader is not None:
+            deepcopy(self._loader, memo).add_target(self._index, result)
+        return result
+
+    def _materialized_cls(self):
+        raise NotImplementedError
+
+
+class LazyFieldDict(_LazyColumnsMixin, dict):
+    """
+    The collected xBlock fields of a block, loaded one field column at a time.
+    """
+    def _materialized_cls(self):
+        return dict
+
+
+class LazyTransformerDataMap(_LazyColumnsMixin, TransformerDataMap):
+    """
+    The transformer data of a block, loaded one transformer column at a time.
+    """
+    def _translate(self, key):
+        return self._translate_key(key)
+
+    def __getitem__(self, key):
+        return TransformerDataMap.__getitem__(self, key)
+
+    def _materialized_cls(self):
+        return TransformerDataMap
@@ -6,10 +6,9 @@ Module for the Storage of BlockStructure objects.
 
 from logging import getLogger
 
+from django.conf import settings
 
-from openedx.core.lib.cache_utils import zpickle, zunpickle
-
-from . import config
+from . import config, serialization
 from .block_structure import BlockStructureBlockData
 from .exceptions import BlockStructureNotFound
 from .factory import BlockStructureFactory
@@ -195,12 +194,12 @@ class BlockStructureStore:
         """
         Serializes the data for the given block_structure.
         """
-        data_to_cache = (
+        return serialization.serialize(
             block_structure._block_relations,
             block_structure.transformer_data,
             block_structure._block_data_map,
+            self._serialization_format(),
         )
-        return zpickle(data_to_cache)
 
     def _deserialize(self, serialized_data, root_block_usage_key):
         """
@@ -208,7 +207,7 @@ class BlockStructureStore:
         """
 
         try:
-            block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
+            block_relations, transformer_data, block_data_map = serialization.deserialize(serialized_data)
         except Exception:
             # Somehow failed to de-serialized the data, assume it's corrupt.
             bs_model = self._get_model(root_block_usage_key)
@@ -222,6 +221,22 @@ class BlockStructureStore:
             block_data_map,
         )
 
+    @staticmethod
+    def _serialization_format():
+        """
+        Returns the format in which block structures are to be serialized.
+        Stored data in any format can always be deserialized.
+        """
+        # .. setting_name: BLOCK_STRUCTURES_SETTINGS['SERIALIZATION_FORMAT']
+        # .. setting_default: 'pickle'
+        # .. setting_description: The format used to serialize block structures into the cache
+        #   and storage. 'pickle' pickles the collected data wholesale. 'columnar' stores the blocks
+        #   in an indexed table with one separately loaded column per collected field, so that only
+        #   the fields that are actually accessed are deserialized.
+        return settings.BLOCK_STRUCTURES_SETTINGS.get(
+            'SERIALIZATION_FORMAT', serialization.SERIALIZATION_FORMAT_PICKLE
+        )
+
     @staticmethod
     def _encode_root_cache_key(bs_model):
         """
@@ -16,7 +16,7 @@ from ..block_structure import BlockStructureBlockData
 from ..exceptions import BlockStructureNotFound
 from ..models import BlockStructureModel
 from ..store import BlockStructureStore
-from ..transformer import BlockStructureTransformer, FilteringTransformerMixin
+from ..transformer import BlockStructureTransformer, FilteringTransformerMixin, MultiUserTransformerMixin
 from ..transformer_registry import TransformerRegistry
 
 
@@ -206,6 +206,26 @@ class MockFilteringTransformer(FilteringTransformerMixin, BlockStructureTransfor
         return [block_structure.create_universal_filter()]
 
 
+class MockMultiUserTransformer(MultiUserTransformerMixin, BlockStructureTransformer):
+    """
+    A mock MultiUserTransformerMixin class, which removes the blocks
+    given as the usage_info.
+    """
+    WRITE_VERSION = 1
+    READ_VERSION = 1
+
+    @classmethod
+    def name(cls):
+        # Use the class' name for Mock transformers.
+        return cls.__name__
+
+    def transform(self, usage_info, block_structure):
+        block_structure.remove_block_traversal(lambda block_key: block_key in usage_info)
+
+    def removed_blocks_for_user(self, usage_info, block_structure, block_index):
+        return block_index.mask(usage_info)
+
+
 def clear_registered_transformers_cache():
     """
     Test helper to clear out any cached values of registered transformers.
@@ -0,0 +1,118 @@
+"""
+Tests for block_index.py
+"""
+
+
+import itertools
+from unittest import TestCase
+
+import ddt
+import pytest
+
+from ..block_index import BlockIndex, BlockSet
+from ..exceptions import TransformerException
+from ..transformers import BlockStructureTransformers
+from .helpers import (
+    ChildrenMapTestMixin,
+    MockMultiUserTransformer,
+    MockTransformer,
+    mock_registered_transformers
+)
+
+
+@ddt.ddt
+class TestBlockIndex(ChildrenMapTestMixin, TestCase):
+    """
+    Tests for BlockIndex and BlockSet
+    """
+
+    #     0
+    #    / \
+    #   1  2
+    #  / \  \
+    # 3   4  5
+    #     |
+    #     6
+    TREE_CHILDREN_MAP = [[1, 2], [3, 4], [5], [], [6], [], []]
+
+    def get_remaining_blocks(self, children_map, removed, removed_keeping_descendants):
+        """
+        Returns the blocks left in a block structure for the given
+        children_map after removing the given blocks.
+        """
+        block_structure = self.create_block_structure(children_map)
+        block_structure.filter_topological_traversal(
+            lambda block_key: (
+                block_structure.retain_or_remove(block_key, lambda key: key in removed) and
+                block_structure.retain_or_remove(
+                    block_key, lambda key: key in removed_keeping_descendants, keep_descendants=True,
+                )
+            )
+        )
+        block_structure._prune_unreachable()  # pylint: disable=protected-access
+        return set(block_structure)
+
+    def test_block_keys(self):
+        block_structure = self.create_block_structure(self.DAG_CHILDREN_MAP)
+        block_index = BlockIndex(block_structure)
+        assert block_index.block_keys == list(block_structure.topological_traversal())
+        assert len(block_index) == 7
+        assert block_index.all_blocks == 0b1111111
+        assert block_index.mask([]) == 0
+        assert block_index.mask([0, 3, 'unknown']) == block_index.bit(0) | block_index.bit(3)
+        assert block_index.mask_where(lambda block_key: block_key % 2) == block_index.mask([1, 3, 5])
+        assert block_index.block_keys_in(block_index.mask([5, 1, 4])) == [
+            block_key for block_key in block_index.block_keys if block_key in (1, 4, 5)
+        ]
+
+    @ddt.data(
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+        TREE_CHILDREN_MAP,
+    )
+    def test_visible(self, children_map):
+        block_index = BlockIndex(self.create_block_structure(children_map))
+        all_blocks = list(range(len(children_map)))
+        for removed_count in range(len(all_blocks) + 1):
+            for removed in itertools.combinations(all_blocks, removed_count):
+                for removed_keeping_descendants in [()] + [(block_key,) for block_key in all_blocks]:
+                    visible = block_index.visible(
+                        block_index.mask(removed), block_index.mask(removed_keeping_descendants),
+                    )
+                    assert set(BlockSet(block_index, visible)) == self.get_remaining_blocks(
+                        children_map, removed, removed_keeping_descendants,
+                    ), f'removed {removed}, removed keeping descendants {removed_keeping_descendants}'
+
+    def test_starting_block(self):
+        block_index = BlockIndex(self.create_block_structure(self.DAG_CHILDREN_MAP), root_block_usage_key=2)
+        assert set(block_index.block_keys) == {2, 3, 4, 5, 6}
+        assert set(BlockSet(block_index, block_index.visible(block_index.mask([4])))) == {2, 3, 5, 6}
+        assert not BlockSet(block_index, block_index.visible(block_index.mask([2])))
+
+    def test_block_set(self):
+        block_index = BlockIndex(self.create_block_structure(self.SIMPLE_CHILDREN_MAP))
+        block_set = BlockSet(block_index, block_index.mask([0, 2, 4]))
+        assert len(block_set) == 3
+        assert 2 in block_set
+        assert 1 not in block_set
+        assert 'unknown' not in block_set
+        assert list(block_set) == [0, 4, 2]
+
+    def test_transform_for_users(self):
+        transformer = MockMultiUserTransformer()
+        with mock_registered_transformers([transformer]):
+            transformers = BlockStructureTransformers([transformer])
+        block_structure = self.create_block_structure(self.DAG_CHILDREN_MAP)
+
+        block_sets = transformers.transform_for_users(block_structure, [set(), {2}, {1, 2}])
+        assert [set(block_set) for block_set in block_sets] == [set(range(7)), {0, 1, 3, 5, 6}, {0}]
+        # The block structure isn't modified.
+        self.assert_block_structure(block_structure, self.DAG_CHILDREN_MAP)
+
+    def test_transform_for_users_unsupported(self):
+        transformer = MockTransformer()
+        with mock_registered_transformers([transformer]):
+            transformers = BlockStructureTransformers([transformer])
+        with pytest.raises(TransformerException):
+            transformers.transform_for_users(self.create_block_structure(self.SIMPLE_CHILDREN_MAP), [None])
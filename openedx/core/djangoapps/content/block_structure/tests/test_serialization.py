@@ -0,0 +1,188 @@
+"""
+Tests for block_structure/serialization.py
+"""
+# pylint: disable=protected-access
+
+import pickle
+import tracemalloc
+import unittest
+from copy import deepcopy
+from unittest import TestCase
+
+import ddt
+import pytest
+
+from ..block_structure import TransformerDataMap
+from ..serialization import (
+    SERIALIZATION_FORMAT_COLUMNAR,
+    SERIALIZATION_FORMAT_PICKLE,
+    SERIALIZATION_FORMATS,
+    LazyFieldDict,
+    LazyTransformerDataMap,
+    deserialize,
+    serialize
+)
+from .helpers import ChildrenMapTestMixin, MockTransformer
+
+
+def _serialize(block_structure, serialization_format):
+    """
+    Serializes the given block structure in the given format.
+    """
+    return serialize(
+        block_structure._block_relations,
+        block_structure.transformer_data,
+        block_structure._block_data_map,
+        serialization_format,
+    )
+
+
+@ddt.ddt
+class TestSerialization(ChildrenMapTestMixin, TestCase):
+    """
+    Tests for the block structure serialization formats.
+    """
+    def setUp(self):
+        super().setUp()
+        self.children_map = self.DAG_CHILDREN_MAP
+        self.block_structure = self.create_block_structure(self.children_map)
+        for block_key in range(len(self.children_map)):
+            self.block_structure.override_xblock_field(block_key, 'display_name', f'Block {block_key}')
+            if block_key % 2:
+                self.block_structure.override_xblock_field(block_key, 'graded', True)
+            self.block_structure.set_transformer_block_field(block_key, MockTransformer, 'test', block_key * 10)
+        self.block_structure.set_transformer_data(MockTransformer, 'version', 3)
+
+    @ddt.data(*SERIALIZATION_FORMATS)
+    def test_round_trip(self, serialization_format):
+        block_relations, transformer_data, block_data_map = deserialize(
+            _serialize(self.block_structure, serialization_format)
+        )
+        assert list(block_relations) == list(self.block_structure._block_relations)
+        for block_key, relations in self.block_structure._block_relations.items():
+            assert block_relations[block_key].children == relations.children
+            assert block_relations[block_key].parents == relations.parents
+
+        assert transformer_data[MockTransformer].version == 3
+        for block_key, block_data in self.block_structure._block_data_map.items():
+            assert block_data_map[block_key].fields == block_data.fields
+            assert block_data_map[block_key].transformer_data[MockTransformer].fields == \
+                block_data.transformer_data[MockTransformer].fields
+
+    def test_columnar_fields_loaded_lazily(self):
+        __, __, block_data_map = deserialize(_serialize(self.block_structure, SERIALIZATION_FORMAT_COLUMNAR))
+
+        block_data = block_data_map[1]
+        assert isinstance(block_data.fields, LazyFieldDict)
+        assert isinstance(block_data.transformer_data, LazyTransformerDataMap)
+        assert not dict.__len__(block_data.fields)
+
+        # Accessing one field loads that field's column for all blocks, but no other.
+        assert block_data.graded is True
+        assert dict(dict.items(block_data_map[3].fields)) == {'graded': True}
+        assert not dict.__len__(block_data_map[2].fields)
+        assert getattr(block_data_map[2], 'graded', None) is None
+
+        assert block_data_map[2].transformer_data[MockTransformer].test == 20
+        assert block_data_map[2].transformer_data.get(MockTransformer.name()).test == 20
+        assert 'unknown_transformer' not in block_data_map[2].transformer_data
+
+    def test_columnar_writes_before_load(self):
+        __, __, block_data_map = deserialize(_serialize(self.block_structure, SERIALIZATION_FORMAT_COLUMNAR))
+
+        # Values set before a column is loaded aren't overwritten by the load.
+        block_data_map[1].graded = False
+        assert block_data_map[1].graded is False
+        assert block_data_map[3].graded is True
+
+        del block_data_map[0].display_name
+        assert getattr(block_data_map[0], 'display_name', None) is None
+        assert block_data_map[4].display_name == 'Block 4'
+
+    def test_columnar_pickles_are_materialized(self):
+        __, __, block_data_map = deserialize(_serialize(self.block_structure, SERIALIZATION_FORMAT_COLUMNAR))
+        copied = pickle.loads(pickle.dumps(block_data_map))
+
+        for block_key, block_data in self.block_structure._block_data_map.items():
+            assert type(copied[block_key].fields) is dict  # pylint: disable=unidiomatic-typecheck
+            assert type(copied[block_key].transformer_data) is TransformerDataMap  # pylint: disable=unidiomatic-typecheck
+            assert copied[block_key].fields == block_data.fields
+            assert copied[block_key].transformer_data[MockTransformer].test == block_key * 10
+
+    def test_columnar_deepcopies_are_lazy(self):
+        __, __, block_data_map = deserialize(_serialize(self.block_structure, SERIALIZATION_FORMAT_COLUMNAR))
+        assert block_data_map[1].graded is True
+        copied = deepcopy(block_data_map)
+
+        # Only the loaded column is copied, the others are loaded on first access to the copy.
+        assert isinstance(copied[2].fields, LazyFieldDict)
+        assert isinstance(copied[2].transformer_data, LazyTransformerDataMap)
+        assert dict(dict.items(copied[3].fields)) == {'graded': True}
+        assert not dict.__len__(copied[2].fields)
+        assert not dict.__len__(copied[2].transformer_data)
+
+        assert copied[2].display_name == 'Block 2'
+        assert dict(dict.items(copied[4].fields)) == {'display_name': 'Block 4'}
+        assert not dict.__contains__(block_data_map[4].fields, 'display_name')
+        for block_key, block_data in self.block_structure._block_data_map.items():
+            assert copied[block_key].fields == block_data.fields
+            assert copied[block_key].transformer_data[MockTransformer].test == block_key * 10
+
+        # The copies don't share any data with the original.
+        copied[1].graded = False
+        copied[2].transformer_data[MockTransformer].test = 0
+        assert block_data_map[1].graded is True
+        assert block_data_map[2].transformer_data[MockTransformer].test == 20
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError):
+            _serialize(self.block_structure, 'unknown')
+
+
+@unittest.skip
+class BlockStructureSerializationPerf(ChildrenMapTestMixin, TestCase):
+    """
+    Compares the time and memory used to load a large block structure in
+    each serialization format, when only a couple of fields are accessed.
+    """
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    NUM_BLOCKS = 5000
+    NUM_FIELDS = 30
+
+    def _create_large_block_structure(self):
+        """
+        Returns a block structure with NUM_BLOCKS blocks in a 3-level tree,
+        each with NUM_FIELDS collected fields.
+        """
+        children_map = [list(range(1, 51))]
+        children_map.extend([] for __ in range(50))
+        for parent in range(1, 51):
+            first_child = len(children_map)
+            children_map[parent] = list(range(first_child, first_child + (self.NUM_BLOCKS // 50) - 1))
+            children_map.extend([] for __ in children_map[parent])
+
+        block_structure = self.create_block_structure(children_map)
+        for block_key in block_structure:
+            for field_index in range(self.NUM_FIELDS):
+                block_structure.override_xblock_field(block_key, f'field_{field_index}', f'value {field_index}')
+            block_structure.set_transformer_block_field(block_key, MockTransformer, 'test', block_key)
+        return block_structure
+
+    def test_load_memory(self):
+        block_structure = self._create_large_block_structure()
+        peak_allocated = {}
+        for serialization_format in (SERIALIZATION_FORMAT_PICKLE, SERIALIZATION_FORMAT_COLUMNAR):
+            serialized_data = _serialize(block_structure, serialization_format)
+
+            tracemalloc.start()
+            __, __, block_data_map = deserialize(serialized_data)
+            for block_data in block_data_map.values():
+                getattr(block_data, 'field_0', None)
+                block_data.transformer_data.get(MockTransformer.name())
+            __, peak_allocated[serialization_format] = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        # Only the columns of the accessed field and transformer are loaded.
+        assert peak_allocated[SERIALIZATION_FORMAT_COLUMNAR] < peak_allocated[SERIALIZATION_FORMAT_PICKLE] * 2 / 3
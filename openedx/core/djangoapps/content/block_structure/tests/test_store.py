@@ -4,6 +4,7 @@ Tests for block_structure/cache.py
 
 import pytest
 import ddt
+from django.test.utils import override_settings
 from edx_toggles.toggles.testutils import override_waffle_switch
 
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
@@ -11,6 +12,7 @@ from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
 from ..config import STORAGE_BACKING_FOR_CACHE
 from ..config.models import BlockStructureConfiguration
 from ..exceptions import BlockStructureNotFound
+from ..serialization import SERIALIZATION_FORMAT_COLUMNAR, SERIALIZATION_FORMAT_PICKLE
 from ..store import BlockStructureStore
 from .helpers import ChildrenMapTestMixin, MockCache, MockTransformer, UsageKeyFactoryMixin
 
@@ -60,6 +62,16 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
             assert stored_value is not None
             self.assert_block_structure(stored_value, self.children_map)
 
+    @ddt.data(SERIALIZATION_FORMAT_PICKLE, SERIALIZATION_FORMAT_COLUMNAR)
+    def test_add_and_get_serialization_format(self, serialization_format):
+        with override_settings(BLOCK_STRUCTURES_SETTINGS={'SERIALIZATION_FORMAT': serialization_format}):
+            self.store.add(self.block_structure)
+        stored_value = self.store.get(self.block_structure.root_block_usage_key)
+        self.assert_block_structure(stored_value, self.children_map)
+        assert stored_value.get_transformer_block_field(
+            self.block_key_factory(0), MockTransformer, 'test',
+        ) == f'{MockTransformer.name()} val'
+
     @ddt.data(True, False)
     def test_delete(self, with_storage_backing):
         with override_waffle_switch(STORAGE_BACKING_FOR_CACHE, active=with_storage_backing):
@@ -212,6 +212,63 @@ class FilteringTransformerMixin(BlockStructureTransformer):
         raise NotImplementedError
 
 
+class MultiUserTransformerMixin(BlockStructureTransformer):
+    """
+    Transformers that only remove blocks may optionally implement this
+    mixin so that the blocks visible to many users can be computed at
+    once, with BlockStructureTransformers.transform_for_users.
+
+    Instead of transforming a copy of the block structure for each
+    user, the transformer computes anything that doesn't depend on the
+    user once, in prepare_for_users, and then returns the blocks to
+    remove for each user as a mask of the blocks of a BlockIndex. The
+    block structure is shared by all users and must not be modified.
+    """
+
+    def prepare_for_users(self, usage_infos, block_structure, block_index):
+        """
+        Computes the data used by removed_blocks_for_user for all of the
+        given usage_infos, for example the masks of the blocks that a
+        user may be denied access to, or user data fetched in bulk.
+
+        Arguments:
+            usage_infos ([any negotiated type]) - The usage_info of each
+                user for which the block structure is evaluated.
+
+            block_structure (BlockStructureBlockData) - The collected
+                block structure, which must not be modified.
+
+            block_index (BlockIndex) - The index of the blocks of the
+                block_structure that are evaluated.
+        """
+
+    def blocks_removed_keeping_descendants(self, block_structure, block_index):
+        """
+        Returns the mask of the blocks that are removed for all users
+        while keeping their descendants, as remove_block does when
+        keep_descendants is True.
+
+        Arguments:
+            See the description in prepare_for_users.
+        """
+        return 0
+
+    @abstractmethod
+    def removed_blocks_for_user(self, usage_info, block_structure, block_index):
+        """
+        Returns the mask of the blocks that the transform method would
+        remove, with their descendants, for the given usage_info.
+
+        Arguments:
+            usage_info (any negotiated type) - The usage_info of one of
+                the users given to prepare_for_users.
+
+            See the description in prepare_for_users for the other
+            arguments.
+        """
+        raise NotImplementedError
+
+
 def combine_filters(block_structure, filters):
     return functools.reduce(
         _filter_chain,
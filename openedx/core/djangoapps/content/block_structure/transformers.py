@@ -3,8 +3,9 @@ Module for a collection of BlockStructureTransformers.
 """
 from logging import getLogger
 
+from .block_index import BlockIndex, BlockSet
 from .exceptions import TransformerDataIncompatible, TransformerException
-from .transformer import FilteringTransformerMixin, combine_filters
+from .transformer import FilteringTransformerMixin, MultiUserTransformerMixin, combine_filters
 from .transformer_registry import TransformerRegistry
 
 logger = getLogger(__name__)  # pylint: disable=C0103
@@ -116,6 +117,58 @@ class BlockStructureTransformers:
         # Prune the block structure to remove any unreachable blocks.
         block_structure._prune_unreachable()  # pylint: disable=protected-access
 
+    def transform_for_users(self, block_structure, usage_infos, root_block_usage_key=None):
+        """
+        Returns the blocks of the given block structure that are left
+        for each of the given usage_infos after the transformation by
+        each transformer in the collection, without modifying the block
+        structure.
+
+        Arguments:
+            block_structure (BlockStructureBlockData) - The collected
+                block structure.
+
+            usage_infos ([any negotiated type]) - The usage_info of each
+                user for which the block structure is evaluated.
+
+            root_block_usage_key (UsageKey) - The block from which the
+                block structure is evaluated. If None, the root of the
+                block_structure is used.
+
+        Returns:
+            [BlockSet] - The blocks left for each of the usage_infos,
+                in the same order.
+
+        Raises:
+            TransformerException - if any transformer doesn't implement
+                MultiUserTransformerMixin.
+        """
+        transformers = self._transformers['supports_filter'] + self._transformers['no_filter']
+        unsupported_transformers = [
+            transformer for transformer in transformers
+            if not isinstance(transformer, MultiUserTransformerMixin)
+        ]
+        if unsupported_transformers:
+            raise TransformerException(
+                f"The following requested transformers can't transform for multiple users: {unsupported_transformers}"
+            )
+
+        block_index = BlockIndex(block_structure, root_block_usage_key)
+        removed_keeping_descendants = 0
+        for transformer in transformers:
+            removed_keeping_descendants |= transformer.blocks_removed_keeping_descendants(
+                block_structure, block_index,
+            )
+            transformer.prepare_for_users(usage_infos, block_structure, block_index)
+
+        block_sets = []
+        for usage_info in usage_infos:
+            removed = 0
+            for transformer in transformers:
+                removed |= transformer.removed_blocks_for_user(usage_info, block_structure, block_index)
+            block_sets.append(BlockSet(block_index, block_index.visible(removed, removed_keeping_descendants)))
+        return block_sets
+
     def _transform_with_filters(self, block_structure):
         """
         Transforms the given block_structure using the transform_block_filters
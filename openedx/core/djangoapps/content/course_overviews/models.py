@@ -7,18 +7,21 @@ import json
 import logging
 from datetime import datetime
 from urllib.parse import urlparse, urlunparse
+from uuid import uuid4
 
 import pytz
 from ccx_keys.locator import CCXLocator
 from config_models.models import ConfigurationModel
 from django.conf import settings
+from django.core.cache import cache
 from django.db import models, transaction
-from django.db.models import Q
+from django.db.models import Q, prefetch_related_objects
 from django.db.models.signals import post_save, post_delete
 from django.db.utils import IntegrityError
 from django.template import defaultfilters
 
 from django.utils.functional import cached_property
+from edx_django_utils.monitoring import set_custom_attribute
 from model_utils.models import TimeStampedModel
 from opaque_keys.edx.django.models import CourseKeyField, UsageKeyField
 from simple_history.models import HistoricalRecords
@@ -201,9 +204,11 @@ class CourseOverview(TimeStampedModel):
             # check for equality here in python.
             if course_overview.id != course.id:
                 raise CourseOverviewCaseMismatchException(course_overview.id, course.id)
+            stored_values = course_overview._get_field_values()  # lint-amnesty, pylint: disable=protected-access
         else:
             log.info('Creating course overview for %s.', str(course.id))
             course_overview = cls()
+            stored_values = None
 
         course_overview.version = cls.VERSION
         course_overview.id = course.id
@@ -276,16 +281,42 @@ class CourseOverview(TimeStampedModel):
         if not CatalogIntegration.is_enabled():
             course_overview.language = course.language
 
+        course_overview._stored_values = stored_values  # lint-amnesty, pylint: disable=protected-access
         return course_overview
 
+    # The fields which aren't compared by get_changed_fields, since they change whenever the overview is saved.
+    UNTRACKED_FIELDS = ('created', 'modified')
+
+    def _get_field_values(self):
+        """
+        Returns a dict of the values of the fields of this overview, keyed by their attribute names.
+        """
+        return {
+            field.attname: field.to_python(getattr(self, field.attname))
+            for field in self._meta.concrete_fields
+            if field.attname not in self.UNTRACKED_FIELDS
+        }
+
+    def get_changed_fields(self):
+        """
+        Returns the attribute names of the fields of an overview returned by _create_or_update
+        whose values differ from the ones stored in the database, or None if it wasn't stored.
+        """
+        stored_values = getattr(self, '_stored_values', None)
+        if stored_values is None:
+            return None
+        return [name for name, value in self._get_field_values().items() if value != stored_values[name]]
+
     @classmethod
-    def load_from_module_store(cls, course_id):
+    def load_from_module_store(cls, course_id, skip_unchanged=False):
         """
         Load a CourseBlock, create or update a CourseOverview from it, cache the
         overview, and return it.
 
         Arguments:
             course_id (CourseKey): the ID of the course overview to be loaded.
+            skip_unchanged (bool): if True, an existing overview is only saved, and its
+                images only recreated, if the values extracted from the course changed.
 
         Returns:
             CourseOverview: overview of the requested course.
@@ -306,25 +337,25 @@ class CourseOverview(TimeStampedModel):
             if isinstance(course, CourseBlock):
                 try:
                     course_overview = cls._create_or_update(course)
+                    changed_fields = course_overview.get_changed_fields()
+                    skip_save = skip_unchanged and changed_fields == []
                     with transaction.atomic():
-                        course_overview.save()
-                        # Remove and recreate all the course tabs
-                        CourseOverviewTab.objects.filter(course_overview=course_overview).delete()
-                        CourseOverviewTab.objects.bulk_create([
-                            CourseOverviewTab(
-                                tab_id=tab.tab_id,
-                                type=tab.type,
-                                name=tab.name,
-                                course_staff_only=tab.course_staff_only,
-                                url_slug=tab.get('url_slug'),
-                                link=tab.get('link'),
-                                is_hidden=tab.get('is_hidden', False),
-                                course_overview=course_overview)
-                            for tab in course.tabs
-                        ])
-                        # Remove and recreate course images
-                        CourseOverviewImageSet.objects.filter(course_overview=course_overview).delete()
-                        CourseOverviewImageSet.create(course_overview, course)
+                        if skip_save:
+                            log.info('Skipping unchanged course overview for %s.', str(course_id))
+                            set_custom_attribute('course_overview_refresh', 'skipped')
+                        else:
+                            course_overview.save()
+                            set_custom_attribute(
+                                'course_overview_refresh', 'created' if changed_fields is None else 'updated'
+                            )
+                        cls._update_tabs(course_overview, course.tabs)
+                        if (
+                            not skip_save or
+                            not CourseOverviewImageSet.objects.filter(course_overview=course_overview).exists()
+                        ):
+                            # Remove and recreate course images
+                            CourseOverviewImageSet.objects.filter(course_overview=course_overview).delete()
+                            CourseOverviewImageSet.create(course_overview, course)
 
                 except IntegrityError:
                     # There is a rare race condition that will occur if
@@ -363,6 +394,42 @@ class CourseOverview(TimeStampedModel):
                 )
                 raise cls.DoesNotExist()
 
+    @classmethod
+    def _update_tabs(cls, course_overview, tabs):
+        """
+        Updates the CourseOverviewTabs of the overview to match the course's tabs.
+
+        Tabs are matched by position, and only the rows which differ are updated,
+        so that the rows keep the order of the course's tabs.
+        """
+        overview_tabs = list(CourseOverviewTab.objects.filter(course_overview=course_overview).order_by('id'))
+        tabs_to_update = []
+        tabs_to_create = []
+        for index, tab in enumerate(tabs):
+            tab_values = {
+                'tab_id': tab.tab_id,
+                'type': tab.type,
+                'name': tab.name,
+                'course_staff_only': tab.course_staff_only,
+                'url_slug': tab.get('url_slug'),
+                'link': tab.get('link'),
+                'is_hidden': tab.get('is_hidden', False),
+            }
+            if index >= len(overview_tabs):
+                tabs_to_create.append(CourseOverviewTab(course_overview=course_overview, **tab_values))
+            elif any(getattr(overview_tabs[index], name) != value for name, value in tab_values.items()):
+                for name, value in tab_values.items():
+                    setattr(overview_tabs[index], name, value)
+                tabs_to_update.append(overview_tabs[index])
+
+        removed_tab_ids = [overview_tab.id for overview_tab in overview_tabs[len(tabs):]]
+        if removed_tab_ids:
+            CourseOverviewTab.objects.filter(id__in=removed_tab_ids).delete()
+        if tabs_to_update:
+            CourseOverviewTab.objects.bulk_update(tabs_to_update, CourseOverviewTab.COURSE_TAB_FIELDS)
+        if tabs_to_create:
+            CourseOverviewTab.objects.bulk_create(tabs_to_create)
+
     @classmethod
     def course_exists(cls, course_id):
         """
@@ -405,13 +472,18 @@ class CourseOverview(TimeStampedModel):
             - IOError if some other error occurs while trying to load the
                 course from the module store.
         """
-        try:
-            course_overview = cls.objects.select_related('image_set').get(id=course_id)
-            if course_overview.version < cls.VERSION:
-                # Reload the overview from the modulestore to update the version
-                course_overview = cls.load_from_module_store(course_id)
-        except cls.DoesNotExist:
-            course_overview = None
+        cache_keys = cls._get_cache_keys([course_id])
+        course_overview = cls._get_cached_overviews(cache_keys).get(course_id)
+        if course_overview is None:
+            try:
+                course_overview = cls.objects.select_related('image_set').get(id=course_id)
+                if course_overview.version < cls.VERSION:
+                    # Reload the overview from the modulestore to update the version
+                    course_overview = cls.load_from_module_store(course_id)
+                else:
+                    cls._cache_overviews([course_overview], cache_keys)
+            except cls.DoesNotExist:
+                course_overview = None
 
         # Regenerate the thumbnail images if they're missing (either because
         # they were never generated, or because they were flushed out after
@@ -426,8 +498,9 @@ class CourseOverview(TimeStampedModel):
         """
         Return a dict mapping course_ids to CourseOverviews.
 
-        Tries to select all CourseOverviews in one query,
-        then fetches remaining (uncached) overviews from the modulestore.
+        Tries to get all CourseOverviews from the cache in one round trip,
+        then to select the remaining ones in one query, then fetches remaining
+        (uncached) overviews from the modulestore.
 
         Course IDs for non-existant courses will map to None.
 
@@ -436,13 +509,19 @@ class CourseOverview(TimeStampedModel):
 
         Returns: dict[CourseKey, CourseOverview|None]
         """
-        overviews = {
-            overview.id: overview
-            for overview in cls.objects.select_related('image_set').filter(
-                id__in=course_ids,
-                version__gte=cls.VERSION
+        course_ids = list(course_ids)
+        cache_keys = cls._get_cache_keys(course_ids)
+        overviews = cls._get_cached_overviews(cache_keys)
+        uncached_course_ids = [course_id for course_id in course_ids if course_id not in overviews]
+        if uncached_course_ids:
+            stored_overviews = list(
+                cls.objects.select_related('image_set').filter(
+                    id__in=uncached_course_ids,
+                    version__gte=cls.VERSION
+                )
             )
-        }
+            cls._cache_overviews(stored_overviews, cache_keys)
+            overviews.update((overview.id, overview) for overview in stored_overviews)
         for course_id in course_ids:
             if course_id not in overviews:
                 try:
@@ -451,6 +530,76 @@ class CourseOverview(TimeStampedModel):
                     overviews[course_id] = None
         return overviews
 
+    @staticmethod
+    def _generation_key(course_id):
+        """
+        Returns the key of the current generation of the cached overview of the course.
+        """
+        return f'course_overviews.course_overview_generation.{course_id}'
+
+    @classmethod
+    def _get_cache_keys(cls, course_ids):
+        """
+        Returns a dict mapping the ids of the given courses to the keys of their cached overviews,
+        which change with the VERSION and with the generation of each course's overview.
+
+        The keys must be read before the overviews are read from the database: an overview read
+        before its invalidation can then only be cached under a key that's no longer used.
+        """
+        if not settings.COURSE_OVERVIEW_CACHE_TIMEOUT or not course_ids:
+            return {}
+        generation_keys = {cls._generation_key(course_id): course_id for course_id in course_ids}
+        generations = cache.get_many(list(generation_keys))
+        cache_keys = {}
+        for generation_key, course_id in generation_keys.items():
+            generation = generations.get(generation_key)
+            if generation is None:
+                generation = uuid4().hex
+                if not cache.add(generation_key, generation, None):
+                    generation = cache.get(generation_key, generation)
+            cache_keys[course_id] = f'course_overviews.course_overview.v{cls.VERSION}.{course_id}.{generation}'
+        return cache_keys
+
+    @classmethod
+    def _get_cached_overviews(cls, cache_keys):
+        """
+        Returns a dict mapping the ids of the courses whose overview is cached under the given
+        keys (see _get_cache_keys) to their overview.
+        """
+        if not cache_keys:
+            return {}
+        course_ids = {cache_key: course_id for course_id, cache_key in cache_keys.items()}
+        return {
+            course_ids[cache_key]: overview
+            for cache_key, overview in cache.get_many(list(course_ids)).items()
+        }
+
+    @classmethod
+    def _cache_overviews(cls, course_overviews, cache_keys):
+        """
+        Caches the overviews under the given keys (see _get_cache_keys), along with their tabs.
+        The overviews should have their image set selected.
+        """
+        course_overviews = [overview for overview in course_overviews if overview.id in cache_keys]
+        if not course_overviews:
+            return
+        prefetch_related_objects(course_overviews, 'tab_set')
+        cache.set_many(
+            {cache_keys[overview.id]: overview for overview in course_overviews},
+            settings.COURSE_OVERVIEW_CACHE_TIMEOUT,
+        )
+
+    @classmethod
+    def invalidate_cache(cls, course_id):
+        """
+        Starts a new generation of the cached overview of the course, now and once the current
+        transaction is committed, so that overviews read before the new data was committed
+        are never read from the cache.
+        """
+        generation_key = cls._generation_key(course_id)
+        cache.delete(generation_key)
+        transaction.on_commit(lambda: cache.delete(generation_key))
+
     @classmethod
     def _get_course_has_highlights(cls, course):
         # Avoid circular import here
@@ -995,6 +1144,9 @@ class CourseOverviewTab(models.Model):
     link = models.TextField(null=True)
     is_hidden = models.BooleanField(default=False)
 
+    # The fields copied from the course's tabs.
+    COURSE_TAB_FIELDS = ('tab_id', 'type', 'name', 'course_staff_only', 'url_slug', 'link', 'is_hidden')
+
     def __str__(self):
         return self.tab_id
 
@@ -1020,11 +1172,11 @@ class CourseOverviewImageSet(TimeStampedModel):
        CourseOverview to configuration changes.
 
     3. A CourseOverviewImageSet is automatically deleted when the CourseOverview
-       it belongs to is deleted. So it will be regenerated whenever there's a
-       new publish or the CourseOverview schema version changes. It's not
-       particularly smart about this, and will just re-write the same thumbnails
-       over and over to the same location without checking to see if there were
-       changes.
+       it belongs to is deleted. So it will be regenerated whenever the
+       CourseOverview schema version changes, or a new publish changes the
+       CourseOverview. It's not particularly smart about this, and will just
+       re-write the same thumbnails to the same location without checking to
+       see if the course image changed.
 
     4. Just because a CourseOverviewImageSet is successfully created does not
        mean that any thumbnails exist. There might have been a processing error,
@@ -1205,7 +1357,18 @@ def _invalidate_overview_cache(**kwargs):  # pylint: disable=unused-argument
     RequestCache('course_overview').clear()
 
 
+def _invalidate_cached_overview(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the cached course overview of the saved or deleted overview or image set.
+    """
+    CourseOverview.invalidate_cache(instance.id if sender is CourseOverview else instance.course_overview_id)
+
+
 post_save.connect(_invalidate_overview_cache, sender=CourseOverview)
 post_save.connect(_invalidate_overview_cache, sender=CourseOverviewImageConfig)
 post_delete.connect(_invalidate_overview_cache, sender=CourseOverview)
 post_delete.connect(_invalidate_overview_cache, sender=CourseOverviewImageConfig)
+post_save.connect(_invalidate_cached_overview, sender=CourseOverview)
+post_save.connect(_invalidate_cached_overview, sender=CourseOverviewImageSet)
+post_delete.connect(_invalidate_cached_overview, sender=CourseOverview)
+post_delete.connect(_invalidate_cached_overview, sender=CourseOverviewImageSet)
@@ -38,7 +38,9 @@ def _listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable
         previous_course_overview = CourseOverview.objects.get(id=course_key)
     except CourseOverview.DoesNotExist:
         previous_course_overview = None
-    updated_course_overview = CourseOverview.load_from_module_store(course_key)
+    updated_course_overview = CourseOverview.load_from_module_store(course_key, skip_unchanged=True)
+    # The overview's tabs may have changed even if the overview itself didn't.
+    CourseOverview.invalidate_cache(course_key)
     _check_for_course_changes(previous_course_overview, updated_course_overview)
 
 
@@ -49,6 +51,7 @@ def _listen_for_course_delete(sender, course_key, **kwargs):  # pylint: disable=
     invalidates the corresponding CourseOverview cache entry if one exists.
     """
     CourseOverview.objects.filter(id=course_key).delete()
+    CourseOverview.invalidate_cache(course_key)
     courserun_key = str(course_key)
     LOG.info(f'DELETE_COURSE_DETAILS triggered upon course_deleted signal. Key: [{courserun_key}]')
     # This signal will be handled in `federated_content_connector` plugin
@@ -24,6 +24,7 @@ from openedx.core.djangoapps.catalog.tests.mixins import CatalogIntegrationMixin
 from openedx.core.djangoapps.dark_lang.models import DarkLangConfig
 from openedx.core.djangoapps.models.course_details import CourseDetails
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
+from openedx.core.lib.cache_utils import RequestCache
 from openedx.core.lib.courses import course_image_url
 from common.djangoapps.static_replace.models import AssetBaseUrlConfig
 from xmodule.assetstore.assetmgr import AssetManager  # lint-amnesty, pylint: disable=wrong-import-order
@@ -40,6 +41,7 @@ from xmodule.modulestore import ModuleStoreEnum  # lint-amnesty, pylint: disable
 from xmodule.modulestore.django import modulestore  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.modulestore.tests.factories import CourseFactory, check_mongo_calls_range  # lint-amnesty, pylint: disable=wrong-import-order
+from xmodule.tabs import CourseTab  # lint-amnesty, pylint: disable=wrong-import-order
 
 from ..models import CourseOverview, CourseOverviewImageConfig, CourseOverviewImageSet, CourseOverviewTab
 from .factories import CourseOverviewFactory
@@ -1092,9 +1094,9 @@ class CourseOverviewTabTestCase(ModuleStoreTestCase):
 
     ENABLED_SIGNALS = ['course_published']
 
-    def test_tabs_deletion_rollback_on_integrity_error(self):
+    def test_tabs_update_rollback_on_integrity_error(self):
         """
-        Tests that course_overview tabs deletion is correctly rolled back if an Exception
+        Tests that course_overview tabs update is correctly rolled back if an Exception
         occurs while updating the course_overview.
         """
         course = CourseFactory.create()
@@ -1106,10 +1108,11 @@ class CourseOverviewTabTestCase(ModuleStoreTestCase):
         ) as course_overview_tabs_bulk_create:
             course_overview_tabs_bulk_create.side_effect = IntegrityError
 
-            # Update display name on the course block
+            # Update display name and tabs on the course block
             # This fires a course_published signal, which should be caught in signals.py,
             # which should in turn load CourseOverview from modulestore.
             course.display_name = 'Updated display name'
+            course.tabs.append(CourseTab.load('static_tab', name='New Tab', url_slug='new_tab'))
             with self.store.branch_setting(ModuleStoreEnum.Branch.draft_preferred):
                 self.store.update_item(course, ModuleStoreEnum.UserID.test)
 
@@ -1118,3 +1121,155 @@ class CourseOverviewTabTestCase(ModuleStoreTestCase):
             actual_tabs = {tab.tab_id for tab in course_overview.tab_set.all()}
             assert actual_tabs == expected_tabs
             assert course_overview.display_name != course.display_name
+
+    def test_tabs_updated_in_place(self):
+        """
+        Tests that only the tabs which changed are updated, and that the tabs keep the course's order.
+        """
+        course = CourseFactory.create()
+        course_overview = CourseOverview.get_from_id(course.id)
+        tab_row_ids = [tab.id for tab in course_overview.tab_set.order_by('id')]
+
+        course.tabs.append(CourseTab.load('static_tab', name='New Tab', url_slug='new_tab'))
+        with self.store.branch_setting(ModuleStoreEnum.Branch.draft_preferred):
+            self.store.update_item(course, ModuleStoreEnum.UserID.test)
+
+        updated_tabs = list(CourseOverview.get_from_id(course.id).tab_set.order_by('id'))
+        assert [tab.tab_id for tab in updated_tabs] == [tab.tab_id for tab in course.tabs]
+        assert updated_tabs[-1].name == 'New Tab'
+        # The rows of the existing tabs are kept.
+        assert [tab.id for tab in updated_tabs[:-1]] == tab_row_ids
+
+        course.tabs.pop(1)
+        with self.store.branch_setting(ModuleStoreEnum.Branch.draft_preferred):
+            self.store.update_item(course, ModuleStoreEnum.UserID.test)
+
+        updated_tabs = list(CourseOverview.get_from_id(course.id).tab_set.order_by('id'))
+        assert [tab.tab_id for tab in updated_tabs] == [tab.tab_id for tab in course.tabs]
+        assert [tab.id for tab in updated_tabs] == tab_row_ids
+
+
+class CourseOverviewRefreshTestCase(ModuleStoreTestCase):
+    """
+    Tests for refreshing CourseOverviews when their course is published.
+    """
+
+    def test_unchanged_course_is_not_saved(self):
+        course = CourseFactory.create()
+        CourseOverview.load_from_module_store(course.id)
+        num_history_records = CourseOverview.history.filter(id=course.id).count()
+        modified = CourseOverview.objects.get(id=course.id).modified
+
+        with mock.patch(
+            'openedx.core.djangoapps.content.course_overviews.models.set_custom_attribute'
+        ) as mock_set_custom_attribute:
+            course_overview = CourseOverview.load_from_module_store(course.id, skip_unchanged=True)
+
+        mock_set_custom_attribute.assert_called_once_with('course_overview_refresh', 'skipped')
+        assert course_overview.get_changed_fields() == []
+        assert CourseOverview.history.filter(id=course.id).count() == num_history_records
+        assert CourseOverview.objects.get(id=course.id).modified == modified
+
+    def test_changed_course_is_saved(self):
+        course = CourseFactory.create()
+        CourseOverview.load_from_module_store(course.id)
+        num_history_records = CourseOverview.history.filter(id=course.id).count()
+
+        course.display_name = 'Updated display name'
+        self.update_course(course, ModuleStoreEnum.UserID.test)
+        with mock.patch(
+            'openedx.core.djangoapps.content.course_overviews.models.set_custom_attribute'
+        ) as mock_set_custom_attribute:
+            course_overview = CourseOverview.load_from_module_store(course.id, skip_unchanged=True)
+
+        mock_set_custom_attribute.assert_called_once_with('course_overview_refresh', 'updated')
+        assert course_overview.get_changed_fields() == ['display_name']
+        assert CourseOverview.objects.get(id=course.id).display_name == 'Updated display name'
+        assert CourseOverview.history.filter(id=course.id).count() == num_history_records + 1
+
+    def test_unchanged_course_without_image_set(self):
+        course = CourseFactory.create()
+        CourseOverview.load_from_module_store(course.id)
+        CourseOverviewImageSet.objects.filter(course_overview_id=course.id).delete()
+
+        with mock.patch.object(CourseOverviewImageSet, 'create') as mock_create:
+            CourseOverview.load_from_module_store(course.id, skip_unchanged=True)
+        assert mock_create.called
+
+    def test_new_course_is_created(self):
+        course = CourseFactory.create()
+        CourseOverview.objects.filter(id=course.id).delete()
+        with mock.patch(
+            'openedx.core.djangoapps.content.course_overviews.models.set_custom_attribute'
+        ) as mock_set_custom_attribute:
+            course_overview = CourseOverview.load_from_module_store(course.id, skip_unchanged=True)
+        mock_set_custom_attribute.assert_called_once_with('course_overview_refresh', 'created')
+        assert course_overview.get_changed_fields() is None
+
+
+@override_settings(COURSE_OVERVIEW_CACHE_TIMEOUT=60)
+class CourseOverviewCacheTestCase(ModuleStoreTestCase, CacheIsolationTestCase):
+    """
+    Tests for caching CourseOverviews.
+    """
+
+    ENABLED_CACHES = ['default']
+    ENABLED_SIGNALS = ['course_deleted', 'course_published']
+
+    def test_get_from_ids_cached(self):
+        courses = [CourseFactory.create() for _ in range(3)]
+        course_ids = [course.id for course in courses]
+        CourseOverview.get_from_ids(course_ids)
+
+        with self.assertNumQueries(0):
+            overviews = CourseOverview.get_from_ids(course_ids)
+            for overview in overviews.values():
+                assert {tab.tab_id for tab in overview.tab_set.all()}
+                assert hasattr(overview, 'image_set')
+        assert set(overviews) == set(course_ids)
+
+    def test_get_from_id_cached(self):
+        course = CourseFactory.create()
+        CourseOverview.get_from_ids([course.id])
+        RequestCache('course_overview').clear()
+
+        with mock.patch.object(CourseOverview, 'objects') as mock_objects:
+            assert CourseOverview.get_from_id(course.id).id == course.id
+        assert not mock_objects.select_related.called
+
+    def test_publish_invalidates_cache(self):
+        course = CourseFactory.create()
+        CourseOverview.get_from_ids([course.id])
+
+        course.display_name = 'Updated display name'
+        course.tabs.append(CourseTab.load('static_tab', name='New Tab', url_slug='new_tab'))
+        with self.store.branch_setting(ModuleStoreEnum.Branch.draft_preferred):
+            self.store.update_item(course, ModuleStoreEnum.UserID.test)
+
+        overview = CourseOverview.get_from_ids([course.id])[course.id]
+        assert overview.display_name == 'Updated display name'
+        assert 'static_tab_new_tab' in {tab.tab_id for tab in overview.tab_set.all()}
+
+    def test_delete_invalidates_cache(self):
+        course = CourseFactory.create()
+        CourseOverview.get_from_ids([course.id])
+
+        self.store.delete_course(course.id, ModuleStoreEnum.UserID.test)
+
+        assert CourseOverview.get_from_ids([course.id]) == {course.id: None}
+
+    def test_overview_read_before_invalidation_is_not_cached(self):
+        course = CourseFactory.create()
+        CourseOverview.get_from_ids([course.id])
+
+        # A request reads the overview while the course is being published...
+        # pylint: disable=protected-access
+        cache_keys = CourseOverview._get_cache_keys([course.id])
+        stale_overview = CourseOverview.objects.select_related('image_set').get(id=course.id)
+        CourseOverview.objects.filter(id=course.id).update(display_name='Updated display name')
+        CourseOverview.invalidate_cache(course.id)
+        # ...and caches it once the cache was invalidated.
+        CourseOverview._cache_overviews([stale_overview], cache_keys)
+
+        overview = CourseOverview.get_from_ids([course.id])[course.id]
+        assert overview.display_name == 'Updated display name'
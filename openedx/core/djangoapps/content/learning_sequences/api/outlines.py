@@ -6,10 +6,11 @@ __init__.py imports from here, and is a more stable place to import from.
 import logging
 from collections import defaultdict
 from datetime import datetime
-from typing import Dict, FrozenSet, List, Optional, Union
+from typing import Dict, FrozenSet, List, Optional
 
 from django.db import transaction
 from django.db.models.query import QuerySet
+from django.utils import timezone
 from edx_django_utils.cache import TieredCache
 from edx_django_utils.monitoring import function_trace, set_custom_attribute
 from opaque_keys import OpaqueKey
@@ -39,6 +40,8 @@ from ..models import (
     LearningContext,
     LearningSequence,
     PublishReport,
+    SectionPartitionGroup,
+    SectionSequencePartitionGroup,
     UserPartitionGroup
 )
 from .permissions import can_see_all_content
@@ -53,6 +56,22 @@ from .processors.visibility import VisibilityOutlineProcessor
 
 log = logging.getLogger(__name__)
 
+# These are processors that alter which sequences are visible to students.
+# For instance, certain sequences that are intentionally hidden or not yet
+# released. These do not need to be run for staff users. This is where we
+# would add in pluggability for OutlineProcessors down the road.
+OUTLINE_PROCESSOR_CLASSES = [
+    ('content_gating', ContentGatingOutlineProcessor),
+    ('milestones', MilestonesOutlineProcessor),
+    ('schedule', ScheduleOutlineProcessor),
+    ('special_exams', SpecialExamsOutlineProcessor),
+    ('visibility', VisibilityOutlineProcessor),
+    ('enrollment', EnrollmentOutlineProcessor),
+    ('enrollment_track_partitions', EnrollmentTrackPartitionGroupsOutlineProcessor),
+    ('cohorts_partitions', CohortPartitionGroupsOutlineProcessor),
+    ('teams_partitions', TeamPartitionGroupsOutlineProcessor),
+]
+
 # Public API...
 __all__ = [
     'get_content_errors',
@@ -60,6 +79,7 @@ __all__ = [
     'get_course_outline',
     'get_user_course_outline',
     'get_user_course_outline_details',
+    'get_user_course_outlines',
     'key_supports_outlines',
     'replace_course_outline',
 ]
@@ -300,7 +320,36 @@ def get_user_course_outline_details(course_key: CourseKey,
     )
 
 
-def _get_user_course_outline_and_processors(course_key: CourseKey,  # lint-amnesty, pylint: disable=missing-function-docstring
+@function_trace('learning_sequences.api.get_user_course_outlines')
+def get_user_course_outlines(course_key: CourseKey,
+                             users: List[types.User],
+                             at_time: datetime) -> Dict[int, UserCourseOutlineData]:
+    """
+    Get the outlines of a course customized for many users at a particular time.
+
+    This returns the same outlines as calling get_user_course_outline for each
+    user, but the course level data is loaded once, and the outline processors
+    may fetch the data of all the users at once, which makes it the better way
+    to get the outlines of many learners (e.g. for grade or progress reports).
+
+    Returns a dict mapping the ids of the users to their outlines.
+    """
+    set_custom_attribute('learning_sequences.api.num_users', len(users))
+    full_course_outline = get_course_outline(course_key)
+    processors_course_data = _get_outline_processors_course_data(full_course_outline)
+    for name, processor_cls in OUTLINE_PROCESSOR_CLASSES:
+        with function_trace(f'learning_sequences.api.outline_processors.{name}.prefetch_user_data'):
+            processor_cls.prefetch_user_data(course_key, users, processors_course_data[name])
+
+    user_course_outlines = {}
+    for user in users:
+        user_course_outlines[user.id], _ = _process_user_course_outline(
+            full_course_outline, processors_course_data, user, at_time
+        )
+    return user_course_outlines
+
+
+def _get_user_course_outline_and_processors(course_key: CourseKey,
                                             user: types.User,
                                             at_time: datetime):
     """
@@ -317,35 +366,58 @@ def _get_user_course_outline_and_processors(course_key: CourseKey,  # lint-amnes
     set_custom_attribute('learning_sequences.api.user_id', user.id)
 
     full_course_outline = get_course_outline(course_key)
-    user_can_see_all_content = can_see_all_content(user, course_key)
+    processors_course_data = _get_outline_processors_course_data(full_course_outline)
+    return _process_user_course_outline(full_course_outline, processors_course_data, user, at_time)
 
-    # These are processors that alter which sequences are visible to students.
-    # For instance, certain sequences that are intentionally hidden or not yet
-    # released. These do not need to be run for staff users. This is where we
-    # would add in pluggability for OutlineProcessors down the road.
-    processor_classes = [
-        ('content_gating', ContentGatingOutlineProcessor),
-        ('milestones', MilestonesOutlineProcessor),
-        ('schedule', ScheduleOutlineProcessor),
-        ('special_exams', SpecialExamsOutlineProcessor),
-        ('visibility', VisibilityOutlineProcessor),
-        ('enrollment', EnrollmentOutlineProcessor),
-        ('enrollment_track_partitions', EnrollmentTrackPartitionGroupsOutlineProcessor),
-        ('cohorts_partitions', CohortPartitionGroupsOutlineProcessor),
-        ('teams_partitions', TeamPartitionGroupsOutlineProcessor),
-    ]
+
+def _get_outline_processors_course_data(full_course_outline: CourseOutlineData) -> Dict[str, dict]:
+    """
+    Get the course level data of each outline processor, by processor name.
+
+    This is the part of the outline processing that is the same for every user
+    of the course, so it's cached for the published version of the course.
+    """
+    course_key = full_course_outline.course_key
+    cache_key = "learning_sequences.api.outline_processors_course_data.v1.{}.{}".format(
+        course_key, full_course_outline.published_version
+    )
+    course_data_cache_result = TieredCache.get_cached_response(cache_key)
+    if course_data_cache_result.is_found:
+        return course_data_cache_result.value
+
+    processors_course_data = {}
+    for name, processor_cls in OUTLINE_PROCESSOR_CLASSES:
+        with function_trace(f'learning_sequences.api.outline_processors.{name}.load_course_data'):
+            processors_course_data[name] = processor_cls.load_course_data(course_key, full_course_outline)
+    TieredCache.set_all_tiers(cache_key, processors_course_data, 300)
+
+    return processors_course_data
+
+
+def _process_user_course_outline(full_course_outline: CourseOutlineData,
+                                 processors_course_data: Dict[str, dict],
+                                 user: types.User,
+                                 at_time: datetime):
+    """
+    Run the outline processors for a user, with their course level data.
+
+    Returns the UserCourseOutlineData and the dict of outline processors, as
+    _get_user_course_outline_and_processors does.
+    """
+    course_key = full_course_outline.course_key
+    user_can_see_all_content = can_see_all_content(user, course_key)
 
     # Run each OutlineProcessor in order to figure out what items we have to
     # remove from the CourseOutline.
     processors = {}
     usage_keys_to_remove = set()
     inaccessible_sequences = set()
-    for name, processor_cls in processor_classes:
+    for name, processor_cls in OUTLINE_PROCESSOR_CLASSES:
         # Future optimization: This should be parallelizable (don't rely on a
         # particular ordering).
         processor = processor_cls(course_key, user, at_time)
         processors[name] = processor
-        processor.load_data(full_course_outline)
+        processor.load_data(full_course_outline, processors_course_data[name])
         if not user_can_see_all_content:
             # function_trace lets us see how expensive each processor is being.
             with function_trace(f'learning_sequences.api.outline_processors.{name}'):
@@ -389,7 +461,10 @@ def replace_course_outline(course_outline: CourseOutlineData,
     Replace the model data stored for the Course Outline with the contents of
     course_outline (a CourseOutlineData). Record any content errors.
 
-    This isn't particularly optimized at the moment.
+    The stored outline is compared with course_outline, and only the rows that
+    differ are inserted, updated or deleted, in bulk. So the number of queries
+    doesn't grow with the size of the course, and republishing a course with
+    few changes only writes a few rows.
     """
     log.info(
         "Replacing CourseOutline for %s (version %s, %d sequences)",
@@ -404,12 +479,13 @@ def replace_course_outline(course_outline: CourseOutlineData,
         # Update or create the basic CourseContext...
         course_context = _update_course_context(course_outline)
 
-        # Wipe out the CourseSectionSequences join+ordering table
-        course_context.section_sequences.all().delete()
-
-        _update_sections(course_outline, course_context)
-        _update_sequences(course_outline, course_context)
-        _update_course_section_sequences(course_outline, course_context)
+        section_models = _update_sections(course_outline, course_context)
+        sequence_models = _update_sequences(course_outline, course_context)
+        section_sequence_models = _update_course_section_sequences(
+            course_outline, course_context, section_models, sequence_models
+        )
+        _update_exams(course_outline, section_sequence_models)
+        _update_user_partition_groups(course_outline, course_context, section_models, section_sequence_models)
         _update_publish_report(course_outline, content_errors, course_context)
 
 
@@ -442,113 +518,350 @@ def _update_course_context(course_outline: CourseOutlineData):
     return course_context
 
 
+def _set_changed_values(model_obj, values: Dict) -> bool:
+    """
+    Set the given field values on model_obj, and return whether any of them changed.
+    """
+    changed = False
+    for field_name, value in values.items():
+        if getattr(model_obj, field_name) != value:
+            setattr(model_obj, field_name, value)
+            changed = True
+    return changed
+
+
+def _bulk_update(model_class, model_objs: List, field_names: List[str]):
+    """
+    Save the given fields of the model_objs (and their modified timestamps) in bulk.
+    """
+    if not model_objs:
+        return
+    modified = timezone.now()
+    for model_obj in model_objs:
+        model_obj.modified = modified
+    model_class.objects.bulk_update(model_objs, field_names + ['modified'])
+
+
 def _update_sections(course_outline: CourseOutlineData, course_context: CourseContext):
     """
-    Add/Update relevant sections
+    Add/Update/Delete sections to match the outline.
+
+    Returns a dict mapping the usage keys of the outline's sections to their CourseSection.
     """
+    section_models = {
+        section_model.usage_key: section_model
+        for section_model in CourseSection.objects.filter(course_context=course_context)
+    }
+    sections_to_create = []
+    sections_to_update = []
     for ordering, section_data in enumerate(course_outline.sections):
-        sec_model, _created = CourseSection.objects.update_or_create(
-            course_context=course_context,
-            usage_key=section_data.usage_key,
-            defaults={
-                'title': section_data.title,
-                'ordering': ordering,
-                'hide_from_toc': section_data.visibility.hide_from_toc,
-                'visible_to_staff_only': section_data.visibility.visible_to_staff_only,
-            }
-        )
-        # clear out any user partition group mappings, and remake them...
-        _update_user_partition_groups(section_data.user_partition_groups, sec_model)
+        values = {
+            'title': section_data.title,
+            'ordering': ordering,
+            'hide_from_toc': section_data.visibility.hide_from_toc,
+            'visible_to_staff_only': section_data.visibility.visible_to_staff_only,
+        }
+        section_model = section_models.get(section_data.usage_key)
+        if section_model is None:
+            sections_to_create.append(
+                CourseSection(course_context=course_context, usage_key=section_data.usage_key, **values)
+            )
+        elif _set_changed_values(section_model, values):
+            sections_to_update.append(section_model)
 
     # Delete sections that we don't want any more
-    section_usage_keys_to_keep = [
-        section_data.usage_key for section_data in course_outline.sections
+    section_usage_keys_to_keep = {section_data.usage_key for section_data in course_outline.sections}
+    section_ids_to_delete = [
+        section_model.id
+        for usage_key, section_model in section_models.items()
+        if usage_key not in section_usage_keys_to_keep
     ]
-    CourseSection.objects \
-        .filter(course_context=course_context) \
-        .exclude(usage_key__in=section_usage_keys_to_keep) \
-        .delete()
+    if section_ids_to_delete:
+        CourseSection.objects.filter(id__in=section_ids_to_delete).delete()
+
+    _bulk_update(CourseSection, sections_to_update, ['title', 'ordering', 'hide_from_toc', 'visible_to_staff_only'])
+    if sections_to_create:
+        CourseSection.objects.bulk_create(sections_to_create)
+        # Not all databases set the primary keys of the created rows.
+        section_models.update(
+            (section_model.usage_key, section_model)
+            for section_model in CourseSection.objects.filter(
+                course_context=course_context,
+                usage_key__in=[section_model.usage_key for section_model in sections_to_create],
+            )
+        )
+
+    return {usage_key: section_models[usage_key] for usage_key in section_usage_keys_to_keep}
 
 
 def _update_sequences(course_outline: CourseOutlineData, course_context: CourseContext):
     """
-    Add/Update relevant sequences
+    Add/Update/Delete sequences to match the outline.
+
+    Returns a dict mapping the usage keys of the outline's sequences to their LearningSequence.
     """
-    for section_data in course_outline.sections:
-        for sequence_data in section_data.sequences:
-            LearningSequence.objects.update_or_create(
-                learning_context=course_context.learning_context,
-                usage_key=sequence_data.usage_key,
-                defaults={'title': sequence_data.title}
+    learning_context = course_context.learning_context
+    sequence_models = {
+        sequence_model.usage_key: sequence_model
+        for sequence_model in LearningSequence.objects.filter(learning_context=learning_context)
+    }
+    sequences_to_create = []
+    sequences_to_update = []
+    for usage_key, sequence_data in course_outline.sequences.items():
+        sequence_model = sequence_models.get(usage_key)
+        if sequence_model is None:
+            sequences_to_create.append(
+                LearningSequence(learning_context=learning_context, usage_key=usage_key, title=sequence_data.title)
             )
-    LearningSequence.objects \
-        .filter(learning_context=course_context.learning_context) \
-        .exclude(usage_key__in=course_outline.sequences) \
-        .delete()
+        elif _set_changed_values(sequence_model, {'title': sequence_data.title}):
+            sequences_to_update.append(sequence_model)
 
+    sequence_ids_to_delete = [
+        sequence_model.id
+        for usage_key, sequence_model in sequence_models.items()
+        if usage_key not in course_outline.sequences
+    ]
+    if sequence_ids_to_delete:
+        LearningSequence.objects.filter(id__in=sequence_ids_to_delete).delete()
+
+    _bulk_update(LearningSequence, sequences_to_update, ['title'])
+    if sequences_to_create:
+        LearningSequence.objects.bulk_create(sequences_to_create)
+        sequence_models.update(
+            (sequence_model.usage_key, sequence_model)
+            for sequence_model in LearningSequence.objects.filter(
+                learning_context=learning_context,
+                usage_key__in=[sequence_model.usage_key for sequence_model in sequences_to_create],
+            )
+        )
+
+    return {usage_key: sequence_models[usage_key] for usage_key in course_outline.sequences}
 
-def _update_course_section_sequences(course_outline: CourseOutlineData, course_context: CourseContext):
+
+def _update_course_section_sequences(course_outline: CourseOutlineData,
+                                     course_context: CourseContext,
+                                     section_models: Dict,
+                                     sequence_models: Dict):
     """
-    Add/Update relevant course section and sequences
+    Add/Update/Delete course section sequences to match the outline.
+
+    This must run after the sections and sequences are updated, since deleting
+    them also deletes their course section sequences.
+
+    Returns a dict mapping the usage keys of the outline's sequences to their CourseSectionSequence.
     """
-    section_models = {
-        section_model.usage_key: section_model
-        for section_model
-        in CourseSection.objects.filter(course_context=course_context).all()
-    }
-    sequence_models = {
-        sequence_model.usage_key: sequence_model
-        for sequence_model
-        in LearningSequence.objects.filter(learning_context=course_context.learning_context).all()
+    section_sequence_models = {
+        section_sequence_model.sequence_id: section_sequence_model
+        for section_sequence_model in CourseSectionSequence.objects.filter(
+            course_context=course_context
+        ).select_related('exam')
     }
+    sequence_ids_to_keep = {sequence_model.id for sequence_model in sequence_models.values()}
+    section_sequence_ids_to_delete = [
+        section_sequence_model.id
+        for sequence_id, section_sequence_model in section_sequence_models.items()
+        if sequence_id not in sequence_ids_to_keep
+    ]
+    if section_sequence_ids_to_delete:
+        CourseSectionSequence.objects.filter(id__in=section_sequence_ids_to_delete).delete()
 
+    section_sequences_to_create = []
+    section_sequences_to_update = []
+    section_sequences_to_reorder = []
     ordering = 0
     for section_data in course_outline.sections:
         for sequence_data in section_data.sequences:
-            course_section_sequence, _ = CourseSectionSequence.objects.update_or_create(
-                course_context=course_context,
-                section=section_models[section_data.usage_key],
-                sequence=sequence_models[sequence_data.usage_key],
-                defaults={
-                    'ordering': ordering,
-                    'inaccessible_after_due': sequence_data.inaccessible_after_due,
-                    'hide_from_toc': sequence_data.visibility.hide_from_toc,
-                    'visible_to_staff_only': sequence_data.visibility.visible_to_staff_only,
-                },
-            )
-            ordering += 1
-
-            # If a sequence is an exam, update or create an exam record
-            if bool(sequence_data.exam):
-                CourseSequenceExam.objects.update_or_create(
-                    course_section_sequence=course_section_sequence,
-                    defaults={
-                        'is_practice_exam': sequence_data.exam.is_practice_exam,
-                        'is_proctored_enabled': sequence_data.exam.is_proctored_enabled,
-                        'is_time_limited': sequence_data.exam.is_time_limited,
-                    },
+            values = {
+                'section_id': section_models[section_data.usage_key].id,
+                'inaccessible_after_due': sequence_data.inaccessible_after_due,
+                'hide_from_toc': sequence_data.visibility.hide_from_toc,
+                'visible_to_staff_only': sequence_data.visibility.visible_to_staff_only,
+                'ordering': ordering,
+            }
+            sequence_model = sequence_models[sequence_data.usage_key]
+            section_sequence_model = section_sequence_models.get(sequence_model.id)
+            if section_sequence_model is None:
+                section_sequences_to_create.append(
+                    CourseSectionSequence(course_context=course_context, sequence=sequence_model, **values)
                 )
             else:
-                # Otherwise, delete any exams associated with it
-                CourseSequenceExam.objects.filter(course_section_sequence=course_section_sequence).delete()
+                if section_sequence_model.ordering != ordering:
+                    section_sequences_to_reorder.append(section_sequence_model)
+                if _set_changed_values(section_sequence_model, values):
+                    section_sequences_to_update.append(section_sequence_model)
+            ordering += 1
+
+    if section_sequences_to_reorder:
+        # The ordering of a course's section sequences is unique, and the
+        # database may check that for each row updated, so first move the
+        # reordered rows out of the way of the others.
+        first_free_ordering = max(
+            [ordering] +
+            [section_sequence_model.ordering for section_sequence_model in section_sequence_models.values()]
+        ) + 1
+        CourseSectionSequence.objects.bulk_update(
+            [
+                CourseSectionSequence(id=section_sequence_model.id, ordering=first_free_ordering + index)
+                for index, section_sequence_model in enumerate(section_sequences_to_reorder)
+            ],
+            ['ordering'],
+        )
+    _bulk_update(
+        CourseSectionSequence,
+        section_sequences_to_update,
+        ['section_id', 'inaccessible_after_due', 'hide_from_toc', 'visible_to_staff_only', 'ordering'],
+    )
+    if section_sequences_to_create:
+        CourseSectionSequence.objects.bulk_create(section_sequences_to_create)
+        section_sequence_models.update(
+            (section_sequence_model.sequence_id, section_sequence_model)
+            for section_sequence_model in CourseSectionSequence.objects.filter(
+                course_context=course_context,
+                sequence_id__in=[
+                    section_sequence_model.sequence_id for section_sequence_model in section_sequences_to_create
+                ],
+            ).select_related('exam')
+        )
 
-            # clear out any user partition group mappings, and remake them...
-            _update_user_partition_groups(sequence_data.user_partition_groups, course_section_sequence)
+    return {
+        usage_key: section_sequence_models[sequence_model.id]
+        for usage_key, sequence_model in sequence_models.items()
+    }
 
 
-def _update_user_partition_groups(upg_data: Dict[int, FrozenSet[int]],
-                                  model_obj: Union[CourseSection, CourseSectionSequence]):
+def _update_exams(course_outline: CourseOutlineData, section_sequence_models: Dict):
     """
-    Replace UserPartitionGroups associated with this content with `upg_data`.
+    Add/Update/Delete the exams of the course section sequences to match the outline.
     """
-    model_obj.new_user_partition_groups.all().delete()
-    if upg_data:
-        for partition_id, group_ids in upg_data.items():
-            for group_id in group_ids:
-                upg, _ = UserPartitionGroup.objects.get_or_create(
-                    partition_id=partition_id, group_id=group_id
-                )
-                model_obj.new_user_partition_groups.add(upg)
+    exams_to_create = []
+    exams_to_update = []
+    exam_ids_to_delete = []
+    for usage_key, sequence_data in course_outline.sequences.items():
+        section_sequence_model = section_sequence_models[usage_key]
+        exam_model = getattr(section_sequence_model, 'exam', None)
+        if not sequence_data.exam:
+            # Delete any exams associated with sequences that aren't exams
+            if exam_model is not None:
+                exam_ids_to_delete.append(exam_model.id)
+            continue
+
+        values = {
+            'is_practice_exam': sequence_data.exam.is_practice_exam,
+            'is_proctored_enabled': sequence_data.exam.is_proctored_enabled,
+            'is_time_limited': sequence_data.exam.is_time_limited,
+        }
+        if exam_model is None:
+            exams_to_create.append(CourseSequenceExam(course_section_sequence=section_sequence_model, **values))
+        elif _set_changed_values(exam_model, values):
+            exams_to_update.append(exam_model)
+
+    if exam_ids_to_delete:
+        CourseSequenceExam.objects.filter(id__in=exam_ids_to_delete).delete()
+    _bulk_update(CourseSequenceExam, exams_to_update, ['is_practice_exam', 'is_proctored_enabled', 'is_time_limited'])
+    if exams_to_create:
+        CourseSequenceExam.objects.bulk_create(exams_to_create)
+
+
+def _update_user_partition_groups(course_outline: CourseOutlineData,
+                                  course_context: CourseContext,
+                                  section_models: Dict,
+                                  section_sequence_models: Dict):
+    """
+    Add/Delete the UserPartitionGroups associated with sections and course section sequences to match the outline.
+    """
+    section_upg_data = {
+        section_models[section_data.usage_key].id: section_data.user_partition_groups
+        for section_data in course_outline.sections
+    }
+    section_sequence_upg_data = {
+        section_sequence_models[usage_key].id: sequence_data.user_partition_groups
+        for usage_key, sequence_data in course_outline.sequences.items()
+    }
+    upg_ids = _get_user_partition_group_ids(
+        list(section_upg_data.values()) + list(section_sequence_upg_data.values())
+    )
+    _update_partition_group_links(
+        SectionPartitionGroup,
+        'course_section_id',
+        SectionPartitionGroup.objects.filter(course_section__course_context=course_context),
+        section_upg_data,
+        upg_ids,
+    )
+    _update_partition_group_links(
+        SectionSequencePartitionGroup,
+        'course_section_sequence_id',
+        SectionSequencePartitionGroup.objects.filter(course_section_sequence__course_context=course_context),
+        section_sequence_upg_data,
+        upg_ids,
+    )
+
+
+def _get_user_partition_group_ids(upg_data_list: List[Dict[int, FrozenSet[int]]]) -> Dict:
+    """
+    Return a dict mapping the (partition_id, group_id) pairs of the given
+    user partition groups to the ids of their UserPartitionGroups, which are
+    created if they don't exist yet.
+    """
+    upg_keys = {
+        (partition_id, group_id)
+        for upg_data in upg_data_list
+        for partition_id, group_ids in upg_data.items()
+        for group_id in group_ids
+    }
+    if not upg_keys:
+        return {}
+
+    def get_upg_ids():
+        return {
+            (partition_id, group_id): upg_id
+            for upg_id, partition_id, group_id in UserPartitionGroup.objects.filter(
+                partition_id__in={partition_id for partition_id, _group_id in upg_keys}
+            ).values_list('id', 'partition_id', 'group_id')
+        }
+
+    upg_ids = get_upg_ids()
+    if not upg_keys.issubset(upg_ids):
+        UserPartitionGroup.objects.bulk_create(
+            [
+                UserPartitionGroup(partition_id=partition_id, group_id=group_id)
+                for partition_id, group_id in upg_keys - set(upg_ids)
+            ],
+            ignore_conflicts=True,
+        )
+        upg_ids = get_upg_ids()
+    return upg_ids
+
+
+def _update_partition_group_links(through_model, content_field_name: str, stored_links: QuerySet,
+                                  upg_data_by_content_id: Dict[int, Dict[int, FrozenSet[int]]],
+                                  upg_ids: Dict):
+    """
+    Add/Delete the rows of through_model, which link the content in its
+    content_field_name to UserPartitionGroups, to match upg_data_by_content_id.
+    """
+    links_to_keep = {
+        (content_id, upg_ids[(partition_id, group_id)])
+        for content_id, upg_data in upg_data_by_content_id.items()
+        for partition_id, group_ids in upg_data.items()
+        for group_id in group_ids
+    }
+    stored_link_ids = {
+        (content_id, upg_id): link_id
+        for link_id, content_id, upg_id in stored_links.values_list(
+            'id', content_field_name, 'user_partition_group_id'
+        )
+    }
+    link_ids_to_delete = [
+        link_id for link, link_id in stored_link_ids.items() if link not in links_to_keep
+    ]
+    if link_ids_to_delete:
+        through_model.objects.filter(id__in=link_ids_to_delete).delete()
+    links_to_create = links_to_keep - set(stored_link_ids)
+    if links_to_create:
+        through_model.objects.bulk_create([
+            through_model(**{content_field_name: content_id, 'user_partition_group_id': upg_id})
+            for content_id, upg_id in links_to_create
+        ])
 
 
 def _update_publish_report(course_outline: CourseOutlineData,
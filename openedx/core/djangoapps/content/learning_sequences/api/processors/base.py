@@ -4,6 +4,7 @@ of adding new logic that manipulates the Course Outline for a given student.
 """
 import logging
 from datetime import datetime
+from typing import List, Optional
 
 from opaque_keys.edx.keys import CourseKey  # lint-amnesty, pylint: disable=unused-import
 from openedx.core import types
@@ -17,11 +18,15 @@ class OutlineProcessor:
     """
     Base class for manipulating the Course Outline.
 
-    You can inherit from this class and extend any of its four main methods:
-    __init__, load_data, inaccessible_sequences, usage_keys_to_remove.
+    You can inherit from this class and extend any of its main methods:
+    load_course_data, __init__, load_data, inaccessible_sequences,
+    usage_keys_to_remove, and, for outlines of many users at once,
+    prefetch_user_data.
 
     An OutlineProcessor is invoked synchronously during a request for the
     CourseOutline. The steps are:
+        * load_course_data (its result is cached, and shared by all users)
+        * prefetch_user_data (only when outlines are requested for many users)
         * __init__
         * load_data
         * inaccessible_sequences, usage_keys_to_remove (no ordering guarantee)
@@ -46,9 +51,38 @@ class OutlineProcessor:
         self.user = user
         self.at_time = at_time
 
-    def load_data(self, full_course_outline: CourseOutlineData):  # pylint: disable=unused-argument
+    @classmethod
+    def load_course_data(cls, course_key: CourseKey, full_course_outline: CourseOutlineData) -> dict:
         """
-        Fetch whatever data you need about the course and user here.
+        Fetch the data you need which is the same for every user of the course.
+
+        This is run once for a course, and what it returns is cached (for the
+        published version of the course, and for a few minutes at most) and
+        passed to `load_data` for every user, so it must be picklable, and it
+        must not be something which has to take effect immediately when it
+        changes. If it's run for the processor of a user (i.e. `load_data` is
+        called without any course data), it is not cached.
+        """
+        return {}
+
+    @classmethod
+    def prefetch_user_data(cls, course_key: CourseKey, users: List[types.User], course_data: dict):
+        """
+        Fetch the data of many users at once, before `load_data` is called for
+        each of them, when outlines are requested for a batch of users.
+
+        Usually this means warming the RequestCache that the per-user functions
+        your `load_data` calls already use. It's only an optimization, so there
+        is no need to override this method.
+        """
+        pass  # lint-amnesty, pylint: disable=unnecessary-pass
+
+    def load_data(self, full_course_outline: CourseOutlineData, course_data: Optional[dict] = None):
+        """
+        Fetch whatever data you need about the user here.
+
+        `course_data` is what `load_course_data` returned for the course, or
+        None, in which case you should call `load_course_data` yourself.
 
         If everything you need is already in the CourseOutlineData, there is no
         need to override this method.
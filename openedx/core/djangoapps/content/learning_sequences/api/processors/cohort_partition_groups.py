@@ -27,15 +27,23 @@ class CohortPartitionGroupsOutlineProcessor(OutlineProcessor):
         self.user_cohort_group_id: Union[int, None] = None
         self.cohorted_partition_id: Union[int, None] = None
 
-    def load_data(self, full_course_outline) -> None:
+    @classmethod
+    def load_course_data(cls, course_key, full_course_outline):
         """
-        Load the cohorted partition id and the user's group id.
+        Load the cohorted partition id.
         """
-
         # It is possible that a cohort is not linked to any content group/partition.
         # This is why the cohorted_partition_id needs to be set independently
         # of a particular user's cohort.
-        self.cohorted_partition_id = get_cohorted_user_partition_id(self.course_key)
+        return {'cohorted_partition_id': get_cohorted_user_partition_id(course_key)}
+
+    def load_data(self, full_course_outline, course_data=None) -> None:
+        """
+        Load the cohorted partition id and the user's group id.
+        """
+        if course_data is None:
+            course_data = self.load_course_data(self.course_key, full_course_outline)
+        self.cohorted_partition_id = course_data['cohorted_partition_id']
 
         if self.cohorted_partition_id:
             user_cohort = get_cohort(self.user, self.course_key)
@@ -12,17 +12,44 @@ class EnrollmentOutlineProcessor(OutlineProcessor):
     """
     Simple OutlineProcessor that removes items based on Enrollment and course visibility setting.
     """
-    def usage_keys_to_remove(self, full_course_outline):
+    def __init__(self, course_key, user, at_time):
+        super().__init__(course_key, user, at_time)
+        self.is_outline_public = False
+
+    @classmethod
+    def load_course_data(cls, course_key, full_course_outline):
         """
-        Return sequences/sections to be removed
+        Check whether the outline is visible to users who are not enrolled.
         """
-        # Public outlines and courses don't need to hide anything from the outline.
-        is_unenrolled_access_enabled = COURSE_ENABLE_UNENROLLED_ACCESS_FLAG.is_enabled(self.course_key)
+        is_unenrolled_access_enabled = COURSE_ENABLE_UNENROLLED_ACCESS_FLAG.is_enabled(course_key)
         is_course_outline_publicly_visible = (
             full_course_outline.course_visibility in [CourseVisibility.PUBLIC, CourseVisibility.PUBLIC_OUTLINE]
         )
+        return {'is_outline_public': is_unenrolled_access_enabled and is_course_outline_publicly_visible}
+
+    @classmethod
+    def prefetch_user_data(cls, course_key, users, course_data):
+        """
+        Fetch the enrollments of all the users at once.
+        """
+        CourseEnrollment.bulk_fetch_enrollment_states(
+            [user for user in users if user.is_authenticated], course_key
+        )
 
-        if is_unenrolled_access_enabled and is_course_outline_publicly_visible:
+    def load_data(self, full_course_outline, course_data=None):
+        """
+        Get whether the outline is public from the course data.
+        """
+        if course_data is None:
+            course_data = self.load_course_data(self.course_key, full_course_outline)
+        self.is_outline_public = course_data['is_outline_public']
+
+    def usage_keys_to_remove(self, full_course_outline):
+        """
+        Return sequences/sections to be removed
+        """
+        # Public outlines and courses don't need to hide anything from the outline.
+        if self.is_outline_public:
             return frozenset()
 
         # Students who are enrolled can see the full outline.
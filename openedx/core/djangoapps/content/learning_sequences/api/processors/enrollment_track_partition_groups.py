@@ -33,14 +33,22 @@ class EnrollmentTrackPartitionGroupsOutlineProcessor(OutlineProcessor):
         self.enrollment_track_groups: Dict[str, Group] = {}
         self.user_group = None
 
-    def load_data(self, full_course_outline) -> None:
+    @classmethod
+    def load_course_data(cls, course_key, full_course_outline):
+        """
+        Create the enrollment track partition of this course.
+        """
+        return {'user_partition': create_enrollment_track_partition_with_course_id(course_key)}
+
+    def load_data(self, full_course_outline, course_data=None) -> None:
         """
         Pull track groups for this course and which group the user is in.
         """
-        user_partition = create_enrollment_track_partition_with_course_id(self.course_key)
+        if course_data is None:
+            course_data = self.load_course_data(self.course_key, full_course_outline)
         self.enrollment_track_groups = get_user_partition_groups(
             self.course_key,
-            [user_partition],
+            [course_data['user_partition']],
             self.user,
             partition_dict_key='id'
         )
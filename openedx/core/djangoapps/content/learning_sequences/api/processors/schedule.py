@@ -43,7 +43,7 @@ class ScheduleOutlineProcessor(OutlineProcessor):
         self._course_end = None
         self._is_beta_tester = False
 
-    def load_data(self, full_course_outline):
+    def load_data(self, full_course_outline, course_data=None):
         """
         Pull dates information from edx-when.
 
@@ -33,17 +33,28 @@ class TeamPartitionGroupsOutlineProcessor(OutlineProcessor):
         super().__init__(course_key, user, at_time)
         self.current_user_groups: Dict[str, Group] = {}
 
-    def load_data(self, _) -> None:
+    @classmethod
+    def load_course_data(cls, course_key, full_course_outline):
+        """
+        Create the team-set partitions of this course.
+        """
+        if not CONTENT_GROUPS_FOR_TEAMS.is_enabled(course_key):
+            return {'user_partitions': []}
+
+        return {'user_partitions': create_team_set_partitions_with_course_id(course_key)}
+
+    def load_data(self, full_course_outline, course_data=None) -> None:
         """
         Pull team groups for this course and which group the user is in.
         """
         if not CONTENT_GROUPS_FOR_TEAMS.is_enabled(self.course_key):
             return
 
-        user_partitions = create_team_set_partitions_with_course_id(self.course_key)
+        if course_data is None:
+            course_data = self.load_course_data(self.course_key, full_course_outline)
         self.current_user_groups = get_user_partition_groups(
             self.course_key,
-            user_partitions,
+            course_data['user_partitions'],
             self.user,
             partition_dict_key="id",
         )
@@ -10,10 +10,16 @@ class VisibilityOutlineProcessor(OutlineProcessor):
     Simple OutlineProcessor that removes items based on VisibilityData.
 
     We only remove items with this Processor, we never make them visible-but-
-    inaccessible. There is no need to implement `load_data` because everything
-    we need comes from the CourseOutlineData itself.
+    inaccessible. Everything we need comes from the CourseOutlineData itself,
+    and is the same for every user, so the items to remove are found once for
+    the course, in `load_course_data`.
     """
-    def usage_keys_to_remove(self, full_course_outline):
+    def __init__(self, course_key, user, at_time):
+        super().__init__(course_key, user, at_time)
+        self.removed_usage_keys = frozenset()
+
+    @classmethod
+    def load_course_data(cls, course_key, full_course_outline):
         """
         Remove anything flagged with `hide_from_toc` or `visible_to_staff_only`.
 
@@ -39,4 +45,18 @@ class VisibilityOutlineProcessor(OutlineProcessor):
             for seq in full_course_outline.sequences.values()
             if should_remove(seq.visibility)
         }
-        return frozenset(sections_to_remove | seqs_to_remove)
+        return {'removed_usage_keys': frozenset(sections_to_remove | seqs_to_remove)}
+
+    def load_data(self, full_course_outline, course_data=None):
+        """
+        Get the items to remove from the course data.
+        """
+        if course_data is None:
+            course_data = self.load_course_data(self.course_key, full_course_outline)
+        self.removed_usage_keys = course_data['removed_usage_keys']
+
+    def usage_keys_to_remove(self, full_course_outline):
+        """
+        Return the items removed for every user of the course.
+        """
+        return self.removed_usage_keys
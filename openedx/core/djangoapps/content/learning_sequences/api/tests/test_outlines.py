@@ -4,11 +4,14 @@ models for this app.
 """
 from datetime import datetime, timezone
 from unittest.mock import patch, MagicMock
+import timeit
 import unittest
 
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
+from django.db import connection
 from django.db.models import signals
+from django.test.utils import CaptureQueriesContext
 from edx_proctoring.exceptions import ProctoredExamNotFoundException
 from edx_toggles.toggles.testutils import override_waffle_flag
 from edx_when.api import set_dates_for_course
@@ -52,10 +55,12 @@ from ..outlines import (
     get_course_outline,
     get_user_course_outline,
     get_user_course_outline_details,
+    get_user_course_outlines,
     key_supports_outlines,
     replace_course_outline,
 )
 from ..processors.enrollment_track_partition_groups import EnrollmentTrackPartitionGroupsOutlineProcessor
+from ..processors.visibility import VisibilityOutlineProcessor
 from .test_data import generate_sections
 
 
@@ -158,6 +163,88 @@ class CourseOutlineTestCase(CacheIsolationTestCase):
             uncached_new_version_outline = get_course_outline(self.course_key)  # lint-amnesty, pylint: disable=unused-variable
             assert new_version_outline == new_version_outline  # lint-amnesty, pylint: disable=comparison-with-itself
 
+    def _replace_course_outline_queries(self, course_outline):
+        """
+        Replace the course outline, and return the number of queries it made.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            replace_course_outline(course_outline)
+        assert get_course_outline(course_outline.course_key) == course_outline
+        return len(queries)
+
+    def test_replace_query_count(self):
+        """Republishing an outline makes the same number of queries, whatever its size."""
+        large_course_key = CourseKey.from_string("course-v1:OpenEdX+Learn+Large")
+        large_outline = attr.evolve(
+            self.course_outline,
+            course_key=large_course_key,
+            sections=generate_sections(large_course_key, [10, 10, 10]),
+        )
+        replace_course_outline(self.course_outline)
+        replace_course_outline(large_outline)
+
+        num_queries = self._replace_course_outline_queries(
+            attr.evolve(self.course_outline, published_version="2222222222222222")
+        )
+        assert self._replace_course_outline_queries(
+            attr.evolve(large_outline, published_version="2222222222222222")
+        ) == num_queries
+
+        # Changing a sequence only updates its row.
+        sections = generate_sections(large_course_key, [10, 10, 10])
+        sections[1].sequences[3] = attr.evolve(sections[1].sequences[3], title="Renamed")
+        assert self._replace_course_outline_queries(
+            attr.evolve(large_outline, sections=sections, published_version="3333333333333333")
+        ) == num_queries + 1
+
+    def test_incremental_replace(self):
+        """Outlines with moved, added and removed content are replaced correctly."""
+        replace_course_outline(self.course_outline)
+        sections = generate_sections(self.course_key, [3, 3, 3])
+        new_sequence = CourseLearningSequenceData(
+            usage_key=self.course_key.make_usage_key('sequential', 'new_sequence'),
+            title="New Sequence",
+            visibility=VisibilityData(),
+            exam=ExamData(is_time_limited=True),
+            user_partition_groups={50: frozenset([1, 2])},
+        )
+        moved_sequence = sections[1].sequences.pop(0)
+        sections[0] = attr.evolve(sections[0], sequences=[new_sequence] + sections[0].sequences + [moved_sequence])
+        sections[2] = attr.evolve(sections[2], user_partition_groups={51: frozenset([3])})
+        outline = attr.evolve(
+            self.course_outline, sections=[sections[2], sections[0], sections[1]], published_version="1"
+        )
+        self._replace_course_outline_queries(outline)
+
+        # Remove a section, and change the exam and the groups of the new sequence.
+        changed_sequence = attr.evolve(
+            new_sequence, exam=ExamData(is_practice_exam=True), user_partition_groups={50: frozenset([2])}
+        )
+        outline = attr.evolve(
+            outline,
+            sections=[
+                outline.sections[0],
+                attr.evolve(outline.sections[1], sequences=[changed_sequence] + outline.sections[1].sequences[1:]),
+            ],
+            published_version="2",
+        )
+        self._replace_course_outline_queries(outline)
+
+        # Remove the exam and the groups, and reverse the order of everything.
+        changed_sequence = attr.evolve(new_sequence, exam=ExamData(), user_partition_groups={})
+        outline = attr.evolve(
+            outline,
+            sections=[
+                attr.evolve(section, sequences=list(reversed(section.sequences)))
+                for section in reversed([
+                    outline.sections[0],
+                    attr.evolve(outline.sections[1], sequences=[changed_sequence] + outline.sections[1].sequences[1:]),
+                ])
+            ],
+            published_version="3",
+        )
+        self._replace_course_outline_queries(outline)
+
 
 class UserCourseOutlineTestCase(CacheIsolationTestCase):
     """
@@ -228,6 +315,33 @@ class UserCourseOutlineTestCase(CacheIsolationTestCase):
         )
         assert global_staff_outline_details.outline == global_staff_outline
 
+    def test_user_course_outlines(self):
+        """The outlines of many users are the same as their individual outlines."""
+        at_time = datetime(2020, 5, 21, tzinfo=timezone.utc)
+        unenrolled_student = UserFactory.create(
+            username='unenrolled', email='unenrolled@example.com', is_staff=False
+        )
+        users = [self.global_staff, self.student, self.beta_tester, unenrolled_student]
+        user_outlines = get_user_course_outlines(self.course_key, users, at_time)
+
+        assert set(user_outlines) == {user.id for user in users}
+        for user in users:
+            assert user_outlines[user.id] == get_user_course_outline(self.course_key, user, at_time)
+        assert not user_outlines[unenrolled_student.id].sections
+
+    def test_course_data_loaded_once(self):
+        """The course level data of the outline processors is shared by all users."""
+        at_time = datetime(2020, 5, 21, tzinfo=timezone.utc)
+        with patch.object(
+            VisibilityOutlineProcessor,
+            'load_course_data',
+            wraps=VisibilityOutlineProcessor.load_course_data,
+        ) as mock_load_course_data:
+            get_user_course_outlines(self.course_key, [self.student, self.beta_tester], at_time)
+            get_user_course_outline(self.course_key, self.student, at_time)
+            get_user_course_outline_details(self.course_key, self.global_staff, at_time)
+        assert mock_load_course_data.call_count == 1
+
 
 class OutlineProcessorTestCase(CacheIsolationTestCase):  # lint-amnesty, pylint: disable=missing-class-docstring
     @classmethod
@@ -2191,3 +2305,63 @@ class TeamPartitionGroupsTestCase(OutlineProcessorTestCase):
         assert team_partition_groups_processor.usage_keys_to_remove(self.outline) == {
             self.course_key.make_usage_key('subsection', '2')
         }
+
+
+@unittest.skip
+class UserCourseOutlinePerf(CacheIsolationTestCase):
+    """
+    Measures the latency of user outlines for a course with 500 sequences, for
+    one user at a time and for a batch of users.
+    """
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    NUM_USERS = 50
+
+    @classmethod
+    def setUpTestData(cls):  # lint-amnesty, pylint: disable=super-method-not-called
+        cls.course_key = CourseKey.from_string("course-v1:OpenEdX+Outline+Perf")
+        set_dates_for_course(
+            cls.course_key,
+            [(cls.course_key.make_usage_key('course', 'course'), {'start': datetime(2020, 5, 10, tzinfo=timezone.utc)})]
+        )
+        replace_course_outline(
+            CourseOutlineData(
+                course_key=cls.course_key,
+                title="Outline Perf Test Course",
+                published_at=datetime(2020, 5, 20, tzinfo=timezone.utc),
+                published_version="5ebece4b69dd593d82fe2020",
+                entrance_exam_id=None,
+                days_early_for_beta=None,
+                sections=generate_sections(cls.course_key, [25] * 20),
+                self_paced=False,
+                course_visibility=CourseVisibility.PRIVATE
+            )
+        )
+        cls.students = []
+        for i in range(cls.NUM_USERS):
+            student = UserFactory.create(username=f'student_{i}', email=f'student_{i}@example.com')
+            student.courseenrollment_set.create(course_id=cls.course_key, is_active=True, mode="audit")
+            cls.students.append(student)
+
+    def test_outline_latency(self):
+        at_time = datetime(2020, 5, 21, tzinfo=timezone.utc)
+        # Warm the course outline cache, as publishing the course would.
+        get_course_outline(self.course_key)
+
+        per_user_elapsed = timeit.timeit(
+            lambda: [get_user_course_outline(self.course_key, student, at_time) for student in self.students],
+            number=1,
+        )
+
+        self.clear_caches()
+        get_course_outline(self.course_key)
+        user_outlines = {}
+        batch_elapsed = timeit.timeit(
+            lambda: user_outlines.update(get_user_course_outlines(self.course_key, self.students, at_time)),
+            number=1,
+        )
+
+        assert len(user_outlines) == self.NUM_USERS
+        assert all(len(outline.accessible_sequences) == 500 for outline in user_outlines.values())
+        assert batch_elapsed < per_user_elapsed
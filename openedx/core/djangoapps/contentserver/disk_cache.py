@@ -0,0 +1,312 @@
+"""
+A local disk cache of the data of course assets.
+
+Assets which are too large for the content cache (see caching.py) would
+otherwise be read from the contentstore (GridFS) for every request, and
+for every range request of a video or a large PDF. Instead, their data
+is copied to a local file in a background thread the first time they are
+requested, and later requests are served from that file.
+
+Files are named after the digest of the asset's content, so a file never
+changes once written, and the processes of a server can share the cache
+directory: files are written to a temporary file which is then renamed.
+The temporary file is also named after the digest and created exclusively,
+so only one thread or process copies a given asset at a time.
+The least recently used files are deleted when the total size of the
+files exceeds the configured maximum. As other processes may add files
+in the meantime, the maximum is only approximately enforced.
+"""
+import hashlib
+import logging
+import mmap
+import os
+import re
+import threading
+import time
+
+from django.conf import settings
+
+log = logging.getLogger(__name__)
+
+# The size of the chunks in which files are copied and served.
+CHUNK_SIZE = 64 * 1024
+
+# Temporary files older than this (in seconds) are left from failed copies, and are deleted.
+STALE_TEMPORARY_FILE_AGE = 60 * 60
+
+TEMPORARY_FILE_PREFIX = '.tmp-'
+
+DIGEST_PATTERN = re.compile(r'^[0-9a-f]{32,128}$')
+
+
+class AssetDiskCache:
+    """
+    A cache of the data of course assets in files of a local directory.
+    """
+    def __init__(self, directory, max_size, max_file_size):
+        """
+        Arguments:
+            directory (str): the directory of the files, which is created if needed.
+            max_size (int): the maximum total size of the files, in bytes.
+            max_file_size (int): the maximum size of a cached asset, in bytes.
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self.max_file_size = max_file_size
+        self._lock = threading.Lock()
+        # The total size of the files, or None until the directory is scanned.
+        self._size = None
+        # The digests of the assets whose data didn't match them, which aren't cached.
+        self._mismatched_digests = set()
+        # The threads copying assets to the cache, by digest.
+        self._copies = {}
+
+        # The statistics of this process.
+        self.hits = 0
+        self.misses = 0
+        self.bytes_served = 0
+
+    @property
+    def hit_ratio(self):
+        """
+        The ratio of the requests for cacheable assets which were served from the cache.
+        """
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        requests = hits + misses
+        return hits / requests if requests else 0.0
+
+    def is_cacheable(self, content):
+        """
+        Returns whether the data of the given content can be cached.
+        """
+        digest = getattr(content, 'content_digest', None)
+        return bool(
+            digest and DIGEST_PATTERN.match(digest) and digest not in self._mismatched_digests and
+            content.length is not None and 0 < content.length <= self.max_file_size
+        )
+
+    def get(self, content):
+        """
+        Returns the path of the file with the data of the given content,
+        or None if it isn't cached.
+        """
+        if not self.is_cacheable(content):
+            return None
+
+        path = self._get_path(content.content_digest)
+        try:
+            # The modification time is the last use of the file, for the eviction.
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return path
+
+    def add(self, content):
+        """
+        Copies the data of the given content from its stream to the cache,
+        and returns the path of its file.
+
+        Returns None if the content can't be cached, if another thread or process
+        is copying it, or if the copy failed, in which case the content's stream
+        may have been read.
+        """
+        if not self.is_cacheable(content):
+            return None
+
+        path = self._get_path(content.content_digest)
+        try:
+            if not self._add(path, content):
+                return None
+        except OSError:
+            log.exception('Could not add %s to the course asset disk cache', content.location)
+            return None
+        return path
+
+    def add_in_background(self, content, load_content):
+        """
+        Copies the data of the given content to the cache in a background thread,
+        unless this process is already copying it.
+
+        Arguments:
+            content: the content to cache.
+            load_content (callable): returns the content with a new stream, since the
+                stream of the given content is read by the request which missed the cache.
+        """
+        if not self.is_cacheable(content):
+            return
+
+        digest = content.content_digest
+        with self._lock:
+            if digest in self._copies:
+                return
+            thread = threading.Thread(
+                target=self._add_in_background, args=(digest, load_content),
+                name=f'asset-disk-cache-{digest}', daemon=True,
+            )
+            self._copies[digest] = thread
+        thread.start()
+
+    def wait_for_copies(self):
+        """
+        Waits until the copies started by add_in_background are finished.
+        """
+        with self._lock:
+            threads = list(self._copies.values())
+        for thread in threads:
+            thread.join()
+
+    def record_bytes_served(self, num_bytes):
+        """
+        Records that the given number of bytes were served from the cache.
+        """
+        with self._lock:
+            self.bytes_served += num_bytes
+
+    def _get_path(self, digest):
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def _add_in_background(self, digest, load_content):
+        """
+        Copies the data of the content returned by load_content to the cache.
+        """
+        try:
+            self.add(load_content())
+        except Exception:  # pylint: disable=broad-except
+            log.exception('Could not load the course asset with digest %s for the disk cache', digest)
+        finally:
+            with self._lock:
+                del self._copies[digest]
+
+    def _add(self, path, content):
+        """
+        Copies the data of the content to the file at the given path.
+
+        Returns False if another thread or process is copying it.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary_file = self._open_temporary_file(content.content_digest)
+        if temporary_file is None:
+            return False
+
+        # The data is checked against the digest, since the files are trusted to match their names.
+        content_md5 = hashlib.md5()
+        size = 0
+        with temporary_file:
+            try:
+                for chunk in content.stream_data():
+                    temporary_file.write(chunk)
+                    content_md5.update(chunk)
+                    size += len(chunk)
+                temporary_file.flush()
+                if size != content.length or content_md5.hexdigest() != content.content_digest:
+                    with self._lock:
+                        self._mismatched_digests.add(content.content_digest)
+                    raise OSError(f'The data of {content.location} does not match its length or digest')
+                os.replace(temporary_file.name, path)
+            except BaseException:
+                os.remove(temporary_file.name)
+                raise
+
+        with self._lock:
+            if self._size is not None:
+                self._size += size
+            if self._size is None or self._size > self.max_size:
+                self._evict()
+        return True
+
+    def _open_temporary_file(self, digest):
+        """
+        Creates and opens the temporary file to copy the data with the given digest to,
+        or returns None if another thread or process is copying it.
+        """
+        path = os.path.join(self.directory, TEMPORARY_FILE_PREFIX + digest)
+        try:
+            return open(path, 'xb')  # pylint: disable=consider-using-with
+        except FileExistsError:
+            if not self._remove_if_stale(path, time.time()):
+                return None
+        # The file was left by a failed copy.
+        try:
+            return open(path, 'xb')  # pylint: disable=consider-using-with
+        except FileExistsError:
+            return None
+
+    def _evict(self):
+        """
+        Deletes the least recently used files until their total size is at most max_size.
+        """
+        files = []
+        now = time.time()
+        for subdirectory in os.scandir(self.directory):
+            if not subdirectory.is_dir():
+                if subdirectory.name.startswith(TEMPORARY_FILE_PREFIX):
+                    self._remove_if_stale(subdirectory.path, now)
+                continue
+            for entry in os.scandir(subdirectory.path):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+
+        files.sort()
+        total_size = sum(size for __, size, __ in files)
+        for __, size, path in files:
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_size -= size
+        self._size = total_size
+
+    def _remove_if_stale(self, path, now):
+        """
+        Removes the given temporary file if it was left by a failed copy,
+        and returns whether it was removed.
+        """
+        try:
+            if now - os.stat(path).st_mtime > STALE_TEMPORARY_FILE_AGE:
+                os.remove(path)
+                return True
+        except FileNotFoundError:
+            return True
+        return False
+
+
+def stream_file_range(path, first_byte, last_byte):
+    """
+    Yields the data of the file between first_byte and last_byte (included),
+    read from a memory map of the file.
+    """
+    with open(path, 'rb') as cached_file:
+        with mmap.mmap(cached_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            for position in range(first_byte, last_byte + 1, CHUNK_SIZE):
+                yield mapped_file[position:min(position + CHUNK_SIZE, last_byte + 1)]
+
+
+_ASSET_DISK_CACHE = None
+
+
+def get_asset_disk_cache():
+    """
+    Returns the AssetDiskCache configured by the COURSE_ASSETS_DISK_CACHE_* settings,
+    or None if it isn't enabled.
+    """
+    global _ASSET_DISK_CACHE  # pylint: disable=global-statement
+    directory = getattr(settings, 'COURSE_ASSETS_DISK_CACHE_DIR', None)
+    if not directory:
+        return None
+    if _ASSET_DISK_CACHE is None or _ASSET_DISK_CACHE.directory != directory:
+        _ASSET_DISK_CACHE = AssetDiskCache(
+            directory,
+            settings.COURSE_ASSETS_DISK_CACHE_MAX_SIZE,
+            settings.COURSE_ASSETS_DISK_CACHE_MAX_FILE_SIZE,
+        )
+    return _ASSET_DISK_CACHE
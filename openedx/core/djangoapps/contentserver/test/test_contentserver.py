@@ -6,6 +6,7 @@ Tests for StaticContentServer
 import copy
 import datetime
 import logging
+import tempfile
 import unittest
 from unittest.mock import patch
 from uuid import uuid4
@@ -27,6 +28,7 @@ from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.modulestore.tests.django_utils import TEST_DATA_SPLIT_MODULESTORE, SharedModuleStoreTestCase
 from xmodule.modulestore.xml_importer import import_course_from_xml
 
+from ..disk_cache import get_asset_disk_cache
 from ..views import HTTP_DATE_FORMAT, StaticContentServer, parse_range_header
 
 log = logging.getLogger(__name__)
@@ -242,18 +244,108 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
 
     def test_range_request_multiple_ranges(self):
         """
-        Test that multiple ranges in request outputs the full content.
+        Test that multiple ranges in request outputs a multipart/byteranges message
+        with the content of each range.
         """
-        first_byte = self.length_unlocked / 4
-        last_byte = self.length_unlocked / 2
-        # lint-amnesty, pylint: disable=bad-option-value, unicode-format-string
+        first_byte = self.length_unlocked // 4
+        last_byte = self.length_unlocked // 2
         resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes={first}-{last}, -100'.format(
             first=first_byte, last=last_byte))
 
+        assert resp.status_code == 206
+        assert 'Content-Range' not in resp
+        content_type, boundary = resp['Content-Type'].split('; boundary=')
+        assert content_type == 'multipart/byteranges'
+
+        data = self.contentstore.find(self.unlocked_asset).data
+        body = b''.join(resp.streaming_content)
+        assert resp['Content-Length'] == str(len(body))
+        part_headers = (
+            '\r\n--{boundary}\r\nContent-Type: text/plain\r\n'
+            'Content-Range: bytes {first}-{last}/{length}\r\n\r\n'
+        )
+        assert body == (
+            part_headers.format(
+                boundary=boundary, first=first_byte, last=last_byte, length=self.length_unlocked,
+            ).encode() + data[first_byte:last_byte + 1] +
+            part_headers.format(
+                boundary=boundary, first=self.length_unlocked - 100, last=self.length_unlocked - 1,
+                length=self.length_unlocked,
+            ).encode() + data[-100:] +
+            f'\r\n--{boundary}--\r\n'.encode()
+        )
+
+    def test_range_request_multiple_ranges_with_unsatisfiable_range(self):
+        """
+        Test that unsatisfiable ranges are ignored when another range is satisfiable.
+        """
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-9, {first}-'.format(
+            first=self.length_unlocked))
+
+        assert resp.status_code == 206
+        assert resp['Content-Range'] == f'bytes 0-9/{self.length_unlocked}'
+        assert resp['Content-Length'] == '10'
+
+    @patch('openedx.core.djangoapps.contentserver.views.MAX_BYTE_RANGES', 2)
+    def test_range_request_too_many_ranges(self):
+        """
+        Test that a range request with more than MAX_BYTE_RANGES ranges outputs the full content.
+        """
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-1, 2-3, 4-5')
+
         assert resp.status_code == 200
         assert 'Content-Range' not in resp
         assert resp['Content-Length'] == str(self.length_unlocked)
 
+    @ddt.data(True, False)
+    def test_range_request_if_range_etag(self, is_current):
+        """
+        Test that a range request is only satisfied if the entity tag in its If-Range
+        header matches the asset's.
+        """
+        etag = self.client.get(self.url_unlocked)['ETag']
+        resp = self.client.get(
+            self.url_unlocked, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=etag if is_current else '"outdated"',
+        )
+        assert resp.status_code == (206 if is_current else 200)
+
+    @ddt.data(True, False)
+    def test_range_request_if_range_date(self, is_current):
+        """
+        Test that a range request is only satisfied if the date in its If-Range
+        header is the asset's last modification date.
+        """
+        last_modified = self.client.get(self.url_unlocked)['Last-Modified']
+        resp = self.client.get(
+            self.url_unlocked, HTTP_RANGE='bytes=0-9',
+            HTTP_IF_RANGE=last_modified if is_current else 'Thu, 01 Dec 1983 20:00:00 GMT',
+        )
+        assert resp.status_code == (206 if is_current else 200)
+
+    def test_conditional_request_etag(self):
+        """
+        Test that a request whose If-None-Match header matches the asset's entity tag
+        is answered with 304 Not Modified.
+        """
+        resp = self.client.get(self.url_unlocked)
+        assert resp['ETag'] == '"{}"'.format(self.contentstore.find(self.unlocked_asset).content_digest)
+
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH=resp['ETag'])
+        assert resp.status_code == 304
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH='"outdated"')
+        assert resp.status_code == 200
+
+    def test_conditional_request_last_modified(self):
+        """
+        Test that a request whose If-Modified-Since header is at or after the asset's
+        last modification is answered with 304 Not Modified.
+        """
+        last_modified = self.client.get(self.url_unlocked)['Last-Modified']
+        resp = self.client.get(self.url_unlocked, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert resp.status_code == 304
+        resp = self.client.get(self.url_unlocked, HTTP_IF_MODIFIED_SINCE='Thu, 01 Dec 1983 20:00:00 GMT')
+        assert resp.status_code == 200
+
     @ddt.data(
         'bytes 0-',
         'bits=0-',
@@ -285,6 +377,37 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
         resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes={first}-{last}'.format(
             first=(self.length_unlocked), last=(self.length_unlocked)))
         assert resp.status_code == 416
+        assert resp['Content-Range'] == f'bytes */{self.length_unlocked}'
+
+    @patch('openedx.core.djangoapps.contentserver.views.get_cached_content', return_value=None)
+    @patch('openedx.core.djangoapps.contentserver.views.CONTENT_CACHE_MAX_LENGTH', 0)
+    def test_disk_cache(self, mock_get_cached_content):
+        """
+        Test that assets which aren't in the content cache are served from the
+        local disk cache, in full and in ranges.
+        """
+        with tempfile.TemporaryDirectory() as cache_directory:
+            with override_settings(COURSE_ASSETS_DISK_CACHE_DIR=cache_directory):
+                with patch.object(AssetManager, 'find', wraps=AssetManager.find) as mock_find:
+                    resp = self.client.get(self.url_unlocked)
+                    assert resp.status_code == 200
+                    data = b''.join(resp.streaming_content)
+                    assert len(data) == self.length_unlocked
+                    assert resp['Content-Length'] == str(self.length_unlocked)
+                    assert 'Content-Disposition' not in resp
+                    # The asset is served from the contentstore while it is copied to the cache.
+                    get_asset_disk_cache().wait_for_copies()
+                    assert mock_find.call_count == 2
+
+                    first_byte = self.length_unlocked // 4
+                    last_byte = self.length_unlocked // 2
+                    resp = self.client.get(self.url_unlocked, HTTP_RANGE=f'bytes={first_byte}-{last_byte}')
+                    assert resp.status_code == 206
+                    assert b''.join(resp.streaming_content) == data[first_byte:last_byte + 1]
+                    assert resp['Content-Range'] == f'bytes {first_byte}-{last_byte}/{self.length_unlocked}'
+                    assert resp['Content-Length'] == str(last_byte - first_byte + 1)
+                    # The range is read from the cached file rather than from a new stream.
+                    assert mock_find.call_count == 3
 
     def test_vary_header_sent(self):
         """
@@ -0,0 +1,184 @@
+"""
+Tests for the local disk cache of course assets
+"""
+
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from django.test.utils import override_settings
+
+from ..disk_cache import (
+    TEMPORARY_FILE_PREFIX,
+    AssetDiskCache,
+    get_asset_disk_cache,
+    stream_file_range
+)
+
+
+class FakeContent:
+    """
+    A course asset streamed from the contentstore.
+    """
+    def __init__(self, data, content_digest=None, chunk_size=3):
+        self.data = data
+        self.length = len(data)
+        self.content_digest = content_digest or hashlib.md5(data).hexdigest()
+        self.location = 'asset-v1:org+course+run+type@asset+block@file.mp4'
+        self.chunk_size = chunk_size
+        self.stream_count = 0
+
+    def stream_data(self):
+        self.stream_count += 1
+        for position in range(0, self.length, self.chunk_size):
+            yield self.data[position:position + self.chunk_size]
+
+
+class AssetDiskCacheTestCase(unittest.TestCase):
+    """
+    Tests for AssetDiskCache.
+    """
+    def setUp(self):
+        super().setUp()
+        temporary_directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(temporary_directory.cleanup)
+        self.directory = temporary_directory.name
+        self.disk_cache = AssetDiskCache(self.directory, max_size=100, max_file_size=50)
+
+    def get_cached_files(self):
+        """
+        Returns the names of the files in the cache.
+        """
+        return {
+            name
+            for subdirectory in os.scandir(self.directory) if subdirectory.is_dir()
+            for name in os.listdir(subdirectory.path)
+        }
+
+    def test_add_and_get(self):
+        content = FakeContent(b'some asset data')
+        assert self.disk_cache.get(content) is None
+
+        path = self.disk_cache.add(content)
+        with open(path, 'rb') as cached_file:
+            assert cached_file.read() == b'some asset data'
+        assert os.path.basename(path) == content.content_digest
+
+        # The file is found without reading the asset again.
+        assert self.disk_cache.get(FakeContent(b'some asset data')) == path
+        assert content.stream_count == 1
+        assert self.disk_cache.hits == 1
+        assert self.disk_cache.misses == 1
+        assert self.disk_cache.hit_ratio == 0.5
+
+    def test_not_cacheable(self):
+        for content in (
+            FakeContent(b''),
+            FakeContent(b'x' * 51),
+            FakeContent(b'data', content_digest='../../etc/passwd'),
+        ):
+            assert not self.disk_cache.is_cacheable(content)
+            assert self.disk_cache.add(content) is None
+            assert content.stream_count == 0
+        assert not self.get_cached_files()
+        assert self.disk_cache.misses == 0
+
+    def test_digest_mismatch(self):
+        content = FakeContent(b'some asset data', content_digest='f' * 32)
+        assert self.disk_cache.add(content) is None
+        assert not self.get_cached_files()
+        assert not [name for name in os.listdir(self.directory) if name.startswith(TEMPORARY_FILE_PREFIX)]
+
+        # The asset isn't read again.
+        assert not self.disk_cache.is_cacheable(content)
+
+    def test_eviction(self):
+        contents = [FakeContent(bytes([index]) * 40) for index in range(3)]
+        now = time.time()
+        for index, content in enumerate(contents[:2]):
+            path = self.disk_cache.add(content)
+            os.utime(path, (now - 100 + index, now - 100 + index))
+
+        # The first content is used, so the second one is the least recently used.
+        self.disk_cache.get(contents[0])
+        self.disk_cache.add(contents[2])
+        assert self.get_cached_files() == {contents[0].content_digest, contents[2].content_digest}
+        assert self.disk_cache.get(contents[1]) is None
+
+    def test_eviction_of_stale_temporary_files(self):
+        stale_path = os.path.join(self.directory, TEMPORARY_FILE_PREFIX + 'stale')
+        recent_path = os.path.join(self.directory, TEMPORARY_FILE_PREFIX + 'recent')
+        for path in (stale_path, recent_path):
+            with open(path, 'wb') as temporary_file:
+                temporary_file.write(b'data')
+        os.utime(stale_path, (time.time() - 2 * 60 * 60,) * 2)
+
+        self.disk_cache.add(FakeContent(b'some asset data'))
+        assert not os.path.exists(stale_path)
+        assert os.path.exists(recent_path)
+
+    def test_add_in_background(self):
+        content = FakeContent(b'some asset data')
+        copy_started = threading.Event()
+        finish_copy = threading.Event()
+        loaded_contents = []
+
+        def load_content():
+            copy_started.set()
+            finish_copy.wait()
+            loaded_contents.append(FakeContent(b'some asset data'))
+            return loaded_contents[-1]
+
+        self.disk_cache.add_in_background(content, load_content)
+        copy_started.wait()
+        # Further misses don't copy the asset again while it is being copied.
+        self.disk_cache.add_in_background(content, load_content)
+        assert self.disk_cache.get(content) is None
+        finish_copy.set()
+        self.disk_cache.wait_for_copies()
+
+        path = self.disk_cache.get(content)
+        with open(path, 'rb') as cached_file:
+            assert cached_file.read() == b'some asset data'
+        assert len(loaded_contents) == 1
+        assert content.stream_count == 0
+
+    def test_add_while_being_copied(self):
+        content = FakeContent(b'some asset data')
+        temporary_path = os.path.join(self.directory, TEMPORARY_FILE_PREFIX + content.content_digest)
+        with open(temporary_path, 'wb') as temporary_file:
+            temporary_file.write(b'some')
+
+        # Another process is copying the asset.
+        assert self.disk_cache.add(content) is None
+        assert content.stream_count == 0
+        assert not self.get_cached_files()
+
+        # The other process failed, and left its temporary file.
+        os.utime(temporary_path, (time.time() - 2 * 60 * 60,) * 2)
+        path = self.disk_cache.add(content)
+        with open(path, 'rb') as cached_file:
+            assert cached_file.read() == b'some asset data'
+        assert not os.path.exists(temporary_path)
+
+    def test_stream_file_range(self):
+        data = bytes(range(50))
+        path = self.disk_cache.add(FakeContent(data))
+        with patch('openedx.core.djangoapps.contentserver.disk_cache.CHUNK_SIZE', 7):
+            assert b''.join(stream_file_range(path, 0, 49)) == data
+            assert b''.join(stream_file_range(path, 10, 30)) == data[10:31]
+            assert b''.join(stream_file_range(path, 49, 49)) == data[49:50]
+            assert [len(chunk) for chunk in stream_file_range(path, 3, 20)] == [7, 7, 4]
+
+    def test_get_asset_disk_cache(self):
+        with override_settings(COURSE_ASSETS_DISK_CACHE_DIR=None):
+            assert get_asset_disk_cache() is None
+        with override_settings(COURSE_ASSETS_DISK_CACHE_DIR=self.directory):
+            disk_cache = get_asset_disk_cache()
+            assert disk_cache.directory == self.directory
+            assert get_asset_disk_cache() is disk_cache
@@ -0,0 +1,90 @@
+"""
+Performance test for streaming large course assets with StaticContentServer.
+"""
+import datetime
+import tracemalloc
+import unittest
+from unittest.mock import patch
+
+import ddt
+from django.test import RequestFactory
+from opaque_keys.edx.keys import CourseKey
+
+from xmodule.contentstore.content import StaticContentStream
+
+from ..views import StaticContentServer
+
+# Size of the asset served.
+ASSET_SIZE = 1024 ** 3
+
+# Size of the chunks of the fake GridFS file, which is the default of GridFS.
+GRIDFS_CHUNK_SIZE = 255 * 1024
+
+
+class FakeGridFsFile:
+    """
+    A GridFS file of zeros, which doesn't keep its data in memory.
+    """
+    chunk_size = GRIDFS_CHUNK_SIZE
+
+    def __init__(self, length):
+        self.length = length
+        self.position = 0
+
+    def seek(self, position):
+        self.position = position
+
+    def read(self, size):
+        size = max(0, min(size, self.length - self.position))
+        self.position += size
+        return bytes(size)
+
+
+@ddt.ddt
+@unittest.skip
+class StreamingAssetPerf(unittest.TestCase):
+    """
+    Checks the peak memory of serving a 1GB asset from the contentstore, in
+    full, in a range and in several ranges.
+    """
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def setUp(self):
+        super().setUp()
+        self.asset_key = CourseKey.from_string('course-v1:org+course+run').make_asset_key('asset', 'video.mp4')
+        for method, return_value in (
+            ('is_user_authorized', True),
+            ('is_cdn_request', False),
+            ('set_caching_headers', None),
+        ):
+            patcher = patch.object(StaticContentServer, method, return_value=return_value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _get_content(self, location):
+        return StaticContentStream(
+            location, 'video.mp4', 'video/mp4', FakeGridFsFile(ASSET_SIZE),
+            last_modified_at=datetime.datetime(2024, 1, 1), length=ASSET_SIZE, content_digest='f' * 32,
+        )
+
+    @ddt.data(
+        None,
+        'bytes=0-',
+        f'bytes=0-{ASSET_SIZE // 2}, {ASSET_SIZE // 2 + 1}-',
+    )
+    def test_streaming_memory(self, range_header):
+        """
+        Serve the asset, with a peak memory which doesn't depend on ASSET_SIZE.
+        """
+        request_kwargs = {'HTTP_RANGE': range_header} if range_header else {}
+        request = RequestFactory().get('/' + str(self.asset_key), **request_kwargs)
+        with patch.object(StaticContentServer, 'load_asset_from_location', self._get_content):
+            tracemalloc.start()
+            response = StaticContentServer().process_request(request)
+            served_size = sum(len(chunk) for chunk in response.streaming_content)
+            __, peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        assert served_size >= ASSET_SIZE
+        assert peak_memory < 16 * GRIDFS_CHUNK_SIZE
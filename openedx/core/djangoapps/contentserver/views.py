@@ -18,17 +18,22 @@ We've turned it into a proper view, with a few warts remaining:
   re-parse the URL to determine which pattern is in effect. We should probably
   have 3 views as entry points.
 """
+import calendar
 import datetime
 import logging
+from uuid import uuid4
 
 from django.http import (
+    FileResponse,
     HttpResponse,
     HttpResponseBadRequest,
     HttpResponseForbidden,
     HttpResponseNotFound,
-    HttpResponseNotModified,
-    HttpResponsePermanentRedirect
+    HttpResponsePermanentRedirect,
+    StreamingHttpResponse
 )
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 from django.views.decorators.http import require_safe
 from edx_django_utils.monitoring import set_custom_attribute
 from opaque_keys import InvalidKeyError
@@ -37,12 +42,13 @@ from opaque_keys.edx.locator import AssetLocator
 from common.djangoapps.student.models import CourseEnrollment
 from openedx.core.djangoapps.header_control import force_header_for_response
 from xmodule.assetstore.assetmgr import AssetManager
-from xmodule.contentstore.content import XASSET_LOCATION_TAG, StaticContent
+from xmodule.contentstore.content import XASSET_LOCATION_TAG, StaticContent, StaticContentStream
 from xmodule.exceptions import NotFoundError
 from xmodule.modulestore import InvalidLocationError
 from xmodule.modulestore.exceptions import ItemNotFoundError
 
 from .caching import get_cached_content, set_cached_content
+from .disk_cache import get_asset_disk_cache, stream_file_range
 from .models import CdnUserAgentsConfig, CourseAssetCacheTtlConfig
 
 
@@ -61,6 +67,15 @@ log = logging.getLogger(__name__)
 
 HTTP_DATE_FORMAT = "%a, %d %b %Y %H:%M:%S GMT"
 
+# Assets smaller than this (in bytes) are kept in the content cache. We cap this at 1MB
+# because it's the default for memcached and also we don't want to do too much
+# buffering in memory when we're serving an actual request.
+CONTENT_CACHE_MAX_LENGTH = 1048576
+
+# Requests for more byte ranges than this get the full content, since many small or
+# overlapping ranges make the server do much more work than the response is worth.
+MAX_BYTE_RANGES = 20
+
 
 class StaticContentServer():
     """
@@ -138,25 +153,31 @@ class StaticContentServer():
 
             # Figure out if the client sent us a conditional request, and let them know
             # if this asset has changed since then.
+            etag = quote_etag(content.content_digest) if content.content_digest else None
             last_modified_at_str = content.last_modified_at.strftime(HTTP_DATE_FORMAT)
-            if 'HTTP_IF_MODIFIED_SINCE' in request.META:
-                if_modified_since = request.META['HTTP_IF_MODIFIED_SINCE']
-                if if_modified_since == last_modified_at_str:
-                    return HttpResponseNotModified()
+            conditional_response = get_conditional_response(
+                request, etag=etag, last_modified=calendar.timegm(content.last_modified_at.utctimetuple()),
+            )
+            if conditional_response is not None:
+                return conditional_response
+
+            # Assets which are too large for the content cache may be in the local disk cache.
+            cached_file_path = self.get_cached_file_path(content, loc)
 
-            # *** File streaming within a byte range ***
+            # *** File streaming within byte ranges ***
             # If a Range is provided, parse Range attribute of the request
             # Add Content-Range in the response if Range is structurally correct
-            # Request -> Range attribute structure: "Range: bytes=first-[last]"
+            # Request -> Range attribute structure: "Range: bytes=first-[last][, first-[last]...]"
             # Response -> Content-Range attribute structure: "Content-Range: bytes first-last/totalLength"
-            # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.35
+            # Several ranges are sent as a multipart/byteranges message.
+            # https://www.rfc-editor.org/rfc/rfc7233
             response = None
-            if request.META.get('HTTP_RANGE'):
-                # If we have a StaticContent, get a StaticContentStream.  Can't manipulate the bytes otherwise.
-                if isinstance(content, StaticContent):
-                    content = AssetManager.find(loc, as_stream=True)
-
-                header_value = request.META['HTTP_RANGE']
+            content_type = content.content_type
+            header_value = request.META.get('HTTP_RANGE')
+            if header_value and not is_range_current(request, etag, last_modified_at_str):
+                # The client's copy of the asset is outdated, so it gets the full content.
+                header_value = None
+            if header_value:
                 try:
                     unit, ranges = parse_range_header(header_value, content.length)
                 except ValueError as exception:
@@ -169,36 +190,59 @@ class StaticContentServer():
                     if unit != 'bytes':
                         # Only accept ranges in bytes
                         log.warning("Unknown unit in Range header: %s for content: %s", header_value, str(loc))
-                    elif len(ranges) > 1:
-                        # According to Http/1.1 spec content for multiple ranges should be sent as a multipart message.
-                        # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
-                        # But we send back the full content.
+                    elif len(ranges) > MAX_BYTE_RANGES:
+                        # We send back the full content.
                         log.warning(
-                            "More than 1 ranges in Range header: %s for content: %s", header_value, str(loc)
+                            "More than %d ranges in Range header: %s for content: %s",
+                            MAX_BYTE_RANGES, header_value, str(loc)
                         )
                     else:
-                        first, last = ranges[0]
+                        # Unsatisfiable ranges are ignored, if any of the ranges is satisfiable.
+                        ranges = [(first, last) for first, last in ranges if 0 <= first <= last < content.length]
+                        if not ranges:
+                            log.warning(
+                                "Cannot satisfy ranges in Range header: %s for content: %s",
+                                header_value, str(loc)
+                            )
+                            response = HttpResponse(status=416)  # Requested Range Not Satisfiable
+                            response['Content-Range'] = f'bytes */{content.length}'
+                            return response
 
-                        if 0 <= first <= last < content.length:
-                            # If the byte range is satisfiable
-                            response = HttpResponse(content.stream_data_in_range(first, last))
+                        if len(ranges) == 1:
+                            first, last = ranges[0]
+                            response = StreamingHttpResponse(stream_range(content, cached_file_path, first, last))
                             response['Content-Range'] = 'bytes {first}-{last}/{length}'.format(
                                 first=first, last=last, length=content.length
                             )
                             response['Content-Length'] = str(last - first + 1)
-                            response.status_code = 206  # Partial Content
-
-                            set_custom_attribute('contentserver.ranged', True)
                         else:
-                            log.warning(
-                                "Cannot satisfy ranges in Range header: %s for content: %s",
-                                header_value, str(loc)
+                            boundary = uuid4().hex
+                            parts = get_multipart_byteranges_parts(content, ranges, boundary)
+                            response = StreamingHttpResponse(
+                                stream_multipart_byteranges(content, cached_file_path, parts, boundary)
                             )
-                            return HttpResponse(status=416)  # Requested Range Not Satisfiable
+                            response['Content-Length'] = str(get_multipart_byteranges_length(parts, boundary))
+                            content_type = f'multipart/byteranges; boundary={boundary}'
+                        response.status_code = 206  # Partial Content
+
+                        if cached_file_path:
+                            get_asset_disk_cache().record_bytes_served(sum(last - first + 1 for first, last in ranges))
+                        set_custom_attribute('contentserver.ranged', True)
+                        set_custom_attribute('contentserver.range_count', len(ranges))
 
             # If Range header is absent or syntactically invalid return a full content response.
             if response is None:
-                response = HttpResponse(content.stream_data())
+                if cached_file_path:
+                    # The file is sent with the server's file wrapper (sendfile) when it has one.
+                    response = FileResponse(open(cached_file_path, 'rb'))  # pylint: disable=consider-using-with
+                    # Don't name the asset after its cache file.
+                    del response['Content-Disposition']
+                    get_asset_disk_cache().record_bytes_served(content.length)
+                elif isinstance(content, StaticContentStream):
+                    # Stream the asset from the contentstore rather than loading it in memory.
+                    response = StreamingHttpResponse(content.stream_data())
+                else:
+                    response = HttpResponse(content.stream_data())
                 response['Content-Length'] = content.length
 
             set_custom_attribute('contentserver.content_len', content.length)
@@ -206,7 +250,7 @@ class StaticContentServer():
 
             # "Accept-Ranges: bytes" tells the user that only "bytes" ranges are allowed
             response['Accept-Ranges'] = 'bytes'
-            response['Content-Type'] = content.content_type
+            response['Content-Type'] = content_type
             response['X-Frame-Options'] = 'ALLOW'
 
             # Set any caching headers, and do any response cleanup needed.  Based on how much
@@ -214,6 +258,8 @@ class StaticContentServer():
             # utilities and properly sanitize and modify a response to ensure that it is as
             # cacheable as possible, which is why we do it ourselves.
             self.set_caching_headers(content, response)
+            if etag:
+                response['ETag'] = etag
 
             return response
 
@@ -309,15 +355,34 @@ class StaticContentServer():
             except (ItemNotFoundError, NotFoundError):  # lint-amnesty, pylint: disable=try-except-raise
                 raise
 
-            # Now that we fetched it, let's go ahead and try to cache it. We cap this at 1MB
-            # because it's the default for memcached and also we don't want to do too much
-            # buffering in memory when we're serving an actual request.
-            if content.length is not None and content.length < 1048576:
+            # Now that we fetched it, let's go ahead and try to cache it, if it's small enough.
+            if content.length is not None and content.length < CONTENT_CACHE_MAX_LENGTH:
                 content = content.copy_to_in_mem()
                 set_cached_content(content)
 
         return content
 
+    def get_cached_file_path(self, content, location):
+        """
+        Returns the path of the file with the data of the given content in the local
+        disk cache, or None if the data isn't cached, in which case it is added to the
+        cache in the background and the request is served from the contentstore.
+
+        Only assets which are streamed from the contentstore are cached on disk, since
+        the others are already in the content cache.
+        """
+        disk_cache = get_asset_disk_cache()
+        if disk_cache is None or not isinstance(content, StaticContentStream) or not disk_cache.is_cacheable(content):
+            return None
+
+        cached_file_path = disk_cache.get(content)
+        set_custom_attribute('contentserver.disk_cache_hit', cached_file_path is not None)
+        if cached_file_path is None:
+            disk_cache.add_in_background(content, lambda: AssetManager.find(location, as_stream=True))
+        set_custom_attribute('contentserver.disk_cache_hit_ratio', disk_cache.hit_ratio)
+        set_custom_attribute('contentserver.disk_cache_bytes_served', disk_cache.bytes_served)
+        return cached_file_path
+
 
 IMPL = StaticContentServer()
 
@@ -363,3 +428,61 @@ def parse_range_header(header_value, content_length):
         raise ValueError('Invalid syntax')
 
     return unit, ranges
+
+
+def is_range_current(request, etag, last_modified):
+    """
+    Returns whether the Range header of the request applies to the current version
+    of the asset, according to the If-Range header of the request.
+
+    See spec for details: https://www.rfc-editor.org/rfc/rfc7233#section-3.2
+    """
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/"')):
+        # Entity tags must match strongly, so weak ones never match.
+        return if_range == etag
+    return if_range == last_modified
+
+
+def stream_range(content, cached_file_path, first_byte, last_byte):
+    """
+    Returns an iterator over the data of the content between first_byte and last_byte
+    (included), read from the local disk cache if the content is cached.
+    """
+    if cached_file_path:
+        return stream_file_range(cached_file_path, first_byte, last_byte)
+    return content.stream_data_in_range(first_byte, last_byte)
+
+
+def get_multipart_byteranges_parts(content, ranges, boundary):
+    """
+    Returns the (headers, first, last) tuples of the parts of a multipart/byteranges
+    message with the given (first, last) ranges of the content.
+    """
+    parts = []
+    for first, last in ranges:
+        headers = f'\r\n--{boundary}\r\n'
+        if content.content_type:
+            headers += f'Content-Type: {content.content_type}\r\n'
+        headers += f'Content-Range: bytes {first}-{last}/{content.length}\r\n\r\n'
+        parts.append((headers.encode('latin-1'), first, last))
+    return parts
+
+
+def get_multipart_byteranges_length(parts, boundary):
+    """
+    Returns the length of the multipart/byteranges message with the given parts.
+    """
+    return sum(len(headers) + last - first + 1 for headers, first, last in parts) + len(f'\r\n--{boundary}--\r\n')
+
+
+def stream_multipart_byteranges(content, cached_file_path, parts, boundary):
+    """
+    Yields the multipart/byteranges message with the given parts of the content.
+    """
+    for headers, first, last in parts:
+        yield headers
+        yield from stream_range(content, cached_file_path, first, last)
+    yield f'\r\n--{boundary}--\r\n'.encode('latin-1')
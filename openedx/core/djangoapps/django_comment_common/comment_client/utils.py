@@ -2,16 +2,32 @@
 """" Common utilities for comment client wrapper """
 
 
+import json
 import logging
+import os
+import time
 from uuid import uuid4
 
 import requests
+from crum import get_current_request
+from django.conf import settings
 from django.utils.translation import get_language
+from edx_django_utils.cache import RequestCache
+from edx_django_utils.monitoring import accumulate, increment
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .settings import SERVICE_HOST as COMMENTS_SERVICE
 
 log = logging.getLogger(__name__)
 
+# The namespace of the request cache of the responses of the comments service.
+RESPONSES_REQUEST_CACHE_NAMESPACE = 'comment_client.responses'
+
+# The session shared by the requests to the comments service, and the process which created it.
+_SESSION = None
+_SESSION_PID = None
+
 
 def strip_none(dic):
     return {k: v for k, v in dic.items() if v is not None}  # lint-amnesty, pylint: disable=consider-using-dict-comprehension
@@ -30,6 +46,71 @@ def extract(dic, keys):
         return strip_none({k: dic.get(k) for k in keys})
 
 
+def get_session():
+    """
+    Returns the requests Session shared by the requests to the comments service
+    of this process, so that they reuse the connections of its pool rather than
+    each opening a new one.
+
+    GET requests, which are idempotent, are retried on connection and read errors.
+    """
+    global _SESSION, _SESSION_PID  # pylint: disable=global-statement
+    pid = os.getpid()
+    if _SESSION is None or _SESSION_PID != pid:
+        # Forked processes can't share the connections of their parent.
+        retries = getattr(settings, 'COMMENTS_SERVICE_GET_RETRIES', 0)
+        adapter = HTTPAdapter(
+            pool_maxsize=getattr(settings, 'COMMENTS_SERVICE_POOL_SIZE', 10),
+            max_retries=Retry(
+                total=retries, connect=retries, read=retries, status=0,
+                allowed_methods=frozenset(['GET']), backoff_factor=0.1, raise_on_status=False,
+            ),
+        )
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _SESSION, _SESSION_PID = session, pid
+    return _SESSION
+
+
+def send_request(method, url, **kwargs):
+    """
+    Sends a request to the comments service with the shared session, taking the
+    same arguments as requests.request.
+    """
+    return get_session().request(method, url, **kwargs)
+
+
+def _get_request_cache(namespace):
+    """
+    Returns the cache of the current Django request, or None outside of requests.
+    """
+    if get_current_request() is None:
+        return None
+    return RequestCache(namespace)
+
+
+def _get_responses_request_cache(method, url, params, headers):
+    """
+    Returns the request cache of the responses of GET requests and the key of the
+    given request in it, if identical GET requests are served from the cache within
+    a Django request, or (None, None).
+
+    Other requests clear the cache, since they may change the responses.
+    """
+    if not getattr(settings, 'COMMENTS_SERVICE_REQUEST_CACHE_ENABLED', False):
+        return None, None
+    request_cache = _get_request_cache(RESPONSES_REQUEST_CACHE_NAMESPACE)
+    if request_cache is None:
+        return None, None
+    if method.lower() != 'get':
+        request_cache.clear()
+        return None, None
+    # The request_id is unique to each request.
+    key_params = sorted((key, str(value)) for key, value in params.items() if key != 'request_id')
+    return request_cache, json.dumps([url, key_params, headers['Accept-Language']])
+
+
 def perform_request(method, url, data_or_params=None, raw=False,
                     metric_action=None, metric_tags=None, paged_results=False):
     # To avoid dependency conflict
@@ -62,7 +143,17 @@ def perform_request(method, url, data_or_params=None, raw=False,
         data = None
         params = data_or_params.copy()
         params.update(request_id_dict)
-    response = requests.request(
+
+    request_cache, cache_key = _get_responses_request_cache(method, url, params, headers)
+    if request_cache is not None:
+        cached_response = request_cache.get_cached_response(cache_key)
+        if cached_response.is_found:
+            increment('comments_service.cached_request_count')
+            # The response is parsed again, since callers may modify the data.
+            return cached_response.value if raw else json.loads(cached_response.value)
+
+    start_time = time.perf_counter()
+    response = send_request(
         method,
         url,
         data=data,
@@ -70,6 +161,8 @@ def perform_request(method, url, data_or_params=None, raw=False,
         headers=headers,
         timeout=config.connection_timeout
     )
+    increment('comments_service.request_count')
+    accumulate('comments_service.request_time', time.perf_counter() - start_time)
 
     metric_tags.append(f'status_code:{response.status_code}')
     status_code = int(response.status_code)
@@ -88,7 +181,7 @@ def perform_request(method, url, data_or_params=None, raw=False,
         raise CommentClient500Error(response.text)
     else:
         if raw:
-            return response.text
+            data = response.text
         else:
             try:
                 data = response.json()
@@ -99,7 +192,9 @@ def perform_request(method, url, data_or_params=None, raw=False,
                         content=response.text[:100]
                     )
                 )
-            return data
+        if request_cache is not None:
+            request_cache.set(cache_key, response.text)
+        return data
 
 
 class CommentClientError(Exception):
@@ -14,9 +14,11 @@ This is used by capa_block.
 """
 
 
+import hashlib
 import logging
 import os.path
 import re
+import threading
 from collections import OrderedDict
 from copy import deepcopy
 from datetime import datetime
@@ -75,6 +77,9 @@ html_problem_semantics = [
     "openendedrubric",
 ]
 
+# The maximum number of parsed problem trees kept in the process-local cache.
+PROBLEM_TEMPLATE_CACHE_SIZE = 512
+
 log = logging.getLogger(__name__)
 
 #-----------------------------------------------------------------------------
@@ -126,6 +131,50 @@ class LoncapaSystem(object):
         self.matlab_api_key = matlab_api_key
 
 
+class _ProblemTemplateCache:
+    """
+    A process-local, thread-safe LRU cache of the parsed (and compatibility-translated)
+    XML trees of problems, keyed by the hash of the problem text.
+
+    The trees in the cache must not be modified: problems work on copies of them.
+    """
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            tree = self._entries.get(key)
+            if tree is not None:
+                self._entries.move_to_end(key)
+            return tree
+
+    def set(self, key, tree):
+        with self._lock:
+            self._entries[key] = tree
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_PROBLEM_TEMPLATE_CACHE = _ProblemTemplateCache(PROBLEM_TEMPLATE_CACHE_SIZE)
+
+
+def clear_problem_template_cache():
+    """
+    Empty the process-local cache of parsed problem trees.
+    """
+    _PROBLEM_TEMPLATE_CACHE.clear()
+
+
 class LoncapaProblem(object):
     """
     Main class for capa Problems.
@@ -187,23 +236,31 @@ class LoncapaProblem(object):
         problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
         self.problem_text = problem_text
 
-        # parse problem XML file into an element tree
+        # parse problem XML file into an element tree, or copy the parsed tree of the same problem text
         if isinstance(problem_text, str):
             # etree chokes on Unicode XML with an encoding declaration
             problem_text = problem_text.encode('utf-8')
-        self.tree = XML(problem_text)
+        template_key = hashlib.sha1(problem_text).hexdigest()
+        template = _PROBLEM_TEMPLATE_CACHE.get(template_key)
+        if template is not None:
+            self.tree = deepcopy(template)
+        else:
+            self.tree = XML(problem_text)
 
-        try:
-            self.make_xml_compatible(self.tree)
-        except Exception:
-            capa_block = self.capa_block
-            log.exception(
-                "CAPAProblemError: %s, id:%s, data: %s",
-                capa_block.display_name,
-                self.problem_id,
-                capa_block.data
-            )
-            raise
+            try:
+                self.make_xml_compatible(self.tree)
+            except Exception:
+                capa_block = self.capa_block
+                log.exception(
+                    "CAPAProblemError: %s, id:%s, data: %s",
+                    capa_block.display_name,
+                    self.problem_id,
+                    capa_block.data
+                )
+                raise
+
+            # Everything after this point depends on the problem's id, seed or course, and modifies the tree.
+            _PROBLEM_TEMPLATE_CACHE.set(template_key, deepcopy(self.tree))
 
         # handle any <include file="foo"> tags
         self._process_includes()
@@ -52,6 +52,7 @@ from .util import (
     get_inner_html_from_xpath,
     is_list_of_files
 )
+from .vectorized_calc import evaluate_samples
 
 log = logging.getLogger(__name__)
 
@@ -3084,6 +3085,12 @@ class FormulaResponse(LoncapaResponse):
         """
         _ = self.capa_system.i18n.gettext
 
+        # Evaluate the answer for all of the test cases at once, if it can be; otherwise (including
+        # when evaluating it is an error), evaluate it for each test case.
+        out = evaluate_samples(var_dict_list, answer, case_sensitive=self.case_sensitive)
+        if out is not None:
+            return out
+
         out = []
         for var_dict in var_dict_list:
             try:
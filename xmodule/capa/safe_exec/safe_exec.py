@@ -8,6 +8,7 @@ from edx_django_utils.monitoring import function_trace
 
 from . import lazymod
 from .remote_exec import is_codejail_rest_service_enabled, get_remote_exec
+from .worker_pool import get_worker_pool, is_codejail_worker_pool_enabled
 
 # Establish the Python environment for Capa.
 # Capa assumes float-friendly division always.
@@ -158,6 +159,8 @@ def safe_exec(
         # Decide which code executor to use.
         if unsafely:
             exec_fn = codejail_not_safe_exec
+        elif is_codejail_worker_pool_enabled():
+            exec_fn = get_worker_pool().safe_exec
         else:
             exec_fn = codejail_safe_exec
 
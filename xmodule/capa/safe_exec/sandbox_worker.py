@@ -0,0 +1,190 @@
+"""
+A warm sandbox worker, run by worker_pool.SandboxWorkerPool.
+
+This module is only imported to get its source, which is run by the sandboxed
+Python (with `python -c`), which may only have the sandbox requirements installed, so it
+must only use the standard library and the modules it imports warm.
+
+The worker imports the modules that Capa code usually uses once, and then
+reads jobs from its stdin, one JSON object per line. Each job is run in a
+forked child process, so that it starts with the warm imports but can't
+affect the worker or the jobs run after it. The result of each job is
+written to the original stdout as one JSON object per line. The child's own
+stdin and stdout are /dev/null, and its stderr is the worker's stderr.
+
+Since the child can read the worker's memory, the worker keeps nothing from
+a job once it has run it, such as its code or its result. The child runs in
+its own process group, which is killed when the job ends, and the worker is
+the subreaper of its descendants (on Linux), so that the processes started
+by a job, even in another process group, are killed when it ends rather
+than running alongside the later jobs.
+"""
+import ctypes
+import ctypes.util
+import json
+import os
+import resource
+import signal
+import sys
+import time
+import traceback
+
+# The modules imported by the worker, so that jobs don't have to import them.
+WARM_IMPORTS = [
+    "random2", "six", "numpy", "math", "scipy", "calc", "eia",
+    "chem.chemcalc", "chem.chemtools", "chem.miller", "verifiers.draganddrop",
+]
+
+# The prctl option to make a process the subreaper of its orphaned descendants.
+PR_SET_CHILD_SUBREAPER = 36
+
+
+class DevNull:
+    """
+    A file which discards what is written to it, for sys.stdout.
+    """
+    def write(self, *args, **kwargs):
+        pass
+
+    def flush(self, *args, **kwargs):
+        pass
+
+
+def run_job(job, result_fd):
+    """
+    Run the job, in a forked child process, and write its result to result_fd.
+    """
+    result = {}
+    try:
+        os.chdir(job["dir"])
+        os.environ["TMPDIR"] = "tmp"
+        if job["cpu"]:
+            # As codejail does, the soft limit sends a SIGXCPU before the hard limit kills.
+            resource.setrlimit(resource.RLIMIT_CPU, (job["cpu"], job["cpu"] + 1))
+        for path in job["python_path"]:
+            sys.path.append(path)
+        sys.stdout = DevNull()
+        code_object = compile(job.pop("code"), "jailed_code", "exec")
+        g_dict = job["globals"]
+        run_start = time.time()
+        result["startup"] = run_start - job["received"]
+        exec(code_object, g_dict)  # pylint: disable=exec-used
+        result["run"] = time.time() - run_start
+        result["globals"] = json_safe(g_dict)  # pylint: disable=undefined-variable
+    except BaseException:  # pylint: disable=broad-except
+        result["error"] = traceback.format_exc()
+    with os.fdopen(result_fd, "w") as result_file:
+        json.dump(result, result_file)
+
+
+def set_child_subreaper():
+    """
+    Make this process the parent of its orphaned descendants, if the platform supports it.
+    """
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        libc.prctl(PR_SET_CHILD_SUBREAPER, 1, 0, 0, 0)
+    except (AttributeError, OSError, TypeError):
+        pass
+
+
+def kill_children():
+    """
+    Kill and reap the remaining child processes of this process, which are the
+    processes started by the last job and orphaned (see set_child_subreaper).
+    """
+    while True:
+        try:
+            pid, __ = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid:
+            continue
+        parent_pid = str(os.getpid())
+        try:
+            entries = os.listdir("/proc")
+        except OSError:
+            return
+        for entry in entries:
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/stat") as stat_file:
+                    # The parent pid is the second field after the command, which is in parentheses.
+                    stat_fields = stat_file.read().rsplit(")", 1)[1].split()
+                if stat_fields[1] == parent_pid:
+                    os.kill(int(entry), signal.SIGKILL)
+            except (OSError, IndexError):
+                pass
+        # Reap the killed processes, and kill their children, now orphaned too.
+        time.sleep(0.01)
+
+
+def run_job_in_child(line, jobs, results):
+    """
+    Run the job of the given line in a forked child process, and write its result to results.
+
+    The job is only referenced from this function, so that the children of later
+    jobs can't read it from the frames of the worker.
+    """
+    job = json.loads(line)
+    job["received"] = time.time()
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.setpgid(0, 0)
+            jobs.close()
+            results.close()
+            os.close(read_fd)
+            run_job(job, write_fd)
+        finally:
+            os._exit(0)  # pylint: disable=protected-access
+
+    # Also set in the parent, so that the process group exists before it is killed.
+    try:
+        os.setpgid(pid, pid)
+    except OSError:
+        pass
+    os.close(write_fd)
+    with os.fdopen(read_fd, "r") as result_file:
+        output = result_file.read()
+    __, status = os.waitpid(pid, 0)
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except OSError:
+        pass
+    kill_children()
+    if os.WIFSIGNALED(status):
+        result = {"status": -os.WTERMSIG(status)}
+    else:
+        result = json.loads(output) if output else {}
+        result["status"] = 1 if "error" in result else os.WEXITSTATUS(status)
+    results.write(json.dumps(result) + "\n")
+    results.flush()
+
+
+def main():
+    """
+    Run the jobs read from stdin, until it's closed.
+    """
+    # As in safe_exec.CODE_PROLOG (see TNL-6456), and so that numpy has no threads which the forks would lose.
+    os.environ["OPENBLAS_NUM_THREADS"] = "1"
+    for module_name in WARM_IMPORTS:
+        try:
+            __import__(module_name)
+        except Exception:  # pylint: disable=broad-except
+            pass
+    set_child_subreaper()
+
+    # Only the worker uses the original stdin and stdout, to receive jobs and send results.
+    jobs = os.fdopen(os.dup(0), "r")
+    results = os.fdopen(os.dup(1), "w")
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+
+    results.write(json.dumps({"ready": True}) + "\n")
+    results.flush()
+    for line in jobs:
+        run_job_in_child(line, jobs, results)
@@ -0,0 +1,191 @@
+"""Test worker_pool.py"""
+
+
+import os
+import textwrap
+import threading
+import unittest
+from unittest.mock import patch
+
+from codejail.safe_exec import SafeExecException
+from django.test import override_settings
+
+from xmodule.capa.safe_exec import safe_exec
+from xmodule.capa.safe_exec import worker_pool
+from xmodule.capa.safe_exec.worker_pool import EXEC_LATENCY, SandboxWorkerPool
+
+
+class TestSandboxWorkerPool(unittest.TestCase):
+    """
+    Tests running code in a pool of sandbox workers.
+    """
+    def setUp(self):
+        super().setUp()
+        self.pool = SandboxWorkerPool(size=2, max_jobs_per_worker=3)
+        self.addCleanup(self.pool.close)
+        EXEC_LATENCY.reset()
+
+    def test_set_values(self):
+        g = {'b': 2}
+        self.pool.safe_exec("a = 17 + b", g)
+        assert g == {'a': 19, 'b': 2}
+
+    def test_warm_imports(self):
+        g = {}
+        self.pool.safe_exec("import math\na = int(math.pi)", g)
+        assert g['a'] == 3
+
+    def test_error(self):
+        with self.assertRaisesRegex(SafeExecException, "Couldn't execute jailed code.*ZeroDivisionError"):
+            self.pool.safe_exec("a = 1/0", {})
+        # The worker is still usable.
+        g = {}
+        self.pool.safe_exec("a = 1", g)
+        assert g['a'] == 1
+
+    def test_syntax_error(self):
+        with self.assertRaisesRegex(SafeExecException, "SyntaxError"):
+            self.pool.safe_exec("a = ", {})
+
+    def test_executions_are_isolated(self):
+        g = {}
+        self.pool.safe_exec("import sys\nsys.modules['math'].leaked = True\nleaked_var = 1", g)
+        g = {}
+        self.pool.safe_exec("import math\na = hasattr(math, 'leaked')\nb = 'leaked_var' in globals()", g)
+        assert g['a'] is False
+        assert g['b'] is False
+
+    def test_previous_executions_are_not_readable(self):
+        self.pool.safe_exec("secret = 'previous-execution'", {})
+        g = {}
+        self.pool.safe_exec(textwrap.dedent("""\
+            import gc, sys
+            def find(needle):
+                frame = sys._getframe().f_back.f_back
+                while frame:
+                    if needle in repr(frame.f_locals):
+                        return True
+                    frame = frame.f_back
+                return any(
+                    needle in repr(obj) for obj in gc.get_objects()
+                    if isinstance(obj, (dict, list)) and obj is not globals()
+                )
+            found = find(''.join(['previous-', 'execution']))
+            """), g)
+        assert g['found'] is False
+
+    def test_started_processes_are_killed(self):
+        g = {}
+        self.pool.safe_exec(textwrap.dedent("""\
+            import subprocess, sys
+            command = [sys.executable, '-c', 'import time; time.sleep(60)']
+            pids = [subprocess.Popen(command).pid, subprocess.Popen(command, start_new_session=True).pid]
+            """), g)
+        for pid in g['pids']:
+            with self.assertRaises(ProcessLookupError):
+                os.kill(pid, 0)
+
+    def test_workers_are_reused_and_recycled(self):
+        pids = []
+        for _ in range(4):
+            g = {}
+            self.pool.safe_exec("import os\npid = os.getppid()", g)
+            pids.append(g['pid'])
+        # A worker runs 3 jobs before being replaced.
+        assert pids[0] == pids[1] == pids[2]
+        assert pids[3] != pids[0]
+
+    def test_callers_waiting_for_a_recycled_worker(self):
+        pool = SandboxWorkerPool(size=1, max_jobs_per_worker=2)
+        self.addCleanup(pool.close)
+        results = []
+
+        def run():
+            g = {}
+            pool.safe_exec("import os, time\ntime.sleep(0.2)\npid = os.getppid()", g)
+            results.append(g['pid'])
+
+        # The callers wait for the only worker, which is replaced after two of them.
+        threads = [threading.Thread(target=run) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=30)
+            assert not thread.is_alive()
+        assert len(results) == 3
+        assert len(set(results)) == 2
+
+    def test_stdout_is_discarded(self):
+        g = {}
+        self.pool.safe_exec("print('hello')\na = 1", g)
+        assert g['a'] == 1
+
+    def test_python_path_and_extra_files(self):
+        pylib = os.path.join(os.path.dirname(__file__), "test_files/pylib")
+        g = {}
+        self.pool.safe_exec(
+            textwrap.dedent("""\
+                import constant, module_from_extra_file
+                a = constant.THE_CONST + module_from_extra_file.VALUE
+                with open("extra.txt") as f:
+                    b = f.read()
+                """),
+            g,
+            python_path=[pylib],
+            extra_files=[("extra.txt", b"extra"), ("module_from_extra_file.py", b"VALUE = 1\n")],
+        )
+        assert g['a'] == 24
+        assert g['b'] == "extra"
+
+    @patch('codejail.jail_code.LIMITS', {'CPU': 0, 'VMEM': 0, 'FSIZE': 0, 'NPROC': 0, 'REALTIME': 1, 'PROXY': 0})
+    def test_timeout(self):
+        with self.assertRaisesRegex(SafeExecException, "Couldn't execute jailed code"):
+            self.pool.safe_exec("import time\ntime.sleep(10)", {})
+        # The killed worker is replaced.
+        g = {}
+        self.pool.safe_exec("a = 1", g)
+        assert g['a'] == 1
+
+    @patch('xmodule.capa.safe_exec.worker_pool.codejail_safe_exec')
+    @patch('codejail.jail_code.LIMIT_OVERRIDES', {'course': {'CPU': 5}})
+    def test_limit_overrides_use_codejail(self, mock_codejail_safe_exec):
+        self.pool.safe_exec("a = 1", {}, limit_overrides_context='course')
+        assert mock_codejail_safe_exec.called
+
+    def test_latency_histogram(self):
+        self.pool.safe_exec("a = 1", {})
+        self.pool.safe_exec("a = 1", {})
+        snapshot = EXEC_LATENCY.snapshot()
+        assert sum(count for __, count in snapshot['queue']) == 2
+        # The startup of the worker, and of each job.
+        assert sum(count for __, count in snapshot['startup']) == 3
+        assert sum(count for __, count in snapshot['run']) == 2
+        assert snapshot['run'][-1][0] is None
+
+
+class TestSafeExecWithWorkerPool(unittest.TestCase):
+    """
+    Tests dispatching safe_exec to the worker pool.
+    """
+    def setUp(self):
+        super().setUp()
+        pool = SandboxWorkerPool(size=1, max_jobs_per_worker=10)
+        self.addCleanup(pool.close)
+        patcher = patch.object(worker_pool, '_WORKER_POOL', pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @override_settings(ENABLE_CODEJAIL_WORKER_POOL=True)
+    def test_uses_worker_pool(self):
+        EXEC_LATENCY.reset()
+        g = {}
+        safe_exec("rnums = [random.randint(0, 999) for _ in xrange(5)]", g, random_seed=17)
+        assert sum(count for __, count in EXEC_LATENCY.snapshot()['run']) == 1
+        expected = {}
+        safe_exec("rnums = [random.randint(0, 999) for _ in xrange(5)]", expected, random_seed=17, unsafely=True)
+        assert g['rnums'] == expected['rnums']
+
+    def test_disabled_by_default(self):
+        with patch.object(SandboxWorkerPool, 'safe_exec') as mock:
+            safe_exec("a = 1", {})
+        assert not mock.called
@@ -0,0 +1,368 @@
+"""
+A pool of warm sandbox workers for Capa's safe_exec.
+
+codejail's safe_exec starts a new sandboxed Python process for each
+execution, which then has to import the modules that Capa code uses
+(numpy, scipy...): this startup usually takes much longer than running the
+code. The workers of a :class:`SandboxWorkerPool` are long-lived sandboxed
+processes which import those modules once, and run each execution in a
+forked child process (see sandbox_worker.py), so that executions are still
+isolated from each other.
+
+Workers are run as codejail's sandboxed Python command, with codejail's
+resource limits (configured from ``settings.CODE_JAIL['limits']``): the
+memory and file size limits apply to the whole worker, the CPU limit to each
+execution, and executions which take longer than the real time limit are
+killed along with their worker. If codejail isn't configured, the workers
+run unsandboxed with the current Python, as codejail's not_safe_exec would.
+
+The time spent waiting for a worker, starting the execution, and running it
+is recorded in :data:`EXEC_LATENCY`.
+"""
+import bisect
+import functools
+import inspect
+import json
+import logging
+import os
+import select
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from codejail import jail_code
+from codejail.safe_exec import SafeExecException, json_safe
+from codejail.safe_exec import safe_exec as codejail_safe_exec
+from codejail.subproc import set_process_limits
+from django.conf import settings
+from edx_django_utils import monitoring as monitoring_utils
+from edx_toggles.toggles import SettingToggle
+
+from . import sandbox_worker
+
+log = logging.getLogger(__name__)
+
+# .. toggle_name: ENABLE_CODEJAIL_WORKER_POOL
+# .. toggle_implementation: SettingToggle
+# .. toggle_default: False
+# .. toggle_description: Set this to True to run Capa's sandboxed Python code in a pool of warm sandbox workers
+#   (see CODE_JAIL_WORKER_POOL_SIZE and CODE_JAIL_WORKER_POOL_MAX_JOBS), instead of starting a new sandboxed
+#   process for each execution. Has no effect if ENABLE_CODEJAIL_REST_SERVICE is True.
+# .. toggle_use_cases: open_edx
+# .. toggle_creation_date: 2026-10-18
+ENABLE_CODEJAIL_WORKER_POOL = SettingToggle(
+    "ENABLE_CODEJAIL_WORKER_POOL", default=False, module_name=__name__
+)
+
+# The source of the workers' program.
+WORKER_CODE = "".join([
+    inspect.getsource(sandbox_worker),
+    inspect.getsource(json_safe),
+    "\nmain()\n",
+])
+
+
+def is_codejail_worker_pool_enabled():
+    return ENABLE_CODEJAIL_WORKER_POOL.is_enabled()
+
+
+class LatencyHistogram:
+    """
+    Counts of durations in buckets, for each of the phases of an execution.
+    """
+    # The upper bounds of the buckets, in milliseconds. The last bucket has no upper bound.
+    BUCKET_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+    PHASES = ('queue', 'startup', 'run')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {phase: [0] * (len(self.BUCKET_BOUNDS_MS) + 1) for phase in self.PHASES}
+
+    def record(self, phase, duration):
+        """
+        Records a duration (in seconds) of the given phase.
+        """
+        duration_ms = duration * 1000
+        with self._lock:
+            self._counts[phase][bisect.bisect_left(self.BUCKET_BOUNDS_MS, duration_ms)] += 1
+        monitoring_utils.accumulate(f'safe_exec.worker_pool.{phase}_ms', duration_ms)
+
+    def snapshot(self):
+        """
+        Returns a dict mapping each phase to a list of (upper bound in ms, count) pairs,
+        the last of which has an upper bound of None.
+        """
+        bounds = self.BUCKET_BOUNDS_MS + (None,)
+        with self._lock:
+            return {phase: list(zip(bounds, counts)) for phase, counts in self._counts.items()}
+
+    def reset(self):
+        with self._lock:
+            for counts in self._counts.values():
+                counts[:] = [0] * len(counts)
+
+
+# The latency of the executions run by worker pools in this process.
+EXEC_LATENCY = LatencyHistogram()
+
+
+class _SandboxWorker:
+    """
+    A sandboxed sandbox_worker.py process, and the directory where it runs jobs.
+    """
+    def __init__(self, limits):
+        self.jobs_run = 0
+        self.home_dir = tempfile.mkdtemp(prefix="codejail-worker-")
+        # The sandbox user needs to be able to read the jobs' files.
+        os.chmod(self.home_dir, 0o775)
+
+        python = jail_code.COMMANDS.get("python")
+        self.user = python['user'] if python else None
+        cmd = []
+        if self.user:
+            cmd.extend(['sudo', '-u', self.user])
+        cmd.extend(python['cmdline_start'] if python else [sys.executable, '-E', '-B'])
+        cmd.extend(['-c', WORKER_CODE])
+
+        rlimits = jail_code.create_rlimits(dict(limits, CPU=0))
+        if not self.user:
+            # The process limit would count the processes of the current user.
+            rlimits = [(limit, value) for limit, value in rlimits if limit != jail_code.resource.RLIMIT_NPROC]
+
+        self.process = subprocess.Popen(  # pylint: disable=consider-using-with, subprocess-popen-preexec-fn
+            cmd, cwd=self.home_dir, env={},
+            preexec_fn=functools.partial(set_process_limits, rlimits),
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        )
+
+    def read_result(self, timeout):
+        """
+        Returns the next result written by the worker, or None if it doesn't
+        write one before the timeout (in seconds, or None for no timeout).
+        """
+        readable, __, __ = select.select([self.process.stdout], [], [], timeout)
+        if not readable:
+            return None
+        line = self.process.stdout.readline()
+        if not line:
+            return None
+        return json.loads(line)
+
+    def run(self, job, job_dir, timeout):
+        """
+        Sends the job to the worker, and returns its result, or None if the
+        worker didn't return it before the timeout.
+        """
+        self.jobs_run += 1
+        self.process.stdin.write(json.dumps(dict(job, dir=job_dir)).encode('utf-8') + b'\n')
+        self.process.stdin.flush()
+        return self.read_result(timeout)
+
+    def close(self):
+        """
+        Stops the worker, killing it if it's running a job, and removes its directory.
+        """
+        if self.process.poll() is None:
+            try:
+                pgid = os.getpgid(self.process.pid)
+            except ProcessLookupError:
+                pass
+            else:
+                if self.user:
+                    # As codejail does: the process was started with sudo, so it must be killed with sudo.
+                    subprocess.call(["sudo", "pkill", "-9", "-g", str(pgid)])
+                else:
+                    os.killpg(pgid, 9)
+        self.process.wait()
+        self.process.stdin.close()
+        self.process.stdout.close()
+        shutil.rmtree(self.home_dir, ignore_errors=True)
+
+
+class SandboxWorkerPool:
+    """
+    A pool of at most `size` warm sandbox workers, each of which is replaced
+    after running `max_jobs_per_worker` jobs.
+
+    Its `safe_exec` method can be used in place of codejail's safe_exec.
+    """
+    # The maximum time, in seconds, to wait for a new worker to import its modules.
+    STARTUP_TIMEOUT = 30
+
+    def __init__(self, size, max_jobs_per_worker):
+        self.size = size
+        self.max_jobs_per_worker = max_jobs_per_worker
+        # The idle workers, the most recently used last.
+        self._idle_workers = []
+        # Notified when a worker becomes idle or is discarded.
+        self._condition = threading.Condition()
+        self._num_workers = 0
+        self._closed = False
+
+    def safe_exec(
+            self,
+            code,
+            globals_dict,
+            files=None,
+            python_path=None,
+            limit_overrides_context=None,
+            slug=None,
+            extra_files=None,
+    ):
+        """
+        Executes the code as codejail's safe_exec does, in a warm worker.
+
+        The workers are started with the default limits, so code whose limits
+        are overridden is executed by codejail's safe_exec instead.
+        """
+        limits = jail_code.get_effective_limits(limit_overrides_context)
+        if limits != jail_code.get_effective_limits():
+            codejail_safe_exec(
+                code, globals_dict, files=files, python_path=python_path,
+                limit_overrides_context=limit_overrides_context, slug=slug, extra_files=extra_files,
+            )
+            return
+
+        queue_start = time.time()
+        worker = self._get_worker(limits)
+        EXEC_LATENCY.record('queue', time.time() - queue_start)
+        if slug:
+            log.info("Executing jailed code %s in worker with PID %s", slug, worker.process.pid)
+
+        job_dir = tempfile.mkdtemp(dir=worker.home_dir)
+        result = None
+        try:
+            self._copy_files(job_dir, files, python_path, extra_files)
+            job = {
+                'code': code,
+                'globals': json_safe(globals_dict),
+                'python_path': [os.path.basename(path) for path in python_path or ()],
+                'cpu': limits['CPU'],
+            }
+            result = worker.run(job, job_dir, limits['REALTIME'] or None)
+        finally:
+            if result is None:
+                # The worker is broken, or still running the job: discard it.
+                log.warning("Discarding sandbox worker with PID %s", worker.process.pid)
+                self._discard_worker(worker)
+            else:
+                shutil.rmtree(job_dir, ignore_errors=True)
+                self._release_worker(worker)
+
+        if result is None:
+            # As codejail's status when it kills code which runs for too long.
+            result = {'status': -9}
+        if 'startup' in result:
+            EXEC_LATENCY.record('startup', result['startup'])
+        if 'run' in result:
+            EXEC_LATENCY.record('run', result['run'])
+        if result['status'] != 0:
+            # The same message as codejail's, where stderr would have the traceback.
+            raise SafeExecException(
+                "Couldn't execute jailed code: stdout: b'', stderr: {stderr!r} with status code: {status}".format(
+                    stderr=result.get('error', '').encode('utf-8'),
+                    status=result['status'],
+                )
+            )
+        globals_dict.update(result['globals'])
+
+    def close(self):
+        """
+        Stops all the idle workers of the pool, and the busy ones once they're released.
+        """
+        with self._condition:
+            self._closed = True
+            idle_workers = self._idle_workers
+            self._idle_workers = []
+        for worker in idle_workers:
+            self._discard_worker(worker)
+
+    def _get_worker(self, limits):
+        """
+        Returns an idle worker, starting one if none is idle and the pool isn't full,
+        or else waiting for one.
+        """
+        with self._condition:
+            while not self._idle_workers and self._num_workers >= self.size:
+                self._condition.wait()
+            if self._idle_workers:
+                return self._idle_workers.pop()
+            self._num_workers += 1
+
+        try:
+            startup_start = time.time()
+            worker = _SandboxWorker(limits)
+            ready = worker.read_result(self.STARTUP_TIMEOUT)
+            EXEC_LATENCY.record('startup', time.time() - startup_start)
+        except Exception:
+            with self._condition:
+                self._num_workers -= 1
+                self._condition.notify()
+            raise
+        if not ready:
+            self._discard_worker(worker)
+            raise SafeExecException("Couldn't start a sandbox worker")
+        return worker
+
+    def _release_worker(self, worker):
+        with self._condition:
+            if not self._closed and worker.jobs_run < self.max_jobs_per_worker:
+                self._idle_workers.append(worker)
+                self._condition.notify()
+                return
+        self._discard_worker(worker)
+
+    def _discard_worker(self, worker):
+        with self._condition:
+            # A caller waiting for a worker can start a new one.
+            self._num_workers -= 1
+            self._condition.notify()
+        worker.close()
+
+    @staticmethod
+    def _copy_files(job_dir, files, python_path, extra_files):
+        """
+        Copies the files of a job to its directory, as codejail's jail_code does.
+        """
+        os.chmod(job_dir, 0o775)
+        tmp_dir = os.path.join(job_dir, "tmp")
+        os.mkdir(tmp_dir)
+        os.chmod(tmp_dir, 0o777)
+
+        extra_names = {name for name, __ in extra_files or ()}
+        files = list(files or ())
+        files.extend(path for path in python_path or () if os.path.basename(path) not in extra_names)
+        for filename in files:
+            dest = os.path.join(job_dir, os.path.basename(filename))
+            if os.path.islink(filename):
+                os.symlink(os.readlink(filename), dest)
+            elif os.path.isfile(filename):
+                shutil.copy(filename, job_dir)
+            else:
+                shutil.copytree(filename, dest, symlinks=True)
+        for name, contents in extra_files or ():
+            with open(os.path.join(job_dir, name), "wb") as extra_file:
+                extra_file.write(contents)
+
+
+_WORKER_POOL = None
+_WORKER_POOL_LOCK = threading.Lock()
+
+
+def get_worker_pool():
+    """
+    Returns the sandbox worker pool of this process, configured by the
+    CODE_JAIL_WORKER_POOL_SIZE and CODE_JAIL_WORKER_POOL_MAX_JOBS settings.
+    """
+    global _WORKER_POOL  # pylint: disable=global-statement
+    with _WORKER_POOL_LOCK:
+        if _WORKER_POOL is None:
+            _WORKER_POOL = SandboxWorkerPool(
+                settings.CODE_JAIL_WORKER_POOL_SIZE,
+                settings.CODE_JAIL_WORKER_POOL_MAX_JOBS,
+            )
+        return _WORKER_POOL
@@ -2,6 +2,7 @@
 Test capa problem.
 """
 import textwrap
+import timeit
 import unittest
 from unittest.mock import patch, MagicMock
 
@@ -12,6 +13,7 @@ import ddt
 from lxml import etree
 from markupsafe import Markup
 
+from xmodule.capa.capa_problem import _PROBLEM_TEMPLATE_CACHE, clear_problem_template_cache
 from xmodule.capa.correctmap import CorrectMap
 from xmodule.capa.responsetypes import LoncapaProblemError
 from xmodule.capa.tests.helpers import new_loncapa_problem
@@ -840,3 +842,103 @@ class CAPAProblemReportHelpersTest(unittest.TestCase):
             with self.assertRaises(Exception):
                 problem.get_grade_from_current_answers(None, correct_map)
             responder_mock.evaluate_answers.assert_not_called()
+
+
+RANDOMIZED_PROBLEM_XML = """
+<problem>
+    <script type="loncapa/python">
+import random
+number = random.randint(1, 1000)
+    </script>
+    <p>What is $number?</p>
+    <numericalresponse answer="$number">
+        <formulaequationinput/>
+    </numericalresponse>
+    <optionresponse>
+        <optioninput>
+            <option correct="False">red</option>
+            <option correct="True">blue</option>
+        </optioninput>
+    </optionresponse>
+</problem>
+"""
+
+
+class ProblemTemplateCacheTest(unittest.TestCase):
+    """
+    Tests for the cache of parsed problem trees.
+    """
+    def setUp(self):
+        super().setUp()
+        clear_problem_template_cache()
+        self.addCleanup(clear_problem_template_cache)
+
+    def test_cached_problems_match_parsed_problems(self):
+        for seed in (1, 2, 3):
+            problem = new_loncapa_problem(RANDOMIZED_PROBLEM_XML, seed=seed)
+            clear_problem_template_cache()
+            parsed_problem = new_loncapa_problem(RANDOMIZED_PROBLEM_XML, seed=seed)
+            assert len(_PROBLEM_TEMPLATE_CACHE) == 1
+            cached_problem = new_loncapa_problem(RANDOMIZED_PROBLEM_XML, seed=seed)
+
+            assert cached_problem.context['number'] == parsed_problem.context['number'] == problem.context['number']
+            assert etree.tostring(cached_problem.tree) == etree.tostring(parsed_problem.tree)
+            assert cached_problem.get_html() == parsed_problem.get_html()
+
+    def test_problems_dont_share_trees(self):
+        problem_1 = new_loncapa_problem(RANDOMIZED_PROBLEM_XML, problem_id='1', seed=1)
+        problem_2 = new_loncapa_problem(RANDOMIZED_PROBLEM_XML, problem_id='2', seed=2)
+        assert problem_1.tree is not problem_2.tree
+        assert problem_1.tree.xpath('//optioninput')[0].get('id') == '1_3_1'
+        assert problem_2.tree.xpath('//optioninput')[0].get('id') == '2_3_1'
+        # The options of the compatibility translation are in the cached tree.
+        assert problem_2.tree.xpath('//optioninput')[0].get('options') == "('red','blue')"
+
+    def test_invalid_problems_not_cached(self):
+        xml = """
+        <problem>
+            <optionresponse>
+                <optioninput>
+                    <option correct="True">red</option>
+                    <option correct="True">blue</option>
+                </optioninput>
+            </optionresponse>
+        </problem>
+        """
+        for _ in range(2):
+            with pytest.raises(LoncapaProblemError):
+                new_loncapa_problem(xml)
+        assert len(_PROBLEM_TEMPLATE_CACHE) == 0
+
+
+@unittest.skip
+class ProblemTemplateCachePerf(unittest.TestCase):
+    """
+    Compares the throughput of constructing and rendering the problems of a
+    50 problem sequential for many learners, with and without the cache of
+    parsed problem trees.
+    """
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    NUM_PROBLEMS = 50
+    NUM_LEARNERS = 20
+
+    def _render_sequential(self, problem_xmls, clear_cache):
+        """
+        Renders every problem for every learner.
+        """
+        for seed in range(self.NUM_LEARNERS):
+            for index, xml in enumerate(problem_xmls):
+                if clear_cache:
+                    clear_problem_template_cache()
+                new_loncapa_problem(xml, problem_id=str(index), seed=seed).get_html()
+
+    def test_render_throughput(self):
+        problem_xmls = [
+            RANDOMIZED_PROBLEM_XML.replace('What is', f'Problem {index}: what is')
+            for index in range(self.NUM_PROBLEMS)
+        ]
+        uncached_elapsed = timeit.timeit(lambda: self._render_sequential(problem_xmls, clear_cache=True), number=1)
+        cached_elapsed = timeit.timeit(lambda: self._render_sequential(problem_xmls, clear_cache=False), number=1)
+        assert cached_elapsed < uncached_elapsed
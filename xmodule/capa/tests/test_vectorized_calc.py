@@ -0,0 +1,143 @@
+"""
+Tests for xmodule/capa/vectorized_calc.py
+"""
+import cmath
+import random
+import timeit
+import unittest
+
+import ddt
+from calc import evaluator
+
+from xmodule.capa.util import compare_with_tolerance
+from xmodule.capa.vectorized_calc import evaluate_samples
+
+# Formulas of the FormulaResponse tests and of calc's own tests, and a few with errors.
+FORMULAS = (
+    'x+2*y',
+    '2*x - x + y + y',
+    'x + y',
+    'x + 3*y',
+    'x + 2*y + y',
+    '2*y',
+    'x+x',
+    'x*1e999',
+    '-x*1e999',
+    '10*x + 0*1e999',
+    'x + 0*1e999',
+    '14*x',
+    '-x^2 + 3.5e-2*x - .5',
+    '2^3^2',
+    'x^y',
+    'x^-1',
+    '(x + y) / (x - y)',
+    'x || y',
+    '5 || x',
+    'sqrt(x) + sqrt(-y)',
+    'sin(x)^2 + cos(x)^2',
+    'tan(x) * sec(y) - csc(x) + cot(y)',
+    'arcsin(x / 10) + arccos(y / 10) + arctan(x)',
+    'arcsec(x) + arccsc(y) + arccot(x)',
+    'sinh(x) + cosh(y) + tanh(x) + sech(x) + csch(y) + coth(x)',
+    'arcsinh(x) + arccosh(y) + arctanh(x / 20) + arcsech(x) + arccsch(y) + arccoth(x)',
+    'exp(x) * ln(y) + log10(x) - log2(y)',
+    'abs(x) - abs(y)',
+    'X + Y',
+    'pi * e * i',
+    '5%',
+    '2.5k * x',
+    'fact(3) * x',
+    'factorial(x)',
+    '1/0',
+    'x / (y - y)',
+    'z + x',
+    'x(',
+    '(x',
+    'x y',
+    '',
+)
+
+
+def scalar_samples(var_dict_list, formula, case_sensitive=False):
+    """
+    Returns the values of the formula for each sample computed with calc.evaluator, or the exception it raises.
+    """
+    try:
+        return [evaluator(var_dict, {}, formula, case_sensitive=case_sensitive) for var_dict in var_dict_list]
+    except Exception as err:  # pylint: disable=broad-except
+        return err
+
+
+def make_samples(num_samples, ranges):
+    """
+    Returns num_samples dicts of variable values, sampled in the given {variable: (low, high)} ranges.
+    """
+    return [
+        {variable: random.uniform(low, high) for variable, (low, high) in ranges.items()}
+        for _ in range(num_samples)
+    ]
+
+
+@ddt.ddt
+class EvaluateSamplesTest(unittest.TestCase):
+    """
+    Tests that formulas evaluated for all samples at once match calc.evaluator.
+    """
+    @ddt.data(*FORMULAS)
+    def test_matches_evaluator(self, formula):
+        for ranges in ({'x': (-10, 10), 'y': (-10, 10)}, {'x': (1, 2), 'y': (1, 2)}):
+            var_dict_list = make_samples(20, ranges)
+            expected = scalar_samples(var_dict_list, formula)
+            results = evaluate_samples(var_dict_list, formula)
+            if isinstance(expected, Exception):
+                # Formulas that can't be evaluated are left to be evaluated sample by sample.
+                assert results is None
+            elif results is not None:
+                assert len(results) == len(expected)
+                for result, expected_result in zip(results, expected):
+                    if cmath.isnan(expected_result):
+                        assert cmath.isnan(result)
+                    else:
+                        assert compare_with_tolerance(result, expected_result, '1e-9%')
+
+    @ddt.data('x+2*y', 'sin(x)^2 + cos(x)^2', 'x^y', 'sqrt(-y)', 'x*1e999', 'pi * e', '')
+    def test_vectorized(self, formula):
+        var_dict_list = make_samples(10, {'x': (1, 2), 'y': (1, 2)})
+        assert evaluate_samples(var_dict_list, formula) is not None
+
+    @ddt.data('fact(x)', 'x^0.5 + (-x)^0.5', 'x / (y - y)', 'x || (y - y)', 'arccot(x)')
+    def test_not_vectorized(self, formula):
+        var_dict_list = make_samples(10, {'x': (1, 2), 'y': (1, 2)})
+        assert evaluate_samples(var_dict_list, formula) is None
+
+    def test_case_sensitive(self):
+        var_dict_list = make_samples(5, {'x': (1, 2), 'X': (3, 4)})
+        assert evaluate_samples(var_dict_list, 'x - X', case_sensitive=True) == scalar_samples(
+            var_dict_list, 'x - X', case_sensitive=True
+        )
+        assert evaluate_samples([{'X': 1.0}], 'x', case_sensitive=True) is None
+
+    def test_no_samples(self):
+        assert evaluate_samples([], 'x') == []
+
+
+@unittest.skip
+class EvaluateSamplesPerf(unittest.TestCase):
+    """
+    Compares the throughput of evaluating formulas sample by sample with calc.evaluator
+    and for all samples at once.
+    """
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    NUM_SAMPLES = 100
+    NUM_ANSWERS = 20
+
+    def test_evaluate_throughput(self):
+        var_dict_list = make_samples(self.NUM_SAMPLES, {'x': (1, 10), 'y': (1, 10)})
+        for formula in ('x+2*y', 'sin(x)^2 + cos(y)^2 - x*y/3', 'exp(-x) * sqrt(y) + (x+y)^3'):
+            scalar_elapsed = timeit.timeit(lambda f=formula: scalar_samples(var_dict_list, f), number=self.NUM_ANSWERS)
+            vectorized_elapsed = timeit.timeit(
+                lambda f=formula: evaluate_samples(var_dict_list, f), number=self.NUM_ANSWERS
+            )
+            assert vectorized_elapsed < scalar_elapsed
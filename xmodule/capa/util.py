@@ -7,6 +7,7 @@ import logging
 import re
 from cmath import isinf, isnan
 from decimal import Decimal
+from functools import lru_cache
 
 import nh3
 from calc import evaluator
@@ -21,6 +22,15 @@ default_tolerance = '0.001%'
 log = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=128)
+def _evaluate_tolerance(tolerance):
+    """
+    Evaluate a tolerance expression. Tolerances can't have variables, and the same few are
+    compared against for every sample of every answer, so they're only parsed once.
+    """
+    return evaluator({}, {}, tolerance)
+
+
 def compare_with_tolerance(student_complex, instructor_complex, tolerance=default_tolerance, relative_tolerance=False):
     """
     Compare student_complex to instructor_complex with maximum tolerance tolerance.
@@ -60,11 +70,11 @@ def compare_with_tolerance(student_complex, instructor_complex, tolerance=defaul
         if tolerance == default_tolerance:
             relative_tolerance = True
         if tolerance.endswith('%'):
-            tolerance = evaluator({}, {}, tolerance[:-1]) * 0.01
+            tolerance = _evaluate_tolerance(tolerance[:-1]) * 0.01
             if not relative_tolerance:
                 tolerance = tolerance * abs(instructor_complex)
         else:
-            tolerance = evaluator({}, {}, tolerance)
+            tolerance = _evaluate_tolerance(tolerance)
 
     if relative_tolerance:
         tolerance = tolerance * max(abs(student_complex), abs(instructor_complex))
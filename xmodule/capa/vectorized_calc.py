@@ -0,0 +1,152 @@
+"""
+Evaluation of calc formulas for many samples of their variables at once.
+
+Numerical sampling (as in FormulaResponse) evaluates a formula for each of
+its samples, and ``calc.evaluator`` parses the formula again every time.
+Here formulas are parsed once, and evaluated with the variables bound to
+NumPy arrays of all of their sampled values, so that each operation of the
+formula is done once for all of the samples.
+
+Only formulas whose evaluation is exactly as well-defined for arrays as for
+scalars are evaluated this way: anything that fails (functions that don't
+accept arrays, floating point errors such as a division by zero, undefined
+variables, parse errors...) makes :func:`evaluate_samples` return None, and
+the caller is expected to evaluate the formula sample by sample instead,
+which gets it the same results and errors as before.
+"""
+import numbers
+import operator
+from functools import lru_cache, reduce
+
+import numpy
+from calc import ParseAugmenter, add_defaults, check_parens, eval_number
+
+# The maximum number of parsed formulas kept in the process-local cache.
+PARSED_FORMULA_CACHE_SIZE = 1024
+
+
+class CannotVectorize(Exception):
+    """
+    Raised when a formula can't be evaluated for all of its samples at once.
+    """
+
+
+@lru_cache(maxsize=PARSED_FORMULA_CACHE_SIZE)
+def parse_formula(math_expr, case_sensitive=False):
+    """
+    Returns the ParseAugmenter of the given formula, with its tree parsed.
+
+    The result is shared between callers, and must not be modified.
+    """
+    check_parens(math_expr)
+    parsed_formula = ParseAugmenter(math_expr, case_sensitive)
+    parsed_formula.parse_algebra()
+    return parsed_formula
+
+
+def evaluate_samples(var_dict_list, math_expr, case_sensitive=False):
+    """
+    Evaluate a formula for each sample of its variables, as calc.evaluator would.
+
+    Arguments:
+        var_dict_list (list): dicts mapping the variable names to their values, one for each sample.
+            Every dict must have the same variables.
+        math_expr (str): the formula
+        case_sensitive (bool): whether variable and function names are case sensitive
+
+    Returns:
+        the list of the values of the formula for each sample, or None if it can't be
+        evaluated for all of them at once, in which case it should be evaluated for each sample.
+    """
+    num_samples = len(var_dict_list)
+    if math_expr.strip() == "":
+        return [float('nan')] * num_samples
+    if num_samples == 0:
+        return []
+
+    try:
+        parsed_formula = parse_formula(math_expr, case_sensitive)
+        variables = {
+            name: numpy.array([var_dict[name] for var_dict in var_dict_list])
+            for name in var_dict_list[0]
+        }
+        all_variables, all_functions = add_defaults(variables, {}, case_sensitive)
+        parsed_formula.check_variables(all_variables, all_functions)
+        with numpy.errstate(all='raise'):
+            result = parsed_formula.reduce_tree(_evaluate_actions(all_variables, all_functions, case_sensitive))
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+    if isinstance(result, numbers.Number):
+        # The formula doesn't depend on the sampled variables.
+        return [result] * num_samples
+    if isinstance(result, numpy.ndarray) and result.shape == (num_samples, ):
+        return list(result)
+    return None
+
+
+def _evaluate_actions(all_variables, all_functions, case_sensitive):
+    """
+    Returns the evaluate actions of calc.evaluator, for variables which may be arrays.
+
+    calc's own actions tell the operators from the operands by comparing them with
+    strings, which doesn't work for arrays.
+    """
+    def casify(name):
+        return name if case_sensitive else name.lower()
+
+    def operands(parse_result):
+        return [token for token in parse_result if not isinstance(token, str)]
+
+    def eval_variable(parse_result):
+        return all_variables[casify(parse_result[0])]
+
+    def eval_function(parse_result):
+        return all_functions[casify(parse_result[0])](parse_result[1])
+
+    def eval_atom(parse_result):
+        return operands(parse_result)[0]
+
+    def eval_power(parse_result):
+        # Exponentiate right to left, e.g. 2^3^2 = 2^(3^2).
+        return reduce(lambda exponent, base: base ** exponent, reversed(operands(parse_result)))
+
+    def eval_parallel(parse_result):
+        if len(parse_result) == 1:
+            return parse_result[0]
+        values = operands(parse_result)
+        if any(numpy.any(numpy.equal(value, 0)) for value in values):
+            # calc returns NaN for the samples with a zero input.
+            raise CannotVectorize
+        return 1. / sum(1. / value for value in values)
+
+    def eval_sum(parse_result):
+        total = 0
+        current_op = operator.add
+        for token in parse_result:
+            if isinstance(token, str):
+                current_op = operator.sub if token == '-' else operator.add
+            else:
+                total = current_op(total, token)
+        return total
+
+    def eval_product(parse_result):
+        product = 1
+        current_op = operator.mul
+        for token in parse_result:
+            if isinstance(token, str):
+                current_op = operator.truediv if token == '/' else operator.mul
+            else:
+                product = current_op(product, token)
+        return product
+
+    return {
+        'number': eval_number,
+        'variable': eval_variable,
+        'function': eval_function,
+        'atom': eval_atom,
+        'power': eval_power,
+        'parallel': eval_parallel,
+        'product': eval_product,
+        'sum': eval_sum,
+    }
@@ -294,6 +294,12 @@ class StaticContent:  # lint-amnesty, pylint: disable=missing-class-docstring
     def stream_data(self):
         yield self._data
 
+    def stream_data_in_range(self, first_byte, last_byte):
+        """
+        Stream the data between first_byte and last_byte (included)
+        """
+        yield self._data[first_byte:last_byte + 1]
+
     @staticmethod
     def serialize_asset_key_with_slash(asset_key):
         """
@@ -314,9 +320,18 @@ class StaticContentStream(StaticContent):  # lint-amnesty, pylint: disable=missi
                          length=length, locked=locked, content_digest=content_digest)
         self._stream = stream
 
+    @property
+    def chunk_size(self):
+        """
+        The size of the reads from the stream: the size of the chunks of GridFS
+        files, so that each read is served by a single chunk.
+        """
+        return getattr(self._stream, 'chunk_size', None) or STREAM_DATA_CHUNK_SIZE
+
     def stream_data(self):
+        chunk_size = self.chunk_size
         while True:
-            chunk = self._stream.read(STREAM_DATA_CHUNK_SIZE)
+            chunk = self._stream.read(chunk_size)
             if len(chunk) == 0:
                 break
             yield chunk
@@ -325,15 +340,15 @@ class StaticContentStream(StaticContent):  # lint-amnesty, pylint: disable=missi
         """
         Stream the data between first_byte and last_byte (included)
         """
+        chunk_size = self.chunk_size
         self._stream.seek(first_byte)
         position = first_byte
-        while True:
-            if last_byte < position + STREAM_DATA_CHUNK_SIZE - 1:
-                chunk = self._stream.read(last_byte - position + 1)
-                yield chunk
+        while position <= last_byte:
+            # Read up to the end of the stream's chunk, so that the next reads are aligned on chunks.
+            chunk = self._stream.read(min(chunk_size - position % chunk_size, last_byte - position + 1))
+            if len(chunk) == 0:
                 break
-            chunk = self._stream.read(STREAM_DATA_CHUNK_SIZE)
-            position += STREAM_DATA_CHUNK_SIZE
+            position += len(chunk)
             yield chunk
 
     def close(self):
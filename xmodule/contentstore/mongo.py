@@ -7,6 +7,7 @@ import hashlib
 import json
 import os
 
+import fs.path
 import gridfs
 import pymongo
 from bson.son import SON
@@ -233,35 +234,55 @@ class MongoContentStore(ContentStore):
         with disk_fs.open(export_name, 'wb') as asset_file:
             asset_file.write(content.data)
 
-    def export_all_for_course(self, course_key, output_directory, assets_policy_file):
+    def export_to_fs(self, location, static_fs):
         """
-        Export all of this course's assets to the output_directory. Export all of the assets'
-        attributes to the policy file.
+        Export the asset to the given pyfilesystem, copying its contents from GridFS a chunk
+        at a time rather than reading the whole asset into memory.
+
+        Args:
+            location (AssetKey): the asset to export
+            static_fs: the filesystem under which to put the asset file
+        """
+        content_id, __ = self.asset_db_key(location)
+        try:
+            with self.fs.get(content_id) as fp:
+                # Need to replace dict IDs with SON for chunk lookup to work under Python 3
+                # because field order can be different and mongo cares about the order
+                if isinstance(fp._id, dict):  # lint-amnesty, pylint: disable=protected-access
+                    fp._file['_id'] = content_id  # lint-amnesty, pylint: disable=protected-access
+
+                import_path = getattr(fp, 'import_path', None)
+                output_directory = os.path.dirname(import_path) if import_path is not None else ''
+                if output_directory:
+                    static_fs.makedirs(output_directory, recreate=True)
+
+                # Escape invalid char from filename.
+                export_name = escape_invalid_characters(name=fp.displayname, invalid_char_list=['/', '\\'])
+                static_fs.setbinfile(fs.path.join(output_directory, export_name), fp)
+        except NoFile:
+            raise NotFoundError(content_id)  # lint-amnesty, pylint: disable=raise-missing-from
+
+    def export_all_for_course_to_fs(self, course_key, export_fs):
+        """
+        Export all of this course's assets to the static directory of the given pyfilesystem
+        (see export_to_fs), and all of the assets' attributes to its policies/assets.json file.
 
         Args:
             course_key (CourseKey): the :class:`CourseKey` identifying the course
-            output_directory: the directory under which to put all the asset files
-            assets_policy_file: the filename for the policy file which should be in the same
-                directory as the other policy files.
+            export_fs: the filesystem of the exported course
         """
         policy = {}
         assets, __ = self.get_all_content_for_course(course_key)
 
+        static_fs = export_fs.makedir('static', recreate=True)
         for asset in assets:
-            # TODO: On 6/19/14, I had to put a try/except around this
-            # to export a course. The course failed on JSON files in
-            # the /static/ directory placed in it with an import.
-            #
-            # If this hasn't been looked at in a while, remove this comment.
-            #
-            # When debugging course exports, this might be a good place
-            # to look. -- pmitros
-            self.export(asset['asset_key'], output_directory)
+            self.export_to_fs(asset['asset_key'], static_fs)
             for attr, value in asset.items():
                 if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
                     policy.setdefault(asset['asset_key'].block_id, {})[attr] = value
 
-        with open(assets_policy_file, 'w') as f:
+        policies_fs = export_fs.makedir('policies', recreate=True)
+        with policies_fs.open('assets.json', 'w') as f:
             json.dump(policy, f, sort_keys=True, indent=4)
 
     def get_all_content_thumbnails_for_course(self, course_key):
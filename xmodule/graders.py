@@ -11,6 +11,7 @@ import sys
 from collections import OrderedDict
 from datetime import datetime
 
+import numpy
 from pytz import UTC
 from django.utils.translation import gettext_lazy as _
 
@@ -237,6 +238,28 @@ class CourseGrader(metaclass=abc.ABCMeta):
         '''Given a grade sheet, return a dict containing grading information'''
         raise NotImplementedError
 
+    def grade_batch(self, batch_sheet, num_students):
+        """
+        Grades num_students students at once, with the same results as calling grade
+        on the grade sheet of each student.
+
+        The batch_sheet is a dict keyed by section format, like a grade sheet.
+        Each value is a 2D numpy array of shape (students, sections) with the
+        percent_graded of each section of that format, in the order of the
+        sections in the grade sheets, and NaN where a section is missing from
+        a student's grade sheet.
+
+        Returns a dict with the following keys:
+        - percent: A 1D numpy array of the final percentage of each student.
+        - grade_breakdown: A dict keyed by category of 1D numpy arrays of the
+        contribution of that category to the final percentage of each student.
+        This is optional, as in the results of grade.
+
+        Section breakdowns are not computed, since they only serve to display
+        the grade of a single student.
+        """
+        raise NotImplementedError
+
 
 class WeightedSubsectionsGrader(CourseGrader):
     """
@@ -292,6 +315,22 @@ class WeightedSubsectionsGrader(CourseGrader):
             'grade_breakdown': grade_breakdown
         }
 
+    def grade_batch(self, batch_sheet, num_students):
+        total_percent = numpy.zeros(num_students)
+        grade_breakdown = OrderedDict()
+
+        # The contributions are summed in the same order as in grade,
+        # so that the results are identical.
+        for subgrader, assignment_type, weight in self.subgraders:
+            weighted_percent = subgrader.grade_batch(batch_sheet, num_students)['percent'] * weight
+            total_percent = total_percent + weighted_percent
+            grade_breakdown[assignment_type] = weighted_percent
+
+        return {
+            'percent': total_percent,
+            'grade_breakdown': grade_breakdown,
+        }
+
 
 class AssignmentFormatGrader(CourseGrader):
     """
@@ -450,6 +489,72 @@ class AssignmentFormatGrader(CourseGrader):
             # No grade_breakdown here
         }
 
+    def grade_batch(self, batch_sheet, num_students):
+        percents = batch_sheet.get(self.type)
+        if percents is None:
+            percents = numpy.empty((num_students, 0))
+
+        # As in grade, each student's breakdown consists of their sections
+        # (in order), followed by placeholder scores of 0 up to min_count.
+        is_missing = numpy.isnan(percents)
+        num_sections = percents.shape[1] - is_missing.sum(axis=1)
+        min_count = int(float(self.min_count))
+        width = max(min_count, percents.shape[1])
+        breakdown = numpy.zeros((num_students, width))
+        present_first = numpy.argsort(is_missing, axis=1, kind='stable')
+        breakdown[:, :percents.shape[1]] = numpy.take_along_axis(numpy.nan_to_num(percents), present_first, axis=1)
+
+        total_percent = numpy.zeros(num_students)
+        breakdown_lengths = numpy.maximum(num_sections, min_count)
+        for breakdown_length in numpy.unique(breakdown_lengths):
+            students = breakdown_lengths == breakdown_length
+            total_percent[students] = self._total_with_drops_batch(breakdown[students, :breakdown_length])
+
+        return {
+            'percent': total_percent,
+        }
+
+    def _total_with_drops_batch(self, breakdown):
+        """
+        Calculates the total score of each row of the given 2D array of
+        breakdown percents, while dropping the lowest scores, as in
+        total_with_drops.
+        """
+        num_students, breakdown_length = breakdown.shape
+        is_kept = numpy.ones(breakdown.shape, dtype=bool)
+        if self.drop_count > 0:
+            # Ties are broken as by the stable sort in total_with_drops.
+            descending_order = numpy.argsort(-breakdown, axis=1, kind='stable')
+            dropped_indices = descending_order[:, max(breakdown_length - self.drop_count, 0):]
+            numpy.put_along_axis(is_kept, dropped_indices, False, axis=1)
+
+        # Sum the kept scores column by column, in the same order as in
+        # total_with_drops, so that the results are identical.
+        aggregate_score = numpy.zeros(num_students)
+        for index in range(breakdown_length):
+            aggregate_score = aggregate_score + numpy.where(is_kept[:, index], breakdown[:, index], 0.0)
+
+        if breakdown_length - self.drop_count > 0:
+            aggregate_score = aggregate_score / (breakdown_length - self.drop_count)
+
+        return aggregate_score
+
+
+def batch_percents_graded(earned, possible):
+    """
+    Returns the percent_graded of each of the given sections' graded totals,
+    as a numpy array of the same shape as the given arrays of earned and
+    possible values, with NaN wherever the possible value isn't positive
+    (since such sections are not included in grade sheets).
+    """
+    earned = numpy.asarray(earned, dtype=float)
+    possible = numpy.asarray(possible, dtype=float)
+    is_included = possible > 0
+    percents = numpy.full(earned.shape, numpy.nan)
+    # Rounded to two decimal places, as by compute_percent.
+    percents[is_included] = numpy.around(earned[is_included] / possible[is_included], decimals=2)
+    return percents
+
 
 def _iter_graded(scores):
     """
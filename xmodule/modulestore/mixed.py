@@ -241,6 +241,16 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
             return course_key
         return store.fill_in_run(course_key)
 
+    def prefetch_definitions(self, usage_key, depth=None, content_fields=None):
+        """
+        Prefetch the definitions of the block at usage_key and its descendants, if the
+        store of the course supports it. Returns the number of definitions prefetched.
+        """
+        store = self._get_modulestore_for_courselike(usage_key.course_key)
+        if not hasattr(store, 'prefetch_definitions'):
+            return 0
+        return store.prefetch_definitions(usage_key, depth=depth, content_fields=content_fields)
+
     def has_item(self, usage_key, **kwargs):
         """
         Does the course include the xblock who's id is reference?
@@ -0,0 +1,101 @@
+"""
+Performance test for the index of split-mongo course structures.
+"""
+import timeit
+import unittest
+from unittest import TestCase
+
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.structure_index import get_structure_index
+from xmodule.modulestore.tests.test_split_structure_index import (
+    BlockMatcher,
+    make_structure,
+    scan_has_path_to_root,
+    scan_items,
+    scan_parents
+)
+
+
+@unittest.skip
+class StructureIndexPerf(TestCase):
+    """
+    Compares looking up the parents and path to the root of every block of a
+    synthetic 10k block course, and finding its blocks by get_items qualifiers,
+    by scanning the structure and with its index.
+    """
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    NUM_CHAPTERS = 10
+    SEQUENTIALS_PER_CHAPTER = 10
+    VERTICALS_PER_SEQUENTIAL = 10
+    COMPONENTS_PER_VERTICAL = 9
+
+    def _create_large_structure(self):
+        """
+        Returns a structure of about 10k blocks.
+        """
+        course = BlockKey('course', 'course')
+        children_map = {course: []}
+        fields_map = {}
+        for chapter_index in range(self.NUM_CHAPTERS):
+            chapter = BlockKey('chapter', f'chapter_{chapter_index}')
+            children_map[course].append(chapter)
+            children_map[chapter] = []
+            for sequential_index in range(self.SEQUENTIALS_PER_CHAPTER):
+                sequential = BlockKey('sequential', f'sequential_{chapter_index}_{sequential_index}')
+                children_map[chapter].append(sequential)
+                children_map[sequential] = []
+                fields_map[sequential] = {'graded': sequential_index % 2 == 0, 'format': 'Homework'}
+                for vertical_index in range(self.VERTICALS_PER_SEQUENTIAL):
+                    vertical = BlockKey('vertical', f'vertical_{chapter_index}_{sequential_index}_{vertical_index}')
+                    children_map[sequential].append(vertical)
+                    children_map[vertical] = [
+                        BlockKey('problem', f'problem_{vertical.id}_{index}')
+                        for index in range(self.COMPONENTS_PER_VERTICAL)
+                    ]
+                    children_map.update((component, []) for component in children_map[vertical])
+        return make_structure(children_map, fields_map)
+
+    def test_lookup_timings(self):
+        structure = self._create_large_structure()
+        # Scanning is quadratic, so only time it for a sample of the blocks.
+        sample = list(structure['blocks'])[::100]
+
+        def scan():
+            for block_key in sample:
+                scan_parents(block_key, structure)
+                scan_has_path_to_root(block_key, structure)
+
+        def index_lookups():
+            index = get_structure_index(structure)
+            for block_key in structure['blocks']:
+                index.get_parents(block_key)
+                index.has_path_to_root(block_key)
+                index.is_in_subtree(block_key, BlockKey('chapter', 'chapter_5'))
+
+        # Building the index and looking up every block beats scanning for a sample of the blocks.
+        assert timeit.timeit(index_lookups, number=1) < timeit.timeit(scan, number=1)
+
+    def test_get_items_timings(self):
+        structure = self._create_large_structure()
+        index = get_structure_index(structure)
+        matcher = BlockMatcher()
+
+        def find_items(qualifiers, settings):
+            return [
+                block_key for block_key in index.find_candidates(structure['blocks'], qualifiers, settings)
+                if matcher.matches(structure['blocks'][block_key], qualifiers, settings)
+            ]
+
+        queries = (
+            ({'block_type': 'chapter'}, {}),
+            ({'block_type': {'$in': ['sequential', 'vertical']}}, {}),
+            ({'block_type': 'sequential'}, {'graded': True}),
+            ({}, {'format': 'Homework'}),
+        )
+        for qualifiers, settings in queries:
+            assert find_items(qualifiers, settings) == scan_items(structure, qualifiers, settings)
+            index_elapsed = timeit.timeit(lambda q=qualifiers, s=settings: find_items(q, s), number=1)
+            scan_elapsed = timeit.timeit(lambda q=qualifiers, s=settings: scan_items(structure, q, s), number=1)
+            assert index_elapsed < scan_elapsed
@@ -0,0 +1,82 @@
+"""
+Performance test for streaming course exports into a tarball.
+"""
+import os
+import tarfile
+import tracemalloc
+import unittest
+from shutil import rmtree
+from tempfile import mkdtemp
+
+from path import Path as path
+
+from xmodule.contentstore.content import StaticContent
+from xmodule.modulestore.tests.utils import SPLIT_MODULESTORE_SETUP, TEST_DATA_DIR
+from xmodule.modulestore.xml_exporter import export_course_to_tarball
+from xmodule.modulestore.xml_importer import import_course_from_xml
+
+# Use only this course in export performance testing.
+COURSE_NAME = 'manual-testing-complete'
+
+# Number of large assets added to the course before each export.
+NUM_ASSETS = 5
+
+TEST_DIR = path(__file__).dirname()
+PLATFORM_ROOT = TEST_DIR.parent.parent.parent.parent.parent.parent
+TEST_DATA_ROOT = PLATFORM_ROOT / TEST_DATA_DIR
+
+
+@unittest.skip
+class StreamingExportPerf(unittest.TestCase):
+    """
+    Checks that the peak memory of streaming the export of a course into a
+    tarball doesn't grow with the size of its assets.
+    """
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def setUp(self):
+        super().setUp()
+        self.export_dir = mkdtemp()
+        self.addCleanup(rmtree, self.export_dir, ignore_errors=True)
+
+    def _add_assets(self, content_store, course_key, size_mb):
+        """
+        Saves NUM_ASSETS assets of the given size for the course.
+        """
+        data = os.urandom(size_mb * 1024 * 1024)
+        for index in range(NUM_ASSETS):
+            asset_key = course_key.make_asset_key('asset', f'large_asset_{index}.bin')
+            content_store.save(StaticContent(asset_key, asset_key.block_id, 'application/octet-stream', data))
+
+    def _get_export_peak_memory(self, size_mb):
+        """
+        Returns the peak traced memory of streaming the export of the course, with
+        NUM_ASSETS assets of size_mb MB, into a tarball.
+        """
+        with SPLIT_MODULESTORE_SETUP.build() as (content_store, store):
+            course_key = store.make_course_key('a', 'course', 'course')
+            import_course_from_xml(
+                store,
+                'test_user',
+                TEST_DATA_ROOT,
+                source_dirs=(COURSE_NAME, ),
+                static_content_store=content_store,
+                target_id=course_key,
+                create_if_not_present=True,
+                raise_on_failure=True,
+            )
+            self._add_assets(content_store, course_key, size_mb)
+
+            tracemalloc.start()
+            with tarfile.open(os.path.join(self.export_dir, f'{size_mb}.tar.gz'), mode='w:gz') as tar_file:
+                export_course_to_tarball(store, content_store, course_key, tar_file, 'exported')
+            __, peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return peak_memory
+
+    def test_export_memory(self):
+        small_assets_peak_memory = self._get_export_peak_memory(1)
+        large_assets_peak_memory = self._get_export_peak_memory(100)
+        # The assets are streamed in chunks, so they are never loaded whole.
+        assert large_assets_peak_memory - small_assets_peak_memory < 10 * 1024 * 1024
@@ -31,5 +31,8 @@ class DefinitionLazyLoader:
         # get_definition may return a cached value perhaps from another course or code path
         # so, we copy the result here so that updates don't cross-pollinate nor change the cached
         # value in such a way that we can't tell that the definition's been updated.
-        definition = self.modulestore.get_definition(self.course_key, self.definition_locator.definition_id)
+        definition_id = self.definition_locator.definition_id
+        definition = self.modulestore.get_prefetched_definition(definition_id)
+        if definition is None:
+            definition = self.modulestore.get_definition(self.course_key, definition_id)
         return copy.deepcopy(definition)
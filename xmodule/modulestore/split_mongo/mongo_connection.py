@@ -8,11 +8,14 @@ import logging
 import math
 import pickle
 import re
+import threading
 import zlib
+from collections import OrderedDict
 from contextlib import contextmanager
 from time import time
 
 from ccx_keys.locator import CCXLocator
+from django.conf import settings
 from django.core.cache import caches, InvalidCacheBackendError
 from django.db.transaction import TransactionManagementError
 import pymongo
@@ -33,6 +36,29 @@ from openedx.core.lib.cache_utils import request_cached
 log = logging.getLogger(__name__)
 
 
+# Request cache namespace of the number of definition queries made in the request.
+DEFINITION_QUERIES_CACHE_NAMESPACE = 'split_mongo.definition_queries'
+
+
+def _record_definition_query():
+    """
+    Count a query for definitions made in the current request.
+    """
+    request_cache = RequestCache(DEFINITION_QUERIES_CACHE_NAMESPACE)
+    request_cache.set('count', get_definition_query_count() + 1)
+
+
+def get_definition_query_count():
+    """
+    Return the number of queries for definitions made in the current request.
+
+    Meant for tests and monitoring, to catch blocks fetching their definitions
+    one at a time.
+    """
+    cached_response = RequestCache(DEFINITION_QUERIES_CACHE_NAMESPACE).get_cached_response('count')
+    return cached_response.value if cached_response.is_found else 0
+
+
 def get_cache(alias):
     """
     Return cache for an `alias`
@@ -190,13 +216,118 @@ def structure_to_mongo(structure, course_context=None):
         return new_structure
 
 
+class LocalStructureCache:
+    """
+    A process-local, thread-safe LRU cache of course structures.
+
+    The cache is bounded by the total (approximate) size of the cached structures
+    in bytes rather than by the number of entries, since structure sizes vary by
+    several orders of magnitude between courses.
+
+    The structure stored under a given ``_id`` never changes (edits always produce
+    a new structure with a new ``_id``), so entries never need to be invalidated;
+    they are only evicted when the cache is full.
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Return the structure stored for ``key`` (marking it as most recently
+        used), or None if it isn't cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, structure, size):
+        """
+        Store ``structure`` (whose approximate size is ``size`` bytes) under ``key``,
+        evicting the least recently used entries as needed.
+
+        Returns:
+            int: the number of entries evicted to make room for ``structure``.
+        """
+        if size > self.max_bytes:
+            return 0
+
+        evictions = 0
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous[1]
+
+            while self._entries and self.current_bytes + size > self.max_bytes:
+                __, (__, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                evictions += 1
+
+            self._entries[key] = (structure, size)
+            self.current_bytes += size
+        return evictions
+
+    def clear(self):
+        """
+        Remove all entries from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+
+_LOCAL_STRUCTURE_CACHE = None
+
+
+def get_local_structure_cache():
+    """
+    Return the process-local structure cache, or None if it is disabled.
+
+    The cache is sized by the ``COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES`` setting, and
+    is rebuilt (empty) if that setting changes.
+    """
+    global _LOCAL_STRUCTURE_CACHE  # pylint: disable=global-statement
+
+    max_bytes = getattr(settings, 'COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES', 0)
+    if not max_bytes:
+        return None
+
+    if _LOCAL_STRUCTURE_CACHE is None or _LOCAL_STRUCTURE_CACHE.max_bytes != max_bytes:
+        _LOCAL_STRUCTURE_CACHE = LocalStructureCache(max_bytes)
+    return _LOCAL_STRUCTURE_CACHE
+
+
+def clear_local_structure_cache():
+    """
+    Empty the process-local structure cache, if there is one.
+    """
+    if _LOCAL_STRUCTURE_CACHE is not None:
+        _LOCAL_STRUCTURE_CACHE.clear()
+
+
 class CourseStructureCache:
     """
     Wrapper around django cache object to cache course structure objects.
     The course structures are pickled and compressed when cached.
 
+    If ``COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES`` is set, the uncompressed pickled
+    structures are also kept in a process-local LRU cache (see :class:`LocalStructureCache`)
+    that is consulted before the django cache. They are unpickled for each caller, since
+    callers modify the structures they get (e.g. when loading the definitions of blocks).
+
     If the 'course_structure_cache' doesn't exist, then don't do anything for
-    for set and get.
+    for set and get (other than using the process-local cache).
     """
     def __init__(self):
         self.cache = None
@@ -204,9 +335,21 @@ class CourseStructureCache:
             self.cache = get_cache('course_structure_cache')
         except InvalidCacheBackendError:
             pass
+        self.local_cache = get_local_structure_cache()
 
     def get(self, key, course_context=None):
-        """Pull the compressed, pickled struct data from cache and deserialize."""
+        """
+        Return a new copy of the structure, deserialized from the process-local cache if
+        it is there, otherwise from the compressed, pickled struct data in the django cache.
+        """
+        if self.local_cache is not None:
+            with TIMER.timer("CourseStructureCache.get_local", course_context) as tagger:
+                pickled_data = self.local_cache.get(key)
+                tagger.tag(from_local_cache=str(pickled_data is not None).lower())
+                tagger.measure('local_cache_size', self.local_cache.current_bytes)
+                if pickled_data is not None:
+                    return pickle.loads(pickled_data, encoding='latin-1')
+
         if self.cache is None:
             return None
 
@@ -225,22 +368,41 @@ class CourseStructureCache:
                 pickled_data = zlib.decompress(compressed_pickled_data)
                 tagger.measure('uncompressed_size', len(pickled_data))
 
-                return pickle.loads(pickled_data, encoding='latin-1')
+                structure = pickle.loads(pickled_data, encoding='latin-1')
             except Exception:  # lint-amnesty, pylint: disable=broad-except
                 # The cached data is corrupt in some way, get rid of it.
                 log.warning("CourseStructureCache: Bad data in cache for %s", course_context)
                 self.cache.delete(key)
                 return None
 
+        self._set_local(key, pickled_data, course_context)
+        return structure
+
+    def _set_local(self, key, pickled_data, course_context=None):
+        """
+        Add the pickled structure to the process-local cache (if it is enabled).
+        """
+        if self.local_cache is None:
+            return
+
+        with TIMER.timer("CourseStructureCache.set_local", course_context) as tagger:
+            evictions = self.local_cache.set(key, pickled_data, len(pickled_data))
+            tagger.measure('local_cache_evictions', evictions)
+            tagger.measure('local_cache_size', self.local_cache.current_bytes)
+
     def set(self, key, structure, course_context=None):
         """Given a structure, will pickle, compress, and write to cache."""
-        if self.cache is None:
+        if self.cache is None and self.local_cache is None:
             return None
 
         with TIMER.timer("CourseStructureCache.set", course_context) as tagger:
             pickled_data = pickle.dumps(structure, 4)  # Protocol can't be incremented until cache is cleared
             tagger.measure('uncompressed_size', len(pickled_data))
 
+            self._set_local(key, pickled_data, course_context)
+            if self.cache is None:
+                return None
+
             # 1 = Fastest (slightly larger results)
             compressed_pickled_data = zlib.compress(pickled_data, 1)
             data_size = len(compressed_pickled_data)
@@ -543,6 +705,7 @@ class MongoPersistenceBackend:
         Get the definition from the persistence mechanism whose id is the given key
         """
         with TIMER.timer("get_definition", course_context) as tagger:
+            _record_definition_query()
             definition = self.definitions.find_one({'_id': key})
             tagger.measure("fields", len(definition['fields']))
             tagger.tag(block_type=definition['block_type'])
@@ -554,6 +717,7 @@ class MongoPersistenceBackend:
         """
         with TIMER.timer("get_definitions", course_context) as tagger:
             tagger.measure('definitions', len(definitions))
+            _record_definition_query()
             definitions = self.definitions.find({'_id': {'$in': definitions}})
             return definitions
 
@@ -606,6 +770,7 @@ class MongoPersistenceBackend:
         If connections is True, then close the connection to the database as well.
         """
         RequestCache(namespace="course_index_cache").clear()
+        clear_local_structure_cache()
 
         self.ensure_connection()
         connection = self.database.client
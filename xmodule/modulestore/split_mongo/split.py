@@ -101,6 +101,7 @@ from xmodule.modulestore.exceptions import (
 )
 from xmodule.modulestore.split_mongo import CourseEnvelope
 from xmodule.modulestore.split_mongo.mongo_connection import DuplicateKeyError, DjangoFlexPersistenceBackend
+from xmodule.modulestore.split_mongo.structure_index import forget_structure_index, get_structure_index
 from xmodule.modulestore.store_utilities import DETACHED_XBLOCK_TYPES
 from xmodule.partitions.partitions_service import PartitionService
 from xmodule.util.misc import get_library_or_course_attribute
@@ -132,6 +133,9 @@ log = logging.getLogger(__name__)
 # When blacklists are this, all children should be excluded
 EXCLUDE_ALL = '*'
 
+# The maximum number of definitions fetched by a single query.
+DEFINITIONS_QUERY_CHUNK_SIZE = 500
+
 
 class SplitBulkWriteRecord(BulkOpsRecord):  # lint-amnesty, pylint: disable=missing-class-docstring
     def __init__(self):
@@ -355,12 +359,35 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
         (no data will be written to the database if a bulk operation is active.)
         """
         self._clear_cache(structure['_id'])
+        forget_structure_index(structure['_id'])
         bulk_write_record = self._get_bulk_ops_record(course_key)
         if bulk_write_record.active:
             bulk_write_record.structures[structure['_id']] = structure
         else:
             self.db_connection.insert_structure(structure, course_key)
 
+    def get_structure_index(self, course_key, structure):
+        """
+        Return the StructureIndex (parent map and ancestry numbering) of the given
+        structure of the course_key course.
+
+        The index is cached unless the structure has been created by the active bulk
+        operation, in which case it may still be edited and the index is rebuilt.
+        """
+        return get_structure_index(structure, self._is_structure_index_cacheable(course_key, structure))
+
+    def _is_structure_index_cacheable(self, course_key, structure):
+        """
+        Return whether the index of the structure can be cached, i.e. whether the structure
+        hasn't been created by the active bulk operation on course_key.
+        """
+        bulk_write_record = self._get_bulk_ops_record(course_key)
+        return not (
+            bulk_write_record.active and
+            structure['_id'] in bulk_write_record.structures and
+            structure['_id'] not in bulk_write_record.structures_in_db
+        )
+
     def get_cached_block(self, course_key, version_guid, block_id):
         """
         If there's an active bulk_operation, see if it's cached this block and just return it
@@ -444,8 +471,13 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
                     definitions.append(definition)
 
         if len(ids):  # lint-amnesty, pylint: disable=len-as-condition
-            # Query the db for the definitions.
-            defs_from_db = list(self.db_connection.get_definitions(list(ids), course_key))
+            # Query the db for the definitions, in chunks to keep the queries to a reasonable size.
+            ids = list(ids)
+            defs_from_db = []
+            for start in range(0, len(ids), DEFINITIONS_QUERY_CHUNK_SIZE):
+                defs_from_db.extend(self.db_connection.get_definitions(
+                    ids[start:start + DEFINITIONS_QUERY_CHUNK_SIZE], course_key
+                ))
             defs_dict = {d.get('_id'): d for d in defs_from_db}
             # Add the retrieved definitions to the cache.
             bulk_write_record.definitions_in_db.update(defs_dict.keys())
@@ -815,6 +847,77 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         else:
             self.request_cache.data['course_cache'] = {}
 
+    def prefetch_definitions(self, usage_key, depth=None, content_fields=None):
+        """
+        Load the definitions of the block at usage_key and of its descendants, with as
+        few queries as possible, so that the lazily loaded content fields of the blocks
+        loaded afterwards in this request don't query for each block's definition.
+
+        Unlike loading blocks with lazy=False, this leaves the cached structure as is:
+        the prefetched definitions are kept in the request cache until they're needed.
+
+        Arguments:
+            usage_key: the root of the subtree whose definitions to prefetch
+            depth: how deep below usage_key to prefetch (None for the whole subtree)
+            content_fields: if not None, only prefetch the definitions of the blocks whose
+                class has at least one of these Scope.content fields (e.g. {'data'})
+
+        Returns:
+            int: the number of definitions prefetched
+        """
+        if self.request_cache is None:
+            return 0
+
+        course = self._lookup_course(usage_key.course_key)
+        blocks = self.descendants(course.structure['blocks'], BlockKey.from_usage_key(usage_key), depth, {})
+        prefetched_definitions = self._get_prefetched_definitions()
+
+        definition_ids = set()
+        has_content_fields = {}
+        for block_key, block_data in blocks.items():
+            definition_id = block_data.definition
+            if (
+                block_data.definition_loaded or
+                definition_id is None or
+                isinstance(definition_id, LocalId) or
+                definition_id in prefetched_definitions
+            ):
+                continue
+            if content_fields is not None:
+                if block_key.type not in has_content_fields:
+                    block_class = XBlock.load_class(block_key.type, self.default_class)
+                    has_content_fields[block_key.type] = any(
+                        field.scope == Scope.content
+                        for field_name, field in block_class.fields.items()
+                        if field_name in content_fields
+                    )
+                if not has_content_fields[block_key.type]:
+                    continue
+            definition_ids.add(definition_id)
+
+        if definition_ids:
+            for definition in self.get_definitions(course.course_key, definition_ids):
+                prefetched_definitions[definition['_id']] = definition
+        return len(definition_ids)
+
+    def get_prefetched_definition(self, definition_id):
+        """
+        Return the definition with the given id if it was loaded by prefetch_definitions
+        in this request, or None otherwise.
+        """
+        if self.request_cache is None:
+            return None
+        return self._get_prefetched_definitions().get(definition_id)
+
+    def _get_prefetched_definitions(self):
+        """
+        Return the request cache of prefetched definitions.
+
+        Definitions are never modified once persisted (edits create a new definition with
+        a new id), so these are valid for all courses and branches.
+        """
+        return self.request_cache.data.setdefault('prefetched_definitions', {})
+
     def _lookup_course(self, course_key, head_validation=True):
         """
         Decode the locator into the right series of db access. Does not
@@ -1221,21 +1324,42 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         items = []
         qualifiers = qualifiers.copy() if qualifiers else {}  # copy the qualifiers (destructively manipulated here)
 
-        def _block_matches_all(block_data):
+        def _block_matches_all(block_data, include_content=True):
             """
-            Check that the block matches all the criteria
+            Check that the block matches all the criteria (except the content criteria, unless include_content)
             """
             # do the checks which don't require loading any additional data
             if (
                 self._block_matches(block_data, qualifiers) and
                 self._block_matches(block_data.fields, settings)
             ):
-                if content:
+                if content and include_content:
                     definition_block = self.get_definition(course_locator, block_data.definition)
                     return self._block_matches(definition_block['fields'], content)
                 else:
                     return True
 
+        def _content_matches(block_ids):
+            """
+            Return the blocks whose definitions match the content criteria, loading the
+            definitions of all of the blocks at once.
+            """
+            blocks = course.structure['blocks']
+            definitions = {
+                definition['_id']: definition
+                for definition in self.get_definitions(
+                    course_locator, [blocks[block_id].definition for block_id in block_ids]
+                )
+            }
+            matching_block_ids = []
+            for block_id in block_ids:
+                definition_block = definitions.get(blocks[block_id].definition)
+                if definition_block is None:
+                    definition_block = self.get_definition(course_locator, blocks[block_id].definition)
+                if self._block_matches(definition_block['fields'], content):
+                    matching_block_ids.append(block_id)
+            return matching_block_ids
+
         if settings is None:
             settings = {}
         if 'name' in qualifiers:
@@ -1265,24 +1389,32 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         if 'children' in qualifiers:
             settings['children'] = qualifiers.pop('children')
 
-        # No need of these caches unless include_orphans is set to False
-        path_cache = None
-        parents_cache = None
-
-        if not include_orphans:
-            path_cache = {}
-            parents_cache = self.build_block_key_to_parents_mapping(course.structure)
-
-        for block_id, value in course.structure['blocks'].items():
-            if _block_matches_all(value):
+        # The index of a structure that's being edited is rebuilt every time, so it's only worth
+        # using to narrow down the blocks to check when it's cached, or to check for orphans.
+        structure_index = None
+        cacheable = self._is_structure_index_cacheable(course.course_key, course.structure)
+        if cacheable or not include_orphans:
+            structure_index = get_structure_index(course.structure, cacheable)
+
+        block_ids = None
+        if cacheable:
+            block_ids = structure_index.find_candidates(course.structure['blocks'], qualifiers, settings)
+        if block_ids is None:
+            block_ids = course.structure['blocks'].keys()
+
+        # Check the content criteria once the other criteria have narrowed down the definitions to load.
+        for block_id in block_ids:
+            if _block_matches_all(course.structure['blocks'][block_id], include_content=False):
                 if not include_orphans:
                     if (
                         block_id.type in DETACHED_XBLOCK_TYPES or
-                        self.has_path_to_root(block_id, course, path_cache, parents_cache)
+                        structure_index.has_path_to_root(block_id)
                     ):
                         items.append(block_id)
                 else:
                     items.append(block_id)
+        if content and items:
+            items = _content_matches(items)
 
         if len(items) > 0:
             return self._load_items(course, items, depth=0, **kwargs)
@@ -1318,6 +1450,8 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
 
         :return Bool: whether or not component has path to the root
         """
+        if path_cache is None and parents_cache is None:
+            return self.get_structure_index(course.course_key, course.structure).has_path_to_root(block_key)
 
         if path_cache and block_key in path_cache:
             return path_cache[block_key]
@@ -1357,14 +1491,15 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             raise ItemNotFoundError(locator)
 
         course = self._lookup_course(locator.course_key)
-        all_parent_ids = self._get_parents_from_structure(BlockKey.from_usage_key(locator), course.structure)
+        structure_index = self.get_structure_index(course.course_key, course.structure)
+        all_parent_ids = structure_index.get_parents(BlockKey.from_usage_key(locator))
 
         # Check and verify the found parent_ids are not orphans; Remove parent which has no valid path
         # to the course root
         parent_ids = [
             valid_parent
             for valid_parent in all_parent_ids
-            if self.has_path_to_root(valid_parent, course)
+            if structure_index.has_path_to_root(valid_parent)
         ]
 
         if len(parent_ids) == 0:
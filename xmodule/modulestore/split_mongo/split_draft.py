@@ -290,6 +290,13 @@ class DraftVersioningModuleStore(SplitMongoModuleStore, ModuleStoreDraftAndPubli
         course_locator = self._map_revision_to_branch(course_locator, revision=revision)
         return super().get_items(course_locator, **kwargs)
 
+    def prefetch_definitions(self, usage_key, depth=None, content_fields=None, revision=None):  # lint-amnesty, pylint: disable=arguments-differ
+        """
+        See :meth:`SplitMongoModuleStore.prefetch_definitions`; uses the branch setting for the revision.
+        """
+        usage_key = self._map_revision_to_branch(usage_key, revision=revision)
+        return super().prefetch_definitions(usage_key, depth=depth, content_fields=content_fields)
+
     def get_parent_location(self, location, revision=None, **kwargs):  # lint-amnesty, pylint: disable=arguments-differ
         '''
         Returns the given location's parent location in this course.
@@ -0,0 +1,318 @@
+"""
+An index of the block hierarchy of a split-mongo course structure.
+
+Finding the parents of a block in a structure, or whether a block is
+reachable from the course root, otherwise means scanning (and, for
+ancestry, repeatedly scanning) every block in the structure. The
+:class:`StructureIndex` does that scan once, so that these lookups are
+O(1) afterwards. It also indexes the blocks by block type and, on demand,
+by the values of their settings fields, so that ``get_items`` only has to
+check the blocks which can match its qualifiers.
+
+Persisted structures are immutable (edits always produce a new structure
+with a new ``_id``), so the index of a persisted structure is cached per
+process, keyed by the structure's ``_id`` (see :func:`get_structure_index`).
+"""
+import re
+import threading
+from collections import OrderedDict, defaultdict
+
+# The maximum number of structure indexes kept in the process-local cache.
+STRUCTURE_INDEX_CACHE_SIZE = 64
+
+# Block types that are the root of a structure.
+ROOT_BLOCK_TYPES = ('course', 'library')
+
+
+class StructureIndex:
+    """
+    The parent map of a structure, along with the depth and pre-order /
+    post-order numbering of every block reachable from the structure's root.
+
+    Blocks that have several parents are numbered along the first path that
+    reaches them from the root, so the interval numbering is only used for
+    subtree membership checks when every block has at most one parent.
+    """
+    def __init__(self, blocks):
+        """
+        :param blocks: the ``blocks`` dict of a structure, mapping BlockKeys to BlockData
+        """
+        self.num_blocks = len(blocks)
+        # dict {BlockKey: list of parent BlockKeys}
+        self.parents = defaultdict(list)
+        # dict {block type: list of BlockKeys, in structure order}
+        self.blocks_by_type = defaultdict(list)
+        for parent_key, block in blocks.items():
+            self.blocks_by_type[parent_key.type].append(parent_key)
+            for child_key in block.fields.get('children', []):
+                self.parents[child_key].append(parent_key)
+        # The maps of a structure are read-only, so don't add entries for unknown blocks.
+        self.parents.default_factory = None
+        self.blocks_by_type.default_factory = None
+
+        # Built on demand, since most structures are never queried by settings field values:
+        # dict {field name: _FieldIndex}, and dict {BlockKey: position in the structure}.
+        self._field_indexes = {}
+        self._positions = None
+
+        self.is_tree = all(len(parents) == 1 for parents in self.parents.values())
+        # dicts {BlockKey: int} of the blocks reachable from a root block.
+        self.depth = {}
+        self.preorder = {}
+        self.postorder = {}
+        self._number_blocks(blocks)
+
+    def _number_blocks(self, blocks):
+        """
+        Numbers the blocks reachable from the root blocks of the structure,
+        with an iterative depth-first traversal.
+        """
+        roots = [
+            block_key for block_key in blocks
+            if block_key.type in ROOT_BLOCK_TYPES and block_key not in self.parents
+        ]
+        counter = 0
+        for root in roots:
+            self.depth[root] = 0
+            self.preorder[root] = counter
+            counter += 1
+            # Stack of (block key, iterator over its children).
+            stack = [(root, iter(self._children(blocks, root)))]
+            while stack:
+                block_key, children = stack[-1]
+                child_key = next(children, None)
+                if child_key is None:
+                    stack.pop()
+                    self.postorder[block_key] = counter
+                    counter += 1
+                elif child_key not in self.preorder:
+                    self.depth[child_key] = len(stack)
+                    self.preorder[child_key] = counter
+                    counter += 1
+                    stack.append((child_key, iter(self._children(blocks, child_key))))
+
+    @staticmethod
+    def _children(blocks, block_key):
+        block = blocks.get(block_key)
+        return block.fields.get('children', []) if block is not None else []
+
+    def get_parents(self, block_key):
+        """
+        Returns the list of the parents of the given block.
+        """
+        return self.parents.get(block_key, [])
+
+    def has_path_to_root(self, block_key):
+        """
+        Returns whether the given block is reachable from the root of the structure.
+        """
+        if block_key in self.preorder:
+            return True
+        # A root block that isn't in the structure is its own root.
+        return block_key.type in ROOT_BLOCK_TYPES and block_key not in self.parents
+
+    def is_ancestor(self, ancestor_key, block_key):
+        """
+        Returns whether ``ancestor_key`` is a proper ancestor of ``block_key``.
+        """
+        if ancestor_key == block_key:
+            return False
+        if self.is_tree and ancestor_key in self.preorder and block_key in self.preorder:
+            return (
+                self.preorder[ancestor_key] < self.preorder[block_key] and
+                self.postorder[block_key] < self.postorder[ancestor_key]
+            )
+
+        # Walk up the (possibly multiple) parents of the block.
+        visited = set()
+        to_visit = list(self.get_parents(block_key))
+        while to_visit:
+            parent_key = to_visit.pop()
+            if parent_key == ancestor_key:
+                return True
+            if parent_key not in visited:
+                visited.add(parent_key)
+                to_visit.extend(self.get_parents(parent_key))
+        return False
+
+    def is_in_subtree(self, block_key, root_key):
+        """
+        Returns whether ``block_key`` is ``root_key`` or one of its descendants.
+        """
+        return block_key == root_key or self.is_ancestor(root_key, block_key)
+
+    def get_blocks_of_type(self, block_type):
+        """
+        Returns the list of the blocks of the given type, in structure order.
+        """
+        return self.blocks_by_type.get(block_type, [])
+
+    def find_candidates(self, blocks, qualifiers, settings):
+        """
+        Returns the blocks which may match the given ``get_items`` qualifiers (on the BlockData)
+        and settings (on the BlockData fields), in structure order, or None if none of the
+        criteria can be looked up in the indexes. Every block which matches is returned, but
+        the candidates still have to be checked against all of the criteria.
+
+        Only the ``block_type`` qualifier and settings fields queried by value (or with ``$in``)
+        are looked up; regexes, functions, ``$nin`` and ``$exists`` criteria are left to the check.
+
+        :param blocks: the ``blocks`` dict of the structure of this index
+        """
+        candidate_lists = []
+        if 'block_type' in qualifiers:
+            values = _lookup_values(qualifiers['block_type'])
+            if values is not None:
+                candidate_lists.append(self._union(blocks, [self.get_blocks_of_type(value) for value in values]))
+
+        for field_name, criteria in settings.items():
+            values = _lookup_values(criteria)
+            if values is not None:
+                field_index = self._get_field_index(blocks, field_name)
+                candidate_lists.append(self._union(
+                    blocks,
+                    [field_index.blocks_by_value.get(value, []) for value in values] + [field_index.unindexed],
+                ))
+
+        if not candidate_lists:
+            return None
+        return min(candidate_lists, key=len)
+
+    def _get_field_index(self, blocks, field_name):
+        """
+        Returns the _FieldIndex of the given settings field, building it if needed.
+        """
+        field_index = self._field_indexes.get(field_name)
+        if field_index is None:
+            field_index = self._field_indexes[field_name] = _FieldIndex(blocks, field_name)
+        return field_index
+
+    def _union(self, blocks, block_lists):
+        """
+        Returns the union of the given lists of blocks, in structure order.
+        """
+        non_empty_lists = [block_list for block_list in block_lists if block_list]
+        if len(non_empty_lists) <= 1:
+            return non_empty_lists[0] if non_empty_lists else []
+
+        if self._positions is None:
+            self._positions = {block_key: position for position, block_key in enumerate(blocks)}
+        union = {block_key for block_list in non_empty_lists for block_key in block_list}
+        return sorted(union, key=self._positions.__getitem__)
+
+
+class _FieldIndex:
+    """
+    The blocks of a structure that have the given settings field set, by value.
+    """
+    def __init__(self, blocks, field_name):
+        # dict {value: list of BlockKeys, in structure order}. Blocks whose value is a
+        # list are listed under each of its elements, as get_items matches any of them.
+        self.blocks_by_value = defaultdict(list)
+        # Blocks whose value can't be indexed, which have to be checked for every value.
+        self.unindexed = []
+        for block_key, block in blocks.items():
+            if field_name not in block.fields:
+                continue
+            value = block.fields[field_name]
+            try:
+                values = set(value) if isinstance(value, list) else {value}
+            except TypeError:
+                self.unindexed.append(block_key)
+                continue
+            for each_value in values:
+                self.blocks_by_value[each_value].append(block_key)
+        self.blocks_by_value.default_factory = None
+
+
+def _lookup_values(criteria):
+    """
+    Returns the list of values which a field equal to (or, for a list field, containing)
+    matches the given get_items criteria, or None if the criteria can't be looked up by value.
+    """
+    if isinstance(criteria, dict):
+        if list(criteria) != ['$in']:
+            return None
+        values = list(criteria['$in'])
+    else:
+        values = [criteria]
+
+    for value in values:
+        if isinstance(value, (dict, list, re.Pattern)) or callable(value):
+            return None
+        try:
+            hash(value)
+        except TypeError:
+            return None
+    return values
+
+
+class _StructureIndexCache:
+    """
+    A process-local, thread-safe LRU cache of StructureIndexes, keyed by structure ``_id``.
+    """
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            index = self._entries.get(key)
+            if index is not None:
+                self._entries.move_to_end(key)
+            return index
+
+    def set(self, key, index):
+        with self._lock:
+            self._entries[key] = index
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_STRUCTURE_INDEX_CACHE = _StructureIndexCache(STRUCTURE_INDEX_CACHE_SIZE)
+
+
+def get_structure_index(structure, cacheable=True):
+    """
+    Returns the StructureIndex of the given structure.
+
+    :param structure: db json of a course structure
+    :param cacheable: whether the structure is persisted (and so immutable), in
+        which case its index is cached. The index of a structure that is still
+        being edited is rebuilt on every call.
+    """
+    if not cacheable:
+        return StructureIndex(structure['blocks'])
+
+    index = _STRUCTURE_INDEX_CACHE.get(structure['_id'])
+    if index is None or index.num_blocks != len(structure['blocks']):
+        index = StructureIndex(structure['blocks'])
+        _STRUCTURE_INDEX_CACHE.set(structure['_id'], index)
+    return index
+
+
+def forget_structure_index(structure_id):
+    """
+    Removes the cached index of the structure with the given ``_id``, if any.
+    """
+    _STRUCTURE_INDEX_CACHE.delete(structure_id)
+
+
+def clear_structure_index_cache():
+    """
+    Empty the process-local cache of structure indexes.
+    """
+    _STRUCTURE_INDEX_CACHE.clear()
@@ -0,0 +1,177 @@
+"""
+A write-only pyfilesystem that streams the files written to it into a tarball.
+
+Exporting a course to a directory and then compressing that directory means
+writing every file twice, and (through the contentstore's export) reading
+every asset into memory. :class:`TarExportFS` can be used as the export
+filesystem instead, so that each OLX file is added to the tarball as soon as
+it is written, and assets are copied into it a chunk at a time.
+"""
+import os
+import tarfile
+import threading
+import time
+from tempfile import SpooledTemporaryFile
+
+from fs import errors
+from fs.base import FS
+from fs.info import Info
+from fs.mode import Mode
+from fs.path import abspath, basename, dirname, normpath, relpath
+
+# Files written through TarExportFS.open are kept in memory up to this size,
+# and spooled to a temporary file beyond it, until they're added to the tarball.
+SPOOL_MAX_SIZE = 1024 * 1024
+
+
+class _TarMemberFile(SpooledTemporaryFile):  # pylint: disable=abstract-method
+    """
+    A file which is added to the tarball of a TarExportFS when it is closed.
+    """
+    def __init__(self, tar_fs, path):
+        super().__init__(max_size=SPOOL_MAX_SIZE, mode='w+b')
+        self._tar_fs = tar_fs
+        self._path = path
+
+    def readable(self):
+        return False
+
+    def close(self):
+        if not self.closed:
+            try:
+                self.seek(0, os.SEEK_END)
+                size = self.tell()
+                self.seek(0)
+                self._tar_fs.add_file(self._path, self, size)
+            finally:
+                super().close()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class TarExportFS(FS):
+    """
+    A write-only filesystem whose files are added to the given TarFile (opened
+    for writing) as they are closed. Directories are added as they are made.
+
+    Files can't be read, removed or rewritten in place; writing a file again adds
+    another member with the same name, which replaces the first one on extraction.
+    """
+    _meta = {
+        'case_insensitive': False,
+        'invalid_path_chars': '\0',
+        'network': False,
+        'read_only': False,
+        'thread_safe': True,
+        'unicode_paths': True,
+        'virtual': False,
+    }
+
+    def __init__(self, tar_file):
+        super().__init__()
+        self._tar_file = tar_file
+        self._tar_lock = threading.RLock()
+        # The paths of the directories made so far, and the sizes of the files written.
+        self._dirs = {'/'}
+        self._files = {}
+
+    def _check_parent(self, path):
+        """
+        Raise ResourceNotFound unless the parent directory of path has been made.
+        """
+        if dirname(path) not in self._dirs:
+            raise errors.ResourceNotFound(path)
+
+    def getinfo(self, path, namespaces=None):
+        path = abspath(normpath(path))
+        if path in self._dirs:
+            return Info({'basic': {'name': basename(path), 'is_dir': True}})
+        if path in self._files:
+            return Info({
+                'basic': {'name': basename(path), 'is_dir': False},
+                'details': {'size': self._files[path], 'type': 2},
+            })
+        raise errors.ResourceNotFound(path)
+
+    def listdir(self, path):
+        path = abspath(normpath(path))
+        if path not in self._dirs:
+            if path in self._files:
+                raise errors.DirectoryExpected(path)
+            raise errors.ResourceNotFound(path)
+        return sorted(
+            basename(child) for child in self._dirs.union(self._files)
+            if child != '/' and dirname(child) == path
+        )
+
+    def makedir(self, path, permissions=None, recreate=False):
+        path = abspath(normpath(path))
+        with self._lock:
+            if path in self._dirs:
+                if not recreate:
+                    raise errors.DirectoryExists(path)
+                return self.opendir(path)
+            if path in self._files:
+                raise errors.DirectoryExists(path)
+            self._check_parent(path)
+
+            tar_info = tarfile.TarInfo(relpath(path))
+            tar_info.type = tarfile.DIRTYPE
+            tar_info.mode = 0o755
+            tar_info.mtime = time.time()
+            with self._tar_lock:
+                self._tar_file.addfile(tar_info)
+            self._dirs.add(path)
+        return self.opendir(path)
+
+    def openbin(self, path, mode='r', buffering=-1, **options):
+        path = abspath(normpath(path))
+        _mode = Mode(mode)
+        _mode.validate_bin()
+        if _mode.reading or _mode.appending:
+            raise errors.ResourceReadOnly(path, msg=f"can't open {path} with mode {mode}, files are write-only")
+        with self._lock:
+            if path in self._dirs:
+                raise errors.FileExpected(path)
+            if _mode.exclusive and path in self._files:
+                raise errors.FileExists(path)
+            self._check_parent(path)
+        return _TarMemberFile(self, path)
+
+    def setbinfile(self, path, file):
+        """
+        Add the contents of the given binary file object (which must be seekable,
+        e.g. a GridFS file) to the tarball, copying it one chunk at a time.
+        """
+        path = abspath(normpath(path))
+        with self._lock:
+            if path in self._dirs:
+                raise errors.FileExpected(path)
+            self._check_parent(path)
+        file.seek(0, os.SEEK_END)
+        size = file.tell()
+        file.seek(0)
+        self.add_file(path, file, size)
+
+    def add_file(self, path, file, size):
+        """
+        Add size bytes read from the given binary file object as the file at path.
+        """
+        tar_info = tarfile.TarInfo(relpath(path))
+        tar_info.size = size
+        tar_info.mode = 0o644
+        tar_info.mtime = time.time()
+        with self._tar_lock:
+            self._tar_file.addfile(tar_info, file)
+        with self._lock:
+            self._files[path] = size
+
+    def remove(self, path):
+        raise errors.ResourceReadOnly(path)
+
+    def removedir(self, path):
+        raise errors.ResourceReadOnly(path)
+
+    def setinfo(self, path, info):
+        raise errors.ResourceReadOnly(path)
@@ -13,6 +13,7 @@ from uuid import uuid4
 import pytest
 import ddt
 import path
+from fs.osfs import OSFS
 from opaque_keys.edx.keys import AssetKey
 from opaque_keys.edx.locator import AssetLocator, CourseLocator
 
@@ -133,16 +134,14 @@ class TestContentstore(unittest.TestCase):
         self.set_up_assets(deprecated)
         root_dir = path.Path(mkdtemp())
         try:
-            self.contentstore.export_all_for_course(
-                self.course1_key, root_dir,
-                path.Path(root_dir / "policy.json"),
-            )
+            self.contentstore.export_all_for_course_to_fs(self.course1_key, OSFS(root_dir))
+            assert path.Path(root_dir / 'policies' / 'assets.json').isfile()
             for filename in self.course1_files:
-                filepath = path.Path(root_dir / filename)
+                filepath = path.Path(root_dir / 'static' / filename)
                 assert filepath.isfile(), f'{filepath} is not a file'
             for filename in self.course2_files:
                 if filename not in self.course1_files:
-                    filepath = path.Path(root_dir / filename)
+                    filepath = path.Path(root_dir / 'static' / filename)
                     assert not filepath.isfile(), f'{filepath} is unexpected exported a file'
         finally:
             shutil.rmtree(root_dir)
@@ -12,6 +12,7 @@ import ddt
 from django.test import TestCase  # lint-amnesty, pylint: disable=reimported
 
 from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.split_mongo.mongo_connection import get_definition_query_count
 from xmodule.modulestore.tests.factories import check_mongo_calls
 from xmodule.modulestore.tests.utils import (
     TEST_DATA_DIR,
@@ -177,3 +178,34 @@ class CountMongoCallsCourseTraversal(TestCase):
                     # and then subsequently retrieved with the lazy and depth=None values
                     course = modulestore.get_item(course.location, depth=None, lazy=False)
                     self._traverse_blocks_in_course(course, access_all_block_fields=True)
+
+    @ddt.data(MIXED_SPLIT_MODULESTORE_BUILDER)
+    def test_prefetch_definitions(self, store_builder):
+        request_cache = MemoryCache()
+        with store_builder.build(request_cache=request_cache) as (content_store, modulestore):
+            course_key = self._import_course(content_store, modulestore)
+
+            with modulestore.bulk_operations(course_key):
+                course = modulestore.get_course(course_key, depth=0, lazy=True)
+                initial_query_count = get_definition_query_count()
+                assert modulestore.prefetch_definitions(course.location) > 0
+                assert get_definition_query_count() == initial_query_count + 1
+                # Definitions are only prefetched once per request.
+                assert modulestore.prefetch_definitions(course.location) == 0
+
+                # Traversing the course lazily doesn't query for the prefetched definitions.
+                course = modulestore.get_item(course.location, depth=None, lazy=True)
+                self._traverse_blocks_in_course(course, access_all_block_fields=True)
+                assert get_definition_query_count() == initial_query_count + 1
+
+    @ddt.data(MIXED_SPLIT_MODULESTORE_BUILDER)
+    def test_prefetch_definitions_of_content_fields(self, store_builder):
+        request_cache = MemoryCache()
+        with store_builder.build(request_cache=request_cache) as (content_store, modulestore):
+            course_key = self._import_course(content_store, modulestore)
+
+            with modulestore.bulk_operations(course_key):
+                course = modulestore.get_course(course_key, depth=0, lazy=True)
+                # Only blocks with a 'data' content field (e.g. html and problems, not verticals) are prefetched.
+                assert modulestore.prefetch_definitions(course.location, content_fields={'data'}) > 0
+                assert modulestore.prefetch_definitions(course.location) > 0
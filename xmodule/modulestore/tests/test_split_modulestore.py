@@ -15,6 +15,7 @@ import pytest
 import ddt
 from ccx_keys.locator import CCXBlockUsageLocator
 from django.core.cache import InvalidCacheBackendError, caches
+from django.test.utils import override_settings
 from opaque_keys.edx.locator import BlockUsageLocator, CourseKey, CourseLocator, LocalId
 from testfixtures import LogCapture
 from xblock.fields import Reference, ReferenceList, ReferenceValueDict
@@ -35,7 +36,11 @@ from xmodule.modulestore.exceptions import (
 )
 from xmodule.modulestore.inheritance import InheritanceMixin
 from xmodule.modulestore.split_mongo import BlockKey
-from xmodule.modulestore.split_mongo.mongo_connection import CourseStructureCache
+from xmodule.modulestore.split_mongo.mongo_connection import (
+    CourseStructureCache,
+    LocalStructureCache,
+    clear_local_structure_cache
+)
 from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
 from xmodule.modulestore.tests.factories import check_mongo_calls
 from xmodule.modulestore.tests.mongo_connection import MONGO_HOST, MONGO_PORT_NUM
@@ -879,6 +884,68 @@ class TestCourseStructureCache(CacheIsolationMixin, SplitModuleTest):
         # data chunk was less than 1MB so no logs were added.
         self.assertEqual(len(capture.records), 0)
 
+    @override_settings(COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES=10 * 1024 * 1024)
+    def test_local_structure_cache(self):
+        # The course_structure_cache is a dummy cache here, so only the
+        # process-local cache can save the mongo call.
+        clear_local_structure_cache()
+        with check_mongo_calls(1):
+            not_cached_structure = self._get_structure(self.new_course)
+
+        with check_mongo_calls(0):
+            cached_structure = self._get_structure(self.new_course)
+
+        assert cached_structure == not_cached_structure
+        clear_local_structure_cache()
+
+        with check_mongo_calls(1):
+            self._get_structure(self.new_course)
+
+    @override_settings(COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES=10 * 1024 * 1024)
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_local_structure_cache_populated_from_django_cache(self, mock_get_cache):
+        enabled_cache = caches['default']
+        mock_get_cache.return_value = enabled_cache
+        clear_local_structure_cache()
+
+        with check_mongo_calls(1):
+            not_cached_structure = self._get_structure(self.new_course)
+
+        # Drop the structure from the local cache; it should be reloaded from
+        # the django cache, and then be served from the local cache even once
+        # the django cache entry is gone.
+        clear_local_structure_cache()
+        with check_mongo_calls(0):
+            self._get_structure(self.new_course)
+
+        enabled_cache.clear()
+        with check_mongo_calls(0):
+            cached_structure = self._get_structure(self.new_course)
+
+        assert cached_structure == not_cached_structure
+        clear_local_structure_cache()
+
+    @override_settings(COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES=10 * 1024 * 1024)
+    def test_local_structure_cache_returns_copies(self):
+        # Callers modify the structures they get (e.g. split's cache_items loads
+        # definitions into the block fields), so they must not share them.
+        clear_local_structure_cache()
+        self._get_structure(self.new_course)
+
+        with check_mongo_calls(0):
+            first_structure = self._get_structure(self.new_course)
+            second_structure = self._get_structure(self.new_course)
+
+        assert first_structure is not second_structure
+        block_key = next(iter(first_structure['blocks']))
+        first_structure['blocks'][block_key].fields['display_name'] = 'Changed by the first caller'
+        first_structure['blocks'][block_key].definition_loaded = True
+
+        assert second_structure['blocks'][block_key].fields.get('display_name') != 'Changed by the first caller'
+        assert not second_structure['blocks'][block_key].definition_loaded
+        assert self._get_structure(self.new_course) == second_structure
+        clear_local_structure_cache()
+
     def _get_structure(self, course):
         """
         Helper function to get a structure from a course.
@@ -888,6 +955,57 @@ class TestCourseStructureCache(CacheIsolationMixin, SplitModuleTest):
         )
 
 
+class TestLocalStructureCache(unittest.TestCase):
+    """Tests for the process-local LocalStructureCache"""
+
+    def test_get_and_set(self):
+        cache = LocalStructureCache(max_bytes=100)
+        assert cache.get('a') is None
+        assert cache.set('a', {'_id': 'a'}, 10) == 0
+        assert cache.get('a') == {'_id': 'a'}
+        assert cache.current_bytes == 10
+
+    def test_evicts_least_recently_used_by_size(self):
+        cache = LocalStructureCache(max_bytes=100)
+        cache.set('a', 'structure_a', 40)
+        cache.set('b', 'structure_b', 40)
+
+        # Touch 'a', so that 'b' is the least recently used
+        cache.get('a')
+
+        assert cache.set('c', 'structure_c', 40) == 1
+        assert 'a' in cache
+        assert 'b' not in cache
+        assert 'c' in cache
+        assert cache.current_bytes == 80
+
+        # A large structure can evict several smaller ones
+        assert cache.set('d', 'structure_d', 90) == 2
+        assert len(cache) == 1
+        assert cache.current_bytes == 90
+
+    def test_oversized_structure_not_cached(self):
+        cache = LocalStructureCache(max_bytes=100)
+        cache.set('a', 'structure_a', 40)
+        assert cache.set('b', 'structure_b', 101) == 0
+        assert 'b' not in cache
+        assert 'a' in cache
+
+    def test_replace_existing_key(self):
+        cache = LocalStructureCache(max_bytes=100)
+        cache.set('a', 'structure_a', 40)
+        cache.set('a', 'structure_a', 60)
+        assert len(cache) == 1
+        assert cache.current_bytes == 60
+
+    def test_clear(self):
+        cache = LocalStructureCache(max_bytes=100)
+        cache.set('a', 'structure_a', 40)
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.current_bytes == 0
+
+
 class SplitModuleItemTests(SplitModuleTest):
     '''
     Item read tests including inheritance
@@ -0,0 +1,257 @@
+"""
+Tests for split_mongo/structure_index.py
+"""
+import re
+from unittest import TestCase
+
+import ddt
+from bson.objectid import ObjectId
+
+from xmodule.modulestore import BlockData, ModuleStoreRead
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.structure_index import (
+    StructureIndex,
+    clear_structure_index_cache,
+    forget_structure_index,
+    get_structure_index
+)
+
+
+def make_structure(children_map, fields_map=None):
+    """
+    Returns a structure whose blocks have the given children, where
+    children_map is a dict {BlockKey: list of child BlockKeys}, and the
+    other settings fields in fields_map, a dict {BlockKey: dict of fields}.
+    """
+    fields_map = fields_map or {}
+    return {
+        '_id': ObjectId(),
+        'blocks': {
+            block_key: BlockData(
+                block_type=block_key.type, fields=dict(fields_map.get(block_key, {}), children=children)
+            )
+            for block_key, children in children_map.items()
+        },
+    }
+
+
+class BlockMatcher:
+    """
+    The get_items block matching of the modulestores, without a modulestore.
+    """
+    _block_matches = ModuleStoreRead._block_matches
+    _value_matches = ModuleStoreRead._value_matches
+
+    def matches(self, block, qualifiers, settings):
+        """
+        Returns whether the BlockData matches the qualifiers and its fields match the settings.
+        """
+        return self._block_matches(block, qualifiers) and self._block_matches(block.fields, settings)
+
+
+def scan_items(structure, qualifiers, settings):
+    """
+    Returns the blocks which match the get_items qualifiers and settings, found by scanning the structure.
+    """
+    matcher = BlockMatcher()
+    return [
+        block_key for block_key, block in structure['blocks'].items()
+        if matcher.matches(block, qualifiers, settings)
+    ]
+
+
+def scan_parents(block_key, structure):
+    """
+    Returns the parents of the block, found by scanning the structure.
+    """
+    return [
+        parent_key for parent_key, block in structure['blocks'].items()
+        if block_key in block.fields.get('children', [])
+    ]
+
+
+def scan_has_path_to_root(block_key, structure):
+    """
+    Returns whether the block has a path to the root, found by scanning the structure.
+    """
+    parents = scan_parents(block_key, structure)
+    if not parents and block_key.type in ('course', 'library'):
+        return True
+    return any(scan_has_path_to_root(parent_key, structure) for parent_key in parents)
+
+
+class TestStructureIndex(TestCase):
+    """
+    Tests for StructureIndex.
+    """
+    course = BlockKey('course', 'course')
+    chapter = BlockKey('chapter', 'chapter')
+    sequential_1 = BlockKey('sequential', 'sequential_1')
+    sequential_2 = BlockKey('sequential', 'sequential_2')
+    vertical_1 = BlockKey('vertical', 'vertical_1')
+    vertical_2 = BlockKey('vertical', 'vertical_2')
+    html = BlockKey('html', 'html')
+    orphan = BlockKey('vertical', 'orphan')
+    orphan_child = BlockKey('problem', 'orphan_child')
+
+    def setUp(self):
+        super().setUp()
+        clear_structure_index_cache()
+        self.structure = make_structure({
+            self.course: [self.chapter],
+            self.chapter: [self.sequential_1, self.sequential_2],
+            self.sequential_1: [self.vertical_1],
+            self.sequential_2: [self.vertical_2],
+            self.vertical_1: [self.html],
+            self.vertical_2: [],
+            self.html: [],
+            self.orphan: [self.orphan_child],
+            self.orphan_child: [],
+        })
+        self.index = StructureIndex(self.structure['blocks'])
+
+    def test_matches_structure_scan(self):
+        for block_key in self.structure['blocks']:
+            assert self.index.get_parents(block_key) == scan_parents(block_key, self.structure)
+            assert self.index.has_path_to_root(block_key) == scan_has_path_to_root(block_key, self.structure)
+
+    def test_orphans(self):
+        assert not self.index.has_path_to_root(self.orphan)
+        assert not self.index.has_path_to_root(self.orphan_child)
+        assert not self.index.has_path_to_root(BlockKey('html', 'unknown'))
+        assert self.index.get_parents(BlockKey('html', 'unknown')) == []
+
+    def test_depth(self):
+        assert self.index.depth[self.course] == 0
+        assert self.index.depth[self.chapter] == 1
+        assert self.index.depth[self.vertical_2] == 3
+        assert self.index.depth[self.html] == 4
+        assert self.orphan not in self.index.depth
+
+    def test_ancestry(self):
+        assert self.index.is_tree
+        assert self.index.is_ancestor(self.course, self.html)
+        assert self.index.is_ancestor(self.sequential_1, self.html)
+        assert not self.index.is_ancestor(self.sequential_2, self.html)
+        assert not self.index.is_ancestor(self.html, self.sequential_1)
+        assert not self.index.is_ancestor(self.html, self.html)
+        assert self.index.is_ancestor(self.orphan, self.orphan_child)
+        assert self.index.is_in_subtree(self.chapter, self.chapter)
+        assert self.index.is_in_subtree(self.vertical_2, self.chapter)
+        assert not self.index.is_in_subtree(self.orphan_child, self.chapter)
+
+    def test_ancestry_with_shared_children(self):
+        self.structure['blocks'][self.vertical_2].fields['children'] = [self.html]
+        index = StructureIndex(self.structure['blocks'])
+        assert not index.is_tree
+        assert index.get_parents(self.html) == [self.vertical_1, self.vertical_2]
+        assert index.is_ancestor(self.sequential_1, self.html)
+        assert index.is_ancestor(self.sequential_2, self.html)
+        assert not index.is_ancestor(self.sequential_2, self.vertical_1)
+
+    def test_cycle(self):
+        self.structure['blocks'][self.orphan_child].fields['children'] = [self.orphan]
+        index = StructureIndex(self.structure['blocks'])
+        assert not index.has_path_to_root(self.orphan)
+        assert index.is_ancestor(self.orphan, self.orphan_child)
+
+    def test_cached_index(self):
+        index = get_structure_index(self.structure)
+        assert get_structure_index(self.structure) is index
+        assert get_structure_index(self.structure, cacheable=False) is not index
+
+        forget_structure_index(self.structure['_id'])
+        assert get_structure_index(self.structure) is not index
+
+    def test_cached_index_rebuilt_when_blocks_change(self):
+        index = get_structure_index(self.structure)
+        self.structure['blocks'][BlockKey('html', 'new')] = BlockData(block_type='html', fields={})
+        assert get_structure_index(self.structure) is not index
+
+
+
+@ddt.ddt
+class TestStructureIndexCandidates(TestCase):
+    """
+    Tests for the block type and settings field indexes of StructureIndex.
+    """
+    course = BlockKey('course', 'course')
+    chapter = BlockKey('chapter', 'chapter')
+    sequential_1 = BlockKey('sequential', 'sequential_1')
+    sequential_2 = BlockKey('sequential', 'sequential_2')
+    problem_1 = BlockKey('problem', 'problem_1')
+    problem_2 = BlockKey('problem', 'problem_2')
+    video = BlockKey('video', 'video')
+    html = BlockKey('html', 'html')
+
+    def setUp(self):
+        super().setUp()
+        self.structure = make_structure(
+            {
+                self.course: [self.chapter],
+                self.chapter: [self.sequential_1, self.sequential_2],
+                self.sequential_1: [self.problem_1, self.video],
+                self.sequential_2: [self.problem_2, self.html],
+                self.problem_1: [],
+                self.problem_2: [],
+                self.video: [],
+                self.html: [],
+            },
+            {
+                self.sequential_1: {'graded': True, 'format': 'Homework'},
+                self.sequential_2: {'graded': False},
+                self.problem_1: {'weight': 1, 'tags': ['easy', 'math']},
+                self.problem_2: {'weight': 2, 'tags': ['math'], 'display_name': 'Problem'},
+                self.video: {'tags': [['nested']], 'display_name': 'Video'},
+                self.html: {'display_name': {'en': 'Html'}},
+            },
+        )
+        self.blocks = self.structure['blocks']
+        self.index = StructureIndex(self.blocks)
+
+    @ddt.data(
+        ({'block_type': 'problem'}, {}),
+        ({'block_type': 'unknown'}, {}),
+        ({'block_type': {'$in': ['problem', 'video', 'unknown']}}, {}),
+        ({'block_type': 'sequential'}, {'graded': True}),
+        ({}, {'graded': False}),
+        ({}, {'weight': 1}),
+        ({}, {'tags': 'math'}),
+        ({}, {'tags': {'$in': ['easy', 'nested']}}),
+        ({}, {'display_name': 'Problem'}),
+        ({}, {'display_name': {'en': 'Html'}}),
+        ({}, {'format': {'$exists': False}}),
+        ({'block_type': 'problem'}, {'display_name': re.compile('Prob')}),
+        ({}, {'children': BlockKey('problem', 'problem_1')}),
+    )
+    @ddt.unpack
+    def test_matches_structure_scan(self, qualifiers, settings):
+        candidates = self.index.find_candidates(self.blocks, qualifiers, settings)
+        if candidates is None:
+            candidates = list(self.blocks)
+        matcher = BlockMatcher()
+        assert [
+            block_key for block_key in candidates
+            if matcher.matches(self.blocks[block_key], qualifiers, settings)
+        ] == scan_items(self.structure, qualifiers, settings)
+
+    def test_candidates(self):
+        assert self.index.find_candidates(self.blocks, {'block_type': 'problem'}, {}) == [
+            self.problem_1, self.problem_2
+        ]
+        assert self.index.find_candidates(self.blocks, {'block_type': {'$in': ['video', 'problem']}}, {}) == [
+            self.problem_1, self.problem_2, self.video
+        ]
+        # The most selective of the criteria is used.
+        assert self.index.find_candidates(self.blocks, {'block_type': 'problem'}, {'weight': 2}) == [self.problem_2]
+        # Blocks whose field value can't be indexed are always candidates.
+        assert self.index.find_candidates(self.blocks, {}, {'display_name': 'Problem'}) == [
+            self.problem_2, self.html
+        ]
+
+    def test_no_indexable_criteria(self):
+        assert self.index.find_candidates(self.blocks, {}, {}) is None
+        assert self.index.find_candidates(self.blocks, {'block_type': re.compile('prob')}, {}) is None
+        assert self.index.find_candidates(self.blocks, {}, {'weight': lambda weight: weight > 1}) is None
+        assert self.index.find_candidates(self.blocks, {}, {'tags': {'$nin': ['math']}}) is None
+        assert self.index.find_candidates(self.blocks, {'edited_by': 'someone'}, {}) is None
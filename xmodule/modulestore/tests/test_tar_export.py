@@ -0,0 +1,83 @@
+"""
+Tests for xmodule/modulestore/tar_export.py
+"""
+import io
+import tarfile
+from unittest import TestCase
+
+from fs import errors
+
+from xmodule.modulestore.tar_export import SPOOL_MAX_SIZE, TarExportFS
+
+
+class TestTarExportFS(TestCase):
+    """
+    Tests for TarExportFS.
+    """
+    def setUp(self):
+        super().setUp()
+        self.buffer = io.BytesIO()
+        self.tar_file = tarfile.open(fileobj=self.buffer, mode='w:gz')  # pylint: disable=consider-using-with
+        self.addCleanup(self.tar_file.close)
+        self.export_fs = TarExportFS(self.tar_file)
+
+    def _members(self):
+        """
+        Closes the tarball and returns a dict {name: contents, or None for directories} of its members.
+        """
+        self.tar_file.close()
+        self.buffer.seek(0)
+        with tarfile.open(fileobj=self.buffer, mode='r:gz') as tar_file:
+            return {
+                member.name: tar_file.extractfile(member).read() if member.isfile() else None
+                for member in tar_file.getmembers()
+            }
+
+    def test_write_files(self):
+        course_fs = self.export_fs.makedir('course')
+        with course_fs.open('course.xml', 'wb') as course_xml:
+            course_xml.write(b'<course/>')
+        course_fs.makedirs('html/sub', recreate=True)
+        with course_fs.open('html/sub/intro.html', 'w') as html_file:
+            html_file.write('h\xe9llo')
+
+        assert self.export_fs.listdir('course') == ['course.xml', 'html']
+        assert course_fs.getsize('course.xml') == 9
+        assert self._members() == {
+            'course': None,
+            'course/course.xml': b'<course/>',
+            'course/html': None,
+            'course/html/sub': None,
+            'course/html/sub/intro.html': 'h\xe9llo'.encode('utf-8'),
+        }
+
+    def test_large_files(self):
+        contents = b'x' * (SPOOL_MAX_SIZE * 2 + 1)
+        with self.export_fs.open('written.bin', 'wb') as written_file:
+            written_file.write(contents)
+        self.export_fs.setbinfile('copied.bin', io.BytesIO(contents))
+
+        assert self._members() == {'written.bin': contents, 'copied.bin': contents}
+
+    def test_makedir(self):
+        self.export_fs.makedir('course')
+        with self.assertRaises(errors.DirectoryExists):
+            self.export_fs.makedir('course')
+        self.export_fs.makedir('course', recreate=True)
+        with self.assertRaises(errors.ResourceNotFound):
+            self.export_fs.makedir('missing/course')
+
+        assert self._members() == {'course': None}
+
+    def test_write_only(self):
+        with self.export_fs.open('course.xml', 'wb') as course_xml:
+            course_xml.write(b'<course/>')
+
+        with self.assertRaises(errors.ResourceReadOnly):
+            self.export_fs.open('course.xml', 'rb')
+        with self.assertRaises(errors.ResourceReadOnly):
+            self.export_fs.open('course.xml', 'ab')
+        with self.assertRaises(errors.ResourceReadOnly):
+            self.export_fs.remove('course.xml')
+        with self.assertRaises(errors.ResourceNotFound):
+            self.export_fs.open('missing/course.xml', 'wb')
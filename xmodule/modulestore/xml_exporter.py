@@ -4,7 +4,6 @@ Methods for exporting course data to XML
 
 
 import logging
-import os
 from abc import abstractmethod
 from json import dumps
 
@@ -24,6 +23,7 @@ from xmodule.modulestore import LIBRARY_ROOT, EdxJSONEncoder, ModuleStoreEnum
 from xmodule.modulestore.draft_and_published import DIRECT_ONLY_CATEGORIES
 from xmodule.modulestore.inheritance import own_metadata
 from xmodule.modulestore.store_utilities import draft_node_constructor, get_draft_subtree_roots
+from xmodule.modulestore.tar_export import TarExportFS
 
 DRAFT_DIR = "drafts"
 PUBLISHED_DIR = "published"
@@ -109,7 +109,7 @@ class ExportManager:
     """
     Manages XML exporting for courselike objects.
     """
-    def __init__(self, modulestore, contentstore, courselike_key, root_dir, target_dir):
+    def __init__(self, modulestore, contentstore, courselike_key, root_dir, target_dir, root_fs=None):
         """
         Export all blocks from `modulestore` and content from `contentstore` as xml to `root_dir`.
 
@@ -118,12 +118,14 @@ class ExportManager:
         `courselike_key`: The Locator of the block to export
         `root_dir`: The directory to write the exported xml to
         `target_dir`: The name of the directory inside `root_dir` to write the content to
+        `root_fs`: A pyfilesystem to write the exported xml to instead of `root_dir`, e.g. a `TarExportFS`
         """
         self.modulestore = modulestore
         self.contentstore = contentstore
         self.courselike_key = courselike_key
         self.root_dir = root_dir
         self.target_dir = str(target_dir)
+        self.root_fs = root_fs
 
     @abstractmethod
     def get_key(self):
@@ -137,7 +139,7 @@ class ExportManager:
         Perform any additional tasks to the root XML node.
         """
 
-    def process_extra(self, root, courselike, root_courselike_dir, xml_centric_courselike_key, export_fs):
+    def process_extra(self, root, courselike, xml_centric_courselike_key, export_fs):
         """
         Process additional content, like static assets.
         """
@@ -159,7 +161,7 @@ class ExportManager:
         """
         with self.modulestore.bulk_operations(self.courselike_key):
 
-            fsm = OSFS(self.root_dir)
+            fsm = self.root_fs or OSFS(self.root_dir)
             root = lxml.etree.Element('unknown')
 
             # export only the published content
@@ -177,8 +179,7 @@ class ExportManager:
             self.process_root(root, export_fs)
 
             # Process extra items-- drafts, assets, etc
-            root_courselike_dir = self.root_dir + '/' + self.target_dir
-            self.process_extra(root, courselike, root_courselike_dir, xml_centric_courselike_key, export_fs)
+            self.process_extra(root, courselike, xml_centric_courselike_key, export_fs)
 
             # Any last pass adjustments
             self.post_process(root, export_fs)
@@ -205,28 +206,22 @@ class CourseExportManager(ExportManager):
         with export_fs.open('course.xml', 'wb') as course_xml:
             lxml.etree.ElementTree(root).write(course_xml, encoding='utf-8')
 
-    def process_extra(self, root, courselike, root_courselike_dir, xml_centric_courselike_key, export_fs):
+    def process_extra(self, root, courselike, xml_centric_courselike_key, export_fs):
         # Export the modulestore's asset metadata.
-        asset_dir = root_courselike_dir + '/' + AssetMetadata.EXPORTED_ASSET_DIR + '/'
-        if not os.path.isdir(asset_dir):
-            os.makedirs(asset_dir)
+        asset_dir = export_fs.makedirs(AssetMetadata.EXPORTED_ASSET_DIR, recreate=True)
         asset_root = lxml.etree.Element(AssetMetadata.ALL_ASSETS_XML_TAG)
         course_assets = self.modulestore.get_all_asset_metadata(self.courselike_key, None)
         for asset_md in course_assets:
             # All asset types are exported using the "asset" tag - but their asset type is specified in each asset key.
             asset = lxml.etree.SubElement(asset_root, AssetMetadata.ASSET_XML_TAG)
             asset_md.to_xml(asset)
-        with OSFS(asset_dir).open(AssetMetadata.EXPORTED_ASSET_FILENAME, 'wb') as asset_xml_file:
+        with asset_dir.open(AssetMetadata.EXPORTED_ASSET_FILENAME, 'wb') as asset_xml_file:
             lxml.etree.ElementTree(asset_root).write(asset_xml_file, encoding='utf-8')
 
         # export the static assets
         policies_dir = export_fs.makedir('policies', recreate=True)
         if self.contentstore:
-            self.contentstore.export_all_for_course(
-                self.courselike_key,
-                root_courselike_dir + '/static/',
-                root_courselike_dir + '/policies/assets.json',
-            )
+            self.contentstore.export_all_for_course_to_fs(self.courselike_key, export_fs)
 
             # If we are using the default course image, export it to the
             # legacy location to support backwards compatibility.
@@ -237,15 +232,18 @@ class CourseExportManager(ExportManager):
                             courselike.id,
                             courselike.course_image
                         ),
+                        as_stream=True,
                     )
                 except NotFoundError:
                     pass
                 else:
-                    output_dir = root_courselike_dir + '/static/images/'
-                    if not os.path.isdir(output_dir):
-                        os.makedirs(output_dir)
-                    with OSFS(output_dir).open('course_image.jpg', 'wb') as course_image_file:
-                        course_image_file.write(course_image.data)
+                    output_dir = export_fs.makedirs('static/images', recreate=True)
+                    try:
+                        with output_dir.open('course_image.jpg', 'wb') as course_image_file:
+                            for chunk in course_image.stream_data():
+                                course_image_file.write(chunk)
+                    finally:
+                        course_image.close()
 
         # export the static tabs
         export_extra_content(
@@ -321,7 +319,7 @@ class LibraryExportManager(ExportManager):
         root.set('org', self.courselike_key.org)
         root.set('library', self.courselike_key.library)
 
-    def process_extra(self, root, courselike, root_courselike_dir, xml_centric_courselike_key, export_fs):
+    def process_extra(self, root, courselike, xml_centric_courselike_key, export_fs):
         """
         Notionally, libraries may have assets. This is currently unsupported, but the structure is here
         to ease in duck typing during import. This may be expanded as a useful feature eventually.
@@ -330,11 +328,7 @@ class LibraryExportManager(ExportManager):
         export_fs.makedir('policies', recreate=True)
 
         if self.contentstore:
-            self.contentstore.export_all_for_course(
-                self.courselike_key,
-                self.root_dir + '/' + self.target_dir + '/static/',
-                self.root_dir + '/' + self.target_dir + '/policies/assets.json',
-            )
+            self.contentstore.export_all_for_course_to_fs(self.courselike_key, export_fs)
 
     def post_process(self, root, export_fs):
         """
@@ -363,6 +357,26 @@ def export_library_to_xml(modulestore, contentstore, library_key, root_dir, libr
     LibraryExportManager(modulestore, contentstore, library_key, root_dir, library_dir).export()
 
 
+def export_course_to_tarball(modulestore, contentstore, course_key, tar_file, course_dir):
+    """
+    Export the course into the directory `course_dir` of the given TarFile (opened for writing),
+    adding each file to it as it's written. See ExportManager for details.
+    """
+    CourseExportManager(
+        modulestore, contentstore, course_key, None, course_dir, root_fs=TarExportFS(tar_file)
+    ).export()
+
+
+def export_library_to_tarball(modulestore, contentstore, library_key, tar_file, library_dir):
+    """
+    Export the library into the directory `library_dir` of the given TarFile (opened for writing),
+    adding each file to it as it's written. See ExportManager for details.
+    """
+    LibraryExportManager(
+        modulestore, contentstore, library_key, None, library_dir, root_fs=TarExportFS(tar_file)
+    ).export()
+
+
 def adapt_references(subtree, destination_course_key, export_fs):
     """
     Map every reference in the subtree into destination_course_key and set it back into the xblock fields
@@ -202,3 +202,29 @@ class ContentTest(unittest.TestCase):  # lint-amnesty, pylint: disable=missing-c
             total_length += len(chunck)
 
         assert total_length == ((last_byte - first_byte) + 1)
+
+    def test_static_content_stream_reads_aligned_on_chunks(self):
+        """
+        Test that StaticContentStream reads the stream in the chunks of the GridFS file,
+        the first one being cut to align the next ones when a range starts mid-chunk.
+        """
+        item = FakeGridFsItem(SAMPLE_STRING)
+        item.chunk_size = 100
+        item.read = Mock(wraps=item.read)
+        static_content_stream = StaticContentStream('loc', 'name', 'type', item, length=item.length)
+
+        data = ''.join(static_content_stream.stream_data_in_range(150, 420))
+        assert data == SAMPLE_STRING[150:421]
+        assert [call.args[0] for call in item.read.call_args_list] == [50, 100, 100, 21]
+
+        item.seek(0)
+        item.read.reset_mock()
+        assert ''.join(static_content_stream.stream_data()) == SAMPLE_STRING
+        assert {call.args[0] for call in item.read.call_args_list} == {100}
+
+    def test_static_content_stream_data_in_range(self):
+        """
+        Test StaticContent stream_data_in_range function, for content in memory.
+        """
+        static_content = StaticContent('loc', 'name', 'type', SAMPLE_STRING)
+        assert ''.join(static_content.stream_data_in_range(100, 1500)) == SAMPLE_STRING[100:1501]
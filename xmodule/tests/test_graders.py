@@ -3,10 +3,12 @@ Grading tests
 """
 
 
+import random
 import unittest
 from datetime import datetime, timedelta
 import pytest
 import ddt
+import numpy
 from pytz import UTC
 
 from lms.djangoapps.grades.scores import compute_percent
@@ -338,6 +340,98 @@ class GraderTest(unittest.TestCase):
         assert expected_error_message in str(error.value)
 
 
+@ddt.ddt
+class BatchGraderTest(unittest.TestCase):
+    """
+    Tests that grading in batch has the same results as grading each grade sheet.
+    """
+    FORMATS = ('Homework', 'Lab', 'Midterm', 'Final')
+    NUM_STUDENTS = 20
+
+    MockGrade = GraderTest.MockGrade
+
+    def _random_grader(self, rand):
+        """
+        Returns a random grader configuration for some of the formats.
+        """
+        return graders.grader_from_conf([
+            {
+                'type': subsection_format,
+                'min_count': rand.randint(0, 5),
+                'drop_count': rand.randint(0, 3),
+                'weight': rand.choice((0, 0.1, 0.15, 0.25, 0.3, 1.0 / 3, 0.6)),
+            }
+            for subsection_format in rand.sample(self.FORMATS, rand.randint(1, len(self.FORMATS)))
+        ])
+
+    def _random_sheets(self, rand):
+        """
+        Returns a random (grade_sheets, batch_sheet) tuple, with the grade
+        sheet of each student and the corresponding batch sheet.
+        """
+        grade_sheets = [{} for __ in range(self.NUM_STUDENTS)]
+        batch_sheet = {}
+        for subsection_format in self.FORMATS:
+            num_sections = rand.randint(0, 8)
+            # Small ranges of values make for many tied scores.
+            earned = [[rand.randint(0, 4) for __ in range(num_sections)] for __ in range(self.NUM_STUDENTS)]
+            possible = [[rand.choice((0, 3, 4, 7)) for __ in range(num_sections)] for __ in range(self.NUM_STUDENTS)]
+            for student, grade_sheet in enumerate(grade_sheets):
+                grade_sheet[subsection_format] = {
+                    f'section{section}': self.MockGrade(
+                        AggregatedScore(
+                            tw_earned=earned[student][section],
+                            tw_possible=possible[student][section],
+                            graded=True,
+                            first_attempted=None,
+                        ),
+                        display_name=f'section{section}',
+                    )
+                    for section in range(num_sections)
+                    # As with CourseGrade.graded_subsections_by_format
+                    if possible[student][section] > 0
+                }
+            batch_sheet[subsection_format] = graders.batch_percents_graded(
+                numpy.array(earned, dtype=float).reshape(self.NUM_STUDENTS, num_sections),
+                numpy.array(possible, dtype=float).reshape(self.NUM_STUDENTS, num_sections),
+            )
+        return grade_sheets, batch_sheet
+
+    @ddt.data(*range(50))
+    def test_equivalent_to_grade(self, seed):
+        rand = random.Random(seed)
+        grader = self._random_grader(rand)
+        grade_sheets, batch_sheet = self._random_sheets(rand)
+
+        batch_result = grader.grade_batch(batch_sheet, self.NUM_STUDENTS)
+        for student, grade_sheet in enumerate(grade_sheets):
+            result = grader.grade(grade_sheet)
+            # The results are identical, not merely close.
+            assert batch_result['percent'][student] == result['percent']
+            assert list(batch_result['grade_breakdown']) == list(result['grade_breakdown'])
+            for category, breakdown in result['grade_breakdown'].items():
+                assert batch_result['grade_breakdown'][category][student] == breakdown['percent']
+
+    def test_assignment_format_grader(self):
+        grader = graders.AssignmentFormatGrader("Lab", 3, 2)
+        batch_sheet = {
+            'Lab': graders.batch_percents_graded(
+                [[1, 1, 1, 0], [5, 3, 0, 0], [0, 0, 0, 0]],
+                [[2, 1, 1, 1], [25, 4, 0, 0], [0, 0, 0, 0]],
+            ),
+        }
+        percents = grader.grade_batch(batch_sheet, 3)['percent']
+        assert list(percents) == [1.0, 0.75, 0.0]
+
+    def test_no_students(self):
+        grader = graders.grader_from_conf([
+            {'type': 'Homework', 'min_count': 2, 'drop_count': 1, 'weight': 1.0},
+        ])
+        result = grader.grade_batch({'Homework': numpy.empty((0, 3))}, 0)
+        assert result['percent'].shape == (0,)
+        assert result['grade_breakdown']['Homework'].shape == (0,)
+
+
 @ddt.ddt
 class ShowCorrectnessTest(unittest.TestCase):
     """